@@ -33,23 +33,35 @@ Agent 模块 - 基于 LangChain 1.0 的对话式二创 Agent
 - 流式处理: from agent.stream import StreamEventProcessor
 """
 
-from agent.remix_agent import (
-    create_remix_agent,
-    get_session_config,
-    get_agent_state,
-)
-from agent.state import RemixAgentState, RemixContext
-from agent.memory import memory_manager, get_store
-
-__all__ = [
+import importlib
+from typing import Any
+
+# 导出名 -> 所在子模块。按需导入（PEP 562）：只使用 agent.memory / agent.intent_classifier
+# 等子模块时不会连带加载 remix_agent 及其全部工具和 LLM 提供商依赖
+_EXPORTS = {
     # Agent 工厂
-    "create_remix_agent",
-    "get_session_config",
-    "get_agent_state",
+    "create_remix_agent": "agent.remix_agent",
+    "get_session_config": "agent.remix_agent",
+    "get_agent_state": "agent.remix_agent",
     # 状态和上下文
-    "RemixAgentState",
-    "RemixContext",
+    "RemixAgentState": "agent.state",
+    "RemixContext": "agent.state",
     # 记忆管理
-    "memory_manager",
-    "get_store",
-]
+    "memory_manager": "agent.memory",
+    "get_store": "agent.memory",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name: str) -> Any:
+    module_name = _EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list:
+    return sorted(set(globals()) | set(__all__))
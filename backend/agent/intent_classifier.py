@@ -160,7 +160,24 @@ class IntentResult(BaseModel):
 # 关键词缓存
 _keywords_cache: dict = {}
 _keywords_cache_timestamp: float = 0
-_keywords_cache_ttl: float = 300  # 5 分钟缓存
+_keywords_cache_ttl: float = 300  # 5 分钟缓存（配置版本轮询不可用时的兜底）
+_keywords_cache_generation: int = 0  # 缓存对应的配置 generation
+
+
+def _keywords_generation() -> int:
+    from services.config_version_service import INSIGHT_MODES_SCOPE, get_config_version_service
+    return get_config_version_service().generation(INSIGHT_MODES_SCOPE)
+
+
+def _keywords_cache_valid() -> bool:
+    """关键词缓存有效：配置 generation 未变化（版本轮询不可用时再按 TTL 判断）"""
+    from services.config_version_service import INSIGHT_MODES_SCOPE, get_config_version_service
+    return get_config_version_service().is_fresh(
+        INSIGHT_MODES_SCOPE,
+        _keywords_cache_generation,
+        _keywords_cache_timestamp,
+        _keywords_cache_ttl,
+    )
 
 # 硬编码回退关键词（当数据库不可用时使用）
 _FALLBACK_KEYWORDS = {
@@ -191,11 +208,12 @@ def _get_intent_keywords() -> dict:
         {mode_key: {"zh": [...], "en": [...]}} 字典
     """
     import time
-    global _keywords_cache, _keywords_cache_timestamp
+    global _keywords_cache, _keywords_cache_timestamp, _keywords_cache_generation
 
     # 检查缓存是否有效
     current_time = time.time()
-    cache_valid = (current_time - _keywords_cache_timestamp) < _keywords_cache_ttl
+    cache_valid = _keywords_cache_valid()
+    generation = _keywords_generation()
 
     if cache_valid and _keywords_cache:
         return _keywords_cache
@@ -218,6 +236,7 @@ def _get_intent_keywords() -> dict:
         if keywords:
             _keywords_cache = keywords
             _keywords_cache_timestamp = current_time
+            _keywords_cache_generation = generation
             return keywords
 
     except Exception as e:
@@ -234,10 +253,11 @@ async def _get_intent_keywords_async() -> dict:
         {mode_key: {"zh": [...], "en": [...]}} 字典
     """
     import time
-    global _keywords_cache, _keywords_cache_timestamp
+    global _keywords_cache, _keywords_cache_timestamp, _keywords_cache_generation
 
     current_time = time.time()
-    cache_valid = (current_time - _keywords_cache_timestamp) < _keywords_cache_ttl
+    cache_valid = _keywords_cache_valid()
+    generation = _keywords_generation()
 
     if cache_valid and _keywords_cache:
         return _keywords_cache
@@ -248,6 +268,7 @@ async def _get_intent_keywords_async() -> dict:
         if keywords:
             _keywords_cache = keywords
             _keywords_cache_timestamp = current_time
+            _keywords_cache_generation = generation
             return keywords
     except Exception as e:
         logger.warning(f"Failed to load keywords from database (async): {e}, using fallback")
@@ -103,6 +103,10 @@ class SessionManagerProtocol(Protocol):
         segments: Optional[List[Dict[str, Any]]] = None
     ) -> ChatMessageEntry: ...
 
+    def add_messages(
+        self, session_id: str, messages: List[Dict[str, Any]]
+    ) -> List[ChatMessageEntry]: ...
+
     def list_messages(
         self, session_id: str, limit: int = 100, offset: int = 0
     ) -> List[ChatMessageEntry]: ...
@@ -210,6 +214,28 @@ class InMemorySessionManager:
             self._sessions[session_id].updated_at = datetime.now()
             return message
 
+    def add_messages(
+        self, session_id: str, messages: List[Dict[str, Any]]
+    ) -> List[ChatMessageEntry]:
+        """批量追加消息，messages 元素格式: {"role", "content", "segments"(可选)}"""
+        with self._lock:
+            if session_id not in self._sessions:
+                self._sessions[session_id] = SessionMetadata(session_id=session_id, title="新对话")
+                self._messages[session_id] = []
+
+            entries = [
+                ChatMessageEntry(
+                    message_id=str(uuid.uuid4()),
+                    role=msg["role"],
+                    content=msg["content"],
+                    segments_json=msg.get("segments"),
+                )
+                for msg in messages
+            ]
+            self._messages[session_id].extend(entries)
+            self._sessions[session_id].updated_at = datetime.now()
+            return entries
+
     def list_messages(
         self,
         session_id: str,
@@ -308,6 +334,12 @@ class InMemorySessionManager:
         """添加消息 (async)"""
         return self.add_message(session_id, role, content, segments)
 
+    async def aadd_messages(
+        self, session_id: str, messages: List[Dict[str, Any]]
+    ) -> List[ChatMessageEntry]:
+        """批量添加消息 (async)"""
+        return self.add_messages(session_id, messages)
+
     async def alist_messages(
         self, session_id: str, limit: int = 100, offset: int = 0
     ) -> List[ChatMessageEntry]:
@@ -642,41 +674,71 @@ class MySQLSessionManager:
         self, session_id: str, role: str, content: str,
         segments: Optional[List[Dict[str, Any]]] = None
     ) -> ChatMessageEntry:
-        from sqlalchemy import text
+        entries = await self._add_messages_async(session_id, [{
+            "role": role,
+            "content": content,
+            "segments": segments,
+        }])
+        return entries[0]
+
+    def add_messages(
+        self, session_id: str, messages: List[Dict[str, Any]]
+    ) -> List[ChatMessageEntry]:
+        return self._run_async(self._add_messages_async(session_id, messages))
 
-        message_id = str(uuid.uuid4())
-        segments_str = json.dumps(segments, ensure_ascii=False) if segments else None
+    async def _add_messages_async(
+        self, session_id: str, messages: List[Dict[str, Any]]
+    ) -> List[ChatMessageEntry]:
+        """
+        单事务追加消息
 
-        async with self.async_session_factory() as session:
-            # 确保会话存在
-            await self._create_session_async(session_id, "新对话", "")
+        一次连接、一次提交内完成:
+        1. upsert 会话 (不存在则创建，存在则刷新 updated_at)
+        2. 批量 INSERT 消息 (executemany，驱动层合并为多行 VALUES)
 
-            insert_query = text("""
-                INSERT INTO agent_session_messages (message_id, session_id, role, content, segments_json)
-                VALUES (:mid, :sid, :role, :content, :segments)
-            """)
-            await session.execute(insert_query, {
-                "mid": message_id,
+        会话行必须先于消息写入 (外键约束)，因此 upsert 放在第一步。
+        """
+        from sqlalchemy import text
+
+        if not messages:
+            return []
+
+        entries = [
+            ChatMessageEntry(
+                message_id=str(uuid.uuid4()),
+                role=msg["role"],
+                content=msg["content"],
+                segments_json=msg.get("segments"),
+            )
+            for msg in messages
+        ]
+
+        upsert_query = text("""
+            INSERT INTO agent_sessions (session_id, title, first_message)
+            VALUES (:sid, '新对话', '')
+            ON DUPLICATE KEY UPDATE updated_at = NOW(6)
+        """)
+        insert_query = text("""
+            INSERT INTO agent_session_messages (message_id, session_id, role, content, segments_json)
+            VALUES (:mid, :sid, :role, :content, :segments)
+        """)
+        rows = [
+            {
+                "mid": entry.message_id,
                 "sid": session_id,
-                "role": role,
-                "content": content,
-                "segments": segments_str,
-            })
+                "role": entry.role,
+                "content": entry.content,
+                "segments": json.dumps(entry.segments_json, ensure_ascii=False) if entry.segments_json else None,
+            }
+            for entry in entries
+        ]
 
-            # 更新会话 updated_at
-            update_query = text("""
-                UPDATE agent_sessions SET updated_at = NOW(6)
-                WHERE session_id = :sid
-            """)
-            await session.execute(update_query, {"sid": session_id})
+        async with self.async_session_factory() as session:
+            await session.execute(upsert_query, {"sid": session_id})
+            await session.execute(insert_query, rows)
             await session.commit()
 
-        return ChatMessageEntry(
-            message_id=message_id,
-            role=role,
-            content=content,
-            segments_json=segments,
-        )
+        return entries
 
     def list_messages(
         self, session_id: str, limit: int = 100, offset: int = 0
@@ -781,6 +843,12 @@ class MySQLSessionManager:
         """添加消息 (async)"""
         return await self._add_message_async(session_id, role, content, segments)
 
+    async def aadd_messages(
+        self, session_id: str, messages: List[Dict[str, Any]]
+    ) -> List[ChatMessageEntry]:
+        """批量添加消息 (async，单事务)"""
+        return await self._add_messages_async(session_id, messages)
+
     async def alist_messages(
         self, session_id: str, limit: int = 100, offset: int = 0
     ) -> List[ChatMessageEntry]:
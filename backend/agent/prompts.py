@@ -337,14 +337,28 @@ MODE_PROMPTS = {
 # Mode Prompt 缓存（从数据库加载）
 _mode_prompt_cache: dict = {}
 _cache_timestamp: float = 0
-_cache_ttl: float = 300  # 5 分钟缓存
+_cache_ttl: float = 300  # 5 分钟缓存（配置版本轮询不可用时的兜底）
+_cache_generation: int = 0  # 缓存对应的配置 generation，其他 worker 修改配置后失效
+
+
+def _mode_prompt_generation() -> int:
+    from services.config_version_service import INSIGHT_MODES_SCOPE, get_config_version_service
+    return get_config_version_service().generation(INSIGHT_MODES_SCOPE)
+
+
+def _mode_prompt_cache_valid() -> bool:
+    """mode prompt 缓存有效：配置 generation 未变化（版本轮询不可用时再按 TTL 判断）"""
+    from services.config_version_service import INSIGHT_MODES_SCOPE, get_config_version_service
+    return get_config_version_service().is_fresh(
+        INSIGHT_MODES_SCOPE, _cache_generation, _cache_timestamp, _cache_ttl,
+    )
 
 
 def _get_cached_mode_prompt(mode: str) -> str:
     """
     从缓存或数据库获取 mode prompt
 
-    1. 检查内存缓存（5 分钟 TTL）
+    1. 检查内存缓存（配置 generation 一致；版本轮询不可用时按 5 分钟 TTL）
     2. 缓存未命中时尝试从数据库加载
     3. 数据库读取失败时回退到硬编码默认值
 
@@ -354,19 +368,12 @@ def _get_cached_mode_prompt(mode: str) -> str:
     Returns:
         mode prompt 字符串
     """
-    import time
-    global _mode_prompt_cache, _cache_timestamp
-
-    # 检查缓存是否有效
-    current_time = time.time()
-    cache_valid = (current_time - _cache_timestamp) < _cache_ttl
-
-    if cache_valid and mode in _mode_prompt_cache:
+    if _mode_prompt_cache_valid() and mode in _mode_prompt_cache:
         return _mode_prompt_cache[mode]
 
     # 回退到硬编码默认值（同步上下文不尝试数据库加载）
-    # 数据库加载由应用启动时的 initialize_default_modes 完成
-    # 或由 _preload_mode_prompts 异步预加载
+    # 数据库加载由应用启动时的 initialize_default_modes 完成，
+    # 配置变更后由配置版本服务回调 _preload_mode_prompts 重新加载
     return MODE_PROMPTS.get(mode, MODE_ANALYZE_PROMPT)
 
 
@@ -374,17 +381,19 @@ async def _preload_mode_prompts():
     """
     异步预加载所有 mode prompt 到缓存
 
-    应在应用启动时调用，或在缓存失效后由异步上下文调用。
+    应在应用启动时调用，并注册为 insight_modes 配置变更回调。
     """
     import time
-    global _mode_prompt_cache, _cache_timestamp
+    global _mode_prompt_cache, _cache_timestamp, _cache_generation
 
+    generation = _mode_prompt_generation()
     try:
         from services.insight_mode_service import insight_mode_service
         prompts = await insight_mode_service.get_all_mode_prompts()
         if prompts:
             _mode_prompt_cache = prompts
             _cache_timestamp = time.time()
+            _cache_generation = generation
             return True
     except Exception as e:
         from utils.logger import logger
@@ -407,14 +416,13 @@ def _get_cached_mode_prompt_sync(mode: str) -> str:
     """
     import time
     import asyncio
-    global _mode_prompt_cache, _cache_timestamp
+    global _mode_prompt_cache, _cache_timestamp, _cache_generation
 
     # 检查缓存是否有效
     current_time = time.time()
-    cache_valid = (current_time - _cache_timestamp) < _cache_ttl
-
-    if cache_valid and mode in _mode_prompt_cache:
+    if _mode_prompt_cache_valid() and mode in _mode_prompt_cache:
         return _mode_prompt_cache[mode]
+    generation = _mode_prompt_generation()
 
     # 尝试从数据库加载
     try:
@@ -431,6 +439,7 @@ def _get_cached_mode_prompt_sync(mode: str) -> str:
             if prompts:
                 _mode_prompt_cache = prompts
                 _cache_timestamp = current_time
+                _cache_generation = generation
                 if mode in _mode_prompt_cache:
                     return _mode_prompt_cache[mode]
     except Exception as e:
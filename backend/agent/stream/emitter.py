@@ -28,7 +28,7 @@ StreamEventEmitter - 流式事件发送器
 """
 
 import time
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional
 
 
 class StreamEventEmitter:
@@ -102,8 +102,9 @@ class StreamEventEmitter:
             "data": data
         })
 
-    def tool_progress(self, message: str, stage: str = "") -> Dict[str, Any]:
-        return self.emit("tool_progress", {"message": message, "stage": stage})
+    def tool_progress(self, message: str, stage: str = "", **extra: Any) -> Dict[str, Any]:
+        """工具进度事件；extra 为附加字段（如排队时的 resource / position）"""
+        return self.emit("tool_progress", {"message": message, "stage": stage, **extra})
 
     def sub_step_start(self, step_id: str, label: str, parent_tool: str) -> Dict[str, Any]:
         """子步骤开始事件
@@ -123,6 +124,23 @@ class StreamEventEmitter:
             "message": message,
         })
 
+    def transcript_partial(
+        self,
+        step_id: str,
+        segments: List[Dict[str, Any]],
+        content_id: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """渐进式转录事件
+
+        转录子步骤进行中推送已解码窗口的字幕分段，前端追加展示；
+        完整结果仍以 transcript 事件为准
+        """
+        return self.emit("transcript_partial", {
+            "step_id": step_id,
+            "segments": segments,
+            "content_id": content_id,
+        })
+
     def final_report_start(self) -> Dict[str, Any]:
         """发送最终报告开始事件
 
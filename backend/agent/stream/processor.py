@@ -310,6 +310,13 @@ class StreamEventProcessor:
             if transcript:
                 return self.emitter.emit("transcript", transcript)
             return None
+        elif event_name == "transcript_partial":
+            # 渐进式转录：某个窗口解码完成的字幕分段，最终以 transcript 事件的完整结果为准
+            return self.emitter.transcript_partial(
+                step_id=custom_data.get("step_id", ""),
+                segments=custom_data.get("segments", []),
+                content_id=custom_data.get("content_id"),
+            )
 
         if isinstance(custom_data, dict):
             # 兼容旧格式: stream_writer({"type": ...})
@@ -338,7 +345,9 @@ class StreamEventProcessor:
             stage = custom_data.get("stage", "")
             message = custom_data.get("message", "")
             if stage or message:
-                return self.emitter.tool_progress(message, stage)
+                # 准入排队事件附带资源类别与排队位置
+                extra = {key: custom_data[key] for key in ("resource", "position") if key in custom_data}
+                return self.emitter.tool_progress(message, stage, **extra)
 
             # 其他自定义事件
             if event_type:
@@ -0,0 +1,67 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2026 relakkes@gmail.com
+#
+# This file is part of MediaCrawlerPro-ContentRemixAgent project.
+# Repository: https://github.com/MediaCrawlerPro/MediaCrawlerPro-ContentRemixAgent/blob/main/backend/agent/tools/admission.py
+# GitHub: https://github.com/NanmiCoder
+# Licensed under NON-COMMERCIAL LEARNING LICENSE 1.1
+#
+# 声明：本代码仅供学习和研究目的使用。使用者应遵守以下原则：
+# 1. 不得用于任何商业用途。
+# 2. 使用时应遵守目标平台的使用条款和robots.txt规则。
+# 3. 不得进行大规模爬取或对平台造成运营干扰。
+# 4. 应合理控制请求频率，避免给目标平台带来不必要的负担。
+# 5. 不得用于任何非法或不当的用途。
+#
+# 详细许可条款请参阅项目根目录下的LICENSE文件。
+# 使用本代码即表示您同意遵守上述原则和LICENSE中的所有条款。
+
+"""
+工具内的重资源准入 - 以当前用户身份占用资源槽位，排队位置推送为 tool_progress 事件
+"""
+
+from contextlib import asynccontextmanager, contextmanager
+
+from langgraph.prebuilt import ToolRuntime
+
+from i18n import t
+from services.admission_control import (
+    QueueCallback,
+    ResourceClass,
+    admission_context,
+    get_admission_controller,
+)
+
+
+def queue_reporter(runtime: ToolRuntime) -> QueueCallback:
+    """排队位置变化时发送 tool_progress（stage=queued，附带 resource / position；position=0 表示已获得槽位）"""
+
+    async def report(resource: ResourceClass, position: int) -> None:
+        resource_label = t(f"progress.resources.{resource.value}")
+        if position > 0:
+            message = t("progress.queued", resource=resource_label, position=position)
+        else:
+            message = t("progress.dequeued", resource=resource_label)
+        runtime.stream_writer({
+            "stage": "queued",
+            "message": message,
+            "resource": resource.value,
+            "position": position,
+        })
+
+    return report
+
+
+@contextmanager
+def tool_admission(runtime: ToolRuntime):
+    """在该范围内的 slot() 调用以工具调用者的身份排队并推送排队进度"""
+    with admission_context(getattr(runtime.context, "user_id", None), queue_reporter(runtime)):
+        yield
+
+
+@asynccontextmanager
+async def tool_slot(runtime: ToolRuntime, *resources: ResourceClass):
+    """占用一个或多个资源槽位（排队时推送进度）"""
+    with tool_admission(runtime):
+        async with get_admission_controller().slots(*resources):
+            yield
@@ -1,6 +1,7 @@
 # -*- coding: utf-8 -*-
 """唇形同步工具 - 支持上传音频/TTS/录音来源"""
 
+from contextlib import AsyncExitStack
 from pathlib import Path
 from typing import List, Literal, Optional
 
@@ -11,14 +12,18 @@ from langgraph.types import Command
 
 from agent.errors import RemixErrorCode, RemixToolException, build_tool_user_message
 from agent.state import RemixContext
+from agent.tools.admission import tool_slot
 from config import settings
 from i18n import t
+from services.admission_control import ResourceClass
+from services.lipsync_poller import get_lipsync_poller
 from services.media_ai_source_service import MediaAISourceService, MediaSourceError
 from services.syncso_client import SyncsoClient, SyncsoClientError
+from services.tts_audio_service import synthesize_tts_audio
 from services.tts_expression_service import build_expressive_tts_text_async
 from services.tts_tag_service import TTSTagError
-from services.voicv_client import VoicvClient, VoicvClientError
-from services.voice_style_profile_store import VoiceStyleProfileStore
+from services.voicv_client import VoicvClientError
+from services.voice_style_profile_store import get_voice_style_profile_store
 from services.media_ai_store import MediaAIStore
 
 
@@ -59,7 +64,7 @@ def _resolve_voice_profile(
     if cloned_voice.get("voice_id") == selected_voice_id and isinstance(cloned_voice.get("expression_profile"), dict):
         return cloned_voice.get("expression_profile")
 
-    store = VoiceStyleProfileStore()
+    store = get_voice_style_profile_store()
     return store.get(selected_voice_id)
 
 
@@ -122,35 +127,15 @@ async def lipsync_generate(
                 tag_strategy="llm",
                 speech_style="speech",
             )
-            tts_client = VoicvClient()
-            tts_result = await tts_client.text_to_speech(
+            tts_result = await synthesize_tts_audio(
                 voice_id=selected_voice_id,
                 text=normalized["text"],
                 audio_format="mp3",
+                speed=float(settings.TTS_AUDIO_SPEED),
+                slot=lambda resource: tool_slot(runtime, resource),
+                source_svc=source_service,
             )
-            tts_audio_url = tts_result["audio_url"]
-            speed = float(settings.TTS_AUDIO_SPEED)
-            if abs(speed - 1.0) > 1e-6:
-                downloaded_bytes, guessed_name, _ = await source_service.download_bytes(
-                    tts_audio_url,
-                    max_bytes=max(settings.VOICE_CLONE_MAX_AUDIO_BYTES, 50 * 1024 * 1024),
-                )
-                input_ext = Path(guessed_name).suffix or ".mp3"
-                speed_bytes, speed_name, speed_content_type = source_service.change_audio_speed(
-                    downloaded_bytes,
-                    input_ext=input_ext,
-                    speed=speed,
-                    output_ext=".mp3",
-                )
-                speed_asset = source_service.persist_bytes(
-                    speed_bytes,
-                    prefix="tts_speed",
-                    ext=Path(speed_name).suffix or ".mp3",
-                    content_type=speed_content_type,
-                )
-                effective_audio_url = speed_asset["url"]
-            else:
-                effective_audio_url = tts_audio_url
+            effective_audio_url = tts_result["audio_url"]
             effective_audio_source_type = "tts"
 
         if effective_audio_source_type == "tts" and not effective_audio_url:
@@ -158,31 +143,32 @@ async def lipsync_generate(
         if not effective_audio_url:
             raise RemixToolException(RemixErrorCode.LIPSYNC_FAILED, t("errors.lipsyncAudioMissing"))
 
-        # 3) 下载素材，调用 Sync.so
-        video_bytes, video_name, video_content_type = await source_service.download_bytes(
-            effective_video_url,
-            max_bytes=300 * 1024 * 1024,
-        )
-        audio_bytes, audio_name, audio_content_type = await source_service.download_bytes(
-            effective_audio_url,
-            max_bytes=50 * 1024 * 1024,
-        )
+        # 3) 下载素材到临时文件，流式上传到 Sync.so（素材不整体驻留内存）
+        async with AsyncExitStack() as media_files:
+            async with tool_slot(runtime, ResourceClass.DOWNLOAD):
+                video_path, video_name, video_content_type = await media_files.enter_async_context(
+                    source_service.download_to_temp(effective_video_url, max_bytes=300 * 1024 * 1024)
+                )
+                audio_path, audio_name, audio_content_type = await media_files.enter_async_context(
+                    source_service.download_to_temp(effective_audio_url, max_bytes=50 * 1024 * 1024)
+                )
 
-        if Path(video_name).suffix == "":
-            video_name = "input_video.mp4"
-        if Path(audio_name).suffix == "":
-            audio_name = "input_audio.mp3"
-
-        sync_client = SyncsoClient()
-        generation = await sync_client.create_generation(
-            video_bytes=video_bytes,
-            video_filename=video_name,
-            video_content_type=video_content_type,
-            audio_bytes=audio_bytes,
-            audio_filename=audio_name,
-            audio_content_type=audio_content_type,
-            model=model,
-        )
+            if Path(video_name).suffix == "":
+                video_name = "input_video.mp4"
+            if Path(audio_name).suffix == "":
+                audio_name = "input_audio.mp3"
+
+            sync_client = SyncsoClient()
+            async with tool_slot(runtime, ResourceClass.MEDIA_API):
+                generation = await sync_client.create_generation(
+                    video_filename=video_name,
+                    video_content_type=video_content_type,
+                    audio_filename=audio_name,
+                    audio_content_type=audio_content_type,
+                    model=model,
+                    video_path=video_path,
+                    audio_path=audio_path,
+                )
 
         lipsync_result = {
             "generation_id": generation.get("generation_id"),
@@ -212,6 +198,14 @@ async def lipsync_generate(
         if user_id:
             store = MediaAIStore()
             await store.upsert_lipsync_result(user_id, lipsync_result)
+        # 交给服务端轮询器跟踪，完成后写库并通过 /media-ai/lipsync/events 推送
+        get_lipsync_poller().track(
+            lipsync_result["generation_id"],
+            user_id,
+            lipsync_result,
+            status=lipsync_result["status"] or "PENDING",
+            output_url=lipsync_result["output_url"] or "",
+        )
 
         return Command(update={
             "messages": [ToolMessage(content=result_text, tool_call_id=runtime.tool_call_id)],
@@ -1,7 +1,6 @@
 # -*- coding: utf-8 -*-
 """文本转语音工具 - 使用指定音色或克隆音色"""
 
-from pathlib import Path
 from typing import List, Optional
 
 from langchain_core.messages import ToolMessage
@@ -11,13 +10,15 @@ from langgraph.types import Command
 
 from agent.errors import RemixErrorCode, RemixToolException, build_tool_user_message
 from agent.state import RemixContext
+from agent.tools.admission import tool_slot
 from config import settings
 from i18n import t
-from services.media_ai_source_service import MediaAISourceService, MediaSourceError
+from services.media_ai_source_service import MediaSourceError
+from services.tts_audio_service import synthesize_tts_audio
 from services.tts_expression_service import build_expressive_tts_text_async
 from services.tts_tag_service import TTSTagError
-from services.voicv_client import VoicvClient, VoicvClientError
-from services.voice_style_profile_store import VoiceStyleProfileStore
+from services.voicv_client import VoicvClientError
+from services.voice_style_profile_store import get_voice_style_profile_store
 from services.media_ai_store import MediaAIStore
 
 
@@ -43,7 +44,7 @@ def _resolve_voice_profile(
     if cloned_voice.get("voice_id") == selected_voice_id and isinstance(cloned_voice.get("expression_profile"), dict):
         return cloned_voice.get("expression_profile")
 
-    store = VoiceStyleProfileStore()
+    store = get_voice_style_profile_store()
     return store.get(selected_voice_id)
 
 
@@ -94,37 +95,15 @@ async def text_to_speech(
             speech_style="speech",
         )
 
-        client = VoicvClient()
-        result = await client.text_to_speech(
+        speed = float(settings.TTS_AUDIO_SPEED)
+        result = await synthesize_tts_audio(
             voice_id=selected_voice_id,
             text=normalized["text"],
             audio_format=audio_format,
+            speed=speed,
+            slot=lambda resource: tool_slot(runtime, resource),
         )
         final_audio_url = result["audio_url"]
-        speed = float(settings.TTS_AUDIO_SPEED)
-
-        if abs(speed - 1.0) > 1e-6:
-            source_svc = MediaAISourceService()
-            downloaded_bytes, guessed_name, _ = await source_svc.download_bytes(
-                final_audio_url,
-                max_bytes=max(settings.VOICE_CLONE_MAX_AUDIO_BYTES, 50 * 1024 * 1024),
-            )
-            input_ext = Path(guessed_name).suffix or f".{audio_format}"
-            output_ext = f".{audio_format}"
-            speed_bytes, speed_name, speed_content_type = source_svc.change_audio_speed(
-                downloaded_bytes,
-                input_ext=input_ext,
-                speed=speed,
-                output_ext=output_ext,
-            )
-            speed_asset = source_svc.persist_bytes(
-                speed_bytes,
-                prefix="tts_speed",
-                ext=Path(speed_name).suffix or output_ext,
-                content_type=speed_content_type,
-            )
-            result["original_audio_url"] = final_audio_url
-            final_audio_url = speed_asset["url"]
 
         tts_result = {
             "voice_id": selected_voice_id,
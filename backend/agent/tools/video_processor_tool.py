@@ -39,13 +39,17 @@ from langgraph.prebuilt import ToolRuntime
 from langgraph.types import Command
 
 from agent.state import RemixContext
+from agent.tools.admission import tool_admission, tool_slot
 from agent.errors import (
     RemixToolException,
     RemixErrorCode,
     require_state,
     build_tool_user_message,
 )
+from config import settings
 from i18n import t
+from services.admission_control import ResourceClass, get_admission_controller
+from services.audio_extractor import AudioInfo
 from utils.logger import logger
 
 
@@ -58,17 +62,217 @@ class VideoProcessResult:
     task_id: Optional[str] = None
 
 
+def _normalize_enum_value(value, default: str) -> str:
+    """处理枚举类型：Platform.BILIBILI -> bilibili"""
+    if value is None:
+        return default
+    if hasattr(value, 'value'):
+        return value.value
+    if isinstance(value, str) and "." in value:
+        # 处理字符串形式的枚举，如 "Platform.BILIBILI"
+        return value.split(".")[-1].lower()
+    return value
+
+
+def _get_asr_version() -> str:
+    """当前 ASR 配置的版本标识（用于结果缓存键）"""
+    from services.asr_service import ASRService
+    return ASRService().model_version
+
+
+async def _load_cached_artifact(platform: str, content_id: Optional[str]):
+    """查询跨会话视频处理缓存，未启用或未命中返回 None"""
+    from config import settings
+
+    if not settings.VIDEO_CACHE_ENABLED or not content_id:
+        return None
+
+    from services.video_artifact_cache import get_video_artifact_cache
+
+    try:
+        return await asyncio.to_thread(
+            get_video_artifact_cache().get, platform, content_id, _get_asr_version()
+        )
+    except Exception as e:
+        logger.warning(f"[process_video] Video cache lookup failed: {e}")
+        return None
+
+
+async def _store_cached_artifact(
+    platform: str,
+    content_id: Optional[str],
+    result: VideoProcessResult,
+    local_video_url: Optional[str],
+) -> None:
+    """写入跨会话视频处理缓存（失败不影响主流程）"""
+    from config import settings
+
+    if not settings.VIDEO_CACHE_ENABLED or not content_id or not result.text:
+        return
+
+    from services.video_artifact_cache import VideoArtifact, get_video_artifact_cache
+
+    try:
+        artifact = VideoArtifact(
+            platform=platform,
+            content_id=content_id,
+            asr_version=_get_asr_version(),
+            text=result.text,
+            segments=result.segments,
+            local_video_url=local_video_url,
+        )
+        await asyncio.to_thread(get_video_artifact_cache().put, artifact)
+    except Exception as e:
+        logger.warning(f"[process_video] Video cache write failed: {e}")
+
+
+async def _download_then_extract(
+    downloader,
+    extractor,
+    video_url: str,
+    task_id: str,
+    step_callback: Optional[Callable[[str, str, str], Awaitable[None]]] = None,
+    announce_start: bool = True,
+) -> tuple[str, AudioInfo]:
+    """
+    先完整下载视频，再用 ffmpeg 提取音频
+
+    Args:
+        announce_start: 是否发送子步骤 start 事件；流式提取回退时两个子步骤已开始，
+            不再重复发送，避免前端出现重复的进度阶段
+
+    Returns:
+        (视频路径, 提取的音频)
+    """
+    import os
+
+    # Step 1: 下载视频
+    if step_callback and announce_start:
+        await step_callback("start", "download_video", t("progress.downloadVideo"))
+    logger.info(f"[{task_id}] Downloading from: {video_url[:100]}...")
+    async with get_admission_controller().slot(ResourceClass.DOWNLOAD):
+        video_path = await downloader.download(video_url, task_id)
+
+    # 诊断：检查下载文件
+    download_size = os.path.getsize(video_path)
+    logger.info(f"[{task_id}] Downloaded: {video_path}, size: {download_size / 1024 / 1024:.2f} MB")
+
+    if download_size < 100 * 1024:  # 小于 100KB
+        logger.error(f"[{task_id}] Downloaded file too small: {download_size} bytes, may be incomplete")
+
+    if step_callback:
+        size_mb = f"{download_size / 1024 / 1024:.2f}"
+        await step_callback("end", "download_video", t("progress.downloadComplete", size=size_mb))
+
+    # Step 2: 提取音频 (同步操作，在线程池中运行)
+    if step_callback and announce_start:
+        await step_callback("start", "extract_audio", t("progress.extractAudio"))
+    logger.info(f"[{task_id}] Extracting audio...")
+    async with get_admission_controller().slot(ResourceClass.FFMPEG):
+        audio = await asyncio.to_thread(extractor.extract, video_path)
+    await _report_extracted_audio(task_id, audio, step_callback)
+    return video_path, audio
+
+
+async def _report_extracted_audio(
+    task_id: str,
+    audio: AudioInfo,
+    step_callback: Optional[Callable[[str, str, str], Awaitable[None]]] = None,
+) -> None:
+    """记录提取结果（时长来自 WAV 头，无需 ffprobe）并结束 extract_audio 子步骤"""
+    import os
+
+    audio_size = os.path.getsize(audio.path)
+    logger.info(
+        f"[{task_id}] Extracted audio: {audio.path}, size: {audio_size / 1024 / 1024:.2f} MB, "
+        f"duration: {audio.duration:.2f}s @ {audio.sample_rate}Hz"
+    )
+
+    if step_callback:
+        size_mb = f"{audio_size / 1024 / 1024:.2f}"
+        await step_callback("end", "extract_audio", t("progress.extractComplete", size=size_mb))
+
+
+async def _download_and_extract_streaming(
+    downloader,
+    extractor,
+    video_url: str,
+    task_id: str,
+    step_callback: Optional[Callable[[str, str, str], Awaitable[None]]] = None,
+    keep_video: bool = False,
+) -> Optional[tuple[Optional[str], AudioInfo]]:
+    """
+    边下载边提取音频：HTTP 响应体直接写入 ffmpeg stdin
+
+    仅在 keep_video 时同时将视频落盘。ffmpeg 无法从管道解析时
+    （如 moov 位于文件末尾的 MP4）返回 None，由调用方回退到先下载后提取。
+    download_video / extract_audio 的 start 事件在此发送，end 事件只在成功时发送，
+    回退路径沿用已开始的子步骤（announce_start=False）。
+
+    Returns:
+        (视频路径或 None, 提取的音频)；需要回退时返回 None
+    """
+    from services.audio_extractor import AudioExtractError
+
+    if step_callback:
+        await step_callback("start", "download_video", t("progress.downloadVideo"))
+        await step_callback("start", "extract_audio", t("progress.extractAudio"))
+    logger.info(f"[{task_id}] Streaming from: {video_url[:100]}...")
+
+    # 下载与 ffmpeg 同时进行，两类槽位一起占用
+    async with get_admission_controller().slots(ResourceClass.DOWNLOAD, ResourceClass.FFMPEG):
+        extraction = await extractor.open_stream(str(downloader.get_task_dir(task_id)))
+        try:
+            video_path, download_size = await downloader.download_streaming(
+                video_url, task_id, sink=extraction.feed, keep_video=keep_video
+            )
+        except AudioExtractError as e:
+            await extraction.abort()
+            logger.warning(f"[{task_id}] Streaming extraction failed, falling back to download: {e}")
+            return None
+        except BaseException:
+            await extraction.abort()
+            raise
+
+        logger.info(f"[{task_id}] Downloaded (streamed): {download_size / 1024 / 1024:.2f} MB")
+        if download_size < 100 * 1024:  # 小于 100KB
+            logger.error(f"[{task_id}] Downloaded file too small: {download_size} bytes, may be incomplete")
+
+        try:
+            audio = await extraction.finish()
+        except AudioExtractError as e:
+            if not video_path:
+                logger.warning(f"[{task_id}] Streaming extraction failed, falling back to download: {e}")
+                return None
+            # 视频已完整落盘，直接对文件提取，无需重新下载
+            logger.warning(f"[{task_id}] Streaming extraction failed, extracting from saved file: {e}")
+            audio = await asyncio.to_thread(extractor.extract, video_path)
+
+    # 确认无需回退后再结束下载子步骤，回退时由重新下载结束
+    if step_callback:
+        size_mb = f"{download_size / 1024 / 1024:.2f}"
+        await step_callback("end", "download_video", t("progress.downloadComplete", size=size_mb))
+    await _report_extracted_audio(task_id, audio, step_callback)
+    return video_path, audio
+
+
 async def _process_video_internal(
     video_url: str,
     step_callback: Optional[Callable[[str, str, str], Awaitable[None]]] = None,
-    persist_video: bool = False
+    persist_video: bool = False,
+    segments_callback: Optional[Callable[[list], Awaitable[None]]] = None,
 ) -> VideoProcessResult:
     """
     内部视频处理函数
 
+    下载、ffmpeg、ASR 各阶段占用对应的准入槽位（services.admission_control），
+    排队身份与进度回调来自调用方设置的 admission_context。
+
     处理流程:
     1. 下载视频到临时目录
     2. 使用 ffmpeg 提取音频 (16kHz WAV)
+       - VIDEO_STREAMING_EXTRACT 开启时，1 和 2 合并为一次流式处理：
+         下载的字节流直接送入 ffmpeg，仅在 persist_video 时同时落盘视频
     3. 使用 faster-whisper 进行语音识别
     4. 根据 persist_video 决定是否清理临时文件
 
@@ -79,13 +283,11 @@ async def _process_video_internal(
             - step_id: 子步骤唯一ID
             - label_or_message: 开始时是标签，结束时是完成消息
         persist_video: 是否保留视频文件（用于后续持久化）
+        segments_callback: 渐进转录回调，每解码完一个窗口以该窗口的分段字典列表调用
 
     Returns:
         VideoProcessResult 包含转录文本和视频路径
     """
-    import os
-    import subprocess
-
     from services.video_downloader import VideoDownloader
     from services.audio_extractor import AudioExtractor
 
@@ -96,49 +298,22 @@ async def _process_video_internal(
     logger.info(f"Starting video processing, task_id={task_id}")
 
     try:
-        # Step 1: 下载视频
-        if step_callback:
-            await step_callback("start", "download_video", t("progress.downloadVideo"))
-        logger.info(f"[{task_id}] Downloading from: {video_url[:100]}...")
-        video_path = await downloader.download(video_url, task_id)
-
-        # 诊断：检查下载文件
-        download_size = os.path.getsize(video_path)
-        logger.info(f"[{task_id}] Downloaded: {video_path}, size: {download_size / 1024 / 1024:.2f} MB")
-
-        if download_size < 100 * 1024:  # 小于 100KB
-            logger.error(f"[{task_id}] Downloaded file too small: {download_size} bytes, may be incomplete")
-
-        if step_callback:
-            size_mb = f"{download_size / 1024 / 1024:.2f}"
-            await step_callback("end", "download_video", t("progress.downloadComplete", size=size_mb))
-
-        # Step 2: 提取音频 (同步操作，在线程池中运行)
-        if step_callback:
-            await step_callback("start", "extract_audio", t("progress.extractAudio"))
-        logger.info(f"[{task_id}] Extracting audio...")
-        audio_path = await asyncio.to_thread(extractor.extract, video_path)
+        audio = None
+        video_path = None
 
-        # 诊断：检查音频文件
-        audio_size = os.path.getsize(audio_path)
-        logger.info(f"[{task_id}] Extracted audio: {audio_path}, size: {audio_size / 1024 / 1024:.2f} MB")
-
-        if step_callback:
-            size_mb = f"{audio_size / 1024 / 1024:.2f}"
-            await step_callback("end", "extract_audio", t("progress.extractComplete", size=size_mb))
-
-        # 获取音频时长
-        probe_cmd = ["ffprobe", "-v", "error", "-show_entries", "format=duration",
-                     "-of", "default=noprint_wrappers=1:nokey=1", audio_path]
-        try:
-            duration_result = subprocess.run(probe_cmd, capture_output=True, text=True, timeout=30)
-            audio_duration = float(duration_result.stdout.strip())
-            logger.info(f"[{task_id}] Audio duration: {audio_duration:.2f} seconds")
+        # Step 1+2: 流式下载并提取音频
+        if settings.VIDEO_STREAMING_EXTRACT:
+            streamed = await _download_and_extract_streaming(
+                downloader, extractor, video_url, task_id, step_callback, persist_video
+            )
+            if streamed:
+                video_path, audio = streamed
 
-            if audio_duration < 10:
-                logger.warning(f"[{task_id}] Audio duration very short: {audio_duration:.2f}s, may indicate extraction issue")
-        except Exception as e:
-            logger.warning(f"[{task_id}] Could not get audio duration: {e}")
+        if audio is None:
+            video_path, audio = await _download_then_extract(
+                downloader, extractor, video_url, task_id, step_callback,
+                announce_start=not settings.VIDEO_STREAMING_EXTRACT,
+            )
 
         # Step 3: ASR 转录 (同步操作，在线程池中运行)
         if step_callback:
@@ -157,7 +332,16 @@ async def _process_video_internal(
             )
         logger.info(f"[{task_id}] Using ASRService (faster-whisper)")
 
-        result = await asyncio.to_thread(asr_service.transcribe, audio_path)
+        on_segments = None
+        if segments_callback:
+            async def on_segments(segments):
+                await segments_callback([
+                    {"start": seg.start, "end": seg.end, "text": seg.text} for seg in segments
+                ])
+
+        # 提取阶段已解码出 16kHz PCM，直接交给 ASR，不再预处理或重复读取
+        async with get_admission_controller().slot(ResourceClass.ASR):
+            result = await asr_service.atranscribe(audio, on_segments=on_segments)
 
         # 诊断：检查转录结果
         logger.info(f"[{task_id}] Transcription completed: {len(result.text)} chars, {len(result.segments)} segments")
@@ -225,6 +409,29 @@ async def _process_video_internal(
             logger.info(f"[{task_id}] Skipping cleanup (persist_video=True)")
 
 
+async def _emit_result_events(content_info: dict, update_dict: dict, result: VideoProcessResult) -> None:
+    """发送 content_info / transcript 事件"""
+    # 发送 content_info 事件（供前端展示卡片，包含 local_video_url）
+    # 使用更新后的 content_info（如果有），否则使用原始的
+    final_content_info = update_dict.get("content_info", content_info)
+    await adispatch_custom_event(
+        "content_info",
+        {"content_info": dict(final_content_info)},
+    )
+
+    # 发送 transcript 事件（供前端立即展示字幕，不必等到 done 事件）
+    await adispatch_custom_event(
+        "transcript",
+        {
+            "transcript": {
+                "text": result.text,
+                "segments": result.segments,
+                "content_id": content_info.get("content_id"),  # 用于缓存验证
+            }
+        },
+    )
+
+
 @tool
 async def process_video(runtime: ToolRuntime[RemixContext]) -> Command:
     """处理视频内容：下载视频、提取音频、转录语音。
@@ -376,10 +583,69 @@ async def process_video(runtime: ToolRuntime[RemixContext]) -> Command:
                     },
                 )
 
+        async def send_partial_transcript(segments: list):
+            """转录过程中按窗口推送已完成的字幕分段"""
+            await adispatch_custom_event(
+                "transcript_partial",
+                {
+                    "step_id": "transcribe",
+                    "segments": segments,
+                    "content_id": content_info.get("content_id"),
+                },
+            )
+
         # 检查是否需要持久化视频
         from config import settings
+        from services.asset_storage import AssetStorageService
         persist_video = settings.PERSIST_VIDEO
 
+        platform = _normalize_enum_value(content_info.get("platform"), "unknown")
+        content_id = content_info.get("content_id", "unknown")
+
+        # 跨会话缓存：同一视频已被处理过时，跳过下载/提取/转录
+        cached_artifact = await _load_cached_artifact(platform, content_info.get("content_id"))
+        if cached_artifact:
+            logger.info(f"[process_video] Video cache hit: {platform}/{content_id}")
+            for step_id, label in (
+                ("download_video", t("progress.downloadVideo")),
+                ("extract_audio", t("progress.extractAudio")),
+            ):
+                await send_sub_step("start", step_id, label)
+                await send_sub_step("end", step_id, t("progress.cacheHit"))
+            await send_sub_step("start", "transcribe", t("progress.transcribe"))
+            await send_sub_step(
+                "end", "transcribe",
+                t("progress.transcribeComplete", count=len(cached_artifact.text)),
+            )
+
+            # 持久化的视频可能已被清理，此时仅复用转录结果
+            local_video_url = cached_artifact.local_video_url
+            if local_video_url and not AssetStorageService().check_exists(
+                platform, content_id, local_video_url.rsplit("/", 1)[-1]
+            ):
+                local_video_url = None
+
+            result = VideoProcessResult(text=cached_artifact.text, segments=cached_artifact.segments)
+            update_dict = {
+                "messages": [ToolMessage(
+                    content=f"视频转录完成，共 {len(result.text)} 字",
+                    tool_call_id=runtime.tool_call_id
+                )],
+                "transcript": {
+                    "text": result.text,
+                    "segments": result.segments,
+                    "content_id": content_info.get("content_id"),
+                },
+                "current_stage": "视频转录完成",
+            }
+            if local_video_url:
+                updated_content_info = dict(content_info)
+                updated_content_info["local_video_url"] = local_video_url
+                update_dict["content_info"] = updated_content_info
+
+            await _emit_result_events(content_info, update_dict, result)
+            return Command(update=update_dict)
+
         # 判断是否需要单独下载视频（B站情况：audio_url 和 video_url 不同）
         need_separate_video_download = (
             persist_video
@@ -390,11 +656,13 @@ async def process_video(runtime: ToolRuntime[RemixContext]) -> Command:
 
         # 调用内部处理函数进行 ASR（使用 asr_url）
         # 如果需要单独下载视频，则不持久化 ASR 用的文件
-        result = await _process_video_internal(
-            asr_url,
-            step_callback=send_sub_step,
-            persist_video=persist_video and not need_separate_video_download
-        )
+        with tool_admission(runtime):
+            result = await _process_video_internal(
+                asr_url,
+                step_callback=send_sub_step,
+                persist_video=persist_video and not need_separate_video_download,
+                segments_callback=send_partial_transcript,
+            )
 
         local_video_url = None
         update_dict = {
@@ -413,18 +681,9 @@ async def process_video(runtime: ToolRuntime[RemixContext]) -> Command:
 
         # 持久化视频和生成元数据
         if persist_video and (result.video_path or need_separate_video_download):
-            from services.asset_storage import AssetStorageService, AssetStorageError
+            from services.asset_storage import AssetStorageError
             from services.video_downloader import VideoDownloader
 
-            platform = content_info.get("platform", "unknown")
-            # 处理枚举类型：Platform.BILIBILI -> bilibili
-            if hasattr(platform, 'value'):
-                platform = platform.value
-            elif isinstance(platform, str) and "." in platform:
-                # 处理字符串形式的枚举，如 "Platform.BILIBILI"
-                platform = platform.split(".")[-1].lower()
-            content_id = content_info.get("content_id", "unknown")
-
             asset_service = AssetStorageService()
             downloader = VideoDownloader()
             video_task_id = None
@@ -443,13 +702,14 @@ async def process_video(runtime: ToolRuntime[RemixContext]) -> Command:
 
                     try:
                         # 下载视频和音频流，然后合并
-                        merged_video_path = await merger.download_and_merge_bilibili(
-                            video_url=video_url,
-                            audio_url=audio_url,
-                            output_path=str(downloader.get_task_dir(video_task_id) / "merged.mp4"),
-                            task_id=video_task_id,
-                            timeout=300
-                        )
+                        async with tool_slot(runtime, ResourceClass.DOWNLOAD, ResourceClass.FFMPEG):
+                            merged_video_path = await merger.download_and_merge_bilibili(
+                                video_url=video_url,
+                                audio_url=audio_url,
+                                output_path=str(downloader.get_task_dir(video_task_id) / "merged.mp4"),
+                                task_id=video_task_id,
+                                timeout=300
+                            )
                         logger.info(f"B站视频合并完成: {merged_video_path}")
 
                         await send_sub_step("end", "merge_bilibili", t("progress.mergeComplete"))
@@ -466,7 +726,8 @@ async def process_video(runtime: ToolRuntime[RemixContext]) -> Command:
 
                         # 回退：只下载视频流（无音频）
                         video_task_id = str(uuid.uuid4())
-                        video_path = await downloader.download(video_url, video_task_id)
+                        async with tool_slot(runtime, ResourceClass.DOWNLOAD):
+                            video_path = await downloader.download(video_url, video_task_id)
                         local_video_url = await asset_service.persist_video(
                             video_path,
                             platform,
@@ -484,11 +745,7 @@ async def process_video(runtime: ToolRuntime[RemixContext]) -> Command:
                     logger.info(f"Video persisted to: {local_video_url}")
 
                 # 处理 content_type 枚举
-                content_type = content_info.get("content_type", "video")
-                if hasattr(content_type, 'value'):
-                    content_type = content_type.value
-                elif isinstance(content_type, str) and "." in content_type:
-                    content_type = content_type.split(".")[-1].lower()
+                content_type = _normalize_enum_value(content_info.get("content_type"), "video")
 
                 # 生成元数据文件（包含完整视频信息）
                 asset_service.generate_metadata(
@@ -542,26 +799,9 @@ async def process_video(runtime: ToolRuntime[RemixContext]) -> Command:
                     except Exception as e:
                         logger.warning(f"Cleanup video temp files failed: {e}")
 
-        # 发送 content_info 事件（供前端展示卡片，包含 local_video_url）
-        # 使用更新后的 content_info（如果有），否则使用原始的
-        final_content_info = update_dict.get("content_info", content_info)
-        await adispatch_custom_event(
-            "content_info",
-            {"content_info": dict(final_content_info)},
-        )
-
-        # 发送 transcript 事件（供前端立即展示字幕，不必等到 done 事件）
-        await adispatch_custom_event(
-            "transcript",
-            {
-                "transcript": {
-                    "text": result.text,
-                    "segments": result.segments,
-                    "content_id": content_info.get("content_id"),  # 用于缓存验证
-                }
-            },
-        )
+        await _store_cached_artifact(platform, content_info.get("content_id"), result, local_video_url)
 
+        await _emit_result_events(content_info, update_dict, result)
         return Command(update=update_dict)
 
     except RemixToolException as e:
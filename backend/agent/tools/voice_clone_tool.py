@@ -1,6 +1,7 @@
 # -*- coding: utf-8 -*-
 """语音克隆工具 - 支持上传/录音/视频前30秒三种来源"""
 
+from contextlib import AsyncExitStack
 from pathlib import Path
 from typing import List, Literal, Optional
 from urllib.parse import urlparse
@@ -12,8 +13,10 @@ from langgraph.types import Command
 
 from agent.errors import RemixErrorCode, RemixToolException, build_tool_user_message
 from agent.state import RemixContext
+from agent.tools.admission import tool_slot
 from config import settings
 from i18n import t
+from services.admission_control import ResourceClass
 from services.download_server_client import (
     DownloadServerClient,
     DownloadServerError,
@@ -23,7 +26,7 @@ from services.download_server_client import (
 from services.media_ai_source_service import MediaAISourceService, MediaSourceError
 from services.tts_tag_service import TTSTagError, normalize_effect_tags, normalize_tone_tags
 from services.voicv_client import VoicvClient, VoicvClientError
-from services.voice_style_profile_store import VoiceStyleProfileStore
+from services.voice_style_profile_store import get_voice_style_profile_store
 
 
 def _resolve_content_media_url(runtime: ToolRuntime[RemixContext]) -> str:
@@ -128,64 +131,74 @@ async def voice_clone(
         if source_type == "content_video":
             max_download = max(max_download, settings.VOICE_CLONE_MAX_SOURCE_BYTES)
 
-        raw_bytes, guessed_name, content_type = await source_service.download_bytes(
-            effective_source_url,
-            max_bytes=max_download,
-        )
+        # 源文件落盘后处理，视频源不整体驻留内存
+        async with AsyncExitStack() as media_files:
+            async with tool_slot(runtime, ResourceClass.DOWNLOAD):
+                source_path, guessed_name, content_type = await media_files.enter_async_context(
+                    source_service.download_to_temp(effective_source_url, max_bytes=max_download)
+                )
 
-        filename = guessed_name
-        voice_bytes = raw_bytes
-        voice_content_type = content_type
-        full_audio_asset = None
-        clip_audio_asset = None
+            filename = guessed_name
+            voice_bytes = None
+            voice_path = source_path
+            voice_content_type = content_type
+            full_audio_asset = None
+            clip_audio_asset = None
 
-        if source_type == "content_video":
-            clip_seconds = duration_seconds or settings.VOICE_SOURCE_DEFAULT_CLIP_SECONDS
-            full_audio_bytes, _, full_content_type = source_service.extract_audio_to_wav(
-                input_bytes=raw_bytes,
-                input_ext=Path(guessed_name).suffix or ".bin",
-            )
-            full_audio_asset = source_service.persist_bytes(
-                full_audio_bytes,
-                prefix="voice_full",
-                ext=".wav",
-                content_type=full_content_type,
-            )
-            voice_bytes, filename, voice_content_type = source_service.trim_audio_clip(
-                input_bytes=full_audio_bytes,
-                input_ext=".wav",
-                start_seconds=start_seconds,
-                duration_seconds=clip_seconds,
-            )
-            clip_audio_asset = source_service.persist_bytes(
-                voice_bytes,
-                prefix="voice_clip",
-                ext=".wav",
-                content_type=voice_content_type,
-            )
-        else:
-            ext = Path(filename).suffix or ".bin"
-            full_audio_asset = source_service.persist_bytes(
-                voice_bytes,
-                prefix="voice_full",
-                ext=ext,
-                content_type=voice_content_type,
-            )
-            # Voicv 仅接受 MP3/WAV，录音常见 webm/ogg/mp4 需先转码
-            normalized_ext = (Path(filename).suffix or "").lower()
-            if normalized_ext not in {".mp3", ".wav"}:
-                voice_bytes, _, voice_content_type = source_service.extract_audio_to_wav(
-                    input_bytes=voice_bytes,
-                    input_ext=normalized_ext or ".bin",
+            if source_type == "content_video":
+                clip_seconds = duration_seconds or settings.VOICE_SOURCE_DEFAULT_CLIP_SECONDS
+                async with tool_slot(runtime, ResourceClass.FFMPEG):
+                    full_audio_bytes, _, full_content_type = await source_service.extract_audio_to_wav(
+                        input_ext=Path(guessed_name).suffix or ".bin",
+                        input_path=source_path,
+                    )
+                full_audio_asset = source_service.persist_bytes(
+                    full_audio_bytes,
+                    prefix="voice_full",
+                    ext=".wav",
+                    content_type=full_content_type,
+                )
+                async with tool_slot(runtime, ResourceClass.FFMPEG):
+                    voice_bytes, filename, voice_content_type = await source_service.trim_audio_clip(
+                        input_bytes=full_audio_bytes,
+                        input_ext=".wav",
+                        start_seconds=start_seconds,
+                        duration_seconds=clip_seconds,
+                    )
+                voice_path = None
+                clip_audio_asset = source_service.persist_bytes(
+                    voice_bytes,
+                    prefix="voice_clip",
+                    ext=".wav",
+                    content_type=voice_content_type,
                 )
-                filename = "voice.wav"
+            else:
+                ext = Path(filename).suffix or ".bin"
+                full_audio_asset = source_service.persist_file(
+                    source_path,
+                    prefix="voice_full",
+                    ext=ext,
+                    content_type=voice_content_type,
+                )
+                # Voicv 仅接受 MP3/WAV，录音常见 webm/ogg/mp4 需先转码
+                normalized_ext = (Path(filename).suffix or "").lower()
+                if normalized_ext not in {".mp3", ".wav"}:
+                    async with tool_slot(runtime, ResourceClass.FFMPEG):
+                        voice_bytes, _, voice_content_type = await source_service.extract_audio_to_wav(
+                            input_ext=normalized_ext or ".bin",
+                            input_path=source_path,
+                        )
+                    voice_path = None
+                    filename = "voice.wav"
 
-        voicv_client = VoicvClient()
-        clone_result = await voicv_client.clone_voice(
-            audio_bytes=voice_bytes,
-            filename=filename,
-            content_type=voice_content_type,
-        )
+            voicv_client = VoicvClient()
+            async with tool_slot(runtime, ResourceClass.MEDIA_API):
+                clone_result = await voicv_client.clone_voice(
+                    audio_bytes=voice_bytes,
+                    filename=filename,
+                    content_type=voice_content_type,
+                    audio_path=voice_path,
+                )
 
         cloned_voice = {
             "voice_id": clone_result["voice_id"],
@@ -201,7 +214,7 @@ async def voice_clone(
             "clip_audio_url": clip_audio_asset["url"] if clip_audio_asset else "",
         }
 
-        style_profile_store = VoiceStyleProfileStore()
+        style_profile_store = get_voice_style_profile_store()
         expression_profile = style_profile_store.upsert(
             clone_result["voice_id"],
             {
@@ -18,6 +18,7 @@
 
 """FastAPI 应用入口"""
 import asyncio
+import importlib
 from contextlib import asynccontextmanager
 from pathlib import Path
 
@@ -30,28 +31,14 @@ from api.routes import health, remix, cookies, llm_config, insight_modes, auth,
 from agent.memory import memory_manager
 from i18n import LanguageMiddleware
 from utils.logger import logger, setup_logging_intercept
+from utils.startup_profiler import start_startup_profiler
 
 # 设置日志拦截，将 uvicorn 日志统一为 Loguru 格式
 setup_logging_intercept()
 
 
-@asynccontextmanager
-async def lifespan(app: FastAPI):
-    """
-    应用生命周期 (异步)
-
-    启动时:
-    - 运行数据库迁移
-    - 检测 DownloadServer 服务可用性
-    - 初始化记忆存储 (Checkpointer + Store)
-    - 预加载 ASR 模型 (faster-whisper)
-
-    关闭时:
-    - 清理记忆存储资源 (关闭数据库连接)
-    """
-    logger.info("Starting Content Remix Agent API...")
-
-    # 运行数据库迁移 (自动执行未完成的迁移)
+async def _run_migrations() -> None:
+    """运行数据库迁移 (自动执行未完成的迁移)"""
     from services.migration_service import migration_service
     try:
         migration_count = await migration_service.run_migrations()
@@ -62,15 +49,13 @@ async def lifespan(app: FastAPI):
     except Exception as e:
         logger.error(f"Database migration failed: {e}")
         logger.error("请检查数据库连接配置和迁移文件")
-        raise SystemExit(1)
+        raise
     finally:
         await migration_service.close()
 
-    # Bootstrap（可选）：创建默认管理员账号
-    from services.bootstrap_service import bootstrap_service
-    await bootstrap_service.bootstrap_default_admin()
 
-    # 检测 DownloadServer 可用性
+async def _check_download_server() -> None:
+    """检测 DownloadServer 可用性"""
     from services.download_server_client import download_server_client, DownloadServerError
     try:
         await download_server_client.ping()
@@ -78,42 +63,144 @@ async def lifespan(app: FastAPI):
     except DownloadServerError as e:
         logger.error(f"DownloadServer 不可用: {e}")
         logger.error("请先启动 DownloadServer 服务后再启动本服务")
-        raise SystemExit(1)
+        raise
 
-    # 创建资源目录（用于存储封面、视频等）
-    assets_dir = Path(settings.ASSETS_DIR)
-    assets_dir.mkdir(parents=True, exist_ok=True)
-    logger.info(f"Assets directory: {assets_dir.resolve()}")
 
-    # 启动时：异步初始化记忆存储
+async def _init_memory() -> None:
+    """异步初始化记忆存储 (Checkpointer + Store)"""
     await memory_manager.initialize()
     logger.info("Memory manager initialized")
 
-    # 检查并预加载 Insight Mode prompts
+
+async def _init_insight_modes(config_versions) -> None:
+    """启动配置版本轮询，检查并预加载 Insight Mode prompts"""
+    # 配置版本轮询需在预加载缓存之前启动，其他 worker 修改配置后本 worker 缓存随之失效
+    from services.config_version_service import INSIGHT_MODES_SCOPE
+    await config_versions.start()
+
     from services.insight_mode_service import insight_mode_service
     try:
         # 验证系统模式已初始化（由迁移系统完成）
         await insight_mode_service.initialize_default_modes()
 
-        # 预加载 mode prompts 到缓存
+        # 预加载 mode prompts 到缓存，配置变更后自动重新加载
         from agent.prompts import _preload_mode_prompts
         await _preload_mode_prompts()
+        config_versions.subscribe(INSIGHT_MODES_SCOPE, _preload_mode_prompts)
         logger.info("Mode prompts preloaded")
     except Exception as e:
         logger.warning(f"Failed to preload insight modes: {e}")
 
-    # 预加载 ASR 模型（在线程池中运行，避免阻塞事件循环）
+
+async def _preload_asr(asr_service) -> None:
+    """预加载 ASR 模型（线程池中加载，或启动 ASR 工作进程池并等待模型加载完成）"""
+    from services.asr_service import ASRError
+    if not await asr_service.apreload():
+        raise ASRError(f"ASR 后端 {asr_service.backend_name} 模型未就绪")
+
+
+async def _warm_agent_imports() -> None:
+    """
+    后台导入 Agent 工厂（全部工具与 LangChain 提供商依赖）
+
+    路由按需导入 agent.remix_agent 以缩短启动时间；在前台阶段结束后于线程中预先导入，
+    避免首个对话请求承担导入耗时。
+    """
+    await asyncio.to_thread(importlib.import_module, "agent.remix_agent")
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    应用生命周期 (异步)
+
+    启动时（互不依赖的步骤并发执行，各阶段耗时汇总输出到日志）:
+    - 后台: 预加载 ASR 模型 (FunASR / ONNX / 工作进程池)，就绪状态见 /health/ready
+    - 第一组: 运行数据库迁移 | 检测 DownloadServer 服务可用性 | 初始化记忆存储 (Checkpointer + Store)
+    - 第二组 (依赖迁移): 创建默认管理员 | 启动配置版本轮询并预加载 Insight Mode prompts
+    - 后台: 导入 Agent 工厂
+
+    关闭时:
+    - 取消未完成的后台启动阶段
+    - 清理记忆存储资源 (关闭数据库连接)
+    - 关闭 ASR 工作进程池
+    - 停止 lipsync 状态轮询
+    - 关闭出站 HTTP 连接池
+    """
+    logger.info("Starting Content Remix Agent API...")
+    profiler = start_startup_profiler()
+
+    # blob 存储目录不得位于公开访问的资源目录内
+    from services.blob_store import BlobStoreError, ensure_blob_dir_private
+    try:
+        ensure_blob_dir_private()
+    except BlobStoreError as e:
+        logger.error(str(e))
+        raise SystemExit(1)
+
+    # 模型加载与数据库无关，最先在后台开始，与其余阶段重叠
     from services.asr_service import ASRService
     asr_service = ASRService()
-    await asyncio.to_thread(asr_service.preload)
+    profiler.start_background("asr_preload", _preload_asr(asr_service))
+
+    # 创建资源目录（用于存储封面、视频等）
+    assets_dir = Path(settings.ASSETS_DIR)
+    assets_dir.mkdir(parents=True, exist_ok=True)
+    logger.info(f"Assets directory: {assets_dir.resolve()}")
+
+    from services.bootstrap_service import bootstrap_service
+    from services.config_version_service import get_config_version_service
+    config_versions = get_config_version_service()
+    try:
+        await profiler.gather(
+            migrations=_run_migrations(),
+            download_server=_check_download_server(),
+            memory=_init_memory(),
+        )
+        await profiler.gather(
+            # Bootstrap（可选）：创建默认管理员账号
+            bootstrap_admin=bootstrap_service.bootstrap_default_admin(),
+            insight_modes=_init_insight_modes(config_versions),
+        )
+    except Exception as e:
+        logger.error(f"Startup failed: {e}")
+        await profiler.aclose()
+        await asr_service.ashutdown()
+        await config_versions.aclose()
+        raise SystemExit(1)
+
+    profiler.start_background("agent_import", _warm_agent_imports())
+    profiler.mark_serving()
 
     yield
 
-    # 关闭时：异步清理记忆存储资源
+    # 关闭时：取消未完成的后台启动阶段
     logger.info("Shutting down Content Remix Agent API...")
+    await profiler.aclose()
+
+    # 异步清理记忆存储资源
     await memory_manager.cleanup()
     logger.info("Memory manager cleaned up")
 
+    # 关闭 ASR 工作进程池
+    await asr_service.ashutdown()
+
+    # 停止配置版本轮询
+    await config_versions.aclose()
+
+    # 停止 lipsync 状态轮询（需在关闭连接池之前）
+    from services.lipsync_poller import get_lipsync_poller
+    await get_lipsync_poller().aclose()
+
+    # 关闭出站 HTTP 连接池
+    from services.http_clients import http_clients
+    await http_clients.aclose_all()
+    logger.info("HTTP client pools closed")
+
+    # 关闭图片处理工作池
+    from services.image_utils import shutdown_image_workers
+    shutdown_image_workers()
+
 
 app = FastAPI(
     title="Content Remix Agent",
@@ -18,6 +18,7 @@
 
 """健康检查路由"""
 from fastapi import APIRouter
+from fastapi.responses import JSONResponse
 
 router = APIRouter()
 
@@ -26,3 +27,43 @@ router = APIRouter()
 async def health():
     """健康检查端点"""
     return {"status": "ok"}
+
+
+@router.get("/health/ready")
+async def readiness():
+    """就绪检查：启动阶段（含 ASR 预加载等后台阶段）全部结束前返回 503，附各阶段状态与耗时"""
+    from utils.startup_profiler import get_startup_profiler
+    profiler = get_startup_profiler()
+    if profiler is None:
+        return JSONResponse(status_code=503, content={"ready": False, "phases": {}})
+    snapshot = profiler.snapshot()
+    return JSONResponse(status_code=200 if snapshot["ready"] else 503, content=snapshot)
+
+
+@router.get("/health/http-clients")
+async def http_client_metrics():
+    """出站 HTTP 连接池统计（按上游：请求数、连接复用率、延迟）"""
+    from services.http_clients import http_clients
+    return {"upstreams": http_clients.metrics()}
+
+
+@router.get("/health/asr")
+async def asr_worker_metrics():
+    """ASR 工作进程池统计（队列深度、运行中任务、超时/重启次数）"""
+    from services.asr_worker_pool import get_asr_worker_pool
+    pool = get_asr_worker_pool()
+    return {"worker_pool": pool.snapshot() if pool else None}
+
+
+@router.get("/health/admission")
+async def admission_metrics():
+    """重资源准入统计（按资源类别：槽位占用、排队数、排队等待时间分布）"""
+    from services.admission_control import get_admission_controller
+    return {"resources": get_admission_controller().snapshot()}
+
+
+@router.get("/health/lipsync")
+async def lipsync_poller_metrics():
+    """Lipsync 服务端轮询统计（跟踪任务数、订阅数、上游查询次数）"""
+    from services.lipsync_poller import get_lipsync_poller
+    return {"poller": get_lipsync_poller().snapshot()}
@@ -3,14 +3,17 @@
 
 import json
 import uuid
+from contextlib import AsyncExitStack
 from pathlib import Path
 from typing import List, Optional
 from urllib.parse import urlparse
 
 from fastapi import APIRouter, File, Form, HTTPException, UploadFile, Depends, Query
 from pydantic import BaseModel, Field
+from sse_starlette.sse import EventSourceResponse
 
 from config import settings
+from services.admission_control import ResourceClass, get_admission_controller
 from services.download_server_client import (
     DownloadServerClient,
     DownloadServerError,
@@ -18,20 +21,28 @@ from services.download_server_client import (
     CookiesNotFoundError,
 )
 from services.media_ai_source_service import MediaAISourceService, MediaSourceError
+from services.lipsync_poller import get_lipsync_poller
 from services.media_ai_store import MediaAIStore
 from services.syncso_client import SyncsoClient, SyncsoClientError
+from services.tts_audio_service import synthesize_tts_audio
 from services.tts_expression_service import build_expressive_tts_text_async
 from services.tts_tag_service import TTSTagError, normalize_effect_tags, normalize_tone_tags
 from services.voicv_client import VoicvClient, VoicvClientError
-from services.voice_style_profile_store import VoiceStyleProfileStore
+from services.voice_style_profile_store import get_voice_style_profile_store
 from services.auth_service import User
 from api.dependencies import get_current_user_optional
+from api.routes.sse_helpers import SSEEventBuilder
 from utils.logger import logger
 
 
 router = APIRouter()
 
 
+def _slot(resource: ResourceClass, current_user: Optional[User]):
+    """以请求用户的身份占用重资源槽位（HTTP 接口同步返回，不推送排队位置）"""
+    return get_admission_controller().slot(resource, user_id=current_user.user_id if current_user else None)
+
+
 def _looks_like_direct_media_url(url: str) -> bool:
     if not url:
         return False
@@ -165,6 +176,10 @@ class LipsyncRequest(BaseModel):
     model: str = "lipsync-2"
 
 
+class LipsyncEventsRequest(BaseModel):
+    generation_ids: List[str] = Field(default_factory=list, max_length=50)
+
+
 def _parse_tags_form(raw: Optional[str]) -> List[str]:
     value = (raw or "").strip()
     if not value:
@@ -241,67 +256,77 @@ async def voice_clone(
         if source_type == "content_video":
             max_download = max(max_download, settings.VOICE_CLONE_MAX_SOURCE_BYTES)
 
-        raw_bytes, guessed_name, content_type = await svc.download_bytes(
-            effective_source_url,
-            max_bytes=max_download,
-        )
-        voice_bytes = raw_bytes
-        voice_name = guessed_name
-        voice_content_type = content_type
-        full_audio_asset = None
-        clip_audio_asset = None
-
-        if source_type == "content_video":
-            clip_seconds = duration_seconds or settings.VOICE_SOURCE_DEFAULT_CLIP_SECONDS
-            # 先提取完整音轨并持久化，再裁剪片段并持久化
-            full_audio_bytes, _, full_audio_content_type = svc.extract_audio_to_wav(
-                input_bytes=raw_bytes,
-                input_ext=Path(guessed_name).suffix or ".bin",
-            )
-            full_audio_asset = svc.persist_bytes(
-                full_audio_bytes,
-                prefix="voice_full",
-                ext=".wav",
-                content_type=full_audio_content_type,
-            )
-
-            voice_bytes, voice_name, voice_content_type = svc.trim_audio_clip(
-                input_bytes=full_audio_bytes,
-                input_ext=".wav",
-                start_seconds=start_seconds,
-                duration_seconds=clip_seconds,
-            )
-            clip_audio_asset = svc.persist_bytes(
-                voice_bytes,
-                prefix="voice_clip",
-                ext=".wav",
-                content_type=voice_content_type,
-            )
-        else:
-            # 上传/录音来源同样持久化一份完整音频，便于复查和复用
-            ext = Path(voice_name).suffix or ".bin"
-            full_audio_asset = svc.persist_bytes(
-                voice_bytes,
-                prefix="voice_full",
-                ext=ext,
-                content_type=voice_content_type,
-            )
-            # Voicv 仅接受 MP3/WAV，录音常见 webm/ogg/mp4 需先转码
-            normalized_ext = (Path(voice_name).suffix or "").lower()
-            if normalized_ext not in {".mp3", ".wav"}:
-                voice_bytes, _, voice_content_type = svc.extract_audio_to_wav(
-                    input_bytes=voice_bytes,
-                    input_ext=normalized_ext or ".bin",
+        # 源文件落盘后处理，上传/转码都直接读文件，视频源不整体驻留内存
+        async with AsyncExitStack() as media_files:
+            async with _slot(ResourceClass.DOWNLOAD, current_user):
+                source_path, guessed_name, content_type = await media_files.enter_async_context(
+                    svc.download_to_temp(effective_source_url, max_bytes=max_download)
+                )
+            voice_bytes = None
+            voice_path = source_path
+            voice_name = guessed_name
+            voice_content_type = content_type
+            full_audio_asset = None
+            clip_audio_asset = None
+
+            if source_type == "content_video":
+                clip_seconds = duration_seconds or settings.VOICE_SOURCE_DEFAULT_CLIP_SECONDS
+                # 先提取完整音轨并持久化，再裁剪片段并持久化
+                async with _slot(ResourceClass.FFMPEG, current_user):
+                    full_audio_bytes, _, full_audio_content_type = await svc.extract_audio_to_wav(
+                        input_ext=Path(guessed_name).suffix or ".bin",
+                        input_path=source_path,
+                    )
+                full_audio_asset = svc.persist_bytes(
+                    full_audio_bytes,
+                    prefix="voice_full",
+                    ext=".wav",
+                    content_type=full_audio_content_type,
                 )
-                voice_name = "voice.wav"
 
-        result = await voicv.clone_voice(
-            audio_bytes=voice_bytes,
-            filename=voice_name,
-            content_type=voice_content_type,
-        )
+                async with _slot(ResourceClass.FFMPEG, current_user):
+                    voice_bytes, voice_name, voice_content_type = await svc.trim_audio_clip(
+                        input_bytes=full_audio_bytes,
+                        input_ext=".wav",
+                        start_seconds=start_seconds,
+                        duration_seconds=clip_seconds,
+                    )
+                voice_path = None
+                clip_audio_asset = svc.persist_bytes(
+                    voice_bytes,
+                    prefix="voice_clip",
+                    ext=".wav",
+                    content_type=voice_content_type,
+                )
+            else:
+                # 上传/录音来源同样持久化一份完整音频，便于复查和复用
+                ext = Path(voice_name).suffix or ".bin"
+                full_audio_asset = svc.persist_file(
+                    source_path,
+                    prefix="voice_full",
+                    ext=ext,
+                    content_type=voice_content_type,
+                )
+                # Voicv 仅接受 MP3/WAV，录音常见 webm/ogg/mp4 需先转码
+                normalized_ext = (Path(voice_name).suffix or "").lower()
+                if normalized_ext not in {".mp3", ".wav"}:
+                    async with _slot(ResourceClass.FFMPEG, current_user):
+                        voice_bytes, _, voice_content_type = await svc.extract_audio_to_wav(
+                            input_ext=normalized_ext or ".bin",
+                            input_path=source_path,
+                        )
+                    voice_path = None
+                    voice_name = "voice.wav"
+
+            async with _slot(ResourceClass.MEDIA_API, current_user):
+                result = await voicv.clone_voice(
+                    audio_bytes=voice_bytes,
+                    filename=voice_name,
+                    content_type=voice_content_type,
+                    audio_path=voice_path,
+                )
 
-        style_profile_store = VoiceStyleProfileStore()
+        style_profile_store = get_voice_style_profile_store()
         style_profile = style_profile_store.upsert(
             result["voice_id"],
             {
@@ -393,10 +418,11 @@ async def avatar_clone(
         if source_type == "content_video":
             effective_source_url = await _resolve_content_video_url(effective_source_url)
 
-        video_bytes, guessed_name, content_type = await svc.download_bytes(
-            effective_source_url,
-            max_bytes=settings.VOICE_CLONE_MAX_SOURCE_BYTES,
-        )
+        async with _slot(ResourceClass.DOWNLOAD, current_user):
+            video_bytes, guessed_name, content_type = await svc.download_bytes(
+                effective_source_url,
+                max_bytes=settings.VOICE_CLONE_MAX_SOURCE_BYTES,
+            )
 
         ext = Path(guessed_name).suffix or ".mp4"
         full_video_asset = svc.persist_bytes(
@@ -408,12 +434,13 @@ async def avatar_clone(
 
         clip_video_asset = None
         if duration_seconds and duration_seconds > 0:
-            clip_bytes, clip_name, clip_content_type = svc.trim_video_clip(
-                input_bytes=video_bytes,
-                input_ext=ext,
-                start_seconds=start_seconds,
-                duration_seconds=duration_seconds,
-            )
+            async with _slot(ResourceClass.FFMPEG, current_user):
+                clip_bytes, clip_name, clip_content_type = await svc.trim_video_clip(
+                    input_bytes=video_bytes,
+                    input_ext=ext,
+                    start_seconds=start_seconds,
+                    duration_seconds=duration_seconds,
+                )
             clip_video_asset = svc.persist_bytes(
                 clip_bytes,
                 prefix="avatar_clip",
@@ -470,7 +497,7 @@ async def text_to_speech(
     try:
         client = VoicvClient()
         source_svc = MediaAISourceService()
-        profile_store = VoiceStyleProfileStore()
+        profile_store = get_voice_style_profile_store()
         voice_profile = profile_store.get(request.voice_id) if request.use_voice_profile else None
 
         normalized = await build_expressive_tts_text_async(
@@ -484,36 +511,16 @@ async def text_to_speech(
             tag_strategy=request.tag_strategy or "llm",
             speech_style=request.speech_style or "speech",
         )
-        result = await client.text_to_speech(
+        speed = float(request.speed if request.speed is not None else settings.TTS_AUDIO_SPEED)
+        result = await synthesize_tts_audio(
             voice_id=request.voice_id,
             text=normalized["text"],
             audio_format=request.audio_format,
+            speed=speed,
+            slot=lambda resource: _slot(resource, current_user),
+            client=client,
+            source_svc=source_svc,
         )
-
-        final_audio_url = result["audio_url"]
-        speed = float(request.speed if request.speed is not None else settings.TTS_AUDIO_SPEED)
-        if abs(speed - 1.0) > 1e-6:
-            downloaded_bytes, guessed_name, _ = await source_svc.download_bytes(
-                final_audio_url,
-                max_bytes=max(settings.VOICE_CLONE_MAX_AUDIO_BYTES, 50 * 1024 * 1024),
-            )
-            input_ext = Path(guessed_name).suffix or f".{request.audio_format}"
-            output_ext = f".{request.audio_format}"
-            speed_bytes, speed_name, speed_content_type = source_svc.change_audio_speed(
-                downloaded_bytes,
-                input_ext=input_ext,
-                speed=speed,
-                output_ext=output_ext,
-            )
-            speed_asset = source_svc.persist_bytes(
-                speed_bytes,
-                prefix="tts_speed",
-                ext=Path(speed_name).suffix or output_ext,
-                content_type=speed_content_type,
-            )
-            result["original_audio_url"] = final_audio_url
-            result["audio_url"] = speed_asset["url"]
-            result["audio_local_path"] = speed_asset["path"]
         result["speed"] = speed
         result["text"] = normalized["text"]
         result["tagged_text"] = normalized["tagged_text"]
@@ -537,7 +544,7 @@ async def text_to_speech(
 @router.post("/tts/preview-tags")
 async def preview_tts_tags(request: TTSPreviewRequest):
     try:
-        profile_store = VoiceStyleProfileStore()
+        profile_store = get_voice_style_profile_store()
         voice_profile = (
             profile_store.get(request.voice_id)
             if request.use_voice_profile and request.voice_id
@@ -605,40 +612,48 @@ async def create_lipsync(
         sync_client = SyncsoClient()
         resolved_video_url = await _resolve_content_media_url(request.video_url)
 
-        video_bytes, video_name, video_content_type = await source_svc.download_bytes(
-            resolved_video_url,
-            max_bytes=300 * 1024 * 1024,
-        )
-        audio_bytes, audio_name, audio_content_type = await source_svc.download_bytes(
-            request.audio_url,
-            max_bytes=50 * 1024 * 1024,
-        )
+        # 素材落盘后流式上传，避免并发任务把数百 MB 视频同时放进内存
+        async with AsyncExitStack() as media_files:
+            async with _slot(ResourceClass.DOWNLOAD, current_user):
+                video_path, video_name, video_content_type = await media_files.enter_async_context(
+                    source_svc.download_to_temp(resolved_video_url, max_bytes=300 * 1024 * 1024)
+                )
+                audio_path, audio_name, audio_content_type = await media_files.enter_async_context(
+                    source_svc.download_to_temp(request.audio_url, max_bytes=50 * 1024 * 1024)
+                )
 
-        result = await sync_client.create_generation(
-            video_bytes=video_bytes,
-            video_filename=video_name,
-            video_content_type=video_content_type,
-            audio_bytes=audio_bytes,
-            audio_filename=audio_name,
-            audio_content_type=audio_content_type,
-            model=request.model,
-        )
+            async with _slot(ResourceClass.MEDIA_API, current_user):
+                result = await sync_client.create_generation(
+                    video_filename=video_name,
+                    video_content_type=video_content_type,
+                    audio_filename=audio_name,
+                    audio_content_type=audio_content_type,
+                    model=request.model,
+                    video_path=video_path,
+                    audio_path=audio_path,
+                )
         user_id = current_user.user_id if current_user else None
+        record = {
+            "generation_id": result.get("generation_id"),
+            "model": request.model,
+            "status": result.get("status"),
+            "output_url": result.get("output_url"),
+            "video_url": resolved_video_url,
+            "audio_url": request.audio_url,
+            "video_source_type": "url",
+            "audio_source_type": "upload",
+        }
         if user_id:
             store = MediaAIStore()
-            await store.upsert_lipsync_result(
-                user_id,
-                {
-                    "generation_id": result.get("generation_id"),
-                    "model": request.model,
-                    "status": result.get("status"),
-                    "output_url": result.get("output_url"),
-                    "video_url": resolved_video_url,
-                    "audio_url": request.audio_url,
-                    "video_source_type": "url",
-                    "audio_source_type": "upload",
-                },
-            )
+            await store.upsert_lipsync_result(user_id, record)
+        # 交给服务端轮询器跟踪，完成后写库并通过 /lipsync/events 推送
+        get_lipsync_poller().track(
+            record["generation_id"],
+            user_id,
+            record,
+            status=record["status"] or "PENDING",
+            output_url=record["output_url"] or "",
+        )
         return {"success": True, "data": result}
     except HTTPException as e:
         logger.warning(f"[media-ai] /lipsync HTTPException: detail={e.detail}")
@@ -648,12 +663,53 @@ async def create_lipsync(
         raise HTTPException(status_code=400, detail=str(e))
 
 
+@router.post("/lipsync/events")
+async def stream_lipsync_status(
+    request: LipsyncEventsRequest,
+    current_user: Optional[User] = Depends(get_current_user_optional),
+):
+    """
+    订阅 lipsync 任务状态（SSE）
+
+    先推送各任务当前状态，之后状态变化时推送 lipsync_status 事件，
+    全部任务结束后发送 done 并关闭连接。状态由服务端轮询器统一获取，
+    打开再多页面也不会增加上游请求。
+    """
+    user_id = current_user.user_id if current_user else None
+    poller = get_lipsync_poller()
+    generation_ids = [gid.strip() for gid in request.generation_ids if gid and gid.strip()]
+    if not generation_ids:
+        raise HTTPException(status_code=400, detail="generation_ids 不能为空")
+
+    async def event_generator():
+        builder = SSEEventBuilder(retry_ms=5000)
+        yield builder.build_with_retry("lipsync_subscribed", {"generation_ids": generation_ids})
+
+        for generation_id in generation_ids:
+            try:
+                await poller.refresh(generation_id, user_id)
+            except SyncsoClientError as e:
+                yield builder.build("lipsync_error", {"generation_id": generation_id, "error": str(e)})
+
+        async for event in poller.watch(generation_ids):
+            yield builder.build("lipsync_status", event)
+
+        yield builder.build("done", {"generation_ids": generation_ids})
+        yield builder.build_done()
+
+    return EventSourceResponse(event_generator())
+
+
 @router.get("/lipsync/{generation_id}")
-async def get_lipsync_status(generation_id: str):
+async def get_lipsync_status(
+    generation_id: str,
+    current_user: Optional[User] = Depends(get_current_user_optional),
+):
+    """查询 lipsync 任务状态（优先返回轮询器缓存，未知任务查询一次上游并开始跟踪）"""
     try:
-        client = SyncsoClient()
-        data = await client.get_generation(generation_id)
-        return {"success": True, "data": data}
+        user_id = current_user.user_id if current_user else None
+        job = await get_lipsync_poller().refresh(generation_id, user_id)
+        return {"success": True, "data": job.payload()}
     except SyncsoClientError as e:
         raise HTTPException(status_code=400, detail=str(e))
 
@@ -45,11 +45,6 @@ from sse_starlette.sse import EventSourceResponse
 
 from agent.intent_classifier import classify_intent
 from agent.memory import get_session_manager, memory_manager
-from agent.remix_agent import (
-    create_remix_agent,
-    get_agent_state,
-    get_session_config,
-)
 from agent.state import RemixContext
 from agent.stream import StreamEventProcessor
 from api.dependencies import get_current_user, get_current_user_optional
@@ -240,6 +235,9 @@ async def analyze(
             return
 
         # 每次请求创建新的 Agent 实例 (线程安全)
+        # Agent 工厂连带加载全部工具与 LangChain 依赖，按需导入以缩短应用启动时间
+        from agent.remix_agent import create_remix_agent, get_agent_state, get_session_config
+
         selected_model = resolve_model_name(request.model_name)
         agent = create_remix_agent(model_name=selected_model)
         # 记录本次请求开始时的累计 token（用于计算 delta）
@@ -622,6 +620,8 @@ async def chat(
             return
 
         # 每次请求创建新的 Agent 实例 (线程安全)
+        from agent.remix_agent import create_remix_agent, get_agent_state, get_session_config
+
         agent = create_remix_agent(model_name=selected_model)
         start_state = await get_agent_state(agent, session_id)
         start_in = int((start_state or {}).get("total_input_tokens") or 0)
@@ -866,6 +866,8 @@ async def get_session(session_id: str):
 
     返回指定会话的当前状态，包括已分析的内容和生成的文案。
     """
+    from agent.remix_agent import create_remix_agent, get_agent_state
+
     agent = create_remix_agent()
     state = await get_agent_state(agent, session_id)
 
@@ -37,16 +37,19 @@ Thinking/Reasoning 支持:
 1. 数据库激活配置 (用户通过 UI 选择的 is_active=1 配置)
 2. .env 环境变量配置 (回退/默认)
 """
-from typing import Optional, Dict, Any
+from __future__ import annotations
 
-from langchain.chat_models import init_chat_model
-from langchain_core.language_models import BaseChatModel
+from typing import TYPE_CHECKING, Optional, Dict, Any
 
 from config import settings
-from langchain_openai import ChatOpenAI
-from utils.chat_openai_with_reasoning import ChatOpenAIWithReasoning
 from utils.logger import logger
 
+if TYPE_CHECKING:
+    from langchain_core.language_models import BaseChatModel
+
+# 各提供商的 LangChain 集成包（langchain_openai 等）导入耗时较长，
+# 只在实际创建对应模型时于分支内导入，避免拖慢应用启动
+
 
 # ============================================================================
 # 数据库配置读取 (同步版本)
@@ -237,6 +240,8 @@ def get_llm(
 
     # ========== Anthropic Claude ==========
     if provider == "anthropic":
+        from langchain.chat_models import init_chat_model
+
         model = _model_name or settings.ANTHROPIC_MODEL_NAME
         api_key = _api_key or settings.ANTHROPIC_API_KEY
         base_url = _base_url or settings.ANTHROPIC_BASE_URL
@@ -285,6 +290,9 @@ def get_llm(
 
     # ========== OpenAI 兼容 API (GPT-5, MiniMax, Kimi) ==========
     elif provider == "openai":
+        from langchain_openai import ChatOpenAI
+        from utils.chat_openai_with_reasoning import ChatOpenAIWithReasoning
+
         model = _model_name or settings.OPENAI_MODEL_NAME
         api_key = _api_key or settings.OPENAI_API_KEY
         base_url = _base_url or settings.OPENAI_BASE_URL
@@ -420,6 +428,8 @@ def get_multimodal_llm(
         RuntimeError: 多模态未启用时抛出
         ValueError: 不支持的多模态提供商
     """
+    from langchain.chat_models import init_chat_model
+
     # 尝试从数据库获取支持多模态的配置
     db_config = _get_active_db_config()
 
@@ -0,0 +1,18 @@
+-- ============================================================================
+-- V014: Config versions
+-- ============================================================================
+-- 目标：
+-- - 管理后台修改配置后，多个 worker 的进程内缓存在 1 秒内同步失效
+-- - 每个作用域一行版本号，配置变更时 +1；各 worker 后台轮询该表（主键小表，开销可忽略）
+--
+-- 作用域：
+-- - insight_modes: 分析模式配置（mode prompt / 意图关键词 / 模式列表）
+
+CREATE TABLE IF NOT EXISTS config_versions (
+    scope VARCHAR(64) NOT NULL PRIMARY KEY COMMENT '配置作用域',
+    version BIGINT UNSIGNED NOT NULL DEFAULT 0 COMMENT '单调递增版本号',
+    updated_at TIMESTAMP(6) DEFAULT CURRENT_TIMESTAMP(6) ON UPDATE CURRENT_TIMESTAMP(6)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
+COMMENT='配置版本号（跨 worker 缓存失效）';
+
+INSERT IGNORE INTO config_versions (scope, version) VALUES ('insight_modes', 0);
@@ -0,0 +1,159 @@
+# -*- coding: utf-8 -*-
+#!/usr/bin/env python
+# Copyright (c) 2026 relakkes@gmail.com
+#
+# This file is part of MediaCrawlerPro-ContentRemixAgent project.
+# Repository: https://github.com/MediaCrawlerPro/MediaCrawlerPro-ContentRemixAgent/blob/main/backend/scripts/bench_asr_batching.py
+# GitHub: https://github.com/NanmiCoder
+# Licensed under NON-COMMERCIAL LEARNING LICENSE 1.1
+#
+# 声明：本代码仅供学习和研究目的使用。使用者应遵守以下原则：
+# 1. 不得用于任何商业用途。
+# 2. 使用时应遵守目标平台的使用条款和robots.txt规则。
+# 3. 不得进行大规模爬取或对平台造成运营干扰。
+# 4. 应合理控制请求频率，避免给目标平台带来不必要的负担。
+# 5. 不得用于任何非法或不当的用途。
+#
+# 详细许可条款请参阅项目根目录下的LICENSE文件。
+# 使用本代码即表示您同意遵守上述原则和LICENSE中的所有条款。
+
+"""
+FunASR 跨任务微批基准测试 (audio-seconds per CPU-second)
+
+同一个 16kHz mono WAV 由 1 / 4 / 16 个并发任务同时转录，统计:
+- wall: 全部任务完成的墙钟时间
+- cpu: 进程 CPU 时间（含所有线程）
+- audio_s/cpu_s: 每 CPU 秒处理的音频秒数，越高越好
+- latency p50/max: 单个任务从提交到拿到结果的耗时（攒批窗口会增加这部分）
+
+模型在进程启动时按 ASR_BATCH_MAX_SIZE 加载，对比时分别运行:
+   uv run python scripts/bench_asr_batching.py sample.wav --batch-size 1
+   uv run python scripts/bench_asr_batching.py sample.wav --batch-size 16 --window-ms 30
+
+--stub-model 以 sleep 模拟的替身模型代替 FunASR（每次 generate 固定开销 + 按音频时长计费，
+所有替身实例共用一把锁，模拟争抢同一计算设备），只用于验证调度器的合批与延迟行为，
+吞吐数字由替身参数决定，不代表真实模型的收益:
+   uv run python scripts/bench_asr_batching.py sample.wav --batch-size 16 --stub-model
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import threading
+import time
+import types
+from concurrent.futures import ThreadPoolExecutor
+
+# 添加 backend 目录到 path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+class _StubAutoModel:
+    """替身 AutoModel: 每次 generate 持设备锁睡眠 call_s + 音频秒数 * audio_ratio，返回 FunASR 格式的结果"""
+
+    call_s = 0.04
+    audio_ratio = 0.02
+    device_lock = threading.Lock()
+
+    def __init__(self, model: str, **kwargs):
+        self.model = model
+
+    def generate(self, input, fs: int = 16000, **kwargs):  # noqa: A002
+        if self.model == _settings_value("ASR_PUNC_MODEL"):
+            self._spend(self.call_s / 10)
+            return [{"text": input + "。"}]
+
+        if self.model == _settings_value("ASR_VAD_MODEL"):
+            total_ms = int(len(input) * 1000 / fs)
+            self._spend(self.call_s + total_ms / 1000 * self.audio_ratio / 10)
+            # 每 5 秒一个语音段
+            return [{"value": [[start, min(start + 5000, total_ms)] for start in range(0, total_ms, 5000)]}]
+
+        inputs = input if isinstance(input, list) else [input]
+        seconds = sum(len(samples) / fs for samples in inputs)
+        self._spend(self.call_s + seconds * self.audio_ratio)
+        results = []
+        for samples in inputs:
+            chars = max(1, int(len(samples) / fs * 4))
+            results.append({
+                "text": "字" * chars,
+                "timestamp": [[i * 250, i * 250 + 200] for i in range(chars)],
+            })
+        return results
+
+    @classmethod
+    def _spend(cls, seconds: float) -> None:
+        with cls.device_lock:
+            time.sleep(seconds)
+
+
+def _settings_value(name: str):
+    from config import settings
+
+    return getattr(settings, name)
+
+
+def _install_stub_funasr(call_ms: float, audio_ratio: float) -> None:
+    """以替身模块顶替 funasr，FunASRBackend 的 `from funasr import AutoModel` 拿到的是替身"""
+    _StubAutoModel.call_s = call_ms / 1000
+    _StubAutoModel.audio_ratio = audio_ratio
+    sys.modules["funasr"] = types.SimpleNamespace(AutoModel=_StubAutoModel)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark FunASR cross-request batching")
+    parser.add_argument("wav", help="16kHz mono WAV 文件")
+    parser.add_argument("--batch-size", type=int, default=16, help="ASR_BATCH_MAX_SIZE（1 表示逐任务转录）")
+    parser.add_argument("--window-ms", type=int, default=30, help="ASR_BATCH_WINDOW_MS")
+    parser.add_argument("--concurrency", default="1,4,16", help="并发任务数列表")
+    parser.add_argument("--stub-model", action="store_true", help="使用 sleep 替身模型，只测调度器")
+    parser.add_argument("--stub-call-ms", type=float, default=40.0, help="替身模型每次 generate 的固定开销")
+    parser.add_argument("--stub-audio-ratio", type=float, default=0.02, help="替身模型每音频秒的耗时（秒）")
+    args = parser.parse_args()
+
+    if args.stub_model:
+        _install_stub_funasr(args.stub_call_ms, args.stub_audio_ratio)
+
+    from config import settings
+
+    settings.ASR_BATCH_MAX_SIZE = args.batch_size
+    settings.ASR_BATCH_WINDOW_MS = args.window_ms
+
+    from services.asr_service import FunASRBackend, read_wav_pcm
+
+    samples, sample_rate = read_wav_pcm(args.wav)
+    audio_seconds = len(samples) / sample_rate
+
+    backend = FunASRBackend()
+    backend._load_model()
+    backend.transcribe(args.wav)  # 预热
+
+    def timed_transcribe(_) -> float:
+        started = time.perf_counter()
+        backend.transcribe(args.wav)
+        return time.perf_counter() - started
+
+    model = "stub" if args.stub_model else "funasr"
+    print(f"model={model} audio={audio_seconds:.1f}s batch_size={args.batch_size} window={args.window_ms}ms")
+    for concurrency in (int(c) for c in args.concurrency.split(",")):
+        wall_start = time.perf_counter()
+        cpu_start = time.process_time()
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            latencies = list(executor.map(timed_transcribe, range(concurrency)))
+        wall = time.perf_counter() - wall_start
+        # 替身模型只睡眠，CPU 时间近似为 0，避免除零
+        cpu = max(time.process_time() - cpu_start, 1e-6)
+        total_audio = audio_seconds * concurrency
+        print(
+            f"jobs={concurrency:<3} wall={wall:8.2f}s cpu={cpu:8.2f}s "
+            f"audio_s/cpu_s={total_audio / cpu:7.2f} audio_s/wall_s={total_audio / wall:7.2f} "
+            f"latency p50={statistics.median(latencies):6.2f}s max={max(latencies):6.2f}s"
+        )
+
+    if backend._batch_scheduler is not None:
+        print(f"batches: {backend._batch_scheduler.metrics.snapshot()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,158 @@
+# -*- coding: utf-8 -*-
+#!/usr/bin/env python
+# Copyright (c) 2026 relakkes@gmail.com
+#
+# This file is part of MediaCrawlerPro-ContentRemixAgent project.
+# Repository: https://github.com/MediaCrawlerPro/MediaCrawlerPro-ContentRemixAgent/blob/main/backend/scripts/bench_asr_onnx.py
+# GitHub: https://github.com/NanmiCoder
+# Licensed under NON-COMMERCIAL LEARNING LICENSE 1.1
+#
+# 声明：本代码仅供学习和研究目的使用。使用者应遵守以下原则：
+# 1. 不得用于任何商业用途。
+# 2. 使用时应遵守目标平台的使用条款和robots.txt规则。
+# 3. 不得进行大规模爬取或对平台造成运营干扰。
+# 4. 应合理控制请求频率，避免给目标平台带来不必要的负担。
+# 5. 不得用于任何非法或不当的用途。
+#
+# 详细许可条款请参阅项目根目录下的LICENSE文件。
+# 使用本代码即表示您同意遵守上述原则和LICENSE中的所有条款。
+
+
+"""
+ASR 后端对比: FunASR (PyTorch) vs ONNX Runtime (int8 量化)
+
+对每个后端统计:
+- load: 模型加载耗时
+- RTF: 转录墙钟时间 / 音频时长（越低越好，取多次运行的中位数）
+- CER: 与参考文本的字错误率（忽略标点和空白）；同名 .txt 文件作为参考文本，
+  没有参考文本时以 FunASR 的输出为基准，报告 ONNX 相对 FunASR 的差异率
+
+不传音频时按 tests/test_asr_service.py 的夹具方式用 write_wav 生成一段静音 WAV，
+仅用于冒烟验证吞吐统计流程（无 CER）。
+
+运行方式:
+   uv run python scripts/bench_asr_onnx.py sample1.wav sample2.wav --runs 3
+   uv run python scripts/bench_asr_onnx.py sample.wav --backends onnx --threads 1,2,4
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+import unicodedata
+from pathlib import Path
+
+# 添加 backend 目录到 path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def normalize(text: str) -> str:
+    """去掉标点和空白，只比较文字内容"""
+    return "".join(
+        c for c in text
+        if not c.isspace() and not unicodedata.category(c).startswith("P")
+    )
+
+
+def edit_distance(ref: str, hyp: str) -> int:
+    """字符级 Levenshtein 距离"""
+    previous = list(range(len(hyp) + 1))
+    for i, r in enumerate(ref, 1):
+        current = [i]
+        for j, h in enumerate(hyp, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (r != h)))
+        previous = current
+    return previous[-1]
+
+
+def cer(ref: str, hyp: str) -> float:
+    ref, hyp = normalize(ref), normalize(hyp)
+    if not ref:
+        return 0.0 if not hyp else 1.0
+    return edit_distance(ref, hyp) / len(ref)
+
+
+def fixture_audio(directory: str) -> str:
+    """与 tests/test_asr_service.py 夹具相同: write_wav 写出 16kHz mono 静音"""
+    from services.audio_extractor import write_wav
+
+    return write_wav(Path(directory) / "fixture.wav", b"\x00\x00" * 16000 * 10, 16000).path
+
+
+def create_backend(name: str):
+    from services.asr_service import FunASRBackend, OnnxASRBackend
+
+    backend_cls = OnnxASRBackend if name == "onnx" else FunASRBackend
+    backend_cls._instance = None
+    backend = backend_cls()
+    start = time.perf_counter()
+    backend._load_model()
+    return backend, time.perf_counter() - start
+
+
+def run_backend(name: str, files: list, runs: int) -> dict:
+    """加载后端并转录全部文件，返回 {load, rtf, texts}"""
+    from services.asr_service import read_wav_pcm
+
+    backend, load_seconds = create_backend(name)
+    backend.transcribe(files[0])  # 预热
+
+    rtfs, texts = [], {}
+    for path in files:
+        samples, sample_rate = read_wav_pcm(path)
+        duration = len(samples) / sample_rate
+        timings = []
+        for _ in range(runs):
+            start = time.perf_counter()
+            raw = backend.transcribe(path)
+            timings.append(time.perf_counter() - start)
+        rtfs.append(statistics.median(timings) / duration)
+        texts[path] = raw.text
+    return {"load": load_seconds, "rtf": statistics.mean(rtfs), "texts": texts}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compare FunASR and quantized ONNX ASR backends")
+    parser.add_argument("wavs", nargs="*", help="16kHz mono WAV 文件（同名 .txt 为参考文本）")
+    parser.add_argument("--backends", default="funasr,onnx", help="对比的后端列表")
+    parser.add_argument("--runs", type=int, default=3, help="每个文件的转录次数（取中位数）")
+    parser.add_argument("--threads", default="", help="ONNX 算子内线程数列表，如 1,2,4（默认用配置值）")
+    parser.add_argument("--no-quantize", action="store_true", help="ONNX 后端加载未量化模型")
+    args = parser.parse_args()
+
+    from config import settings
+
+    settings.ASR_ONNX_QUANTIZE = not args.no_quantize
+
+    with tempfile.TemporaryDirectory() as tmp:
+        files = args.wavs or [fixture_audio(tmp)]
+        references = {
+            path: Path(path).with_suffix(".txt").read_text(encoding="utf-8")
+            for path in files if Path(path).with_suffix(".txt").exists()
+        }
+
+        results = {}
+        for name in args.backends.split(","):
+            if name == "onnx" and args.threads:
+                for threads in (int(t) for t in args.threads.split(",")):
+                    settings.ASR_ONNX_INTRA_OP_THREADS = threads
+                    results[f"onnx/t{threads}"] = run_backend(name, files, args.runs)
+            else:
+                results[name] = run_backend(name, files, args.runs)
+
+    baseline = results.get("funasr")
+    print(f"files={len(files)} runs={args.runs} quantize={settings.ASR_ONNX_QUANTIZE}")
+    for name, result in results.items():
+        line = f"{name:<10} load={result['load']:7.2f}s  RTF={result['rtf']:.4f}"
+        if references:
+            line += "  CER=" + f"{statistics.mean(cer(references[p], result['texts'][p]) for p in references):.4f}"
+        if baseline and result is not baseline:
+            diff = statistics.mean(cer(baseline["texts"][p], result["texts"][p]) for p in files)
+            line += f"  diff_vs_funasr={diff:.4f}  speedup={baseline['rtf'] / result['rtf']:.2f}x"
+        print(line)
+
+
+if __name__ == "__main__":
+    main()
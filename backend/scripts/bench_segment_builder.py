@@ -0,0 +1,108 @@
+# -*- coding: utf-8 -*-
+#!/usr/bin/env python
+# Copyright (c) 2026 relakkes@gmail.com
+#
+# This file is part of MediaCrawlerPro-ContentRemixAgent project.
+# Repository: https://github.com/MediaCrawlerPro/MediaCrawlerPro-ContentRemixAgent/blob/main/backend/scripts/bench_segment_builder.py
+# GitHub: https://github.com/NanmiCoder
+# Licensed under NON-COMMERCIAL LEARNING LICENSE 1.1
+#
+# 声明：本代码仅供学习和研究目的使用。使用者应遵守以下原则：
+# 1. 不得用于任何商业用途。
+# 2. 使用时应遵守目标平台的使用条款和robots.txt规则。
+# 3. 不得进行大规模爬取或对平台造成运营干扰。
+# 4. 应合理控制请求频率，避免给目标平台带来不必要的负担。
+# 5. 不得用于任何非法或不当的用途。
+#
+# 详细许可条款请参阅项目根目录下的LICENSE文件。
+# 使用本代码即表示您同意遵守上述原则和LICENSE中的所有条款。
+
+"""
+SegmentBuilder 基准测试：逐 token 对象 vs 列式 + 向量化切分
+
+生成合成转录（默认 1 小时、每秒 5 字，带标点和停顿），对比:
+- legacy:   FunASR 结果 -> List[Token] -> _build_from_token_list
+- columnar: FunASR 结果 -> TokenColumns -> _build_from_tokens
+输出两者的耗时、token 表示的内存占用（tracemalloc），并校验分段完全一致。
+
+运行方式:
+   uv run python scripts/bench_segment_builder.py --hours 1 --chars-per-second 5
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+# 添加 backend 目录到 path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def synthetic_funasr_item(hours: float, chars_per_second: float, seed: int = 0) -> dict:
+    """生成 FunASR 格式的结果: {"text": ..., "timestamp": [[start_ms, end_ms], ...]}"""
+    rng = random.Random(seed)
+    words = "今天我们来聊一聊这个视频里面最重要的几个观点大家可以看到"
+    total = int(hours * 3600 * chars_per_second)
+    step = 1000 / chars_per_second
+    chars, timestamps = [], []
+    cursor = 0.0
+    for i in range(total):
+        if i and i % rng.randint(8, 30) == 0:
+            chars.append(rng.choice("，。！？"))
+        else:
+            chars.append(rng.choice(words))
+        start = int(cursor)
+        timestamps.append([start, start + int(step * 0.8)])
+        cursor += step + (rng.choice([0, 0, 0, 300, 900]) if rng.random() < 0.05 else 0)
+    return {"text": "".join(chars), "timestamp": timestamps}
+
+
+def measure(label: str, build):
+    """耗时不开 tracemalloc 单独测量；内存为构建后仍持有的 token 与分段大小及过程峰值"""
+    started = time.perf_counter()
+    build()
+    elapsed = time.perf_counter() - started
+
+    tracemalloc.start()
+    tokens, segments = build()
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    _, segments = build()
+    print(f"{label:<9} {elapsed * 1000:9.1f} ms  tokens+segments {retained / 1024 / 1024:6.1f} MB  "
+          f"peak {peak / 1024 / 1024:6.1f} MB  {len(tokens):>8} tokens  {len(segments):>6} segments")
+    return segments
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark SegmentBuilder")
+    parser.add_argument("--hours", type=float, default=1.0)
+    parser.add_argument("--chars-per-second", type=float, default=5.0)
+    args = parser.parse_args()
+
+    from services.asr_service import SegmentBuilder, Token, TokenColumns
+
+    item = synthetic_funasr_item(args.hours, args.chars_per_second)
+    builder = SegmentBuilder()
+
+    def legacy():
+        text = item["text"]
+        tokens = [
+            Token(text=text[i], start_ms=int(ts[0]), end_ms=int(ts[1]))
+            for i, ts in enumerate(item["timestamp"])
+            if len(ts) >= 2 and i < len(text)
+        ]
+        return tokens, builder._build_from_token_list(tokens)
+
+    def columnar():
+        tokens = TokenColumns.from_chars(item["text"], item["timestamp"])
+        return tokens, builder._build_from_tokens(tokens)
+
+    expected = measure("legacy", legacy)
+    actual = measure("columnar", columnar)
+    print("segments identical:", expected == actual)
+
+
+if __name__ == "__main__":
+    main()
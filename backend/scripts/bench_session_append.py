@@ -0,0 +1,100 @@
+# -*- coding: utf-8 -*-
+#!/usr/bin/env python
+# Copyright (c) 2026 relakkes@gmail.com
+#
+# This file is part of MediaCrawlerPro-ContentRemixAgent project.
+# Repository: https://github.com/MediaCrawlerPro/MediaCrawlerPro-ContentRemixAgent/blob/main/backend/scripts/bench_session_append.py
+# GitHub: https://github.com/NanmiCoder
+# Licensed under NON-COMMERCIAL LEARNING LICENSE 1.1
+#
+# 声明：本代码仅供学习和研究目的使用。使用者应遵守以下原则：
+# 1. 不得用于任何商业用途。
+# 2. 使用时应遵守目标平台的使用条款和robots.txt规则。
+# 3. 不得进行大规模爬取或对平台造成运营干扰。
+# 4. 应合理控制请求频率，避免给目标平台带来不必要的负担。
+# 5. 不得用于任何非法或不当的用途。
+#
+# 详细许可条款请参阅项目根目录下的LICENSE文件。
+# 使用本代码即表示您同意遵守上述原则和LICENSE中的所有条款。
+
+"""
+MySQLSessionManager 消息追加基准测试 (inserts/sec)
+
+对比三种写入方式:
+- legacy: 旧实现 (先 SELECT/UPDATE 会话，再 INSERT 消息，再 UPDATE updated_at，两个连接)
+- single: aadd_message，单事务 upsert + insert
+- batch:  aadd_messages，每次追加 user + assistant 两条消息
+
+运行方式 (需配置 AGENT_DB_* 环境变量，且已执行迁移):
+   uv run python scripts/bench_session_append.py --messages 500
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+import uuid
+
+# 添加 backend 目录到 path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+async def _legacy_add_message(mgr, session_id: str, role: str, content: str) -> None:
+    """复现旧版 _add_message_async 的语句序列，作为对照组"""
+    from sqlalchemy import text
+
+    async with mgr.async_session_factory() as session:
+        await mgr._create_session_async(session_id, "新对话", "")
+        await session.execute(text("""
+            INSERT INTO agent_session_messages (message_id, session_id, role, content, segments_json)
+            VALUES (:mid, :sid, :role, :content, NULL)
+        """), {"mid": str(uuid.uuid4()), "sid": session_id, "role": role, "content": content})
+        await session.execute(text("""
+            UPDATE agent_sessions SET updated_at = NOW(6)
+            WHERE session_id = :sid
+        """), {"sid": session_id})
+        await session.commit()
+
+
+async def _run_case(mgr, name: str, total: int) -> None:
+    session_id = f"bench-{name}-{uuid.uuid4()}"
+    start = time.perf_counter()
+
+    if name == "legacy":
+        for i in range(total):
+            await _legacy_add_message(mgr, session_id, "user", f"message {i}")
+    elif name == "single":
+        for i in range(total):
+            await mgr.aadd_message(session_id, "user", f"message {i}")
+    else:
+        for i in range(0, total, 2):
+            await mgr.aadd_messages(session_id, [
+                {"role": "user", "content": f"message {i}"},
+                {"role": "assistant", "content": f"message {i + 1}"},
+            ])
+
+    elapsed = time.perf_counter() - start
+    print(f"{name:<8} {total:>6} msgs  {elapsed:8.3f}s  {total / elapsed:10.1f} inserts/sec")
+
+    await mgr.adelete_session(session_id)
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark session message append")
+    parser.add_argument("--messages", type=int, default=500, help="每种方式写入的消息数")
+    args = parser.parse_args()
+
+    from agent.memory import MySQLSessionManager
+    from db.base import get_mysql_connection_string
+
+    mgr = MySQLSessionManager.from_conn_string(get_mysql_connection_string())
+    try:
+        for name in ("legacy", "single", "batch"):
+            await _run_case(mgr, name, args.messages)
+    finally:
+        await mgr.engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
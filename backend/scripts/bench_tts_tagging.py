@@ -0,0 +1,151 @@
+# -*- coding: utf-8 -*-
+#!/usr/bin/env python
+# Copyright (c) 2026 relakkes@gmail.com
+#
+# This file is part of MediaCrawlerPro-ContentRemixAgent project.
+# Repository: https://github.com/MediaCrawlerPro/MediaCrawlerPro-ContentRemixAgent/blob/main/backend/scripts/bench_tts_tagging.py
+# GitHub: https://github.com/NanmiCoder
+# Licensed under NON-COMMERCIAL LEARNING LICENSE 1.1
+#
+# 声明：本代码仅供学习和研究目的使用。使用者应遵守以下原则：
+# 1. 不得用于任何商业用途。
+# 2. 使用时应遵守目标平台的使用条款和robots.txt规则。
+# 3. 不得进行大规模爬取或对平台造成运营干扰。
+# 4. 应合理控制请求频率，避免给目标平台带来不必要的负担。
+# 5. 不得用于任何非法或不当的用途。
+#
+# 详细许可条款请参阅项目根目录下的LICENSE文件。
+# 使用本代码即表示您同意遵守上述原则和LICENSE中的所有条款。
+
+
+"""
+TTS 规则标注基准测试（5000 字脚本）
+
+对比提示词检测的两种实现:
+- legacy: 旧实现，每个子句/句子按标签逐个提示词做子串查找
+- automaton: 提示词预编译为 Aho–Corasick 自动机，每段文本单次扫描
+
+并给出 build_expressive_tts_text / _sanitize_tagged_text 的整体耗时。
+
+运行方式:
+   uv run python scripts/bench_tts_tagging.py --chars 5000 --rounds 20
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+# 添加 backend 目录到 path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services import tts_expression_service as tts  # noqa: E402
+
+
+_SAMPLE_SENTENCES = [
+    "大家好，今天我们来聊一个特别离谱的事情，你一定想不到。",
+    "哈哈，说实话我第一次看到的时候也笑死了！",
+    "为什么这个产品能卖得这么好？",
+    "首先，我们要搞清楚用户到底需要什么，然后再决定怎么做。",
+    "唉，可惜很多人到最后都没有坚持下来，真的很遗憾。",
+    "赶紧收藏这条视频，马上就要下架了！！",
+    "悄悄告诉你，其实这个方法非常简单，温柔一点就好。",
+    "天哪，竟然还有这种操作，太不可思议了。",
+    "我肯定会继续分享更多干货，放心关注就行。",
+    "如果你也有同样的焦虑和担心，请在评论区告诉我。",
+]
+
+
+def _build_script(chars: int, seed: int = 42) -> str:
+    rng = random.Random(seed)
+    parts = []
+    total = 0
+    while total < chars:
+        sentence = rng.choice(_SAMPLE_SENTENCES)
+        parts.append(sentence)
+        total += len(sentence)
+    return "".join(parts)[:chars]
+
+
+# ---------------------------------------------------------------------------
+# legacy: 复现旧版逐提示词查找，作为对照组
+# ---------------------------------------------------------------------------
+
+def _legacy_contains_hint(text, hints):
+    lowered = (text or "").lower()
+    return any(hint in text or hint in lowered for hint in hints)
+
+
+def _legacy_detect(text, tag_hints):
+    for tag, hints in tag_hints:
+        if _legacy_contains_hint(text, hints):
+            return tag
+    return None
+
+
+def _legacy_emotion(sentence):
+    content = sentence.strip()
+    lowered = content.lower()
+    scores = {}
+    for emotion, keywords in tts._EMOTION_KEYWORDS:
+        score = sum(1 for kw in keywords if kw in lowered or kw in content)
+        if score:
+            scores[emotion] = score
+    return max(scores, key=scores.get) if scores else "(calm)"
+
+
+def _run_legacy(sentences):
+    for sentence in sentences:
+        _legacy_emotion(sentence)
+        for clause in tts._split_clauses(sentence):
+            plain = tts._strip_tags(clause)
+            _legacy_detect(plain, tts._TONE_HINTS)
+            _legacy_detect(plain, tts._EFFECT_HINTS)
+            _legacy_contains_hint(plain, tts._TSK_HINTS)
+
+
+def _run_automaton(sentences):
+    allowed_tones = set(tts._INLINE_TONE_TAGS)
+    allowed_effects = set(tts._AUTO_EFFECT_TAGS)
+    for sentence in sentences:
+        tts.detect_sentence_emotion(sentence)
+        for clause in tts._split_clauses(sentence):
+            plain = tts._strip_tags(clause)
+            hits = tts._scan_hints(plain)
+            tts._detect_tone_tag(plain, allowed_tags=allowed_tones, hits=hits)
+            tts._detect_effect_tag(plain, allowed_tags=allowed_effects, hits=hits)
+
+
+def _timeit(fn, rounds: int) -> float:
+    fn()  # 预热
+    start = time.perf_counter()
+    for _ in range(rounds):
+        fn()
+    return (time.perf_counter() - start) / rounds * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark TTS rule-based tagging")
+    parser.add_argument("--chars", type=int, default=5000, help="脚本字数")
+    parser.add_argument("--rounds", type=int, default=20, help="每项重复次数")
+    args = parser.parse_args()
+
+    script = _build_script(args.chars)
+    sentences = tts.split_sentences(script)
+    print(f"script: {len(script)} chars, {len(sentences)} sentences")
+
+    legacy_ms = _timeit(lambda: _run_legacy(sentences), args.rounds)
+    automaton_ms = _timeit(lambda: _run_automaton(sentences), args.rounds)
+    print(f"{'legacy':<12} hint detection  {legacy_ms:8.2f} ms")
+    print(f"{'automaton':<12} hint detection  {automaton_ms:8.2f} ms  ({legacy_ms / automaton_ms:.1f}x)")
+
+    build_ms = _timeit(lambda: tts.build_expressive_tts_text(script), args.rounds)
+    tagged = tts.build_expressive_tts_text(script)["tagged_text"]
+    sanitize_ms = _timeit(lambda: tts._sanitize_tagged_text(tagged), args.rounds)
+    print(f"{'build':<12} full script     {build_ms:8.2f} ms")
+    print(f"{'sanitize':<12} tagged script   {sanitize_ms:8.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,141 @@
+# -*- coding: utf-8 -*-
+#!/usr/bin/env python
+# Copyright (c) 2026 relakkes@gmail.com
+#
+# This file is part of MediaCrawlerPro-ContentRemixAgent project.
+# Repository: https://github.com/MediaCrawlerPro/MediaCrawlerPro-ContentRemixAgent/blob/main/backend/scripts/bench_video_download.py
+# GitHub: https://github.com/NanmiCoder
+# Licensed under NON-COMMERCIAL LEARNING LICENSE 1.1
+#
+# 声明：本代码仅供学习和研究目的使用。使用者应遵守以下原则：
+# 1. 不得用于任何商业用途。
+# 2. 使用时应遵守目标平台的使用条款和robots.txt规则。
+# 3. 不得进行大规模爬取或对平台造成运营干扰。
+# 4. 应合理控制请求频率，避免给目标平台带来不必要的负担。
+# 5. 不得用于任何非法或不当的用途。
+#
+# 详细许可条款请参阅项目根目录下的LICENSE文件。
+# 使用本代码即表示您同意遵守上述原则和LICENSE中的所有条款。
+
+"""
+VideoDownloader 分段下载基准测试
+
+在本地启动一个支持 Range 的 HTTP 服务器，按连接限速模拟 CDN 单连接带宽，
+对比单连接 (VIDEO_DOWNLOAD_MAX_SEGMENTS=1) 与多连接分段下载的耗时。
+
+运行方式:
+   uv run python scripts/bench_video_download.py --size-mb 64 --rate-mb 8 --segments 1 2 4 8
+"""
+
+import argparse
+import asyncio
+import os
+import re
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# 添加 backend 目录到 path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def _make_handler(payload: bytes, rate_bytes: int):
+    """构造支持 Range 的请求处理器，每个连接限速 rate_bytes/s"""
+
+    class RangeHandler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, *args):
+            pass
+
+        def _range(self):
+            match = re.match(r"bytes=(\d+)-(\d*)", self.headers.get("Range", ""))
+            if not match:
+                return None
+            start = int(match.group(1))
+            end = int(match.group(2)) if match.group(2) else len(payload) - 1
+            return start, min(end, len(payload) - 1)
+
+        def _send_headers(self, rng):
+            if rng:
+                self.send_response(206)
+                self.send_header("Content-Range", f"bytes {rng[0]}-{rng[1]}/{len(payload)}")
+                self.send_header("Content-Length", str(rng[1] - rng[0] + 1))
+            else:
+                self.send_response(200)
+                self.send_header("Content-Length", str(len(payload)))
+            self.send_header("Content-Type", "video/mp4")
+            self.send_header("Accept-Ranges", "bytes")
+            self.end_headers()
+
+        def do_HEAD(self):
+            self._send_headers(self._range())
+
+        def do_GET(self):
+            rng = self._range()
+            self._send_headers(rng)
+            start, end = rng or (0, len(payload) - 1)
+            block = 64 * 1024
+            pos = start
+            try:
+                while pos <= end:
+                    chunk = payload[pos:min(pos + block, end + 1)]
+                    self.wfile.write(chunk)
+                    pos += len(chunk)
+                    if rate_bytes > 0:
+                        time.sleep(len(chunk) / rate_bytes)
+            except (BrokenPipeError, ConnectionResetError):
+                pass
+
+    return RangeHandler
+
+
+async def _run_case(url: str, segments: int, expected: int) -> float:
+    from config import settings
+    from services.video_downloader import VideoDownloader
+
+    settings.VIDEO_DOWNLOAD_MAX_SEGMENTS = segments
+    downloader = VideoDownloader()
+    task_id = f"bench-{segments}-{time.time_ns()}"
+
+    start = time.perf_counter()
+    path = await downloader.download(url, task_id)
+    elapsed = time.perf_counter() - start
+
+    size = os.path.getsize(path)
+    downloader.cleanup(task_id)
+    if size != expected:
+        raise RuntimeError(f"size mismatch: {size} != {expected}")
+    return elapsed
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark segmented video download")
+    parser.add_argument("--size-mb", type=int, default=64, help="测试文件大小 (MB)")
+    parser.add_argument("--rate-mb", type=float, default=8.0, help="单连接限速 (MB/s)，0 表示不限速")
+    parser.add_argument("--segments", type=int, nargs="+", default=[1, 2, 4, 8], help="分段数")
+    args = parser.parse_args()
+
+    from config import settings
+
+    payload = os.urandom(args.size_mb * 1024 * 1024)
+    handler = _make_handler(payload, int(args.rate_mb * 1024 * 1024))
+    server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_address[1]}/video.mp4"
+
+    settings.VIDEO_TEMP_DIR = tempfile.mkdtemp(prefix="bench_video_")
+    settings.VIDEO_DOWNLOAD_MIN_SEGMENT_BYTES = 1024 * 1024
+
+    try:
+        for segments in args.segments:
+            elapsed = await _run_case(url, segments, len(payload))
+            print(f"segments={segments:<3} {elapsed:8.3f}s  {args.size_mb / elapsed:8.2f} MB/s")
+    finally:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
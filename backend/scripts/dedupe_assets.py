@@ -0,0 +1,71 @@
+# -*- coding: utf-8 -*-
+#!/usr/bin/env python
+# Copyright (c) 2026 relakkes@gmail.com
+#
+# This file is part of MediaCrawlerPro-ContentRemixAgent project.
+# Repository: https://github.com/MediaCrawlerPro/MediaCrawlerPro-ContentRemixAgent/blob/main/backend/scripts/dedupe_assets.py
+# GitHub: https://github.com/NanmiCoder
+# Licensed under NON-COMMERCIAL LEARNING LICENSE 1.1
+#
+# 声明：本代码仅供学习和研究目的使用。使用者应遵守以下原则：
+# 1. 不得用于任何商业用途。
+# 2. 使用时应遵守目标平台的使用条款和robots.txt规则。
+# 3. 不得进行大规模爬取或对平台造成运营干扰。
+# 4. 应合理控制请求频率，避免给目标平台带来不必要的负担。
+# 5. 不得用于任何非法或不当的用途。
+#
+# 详细许可条款请参阅项目根目录下的LICENSE文件。
+# 使用本代码即表示您同意遵守上述原则和LICENSE中的所有条款。
+
+"""
+资源目录去重 - 将已有资源迁移到内容寻址存储
+
+遍历 ASSETS_DIR 下的封面、视频、图片和 uploads，把内容相同的文件合并为同一个
+blob，原路径以硬链接形式保留（URL 不变），最后回收无引用 blob 并输出节省的空间。
+
+运行方式:
+   uv run python scripts/dedupe_assets.py            # 执行去重
+   uv run python scripts/dedupe_assets.py --stats    # 仅查看统计
+"""
+
+import argparse
+import os
+import sys
+
+# 添加 backend 目录到 path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def _format_mb(num_bytes: int) -> str:
+    return f"{num_bytes / 1024 / 1024:.2f} MB"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Deduplicate asset files")
+    parser.add_argument("--stats", action="store_true", help="只输出统计，不做去重")
+    args = parser.parse_args()
+
+    from config import settings
+    from services.blob_store import get_blob_store
+
+    store = get_blob_store()
+
+    if args.stats:
+        stats = store.stats()
+    else:
+        print(f"Deduplicating: {os.path.abspath(settings.ASSETS_DIR)}")
+        store.dedupe_tree(settings.ASSETS_DIR)
+        freed = store.gc()
+        stats = store.stats()
+        if freed:
+            print(f"Unreferenced blobs removed: {_format_mb(freed)}")
+
+    print(f"Blobs:      {stats.blob_count}")
+    print(f"References: {stats.ref_count}")
+    print(f"Logical:    {_format_mb(stats.logical_bytes)}")
+    print(f"Physical:   {_format_mb(stats.physical_bytes)}")
+    print(f"Reclaimed:  {_format_mb(stats.reclaimed_bytes)}")
+
+
+if __name__ == "__main__":
+    main()
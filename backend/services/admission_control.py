@@ -0,0 +1,333 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2026 relakkes@gmail.com
+#
+# This file is part of MediaCrawlerPro-ContentRemixAgent project.
+# Repository: https://github.com/MediaCrawlerPro/MediaCrawlerPro-ContentRemixAgent/blob/main/backend/services/admission_control.py
+# GitHub: https://github.com/NanmiCoder
+# Licensed under NON-COMMERCIAL LEARNING LICENSE 1.1
+#
+# 声明：本代码仅供学习和研究目的使用。使用者应遵守以下原则：
+# 1. 不得用于任何商业用途。
+# 2. 使用时应遵守目标平台的使用条款和robots.txt规则。
+# 3. 不得进行大规模爬取或对平台造成运营干扰。
+# 4. 应合理控制请求频率，避免给目标平台带来不必要的负担。
+# 5. 不得用于任何非法或不当的用途。
+#
+# 详细许可条款请参阅项目根目录下的LICENSE文件。
+# 使用本代码即表示您同意遵守上述原则和LICENSE中的所有条款。
+
+
+"""
+重资源准入控制 - 按资源类别限制并发，按用户公平排队
+
+视频下载、ffmpeg、ASR、外部媒体 API（Voicv / Sync.so）原本在各自的请求中直接执行，
+没有全局上限，并发请求一多机器就会过载。这里为每个资源类别设置固定的槽位:
+
+- 槽位空闲时立即进入；占满后进入等待队列，饱和表现为排队而不是崩溃
+- 等待队列按用户分组轮转出队: 同一用户提交再多任务，也只占轮转中的一个位置
+- 排队位置变化时回调 on_queued(resource, position)，获得槽位时 position=0，
+  由调用方转成 SSE tool_progress 事件
+- 每个类别统计准入次数、当前占用/排队数和排队等待时间分布（/health/admission 导出）
+
+同时需要多个类别时使用 slots()，按固定顺序申请，避免交叉持有导致死锁。
+
+调用方通过 admission_context() 设置当前用户和排队回调（ContextVar，请求内有效），
+之后各处 slot() 无需再传入。
+"""
+
+import asyncio
+import time
+from collections import OrderedDict, deque
+from contextlib import AsyncExitStack, asynccontextmanager, contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from enum import Enum
+from typing import AsyncIterator, Awaitable, Callable, Deque, Dict, List, Optional, Tuple
+
+from config import settings
+from utils.logger import logger
+
+
+class ResourceClass(str, Enum):
+    """资源类别（定义顺序即多槽位申请顺序）"""
+    DOWNLOAD = "download"
+    FFMPEG = "ffmpeg"
+    ASR = "asr"
+    MEDIA_API = "media_api"
+
+
+# 排队回调: (资源类别, 排队位置)；位置从 1 开始，排队后获得槽位时以 0 再回调一次
+QueueCallback = Callable[[ResourceClass, int], Awaitable[None]]
+
+# 匿名请求共用一个排队位置
+ANONYMOUS_USER = "anonymous"
+
+# 排队等待时间分布的桶上限(毫秒)，最后一个桶为 +Inf
+WAIT_BUCKETS_MS: Tuple[float, ...] = (10, 100, 1000, 5000, 30000, 120000)
+
+_current_user: ContextVar[Optional[str]] = ContextVar("admission_user", default=None)
+_current_reporter: ContextVar[Optional[QueueCallback]] = ContextVar("admission_reporter", default=None)
+
+
+@contextmanager
+def admission_context(user_id: Optional[str], on_queued: Optional[QueueCallback] = None):
+    """设置当前请求的用户与排队回调，退出时恢复"""
+    user_token = _current_user.set(user_id)
+    reporter_token = _current_reporter.set(on_queued)
+    try:
+        yield
+    finally:
+        _current_reporter.reset(reporter_token)
+        _current_user.reset(user_token)
+
+
+@dataclass
+class ResourceMetrics:
+    """单个资源类别的准入统计"""
+    admitted: int = 0
+    queued: int = 0
+    cancelled: int = 0
+    wait_ms_total: float = 0.0
+    wait_ms_max: float = 0.0
+    wait_buckets: List[int] = field(default_factory=lambda: [0] * (len(WAIT_BUCKETS_MS) + 1))
+
+    def record_wait(self, wait_ms: float) -> None:
+        self.admitted += 1
+        self.wait_ms_total += wait_ms
+        self.wait_ms_max = max(self.wait_ms_max, wait_ms)
+        for index, bound in enumerate(WAIT_BUCKETS_MS):
+            if wait_ms <= bound:
+                self.wait_buckets[index] += 1
+                return
+        self.wait_buckets[-1] += 1
+
+
+@dataclass(eq=False)
+class _Waiter:
+    user: str
+    future: asyncio.Future
+    changed: asyncio.Event
+
+
+class ResourceLimiter:
+    """单个资源类别的槽位与按用户轮转的等待队列"""
+
+    def __init__(self, resource: ResourceClass, capacity: int):
+        self.resource = resource
+        self.capacity = capacity  # <= 0 表示不限制
+        self.active = 0
+        self.metrics = ResourceMetrics()
+        # 用户 -> 该用户的等待者；OrderedDict 的顺序即轮转顺序
+        self._queues: "OrderedDict[str, Deque[_Waiter]]" = OrderedDict()
+
+    @property
+    def waiting(self) -> int:
+        return sum(len(queue) for queue in self._queues.values())
+
+    def _has_free_slot(self) -> bool:
+        return self.capacity <= 0 or self.active < self.capacity
+
+    def position(self, waiter: _Waiter) -> int:
+        """
+        排队位置（1 表示下一个获得槽位）
+
+        轮转出队时，用户 u 的第 k 个等待者之前，
+        排在 u 前面的用户各出 k + 1 个，排在 u 后面的用户各出 k 个。
+        """
+        queue = self._queues.get(waiter.user)
+        if queue is None or waiter not in queue:
+            return 0
+        k = queue.index(waiter)
+        ahead = k
+        before = True
+        for user, other in self._queues.items():
+            if user == waiter.user:
+                before = False
+                continue
+            ahead += min(len(other), k + 1 if before else k)
+        return ahead + 1
+
+    async def acquire(self, user_id: Optional[str] = None, on_queued: Optional[QueueCallback] = None) -> None:
+        """获取一个槽位，占满时按用户公平排队"""
+        started = time.monotonic()
+        if self._has_free_slot() and not self._queues:
+            self.active += 1
+            self.metrics.record_wait(0.0)
+            return
+
+        loop = asyncio.get_running_loop()
+        waiter = _Waiter(user_id or ANONYMOUS_USER, loop.create_future(), asyncio.Event())
+        self._queues.setdefault(waiter.user, deque()).append(waiter)
+        self.metrics.queued += 1
+        self._notify_waiters()
+
+        try:
+            reported = None
+            while not waiter.future.done():
+                position = self.position(waiter)
+                if on_queued and position != reported:
+                    reported = position
+                    await self._report(on_queued, position)
+                    if waiter.future.done():
+                        break
+                waiter.changed.clear()
+                changed = asyncio.ensure_future(waiter.changed.wait())
+                try:
+                    await asyncio.wait({waiter.future, changed}, return_when=asyncio.FIRST_COMPLETED)
+                finally:
+                    changed.cancel()
+        except BaseException:
+            if waiter.future.done() and not waiter.future.cancelled():
+                # 槽位已分配但调用方被取消，归还槽位
+                self.release()
+            else:
+                waiter.future.cancel()
+                self._remove(waiter)
+                self._notify_waiters()
+            self.metrics.cancelled += 1
+            raise
+
+        if on_queued and reported:
+            await self._report(on_queued, 0)
+        wait_ms = (time.monotonic() - started) * 1000
+        self.metrics.record_wait(wait_ms)
+        logger.debug(f"Admission {self.resource.value}: user={waiter.user} waited {wait_ms:.0f}ms")
+
+    def release(self) -> None:
+        """归还槽位并按轮转顺序唤醒下一个等待者"""
+        self.active -= 1
+        self._dispatch()
+
+    async def _report(self, on_queued: QueueCallback, position: int) -> None:
+        try:
+            await on_queued(self.resource, position)
+        except Exception as e:
+            logger.warning(f"Admission queue callback failed: {e}")
+
+    def _remove(self, waiter: _Waiter) -> None:
+        queue = self._queues.get(waiter.user)
+        if queue is None:
+            return
+        try:
+            queue.remove(waiter)
+        except ValueError:
+            return
+        if not queue:
+            del self._queues[waiter.user]
+
+    def _dispatch(self) -> None:
+        """有空闲槽位时，从轮转队首的用户取一个等待者放行"""
+        dispatched = False
+        while self._has_free_slot() and self._queues:
+            user, queue = next(iter(self._queues.items()))
+            waiter = queue.popleft()
+            # 该用户移到轮转末尾（无剩余等待者时移除）
+            del self._queues[user]
+            if queue:
+                self._queues[user] = queue
+            if waiter.future.done():
+                continue
+            waiter.future.set_result(True)
+            self.active += 1
+            dispatched = True
+        if dispatched:
+            self._notify_waiters()
+
+    def _notify_waiters(self) -> None:
+        for queue in self._queues.values():
+            for waiter in queue:
+                waiter.changed.set()
+
+    def snapshot(self) -> dict:
+        m = self.metrics
+        buckets = {}
+        cumulative = 0
+        for bound, count in zip(list(WAIT_BUCKETS_MS) + ["+Inf"], m.wait_buckets):
+            cumulative += count
+            buckets[str(bound)] = cumulative
+        return {
+            "capacity": self.capacity,
+            "active": self.active,
+            "waiting": self.waiting,
+            "waiting_users": len(self._queues),
+            "admitted": m.admitted,
+            "queued": m.queued,
+            "cancelled": m.cancelled,
+            "avg_wait_ms": round(m.wait_ms_total / m.admitted, 1) if m.admitted else 0.0,
+            "max_wait_ms": round(m.wait_ms_max, 1),
+            "wait_ms_buckets": buckets,
+        }
+
+
+class AdmissionController:
+    """各资源类别的准入控制"""
+
+    def __init__(self, capacities: Optional[Dict[ResourceClass, int]] = None, enabled: Optional[bool] = None):
+        self.enabled = settings.ADMISSION_ENABLED if enabled is None else enabled
+        if capacities is None:
+            capacities = {
+                ResourceClass.DOWNLOAD: settings.ADMISSION_DOWNLOAD_SLOTS,
+                ResourceClass.FFMPEG: settings.ADMISSION_FFMPEG_SLOTS,
+                ResourceClass.ASR: settings.ADMISSION_ASR_SLOTS,
+                ResourceClass.MEDIA_API: settings.ADMISSION_MEDIA_API_SLOTS,
+            }
+        self._limiters = {
+            resource: ResourceLimiter(resource, capacities.get(resource, 0)) for resource in ResourceClass
+        }
+
+    def limiter(self, resource: ResourceClass) -> ResourceLimiter:
+        return self._limiters[resource]
+
+    @asynccontextmanager
+    async def slot(
+        self,
+        resource: ResourceClass,
+        user_id: Optional[str] = None,
+        on_queued: Optional[QueueCallback] = None,
+    ) -> AsyncIterator[None]:
+        """
+        占用一个资源槽位
+
+        user_id / on_queued 未传入时使用 admission_context() 设置的值。
+        """
+        if not self.enabled:
+            yield
+            return
+
+        limiter = self._limiters[resource]
+        await limiter.acquire(
+            user_id if user_id is not None else _current_user.get(),
+            on_queued if on_queued is not None else _current_reporter.get(),
+        )
+        try:
+            yield
+        finally:
+            limiter.release()
+
+    @asynccontextmanager
+    async def slots(self, *resources: ResourceClass, user_id: Optional[str] = None) -> AsyncIterator[None]:
+        """同时占用多个类别的槽位（按 ResourceClass 定义顺序申请）"""
+        order = list(ResourceClass)
+        async with AsyncExitStack() as stack:
+            for resource in sorted(set(resources), key=order.index):
+                await stack.enter_async_context(self.slot(resource, user_id=user_id))
+            yield
+
+    def snapshot(self) -> Dict[str, dict]:
+        """各资源类别的占用、排队与等待时间统计"""
+        return {resource.value: limiter.snapshot() for resource, limiter in self._limiters.items()}
+
+
+# =============================================================================
+# Global Instance (Lazy Initialization)
+# =============================================================================
+
+_admission_controller: Optional[AdmissionController] = None
+
+
+def get_admission_controller() -> AdmissionController:
+    """获取准入控制器实例 (单例)"""
+    global _admission_controller
+    if _admission_controller is None:
+        _admission_controller = AdmissionController()
+    return _admission_controller
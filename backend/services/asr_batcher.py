@@ -0,0 +1,154 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2026 relakkes@gmail.com
+#
+# This file is part of MediaCrawlerPro-ContentRemixAgent project.
+# Repository: https://github.com/MediaCrawlerPro/MediaCrawlerPro-ContentRemixAgent/blob/main/backend/services/asr_batcher.py
+# GitHub: https://github.com/NanmiCoder
+# Licensed under NON-COMMERCIAL LEARNING LICENSE 1.1
+#
+# 声明：本代码仅供学习和研究目的使用。使用者应遵守以下原则：
+# 1. 不得用于任何商业用途。
+# 2. 使用时应遵守目标平台的使用条款和robots.txt规则。
+# 3. 不得进行大规模爬取或对平台造成运营干扰。
+# 4. 应合理控制请求频率，避免给目标平台带来不必要的负担。
+# 5. 不得用于任何非法或不当的用途。
+#
+# 详细许可条款请参阅项目根目录下的LICENSE文件。
+# 使用本代码即表示您同意遵守上述原则和LICENSE中的所有条款。
+
+"""
+ASR 跨任务微批调度器
+
+并发用户各自调用 AutoModel.generate 时，每次调用都以 batch=1 跑完整段音频，
+CPU 大量时间花在逐条前向的固定开销上。调度器把不同任务的 VAD 语音块放进同一个队列:
+
+- 消费线程取到第一个语音块后，最多再等待 window_ms，凑满 max_batch 个即提前发车
+- 一批语音块交给 run_batch 一次推理，结果按提交顺序回填到各自的 Future
+- 每个消费线程独占一个模型实例（模型非线程安全），多个实例时批次并行执行
+
+调度器只负责攒批与路由，推理函数由调用方（FunASRBackend）提供。
+"""
+
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from dataclasses import dataclass
+from typing import Any, Callable, List, Sequence
+
+from utils.logger import logger
+
+
+# 推理函数: (模型实例, 语音块列表) -> 与输入一一对应的结果列表
+RunBatch = Callable[[Any, List[Any]], List[Any]]
+
+
+@dataclass
+class BatchMetrics:
+    """微批统计"""
+    batches: int = 0
+    chunks: int = 0
+    max_batch_seen: int = 0
+    failed_batches: int = 0
+
+    def snapshot(self) -> dict:
+        return {
+            "batches": self.batches,
+            "chunks": self.chunks,
+            "avg_batch_size": round(self.chunks / self.batches, 2) if self.batches else 0.0,
+            "max_batch_size": self.max_batch_seen,
+            "failed_batches": self.failed_batches,
+        }
+
+
+class ASRBatchScheduler:
+    """跨任务微批调度器"""
+
+    def __init__(
+        self,
+        models: Sequence[Any],
+        run_batch: RunBatch,
+        max_batch: int,
+        window_ms: int,
+    ):
+        if not models:
+            raise ValueError("ASRBatchScheduler 至少需要一个模型实例")
+        self.run_batch = run_batch
+        self.max_batch = max(1, max_batch)
+        self.window_s = max(0, window_ms) / 1000.0
+        self.metrics = BatchMetrics()
+        self._queue: "queue.Queue" = queue.Queue()
+        self._metrics_lock = threading.Lock()
+        self._closed = False
+        self._threads = [
+            threading.Thread(target=self._consume, args=(model,), name=f"asr-batch-{i}", daemon=True)
+            for i, model in enumerate(models)
+        ]
+        for thread in self._threads:
+            thread.start()
+
+    def submit(self, chunk: Any) -> Future:
+        """提交一个语音块，返回结果 Future"""
+        if self._closed:
+            raise RuntimeError("ASRBatchScheduler 已关闭")
+        future: Future = Future()
+        self._queue.put((chunk, future))
+        return future
+
+    def run_all(self, chunks: Sequence[Any]) -> List[Any]:
+        """提交一个任务的全部语音块并等待结果（按输入顺序返回）"""
+        futures = [self.submit(chunk) for chunk in chunks]
+        return [future.result() for future in futures]
+
+    def close(self) -> None:
+        """停止消费线程（已入队的语音块会先处理完）"""
+        if self._closed:
+            return
+        self._closed = True
+        for _ in self._threads:
+            self._queue.put(None)
+        for thread in self._threads:
+            thread.join()
+
+    def _collect(self, first) -> list:
+        """以 first 为首攒一批，直到凑满或等待窗口结束"""
+        batch = [first]
+        deadline = time.monotonic() + self.window_s
+        while len(batch) < self.max_batch:
+            remaining = deadline - time.monotonic()
+            try:
+                item = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is None:
+                # 关闭信号放回队列，当前批次处理完后再退出
+                self._queue.put(None)
+                break
+            batch.append(item)
+        return batch
+
+    def _consume(self, model: Any) -> None:
+        while True:
+            first = self._queue.get()
+            if first is None:
+                return
+            batch = self._collect(first)
+            chunks = [chunk for chunk, _ in batch]
+            try:
+                results = self.run_batch(model, chunks)
+                if len(results) != len(chunks):
+                    raise RuntimeError(f"批量推理结果数量不匹配: {len(results)} != {len(chunks)}")
+            except Exception as e:
+                logger.error(f"ASR batch of {len(chunks)} failed: {e}")
+                with self._metrics_lock:
+                    self.metrics.failed_batches += 1
+                for _, future in batch:
+                    future.set_exception(e)
+                continue
+
+            with self._metrics_lock:
+                self.metrics.batches += 1
+                self.metrics.chunks += len(chunks)
+                self.metrics.max_batch_seen = max(self.metrics.max_batch_seen, len(chunks))
+            for (_, future), result in zip(batch, results):
+                future.set_result(result)
@@ -23,26 +23,42 @@ ASR 服务 - 语音转文字
 实现带句子级时间戳的语音转文字服务。
 
 架构设计:
-- AudioPreprocessor: 音频预处理（转换为 16kHz mono wav）
-- FunASRBackend: FunASR 转录后端（懒加载单例）
-- SegmentBuilder: 句子切分器（标点/长度/时长/间隙）
-- ASRService: 统一入口（单例模式）
+- AudioPreprocessor: 音频预处理（转换为 16kHz mono wav；已符合要求的音频直接读取 WAV 头判断，不启动子进程）
+- FunASRBackend: FunASR 转录后端（懒加载单例，长音频按 VAD 窗口并行转录）
+- ASRBatchScheduler (asr_batcher.py): 可选的跨任务微批调度，并发任务的 VAD 语音块合批推理
+- TokenColumns: 列式词级时间戳（int32 起止数组 + 单个文本缓冲区）
+- SegmentBuilder: 句子切分器（标点/长度/时长/间隙，切分判断向量化计算）
+- ASRService: 统一入口（单例模式），iter_transcribe / atranscribe(on_segments=...) 按窗口渐进输出分段
+- ASRWorkerPool (asr_worker_pool.py): 可选的模型工作进程池，atranscribe 提交到其中
 
 参考文章： https://wangjunjian.com/funasr/asr/2025/12/06/FunASR.html
 """
 
+import asyncio
 import os
+import queue
 import re
 import subprocess
+import threading
+import time
+import wave
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
 from pathlib import Path
-from typing import List, Optional, Tuple
+from typing import Awaitable, Callable, Generator, Iterator, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
 
 from config import settings
 from schemas import Segment, TranscriptResult
+from services.audio_extractor import AudioExtractError, AudioInfo, read_wav_info
 from utils.logger import logger
 
 
+# 渐进式转录回调: 每解码完一个窗口，收到该窗口的句子级分段
+SegmentsCallback = Callable[[List[Segment]], Awaitable[None]]
+
+
 class ASRError(Exception):
     """ASR 统一错误类型"""
 
@@ -63,15 +79,268 @@ class Token:
     end_ms: int  # 毫秒
 
 
+class TokenColumns:
+    """
+    列式存储的词级时间戳
+
+    FunASR 每个字一个时间戳，长视频会产生数十万个 Token 对象。
+    列式存储将起止时间放在两个 int32 数组中，文本拼接为一个字符串，
+    text[offsets[i]:offsets[i + 1]] 为第 i 个 token 的文本。
+
+    支持 len() / 下标 / 迭代取出 Token，兼容原有 List[Token] 的读取方式。
+    """
+
+    __slots__ = ("text", "offsets", "starts", "ends")
+
+    def __init__(self, text: str, offsets: np.ndarray, starts: np.ndarray, ends: np.ndarray):
+        self.text = text
+        self.offsets = offsets  # int64, 长度 n + 1
+        self.starts = starts    # int32 毫秒
+        self.ends = ends        # int32 毫秒
+
+    @classmethod
+    def from_tokens(cls, tokens: Sequence[Token]) -> "TokenColumns":
+        """由 Token 列表构建"""
+        if isinstance(tokens, TokenColumns):
+            return tokens
+        count = len(tokens)
+        offsets = np.zeros(count + 1, dtype=np.int64)
+        np.cumsum(np.fromiter((len(t.text) for t in tokens), dtype=np.int64, count=count), out=offsets[1:])
+        return cls(
+            "".join(t.text for t in tokens),
+            offsets,
+            np.fromiter((t.start_ms for t in tokens), dtype=np.int32, count=count),
+            np.fromiter((t.end_ms for t in tokens), dtype=np.int32, count=count),
+        )
+
+    @classmethod
+    def from_chars(cls, text: str, timestamps: list) -> "TokenColumns":
+        """
+        由 FunASR 字级结果构建: text 第 i 个字符对应 timestamps[i]
+
+        缺少起止时间的条目跳过，多出的时间戳或字符忽略。
+        """
+        count = min(len(text), len(timestamps))
+        try:
+            pairs = np.asarray(timestamps[:count], dtype=np.float64).reshape(count, -1)
+        except (TypeError, ValueError):
+            pairs = None
+
+        if pairs is not None and pairs.shape[1] >= 2:
+            # 常见情况: 每个字都有 [start, end]，文本缓冲区即 text 前 count 个字符
+            return cls(
+                text[:count],
+                np.arange(count + 1, dtype=np.int64),
+                pairs[:, 0].astype(np.int32),
+                pairs[:, 1].astype(np.int32),
+            )
+
+        keep = [i for i in range(count) if len(timestamps[i]) >= 2]
+        return cls(
+            "".join(text[i] for i in keep),
+            np.arange(len(keep) + 1, dtype=np.int64),
+            np.array([int(timestamps[i][0]) for i in keep], dtype=np.int32),
+            np.array([int(timestamps[i][1]) for i in keep], dtype=np.int32),
+        )
+
+    @classmethod
+    def concat(cls, parts: Sequence[Tuple[int, "TokenColumns"]]) -> "TokenColumns":
+        """按顺序拼接多段，时间戳加上各段的毫秒偏移"""
+        if not parts:
+            return cls.from_tokens([])
+        offsets = [np.zeros(1, dtype=np.int64)]
+        base = 0
+        for _, cols in parts:
+            offsets.append(cols.offsets[1:] + base)
+            base += int(cols.offsets[-1])
+        return cls(
+            "".join(cols.text for _, cols in parts),
+            np.concatenate(offsets),
+            np.concatenate([cols.starts + np.int32(offset) for offset, cols in parts]).astype(np.int32),
+            np.concatenate([cols.ends + np.int32(offset) for offset, cols in parts]).astype(np.int32),
+        )
+
+    def token_text(self, index: int) -> str:
+        return self.text[self.offsets[index]:self.offsets[index + 1]]
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    def __getitem__(self, index: int) -> Token:
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("token index out of range")
+        return Token(text=self.token_text(index), start_ms=int(self.starts[index]), end_ms=int(self.ends[index]))
+
+    def __iter__(self) -> Iterator[Token]:
+        for index in range(len(self)):
+            yield self[index]
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, (TokenColumns, list, tuple)):
+            return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return f"TokenColumns({len(self)} tokens)"
+
+
 @dataclass
 class RawTranscriptResult:
     """FunASR 原始转录结果"""
 
     text: str
-    tokens: List[Token] = field(default_factory=list)
+    tokens: Union[List[Token], TokenColumns] = field(default_factory=list)
     vad_segments: List[Tuple[int, int]] = field(default_factory=list)  # [(start_ms, end_ms), ...]
 
 
+# =============================================================================
+# VAD 窗口切分与拼接
+# =============================================================================
+
+
+def plan_windows(
+    speech_segments: List[Tuple[int, int]],
+    total_ms: int,
+    max_window_ms: int,
+) -> List[Tuple[int, int]]:
+    """
+    将 VAD 语音段合并为不超过 max_window_ms 的窗口
+
+    窗口边界取相邻语音段之间静音的中点，窗口首尾相接覆盖整段音频，
+    因此不会切断任何一句话，也不会丢失音频。
+    单个语音段本身超过 max_window_ms 时独占一个窗口。
+
+    Args:
+        speech_segments: VAD 语音段 [(start_ms, end_ms), ...]，按时间排序
+        total_ms: 音频总时长（毫秒）
+        max_window_ms: 单个窗口最大时长（毫秒）
+
+    Returns:
+        [(start_ms, end_ms), ...]
+    """
+    if not speech_segments or total_ms <= 0:
+        return [(0, max(total_ms, 0))]
+
+    windows = []
+    window_start = 0
+    for i in range(len(speech_segments) - 1):
+        cut = (speech_segments[i][1] + speech_segments[i + 1][0]) // 2
+        # 把下一个语音段加进来会超长，则在当前静音处切分
+        if speech_segments[i + 1][1] - window_start > max_window_ms:
+            windows.append((window_start, cut))
+            window_start = cut
+    windows.append((window_start, total_ms))
+    return windows
+
+
+def stitch_window_results(results: List[Tuple[int, RawTranscriptResult]]) -> RawTranscriptResult:
+    """
+    拼接各窗口的转录结果，时间戳加上窗口起始偏移
+
+    Args:
+        results: [(窗口起始毫秒, 窗口转录结果), ...]，按窗口顺序
+
+    Returns:
+        整段音频的 RawTranscriptResult
+    """
+    text_parts = []
+    columns = []
+    vad_segments: List[Tuple[int, int]] = []
+
+    for offset_ms, result in results:
+        text_parts.append(result.text)
+        columns.append((offset_ms, TokenColumns.from_tokens(result.tokens)))
+        vad_segments.extend((start + offset_ms, end + offset_ms) for start, end in result.vad_segments)
+
+    return RawTranscriptResult(
+        text="".join(text_parts),
+        tokens=TokenColumns.concat(columns),
+        vad_segments=vad_segments,
+    )
+
+
+def _pcm_to_float(frames: bytes, channels: int):
+    """16-bit PCM 转 float32 单声道数组（[-1, 1]）"""
+    samples = np.frombuffer(frames, dtype=np.int16)
+    if channels > 1:
+        samples = samples.reshape(-1, channels).mean(axis=1)
+    return samples.astype(np.float32) / 32768.0
+
+
+def read_wav_pcm(wav_path: str):
+    """
+    读取 16-bit PCM WAV 为 float32 数组（[-1, 1]）
+
+    Returns:
+        (samples: np.ndarray, sample_rate: int)
+    """
+    with wave.open(wav_path, "rb") as wav:
+        if wav.getsampwidth() != 2:
+            raise ASRError(f"不支持的 WAV 位深: {wav.getsampwidth() * 8} bit")
+        sample_rate = wav.getframerate()
+        channels = wav.getnchannels()
+        frames = wav.readframes(wav.getnframes())
+
+    return _pcm_to_float(frames, channels), sample_rate
+
+
+def load_pcm(audio: Union[str, AudioInfo]):
+    """
+    取得音频的 float32 采样
+
+    AudioInfo 携带内存 PCM（提取阶段的解码结果）时直接使用，否则读取 WAV 文件。
+
+    Returns:
+        (samples: np.ndarray, sample_rate: int)
+    """
+    if isinstance(audio, AudioInfo):
+        if audio.pcm is None:
+            return read_wav_pcm(audio.path)
+        if audio.sample_width != 2:
+            raise ASRError(f"不支持的 WAV 位深: {audio.sample_width * 8} bit")
+        return _pcm_to_float(audio.pcm, audio.channels), audio.sample_rate
+    return read_wav_pcm(audio)
+
+
+async def relay_segments(
+    result: Awaitable,
+    updates: "asyncio.Queue",
+    on_segments: SegmentsCallback,
+):
+    """
+    等待 result 完成，期间把 updates 队列中的分段按顺序交给 on_segments
+
+    回调异常只记录日志，不影响转录本身。
+
+    Returns:
+        result 的结果
+    """
+    result = asyncio.ensure_future(result)
+
+    async def notify(segments: List[Segment]) -> None:
+        try:
+            await on_segments(segments)
+        except Exception as e:
+            logger.warning(f"渐进转录回调失败: {e}")
+
+    while True:
+        getter = asyncio.ensure_future(updates.get())
+        try:
+            done, _ = await asyncio.wait({result, getter}, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            if not getter.done():
+                getter.cancel()
+        if getter not in done:
+            break
+        await notify(getter.result())
+
+    while not updates.empty():
+        await notify(updates.get_nowait())
+    return await result
+
+
 # =============================================================================
 # 音频预处理器
 # =============================================================================
@@ -149,32 +418,17 @@ class AudioPreprocessor:
         except FileNotFoundError:
             raise ASRError("ffmpeg 未安装，请安装 ffmpeg")
 
+    @staticmethod
+    def is_asr_ready(info: AudioInfo) -> bool:
+        """是否已是 16kHz mono 16-bit PCM，可直接送入 ASR"""
+        return info.sample_rate == 16000 and info.channels == 1 and info.sample_width == 2
+
     def _check_wav_format(self, wav_path: str) -> bool:
-        """检查 wav 文件是否符合 16kHz mono 格式"""
-        cmd = [
-            "ffprobe",
-            "-v",
-            "error",
-            "-select_streams",
-            "a:0",
-            "-show_entries",
-            "stream=sample_rate,channels",
-            "-of",
-            "csv=p=0",
-            wav_path,
-        ]
+        """读取 WAV 头检查是否符合 16kHz mono 格式（无需 ffprobe）"""
         try:
-            result = subprocess.run(cmd, capture_output=True, text=True, timeout=10)
-            if result.returncode == 0:
-                output = result.stdout.strip()
-                parts = output.split(",")
-                if len(parts) == 2:
-                    sample_rate = int(parts[0])
-                    channels = int(parts[1])
-                    return sample_rate == 16000 and channels == 1
-        except Exception:
-            pass
-        return False
+            return self.is_asr_ready(read_wav_info(wav_path))
+        except AudioExtractError:
+            return False
 
     def cleanup(self, wav_path: str) -> None:
         """清理临时文件"""
@@ -198,11 +452,23 @@ class FunASRBackend:
 
     使用 paraformer-zh + fsmn-vad + ct-punc 实现高质量中文 ASR
     模型懒加载，首次调用时初始化
+
+    ASR_PARALLEL_WORKERS > 1 时，长音频先用 VAD 模型找出静音边界并切成窗口，
+    窗口分发给多个模型实例并行识别，再按窗口偏移拼接时间戳。
+
+    ASR_BATCH_MAX_SIZE > 1 时改为跨任务微批: 每个任务先跑 VAD，语音块提交到
+    ASRBatchScheduler，与其他并发任务的语音块合成一批推理（ASR_PARALLEL_WORKERS 为批处理模型实例数）。
     """
 
     _instance: Optional["FunASRBackend"] = None
     _model = None
     _available: Optional[bool] = None
+    _vad_model = None
+    _model_pool: Optional["queue.Queue"] = None
+    _executor: Optional[ThreadPoolExecutor] = None
+    _batch_scheduler = None
+    _vad_lock = threading.Lock()
+    _load_lock = threading.Lock()
 
     def __new__(cls):
         if cls._instance is None:
@@ -211,35 +477,92 @@ class FunASRBackend:
 
     def _load_model(self) -> None:
         """懒加载模型"""
-        if self._model is not None:
+        if self._model is not None or self._batch_scheduler is not None:
             return
 
-        try:
-            from funasr import AutoModel
+        # 启动时在后台预加载，期间到达的转录请求会并发触发加载，加锁避免重复加载模型
+        with self._load_lock:
+            if self._model is not None or self._batch_scheduler is not None:
+                return
+            try:
+                from funasr import AutoModel
 
-            logger.info(
-                f"正在加载 FunASR 模型: {settings.ASR_MODEL} "
-                f"(VAD: {settings.ASR_VAD_MODEL}, PUNC: {settings.ASR_PUNC_MODEL})"
-            )
+                logger.info(
+                    f"正在加载 FunASR 模型: {settings.ASR_MODEL} "
+                    f"(VAD: {settings.ASR_VAD_MODEL}, PUNC: {settings.ASR_PUNC_MODEL})"
+                )
 
-            self._model = AutoModel(
-                model=settings.ASR_MODEL,
-                vad_model=settings.ASR_VAD_MODEL,
-                punc_model=settings.ASR_PUNC_MODEL,
-                device=settings.ASR_DEVICE,
-            )
+                workers = max(1, settings.ASR_PARALLEL_WORKERS)
+                if settings.ASR_BATCH_MAX_SIZE > 1:
+                    self._load_batch_models(AutoModel, workers)
+                    self._available = True
+                    return
+
+                model = self._create_model(AutoModel)
+
+                # 独立 VAD 模型用于切窗（并行转录与渐进式输出），并行模式额外加载 N-1 个识别模型实例
+                self._vad_model = AutoModel(model=settings.ASR_VAD_MODEL, device=settings.ASR_DEVICE)
+                self._model_pool = queue.Queue()
+                self._model_pool.put(model)
+                for _ in range(workers - 1):
+                    self._model_pool.put(self._create_model(AutoModel))
+                self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="funasr")
+                # 主模型最后赋值，作为加载完成的标志（未持锁的快速路径据此判断）
+                self._model = model
+                if workers > 1:
+                    logger.info(f"FunASR 并行转录已启用: {workers} 个模型实例")
+
+                logger.info("FunASR 模型加载完成")
+                self._available = True
+
+            except ImportError:
+                logger.error("FunASR 未安装，请运行: pip install funasr")
+                self._available = False
+                raise ASRError("FunASR 未安装")
+            except Exception as e:
+                logger.error(f"FunASR 模型加载失败: {e}")
+                self._available = False
+                raise ASRError(f"模型加载失败: {e}")
+
+    @staticmethod
+    def _create_model(auto_model_cls):
+        """创建一个完整的识别模型实例（ASR + VAD + 标点）"""
+        workers = max(1, settings.ASR_PARALLEL_WORKERS)
+        kwargs = {}
+        if workers > 1:
+            # 多实例并行时平分 CPU 线程，避免互相争抢
+            kwargs["ncpu"] = max(1, (os.cpu_count() or 1) // workers)
+        return auto_model_cls(
+            model=settings.ASR_MODEL,
+            vad_model=settings.ASR_VAD_MODEL,
+            punc_model=settings.ASR_PUNC_MODEL,
+            device=settings.ASR_DEVICE,
+            **kwargs,
+        )
 
-            logger.info("FunASR 模型加载完成")
-            self._available = True
+    def _load_batch_models(self, auto_model_cls, workers: int) -> None:
+        """加载微批模式的模型: 独立 VAD + N 组（识别, 标点）模型，每组由一个批处理线程独占"""
+        from services.asr_batcher import ASRBatchScheduler
 
-        except ImportError:
-            logger.error("FunASR 未安装，请运行: pip install funasr")
-            self._available = False
-            raise ASRError("FunASR 未安装")
-        except Exception as e:
-            logger.error(f"FunASR 模型加载失败: {e}")
-            self._available = False
-            raise ASRError(f"模型加载失败: {e}")
+        self._vad_model = auto_model_cls(model=settings.ASR_VAD_MODEL, device=settings.ASR_DEVICE)
+        kwargs = {"ncpu": max(1, (os.cpu_count() or 1) // workers)} if workers > 1 else {}
+        models = [
+            (
+                auto_model_cls(model=settings.ASR_MODEL, device=settings.ASR_DEVICE, **kwargs),
+                auto_model_cls(model=settings.ASR_PUNC_MODEL, device=settings.ASR_DEVICE),
+            )
+            for _ in range(workers)
+        ]
+        self._batch_scheduler = ASRBatchScheduler(
+            models,
+            self._run_batch,
+            max_batch=settings.ASR_BATCH_MAX_SIZE,
+            window_ms=settings.ASR_BATCH_WINDOW_MS,
+        )
+        logger.info(
+            f"FunASR 微批已启用: {workers} 个模型实例, "
+            f"批大小 {settings.ASR_BATCH_MAX_SIZE}, 攒批窗口 {settings.ASR_BATCH_WINDOW_MS}ms"
+        )
 
     def is_available(self) -> bool:
         """检查 FunASR 是否可用"""
@@ -255,12 +578,12 @@ class FunASRBackend:
 
         return self._available
 
-    def transcribe(self, wav_path: str) -> RawTranscriptResult:
+    def transcribe(self, audio: Union[str, AudioInfo]) -> RawTranscriptResult:
         """
-        转录音频文件
+        转录音频
 
         Args:
-            wav_path: 16kHz mono WAV 文件路径
+            audio: 16kHz mono WAV 文件路径，或携带内存 PCM 的 AudioInfo
 
         Returns:
             RawTranscriptResult: 包含文本和词级时间戳
@@ -271,45 +594,404 @@ class FunASRBackend:
         self._load_model()
 
         try:
-            # FunASR generate 调用
-            # timestamp=True 启用词级时间戳
-            result = self._model.generate(
-                input=wav_path,
-                batch_size_s=300,  # 批处理秒数
-                hotword="",  # 热词（可选）
-            )
+            # 采样直接交给模型，FunASR 不再自行读取/解码文件
+            samples, sample_rate = load_pcm(audio)
 
-            if not result:
-                raise ASRError("转录结果为空")
+            if self._batch_scheduler is not None:
+                return self._transcribe_batched(samples, sample_rate)
 
-            # 解析结果
-            # FunASR 返回格式: [{"text": "...", "timestamp": [[start_ms, end_ms], ...]}]
-            # timestamp 是字符级时间戳，与 text 中的字符一一对应
-            item = result[0] if isinstance(result, list) else result
+            if self._use_windows(samples, sample_rate):
+                return self._transcribe_windowed(samples, sample_rate)
 
-            text = item.get("text", "")
-            timestamp_data = item.get("timestamp", [])
+            return self._transcribe_whole(samples, sample_rate)
+
+        except ASRError:
+            raise
+        except Exception as e:
+            logger.error(f"FunASR 转录失败: {e}")
+            raise ASRError(f"语音识别失败: {e}")
+
+    @staticmethod
+    def _use_windows(samples, sample_rate: int) -> bool:
+        """是否按窗口并行转录（多实例且音频不短于 ASR_PARALLEL_MIN_SECONDS）"""
+        if settings.ASR_PARALLEL_WORKERS <= 1:
+            return False
+        return len(samples) / sample_rate >= settings.ASR_PARALLEL_MIN_SECONDS
+
+    def _transcribe_whole(self, samples, sample_rate: int) -> RawTranscriptResult:
+        """整段音频一次 generate 转录（单实例或短音频）"""
+        # FunASR generate 调用
+        # timestamp=True 启用词级时间戳
+        result = self._model.generate(
+            input=samples,
+            fs=sample_rate,
+            batch_size_s=300,  # 批处理秒数
+            hotword="",  # 热词（可选）
+        )
+
+        if not result:
+            raise ASRError("转录结果为空")
 
-            # 解析字符级时间戳
-            # timestamp 格式: [[start_ms, end_ms], [start_ms, end_ms], ...]
-            tokens = []
-            for i, ts in enumerate(timestamp_data):
-                if len(ts) >= 2 and i < len(text):
-                    start_ms = int(ts[0])
-                    end_ms = int(ts[1])
-                    char = text[i]
-                    tokens.append(Token(text=char, start_ms=start_ms, end_ms=end_ms))
+        raw = self._parse_item(result[0] if isinstance(result, list) else result)
+        logger.debug(f"转录完成: {len(raw.text)} 字符, {len(raw.tokens)} 时间戳")
+        return raw
 
-            logger.debug(f"转录完成: {len(text)} 字符, {len(tokens)} 时间戳")
+    @staticmethod
+    def _parse_item(item: dict) -> RawTranscriptResult:
+        """
+        解析 FunASR 单条结果
+
+        FunASR 返回格式: {"text": "...", "timestamp": [[start_ms, end_ms], ...]}
+        timestamp 是字符级时间戳，与 text 中的字符一一对应
+        """
+        text = item.get("text", "")
+        timestamp_data = item.get("timestamp", [])
+        return RawTranscriptResult(text=text, tokens=TokenColumns.from_chars(text, timestamp_data))
+
+    def iter_transcribe(self, audio: Union[str, AudioInfo]) -> Iterator[Tuple[int, RawTranscriptResult]]:
+        """
+        按窗口渐进转录
 
-            return RawTranscriptResult(text=text, tokens=tokens)
+        音频按 VAD 静音切成窗口（微批模式下为语音块），全部提交后按时间顺序产出，
+        前面的窗口解码完即可交给调用方，无需等待整段音频。
+        切窗方式与 transcribe() 一致: 单实例或短音频不切窗，整段一次 generate 后产出一个窗口，
+        拼接结果与 transcribe() 相同。
 
+        Yields:
+            (窗口起始毫秒, 窗口转录结果)，结果中的时间戳相对窗口起点
+        """
+        self._load_model()
+
+        try:
+            samples, sample_rate = load_pcm(audio)
+            total_ms = int(len(samples) * 1000 / sample_rate)
+
+            if self._batch_scheduler is not None:
+                windows = self._detect_speech(samples, sample_rate)
+                submit = self._batch_scheduler.submit
+            elif self._use_windows(samples, sample_rate):
+                speech = self._detect_speech(samples, sample_rate)
+                windows = plan_windows(speech, total_ms, settings.ASR_WINDOW_SECONDS * 1000)
+                submit = lambda chunk: self._executor.submit(self._transcribe_window, *chunk)  # noqa: E731
+            else:
+                windows = [(0, total_ms)]
+                submit = lambda chunk: self._executor.submit(self._transcribe_whole, *chunk)  # noqa: E731
+
+            if len(windows) == 1 and windows[0] == (0, total_ms):
+                # 整段一个窗口时不切片，避免毫秒取整丢掉尾部采样
+                futures = [submit((samples, sample_rate))]
+            else:
+                futures = [
+                    submit((samples[start * sample_rate // 1000:end * sample_rate // 1000], sample_rate))
+                    for start, end in windows
+                ]
         except ASRError:
             raise
         except Exception as e:
             logger.error(f"FunASR 转录失败: {e}")
             raise ASRError(f"语音识别失败: {e}")
 
+        try:
+            for (start, end), future in zip(windows, futures):
+                try:
+                    result = future.result()
+                except ASRError:
+                    raise
+                except Exception as e:
+                    logger.error(f"FunASR 转录失败: {e}")
+                    raise ASRError(f"语音识别失败: {e}")
+                if self._batch_scheduler is not None:
+                    # 与 _transcribe_batched 一致，语音块范围随结果拼接
+                    result.vad_segments = [(0, end - start)]
+                yield start, result
+        finally:
+            # 调用方提前停止迭代时，取消尚未开始的窗口
+            for future in futures:
+                future.cancel()
+
+    def _detect_speech(self, samples, sample_rate: int) -> List[Tuple[int, int]]:
+        """运行 VAD，返回语音段 [(start_ms, end_ms), ...]"""
+        # VAD 模型在并发任务间共享，推理时持锁
+        with self._vad_lock:
+            result = self._vad_model.generate(input=samples, fs=sample_rate)
+        if not result:
+            return []
+        item = result[0] if isinstance(result, list) else result
+        return [(int(seg[0]), int(seg[1])) for seg in item.get("value", []) if len(seg) >= 2]
+
+    def _transcribe_window(self, samples, sample_rate: int) -> RawTranscriptResult:
+        """从模型池借一个实例转录单个窗口"""
+        model = self._model_pool.get()
+        try:
+            result = model.generate(input=samples, fs=sample_rate, batch_size_s=300, hotword="")
+        finally:
+            self._model_pool.put(model)
+        if not result:
+            return RawTranscriptResult(text="")
+        return self._parse_item(result[0] if isinstance(result, list) else result)
+
+    def _transcribe_windowed(self, samples, sample_rate: int) -> RawTranscriptResult:
+        """按 VAD 静音切窗，多个模型实例并行转录后拼接"""
+        total_ms = int(len(samples) * 1000 / sample_rate)
+        speech = self._detect_speech(samples, sample_rate)
+        windows = plan_windows(speech, total_ms, settings.ASR_WINDOW_SECONDS * 1000)
+        logger.info(f"并行转录: {total_ms / 1000:.1f}s 音频切分为 {len(windows)} 个窗口")
+
+        def run(window: Tuple[int, int]) -> RawTranscriptResult:
+            start = window[0] * sample_rate // 1000
+            end = window[1] * sample_rate // 1000
+            return self._transcribe_window(samples[start:end], sample_rate)
+
+        futures = [self._executor.submit(run, window) for window in windows]
+        results = [(window[0], future.result()) for window, future in zip(windows, futures)]
+        stitched = stitch_window_results(results)
+        logger.debug(f"转录完成: {len(stitched.text)} 字符, {len(stitched.tokens)} 时间戳")
+        return stitched
+
+
+    @classmethod
+    def _run_batch(cls, models, chunks: list) -> List[RawTranscriptResult]:
+        """
+        批量识别语音块（在 ASRBatchScheduler 的消费线程中调用）
+
+        Args:
+            models: (识别模型, 标点模型)
+            chunks: [(samples, sample_rate), ...]，可能来自不同任务
+        """
+        asr_model, punc_model = models
+        sample_rate = chunks[0][1]
+        results = asr_model.generate(
+            input=[samples for samples, _ in chunks],
+            fs=sample_rate,
+            batch_size=len(chunks),
+        )
+        if len(results) != len(chunks):
+            raise ASRError(f"批量识别结果数量不匹配: {len(results)} != {len(chunks)}")
+
+        # 标点逐条处理而非合批: ct-punc (CT-Transformer) 的 inference 断言单条输入
+        # (len(data_in) == 1)，AutoModel 对列表输入也只是逐条循环，合批没有收益；
+        # 且标点只处理文本，耗时远小于 paraformer 的声学解码
+        parsed = []
+        for item in results:
+            text = item.get("text", "")
+            if text:
+                punc_result = punc_model.generate(input=text)
+                if punc_result:
+                    text = punc_result[0].get("text", text)
+            # 与整段模式一致: text 为加标点后的文本，timestamp 为识别模型的字级时间戳
+            parsed.append(cls._parse_item({"text": text, "timestamp": item.get("timestamp", [])}))
+        return parsed
+
+    def _transcribe_batched(self, samples, sample_rate: int) -> RawTranscriptResult:
+        """VAD 切出语音块，交给微批调度器与其他任务合批识别后拼接"""
+        speech = self._detect_speech(samples, sample_rate)
+        if not speech:
+            return RawTranscriptResult(text="")
+
+        chunks = [
+            (samples[start * sample_rate // 1000:end * sample_rate // 1000], sample_rate)
+            for start, end in speech
+        ]
+        results = self._batch_scheduler.run_all(chunks)
+        stitched = stitch_window_results([(start, result) for (start, _), result in zip(speech, results)])
+        stitched.vad_segments = list(speech)
+        logger.debug(f"微批转录完成: {len(speech)} 个语音块, {len(stitched.text)} 字符")
+        return stitched
+
+
+# =============================================================================
+# ONNX Runtime 后端 (int8 量化, CPU)
+# =============================================================================
+
+
+class OnnxASRBackend:
+    """
+    ONNX Runtime 转录后端
+
+    使用导出的 paraformer + fsmn-vad + ct-punc ONNX 模型（funasr_onnx），默认加载 int8 量化版本，
+    面向无 GPU 的 CPU 节点。流程与 FunASR 微批模式一致:
+    VAD 切出语音块 -> 逐块识别 -> 标点 -> 按语音块偏移拼接时间戳。
+
+    ONNX Runtime 推理释放 GIL 且会话可多线程共享，ASR_PARALLEL_WORKERS > 1 时
+    语音块由线程池并行识别；每个会话的算子内线程数由 ASR_ONNX_INTRA_OP_THREADS 控制。
+    """
+
+    _instance: Optional["OnnxASRBackend"] = None
+    _asr_model = None
+    _vad_model = None
+    _punc_model = None
+    _available: Optional[bool] = None
+    _executor: Optional[ThreadPoolExecutor] = None
+    _load_lock = threading.Lock()
+    _vad_lock = threading.Lock()
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super().__new__(cls)
+        return cls._instance
+
+    def _load_model(self) -> None:
+        """懒加载模型"""
+        if self._asr_model is not None:
+            return
+
+        with self._load_lock:
+            if self._asr_model is not None:
+                return
+            try:
+                from funasr_onnx import CT_Transformer, Fsmn_vad, Paraformer
+
+                kwargs = {
+                    "quantize": settings.ASR_ONNX_QUANTIZE,
+                    "intra_op_num_threads": settings.ASR_ONNX_INTRA_OP_THREADS,
+                }
+                logger.info(
+                    f"正在加载 ONNX ASR 模型: {settings.ASR_ONNX_MODEL} "
+                    f"(量化: {settings.ASR_ONNX_QUANTIZE}, 算子内线程: {settings.ASR_ONNX_INTRA_OP_THREADS})"
+                )
+                # 模型目录不存在时 funasr_onnx 会从 ModelScope 下载并导出
+                self._vad_model = Fsmn_vad(settings.ASR_ONNX_VAD_MODEL, **kwargs)
+                self._punc_model = CT_Transformer(settings.ASR_ONNX_PUNC_MODEL, **kwargs)
+                self._executor = ThreadPoolExecutor(
+                    max_workers=max(1, settings.ASR_PARALLEL_WORKERS), thread_name_prefix="onnx-asr"
+                )
+                # 识别模型最后赋值，作为加载完成的标志
+                self._asr_model = Paraformer(settings.ASR_ONNX_MODEL, **kwargs)
+
+                logger.info("ONNX ASR 模型加载完成")
+                self._available = True
+
+            except ImportError:
+                logger.error("funasr_onnx 未安装，请运行: uv pip install -r requirements-onnx.txt")
+                self._available = False
+                raise ASRError("funasr_onnx 未安装")
+            except Exception as e:
+                logger.error(f"ONNX ASR 模型加载失败: {e}")
+                self._available = False
+                raise ASRError(f"模型加载失败: {e}")
+
+    def is_available(self) -> bool:
+        """检查 funasr_onnx 与 onnxruntime 是否可用"""
+        if self._available is not None:
+            return self._available
+
+        try:
+            import funasr_onnx  # noqa: F401
+            import onnxruntime  # noqa: F401
+
+            self._available = True
+        except ImportError:
+            self._available = False
+
+        return self._available
+
+    def transcribe(self, audio: Union[str, AudioInfo]) -> RawTranscriptResult:
+        """
+        转录音频
+
+        Args:
+            audio: 16kHz mono WAV 文件路径，或携带内存 PCM 的 AudioInfo
+
+        Returns:
+            RawTranscriptResult: 包含文本和词级时间戳
+
+        Raises:
+            ASRError: 转录失败
+        """
+        chunks = list(self.iter_transcribe(audio))
+        stitched = stitch_window_results(chunks)
+        logger.debug(f"ONNX 转录完成: {len(chunks)} 个语音块, {len(stitched.text)} 字符")
+        return stitched
+
+    def iter_transcribe(self, audio: Union[str, AudioInfo]) -> Iterator[Tuple[int, RawTranscriptResult]]:
+        """
+        按语音块渐进转录
+
+        Yields:
+            (语音块起始毫秒, 语音块转录结果)，结果中的时间戳相对语音块起点
+        """
+        self._load_model()
+
+        try:
+            samples, sample_rate = load_pcm(audio)
+            speech = self._detect_speech(samples)
+            futures = [
+                self._executor.submit(
+                    self._transcribe_chunk,
+                    samples[start * sample_rate // 1000:end * sample_rate // 1000],
+                )
+                for start, end in speech
+            ]
+        except ASRError:
+            raise
+        except Exception as e:
+            logger.error(f"ONNX 转录失败: {e}")
+            raise ASRError(f"语音识别失败: {e}")
+
+        try:
+            for (start, end), future in zip(speech, futures):
+                try:
+                    result = future.result()
+                except Exception as e:
+                    logger.error(f"ONNX 转录失败: {e}")
+                    raise ASRError(f"语音识别失败: {e}")
+                # 语音块范围随结果拼接，无字级时间戳时用于按比例分配
+                result.vad_segments = [(0, end - start)]
+                yield start, result
+        finally:
+            for future in futures:
+                future.cancel()
+
+    def _detect_speech(self, samples) -> List[Tuple[int, int]]:
+        """运行 VAD，返回语音段 [(start_ms, end_ms), ...]"""
+        # Fsmn_vad 内部保存检测状态，并发任务共享时持锁
+        with self._vad_lock:
+            result = self._vad_model(samples)
+        segments = result[0] if result else []
+        return [(int(seg[0]), int(seg[1])) for seg in segments if len(seg) >= 2 and seg[1] > seg[0]]
+
+    def _transcribe_chunk(self, samples) -> RawTranscriptResult:
+        """识别单个语音块并加标点"""
+        result = self._asr_model(samples)
+        if not result:
+            return RawTranscriptResult(text="")
+
+        item = result[0]
+        preds = item.get("preds", "")
+        # 不同版本的 funasr_onnx 返回字符串或 (text, tokens)
+        text = preds[0] if isinstance(preds, (list, tuple)) else preds
+        timestamps = item.get("timestamp", [])
+        if text:
+            punctuated = self._punc_model(text)[0]
+            timestamps = self._align_punctuation(punctuated, text, timestamps)
+            text = punctuated
+        return FunASRBackend._parse_item({"text": text, "timestamp": timestamps})
+
+    @staticmethod
+    def _align_punctuation(punctuated: str, text: str, timestamps: list) -> list:
+        """
+        把识别文本的字级时间戳对齐到加标点后的文本
+
+        标点模型只插入标点，原有字符顺序不变；插入的标点和空格取前一个字的结束时间（零时长），
+        使时间戳与加标点文本逐字符对应。
+        无法逐字对齐时（如英文单词级时间戳）原样返回。
+        """
+        chars = [c for c in text if not c.isspace()]
+        if len(chars) != len(timestamps):
+            return timestamps
+
+        aligned = []
+        j = 0
+        last_end = timestamps[0][0] if timestamps else 0
+        for char in punctuated:
+            if j < len(chars) and char == chars[j]:
+                aligned.append(timestamps[j])
+                last_end = timestamps[j][1]
+                j += 1
+            else:
+                aligned.append([last_end, last_end])
+        return aligned if j == len(chars) else timestamps
+
 
 # =============================================================================
 # Bcut ASR 后端 (B站必剪云端API)
@@ -322,6 +1004,10 @@ class BcutASRBackend:
 
     使用 B站必剪 APP 的逆向 API 实现云端 ASR
     流程: 上传音频 -> 创建任务 -> 轮询结果
+
+    基于共享 httpx 连接池（"bcut" 上游）的异步实现:
+    - 分片按 BCUT_UPLOAD_CONCURRENCY 并发上传，每片从磁盘流式读取，不整体读入内存
+    - 轮询结果使用指数退避（BCUT_POLL_INTERVAL 起，最长 BCUT_POLL_MAX_INTERVAL），不占用线程
     """
 
     API_BASE_URL = "https://member.bilibili.com/x/bcut/rubick-interface"
@@ -335,6 +1021,11 @@ class BcutASRBackend:
         "Content-Type": "application/json",
     }
 
+    # 分片上传时每次从磁盘读取的字节数
+    UPLOAD_READ_SIZE = 256 * 1024
+    # 单个分片的上传尝试次数
+    UPLOAD_ATTEMPTS = 3
+
     _instance: Optional["BcutASRBackend"] = None
 
     def __new__(cls):
@@ -342,30 +1033,32 @@ class BcutASRBackend:
             cls._instance = super().__new__(cls)
         return cls._instance
 
-    def __init__(self):
-        self._session = None
-
-    def _get_session(self):
-        """获取 requests session"""
-        if self._session is None:
-            import requests
-            self._session = requests.Session()
-        return self._session
-
     def is_available(self) -> bool:
         """检查 Bcut API 是否可用（始终可用，只需网络）"""
-        try:
-            import requests  # noqa: F401
-            return True
-        except ImportError:
-            return False
+        return True
 
     def transcribe(self, audio_path: str) -> RawTranscriptResult:
+        """
+        同步转录（脚本等非异步环境使用）
+
+        在独立事件循环中运行 atranscribe，使用临时客户端，
+        避免把共享连接池绑定到该事件循环。
+        """
+        import httpx
+
+        async def run() -> RawTranscriptResult:
+            async with httpx.AsyncClient() as client:
+                return await self.atranscribe(audio_path, client=client)
+
+        return asyncio.run(run())
+
+    async def atranscribe(self, audio_path: str, client=None) -> RawTranscriptResult:
         """
         转录音频文件
 
         Args:
             audio_path: 音频文件路径
+            client: 可选的 httpx.AsyncClient，默认使用共享的 "bcut" 连接池
 
         Returns:
             RawTranscriptResult: 包含文本和词级时间戳
@@ -373,24 +1066,21 @@ class BcutASRBackend:
         Raises:
             ASRError: 转录失败
         """
-        import json
-        import time
-        import requests
+        if client is None:
+            from services.http_clients import get_http_client
+            client = get_http_client("bcut")
 
         try:
-            # 1. 读取音频文件
+            # 1. 检查音频文件
             audio_path = Path(audio_path)
             if not audio_path.exists():
                 raise ASRError(f"音频文件不存在: {audio_path}")
 
-            with open(audio_path, "rb") as f:
-                file_binary = f.read()
-
-            file_size = len(file_binary)
+            file_size = audio_path.stat().st_size
             logger.info(f"Bcut ASR: 上传音频 {file_size / 1024:.1f} KB")
 
             # 2. 请求上传授权
-            payload = json.dumps({
+            upload_data = await self._request(client, "POST", self.API_REQ_UPLOAD, "上传授权", json={
                 "type": 2,
                 "name": "audio.mp3",
                 "size": file_size,
@@ -398,113 +1088,31 @@ class BcutASRBackend:
                 "model_id": "8",
             })
 
-            resp = requests.post(
-                self.API_REQ_UPLOAD,
-                data=payload,
-                headers=self.HEADERS,
-                timeout=30,
+            # 3. 分片并发上传
+            etags = await self._upload_chunks(
+                client, audio_path, file_size, upload_data["upload_urls"], upload_data["per_size"]
             )
-            resp.raise_for_status()
-            resp_data = resp.json()
-
-            if resp_data.get("code") != 0:
-                raise ASRError(f"上传授权失败: {resp_data.get('message')}")
-
-            upload_data = resp_data["data"]
-            in_boss_key = upload_data["in_boss_key"]
-            resource_id = upload_data["resource_id"]
-            upload_id = upload_data["upload_id"]
-            upload_urls = upload_data["upload_urls"]
-            per_size = upload_data["per_size"]
-
-            # 3. 分片上传
-            etags = []
-            for i, url in enumerate(upload_urls):
-                start = i * per_size
-                end = (i + 1) * per_size
-                chunk = file_binary[start:end]
-
-                resp = requests.put(url, data=chunk, headers=self.HEADERS, timeout=60)
-                resp.raise_for_status()
-                etag = resp.headers.get("Etag")
-                if etag:
-                    etags.append(etag)
-
             logger.debug(f"Bcut ASR: 上传完成, {len(etags)} 片")
 
             # 4. 提交上传
-            commit_data = json.dumps({
-                "InBossKey": in_boss_key,
-                "ResourceId": resource_id,
+            commit_data = await self._request(client, "POST", self.API_COMMIT_UPLOAD, "提交上传", json={
+                "InBossKey": upload_data["in_boss_key"],
+                "ResourceId": upload_data["resource_id"],
                 "Etags": ",".join(etags) if etags else "",
-                "UploadId": upload_id,
+                "UploadId": upload_data["upload_id"],
                 "model_id": "8",
             })
 
-            resp = requests.post(
-                self.API_COMMIT_UPLOAD,
-                data=commit_data,
-                headers=self.HEADERS,
-                timeout=30,
-            )
-            resp.raise_for_status()
-            resp_data = resp.json()
-
-            if resp_data.get("code") != 0:
-                raise ASRError(f"提交上传失败: {resp_data.get('message')}")
-
-            download_url = resp_data["data"]["download_url"]
-
             # 5. 创建 ASR 任务
-            resp = requests.post(
-                self.API_CREATE_TASK,
-                json={"resource": download_url, "model_id": "8"},
-                headers=self.HEADERS,
-                timeout=30,
+            task_data = await self._request(
+                client, "POST", self.API_CREATE_TASK, "创建任务",
+                json={"resource": commit_data["download_url"], "model_id": "8"},
             )
-            resp.raise_for_status()
-            resp_data = resp.json()
-
-            if resp_data.get("code") != 0:
-                raise ASRError(f"创建任务失败: {resp_data.get('message')}")
-
-            task_id = resp_data["data"]["task_id"]
+            task_id = task_data["task_id"]
             logger.info(f"Bcut ASR: 任务创建成功, task_id={task_id}")
 
             # 6. 轮询任务结果
-            poll_interval = settings.BCUT_POLL_INTERVAL
-            max_retries = settings.BCUT_MAX_RETRIES
-            task_result = None
-
-            for i in range(max_retries):
-                resp = requests.get(
-                    self.API_QUERY_RESULT,
-                    params={"model_id": 7, "task_id": task_id},
-                    headers=self.HEADERS,
-                    timeout=30,
-                )
-                resp.raise_for_status()
-                resp_data = resp.json()
-
-                if resp_data.get("code") != 0:
-                    raise ASRError(f"查询结果失败: {resp_data.get('message')}")
-
-                task_data = resp_data["data"]
-                state = task_data.get("state", 0)
-
-                if state == 4:  # 完成
-                    task_result = json.loads(task_data["result"])
-                    break
-                elif state == -1:  # 失败
-                    raise ASRError("ASR 任务失败")
-
-                if i % 10 == 0:
-                    logger.debug(f"Bcut ASR: 等待结果... ({i}/{max_retries})")
-
-                time.sleep(poll_interval)
-
-            if task_result is None:
-                raise ASRError("ASR 任务超时")
+            task_result = await self._poll_result(client, task_id)
 
             # 7. 解析结果
             return self._parse_result(task_result)
@@ -515,6 +1123,92 @@ class BcutASRBackend:
             logger.error(f"Bcut ASR 失败: {e}")
             raise ASRError(f"Bcut ASR 失败: {e}")
 
+    async def _request(self, client, method: str, url: str, action: str, **kwargs) -> dict:
+        """调用 Bcut 接口，code != 0 时抛出 ASRError，返回 data 字段"""
+        resp = await client.request(method, url, headers=self.HEADERS, timeout=30, **kwargs)
+        resp.raise_for_status()
+        resp_data = resp.json()
+        if resp_data.get("code") != 0:
+            raise ASRError(f"{action}失败: {resp_data.get('message')}")
+        return resp_data["data"]
+
+    async def _upload_chunks(self, client, audio_path: Path, file_size: int, upload_urls: list, per_size: int) -> list:
+        """按 BCUT_UPLOAD_CONCURRENCY 并发上传分片，返回按分片顺序排列的 ETag"""
+        semaphore = asyncio.Semaphore(max(1, settings.BCUT_UPLOAD_CONCURRENCY))
+
+        async def upload(index: int, url: str) -> Optional[str]:
+            start = index * per_size
+            length = max(0, min(per_size, file_size - start))
+            async with semaphore:
+                for attempt in range(1, self.UPLOAD_ATTEMPTS + 1):
+                    try:
+                        resp = await client.put(
+                            url,
+                            content=self._iter_file_range(audio_path, start, length),
+                            headers={**self.HEADERS, "Content-Length": str(length)},
+                            timeout=60,
+                        )
+                        resp.raise_for_status()
+                        return resp.headers.get("Etag")
+                    except Exception as e:
+                        if attempt == self.UPLOAD_ATTEMPTS:
+                            raise ASRError(f"分片 {index} 上传失败: {e}")
+                        logger.warning(f"Bcut ASR: 分片 {index} 上传失败，重试 ({attempt}/{self.UPLOAD_ATTEMPTS}): {e}")
+                        await asyncio.sleep(0.5 * 2 ** (attempt - 1))
+
+        tasks = [asyncio.create_task(upload(i, url)) for i, url in enumerate(upload_urls)]
+        try:
+            etags = await asyncio.gather(*tasks)
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            raise
+        return [etag for etag in etags if etag]
+
+    async def _iter_file_range(self, path: Path, start: int, length: int):
+        """从磁盘分块读取 [start, start + length) 区间"""
+        with open(path, "rb") as f:
+            f.seek(start)
+            remaining = length
+            while remaining > 0:
+                data = await asyncio.to_thread(f.read, min(self.UPLOAD_READ_SIZE, remaining))
+                if not data:
+                    break
+                remaining -= len(data)
+                yield data
+
+    async def _poll_result(self, client, task_id: str) -> dict:
+        """指数退避轮询任务结果，最多 BCUT_MAX_RETRIES 次，总耗时不超过 BCUT_POLL_TIMEOUT 秒"""
+        import json
+
+        interval = settings.BCUT_POLL_INTERVAL
+        max_retries = settings.BCUT_MAX_RETRIES
+        deadline = time.monotonic() + settings.BCUT_POLL_TIMEOUT
+
+        for i in range(max_retries):
+            task_data = await self._request(
+                client, "GET", self.API_QUERY_RESULT, "查询结果",
+                params={"model_id": 7, "task_id": task_id},
+            )
+            state = task_data.get("state", 0)
+
+            if state == 4:  # 完成
+                return json.loads(task_data["result"])
+            elif state == -1:  # 失败
+                raise ASRError("ASR 任务失败")
+
+            if i % 10 == 0:
+                logger.debug(f"Bcut ASR: 等待结果... ({i}/{max_retries})")
+
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            await asyncio.sleep(min(interval, remaining))
+            interval = min(interval * 1.5, settings.BCUT_POLL_MAX_INTERVAL)
+
+        raise ASRError("ASR 任务超时")
+
     def _parse_result(self, result: dict) -> RawTranscriptResult:
         """解析 Bcut API 返回结果"""
         utterances = result.get("utterances", [])
@@ -581,6 +1275,8 @@ class SegmentBuilder:
     SENTENCE_ENDINGS = {"。", "！", "？", "；", "…", "!", "?", ";"}
     # 次要切分标点（逗号等）
     MINOR_BREAKS = {"，", ",", "、"}
+    # 向量化切分时每次处理的起点数（控制中间矩阵的内存）
+    SPLIT_BLOCK_ROWS = 2048
 
     def __init__(
         self,
@@ -614,8 +1310,103 @@ class SegmentBuilder:
         # 否则使用标点切分 + 比例分配时间戳
         return self._build_from_text_only(raw_result.text, raw_result.vad_segments)
 
-    def _build_from_tokens(self, tokens: List[Token]) -> List[Segment]:
-        """从词级时间戳构建分段"""
+    def _build_from_tokens(self, tokens: Union[List[Token], TokenColumns]) -> List[Segment]:
+        """
+        从词级时间戳构建分段（列式 + 向量化）
+
+        切分规则与逐 token 的 _build_from_token_list 完全一致:
+        标点和间隙只与 token 自身位置有关，长度和时长取决于当前句的起点。
+        每个 token 至少一个字符时，从起点 s 开始最多 max_chars + 1 个 token 内必然切分，
+        因此对所有起点在 [s, s + max_chars] 窗口上一次性算出"第一个切分点"，
+        再沿起点链跳转（每句一次 Python 迭代，而非每字一次）。
+        """
+        cols = TokenColumns.from_tokens(tokens)
+        count = len(cols)
+        if count == 0:
+            return []
+
+        lengths = np.diff(cols.offsets)
+        if (lengths <= 0).any():
+            # 存在空文本 token 时窗口上界不成立，回退逐 token 切分
+            return self._build_from_token_list(list(cols))
+
+        first_split = self._first_split_points(cols, lengths)
+
+        segments = []
+        start = 0
+        while start < count:
+            end = int(first_split[start])
+            segment = self._create_segment_from_columns(cols, start, end)
+            if segment:
+                segments.append(segment)
+            start = end + 1
+        return segments
+
+    def _token_mask(self, cols: TokenColumns, lengths: np.ndarray, marks: set) -> np.ndarray:
+        """每个 token 的文本是否属于 marks"""
+        if (lengths == 1).all():
+            codes = np.frombuffer(cols.text.encode("utf-32-le"), dtype=np.uint32)
+            mark_codes = np.array([ord(m) for m in marks if len(m) == 1], dtype=np.uint32)
+            return np.isin(codes, mark_codes)
+        return np.fromiter(
+            (cols.token_text(i) in marks for i in range(len(cols))), dtype=bool, count=len(cols)
+        )
+
+    def _first_split_points(self, cols: TokenColumns, lengths: np.ndarray) -> np.ndarray:
+        """
+        对每个起点 s，计算从 s 开始的句子在哪个 token 处切分（含该 token）
+
+        Returns:
+            int64 数组，first[s] 为切分 token 下标；直到末尾都不切分时为 n - 1
+        """
+        count = len(cols)
+        punct = self._token_mask(cols, lengths, self.SENTENCE_ENDINGS)
+        minor = self._token_mask(cols, lengths, self.MINOR_BREAKS)
+        starts = cols.starts.astype(np.int64)
+        ends = cols.ends.astype(np.int64)
+        gap = np.zeros(count, dtype=bool)
+        gap[:-1] = (starts[1:] - ends[:-1]) >= self.gap_split_ms
+
+        max_ms = self.max_seconds * 1000
+        steps = np.arange(max(1, self.max_chars + 1), dtype=np.int64)
+        first = np.empty(count, dtype=np.int64)
+
+        for block_start in range(0, count, self.SPLIT_BLOCK_ROWS):
+            rows = np.arange(block_start, min(block_start + self.SPLIT_BLOCK_ROWS, count), dtype=np.int64)
+            index = rows[:, None] + steps[None, :]
+            valid = index < count
+            index = np.minimum(index, count - 1)
+
+            text_len = cols.offsets[index + 1] - cols.offsets[rows][:, None]
+            duration = ends[index] - starts[rows][:, None]
+            split = punct[index]
+            split |= (text_len >= self.max_chars) & (minor[index] | (text_len > self.max_chars))
+            split |= (text_len < self.max_chars) & (duration >= max_ms)
+            split |= gap[index]
+            split &= valid
+
+            hit = split.any(axis=1)
+            first[rows] = np.where(hit, rows + split.argmax(axis=1), count - 1)
+
+        return first
+
+    def _create_segment_from_columns(self, cols: TokenColumns, start: int, end: int) -> Optional[Segment]:
+        """从列式 token 的 [start, end] 区间创建 Segment"""
+        text = cols.text[cols.offsets[start]:cols.offsets[end + 1]].strip()
+        if not text:
+            return None
+
+        start_s = int(cols.starts[start]) / 1000.0
+        end_s = int(cols.ends[end]) / 1000.0
+
+        # 确保最小时长
+        if end_s - start_s < self.min_seconds:
+            end_s = start_s + self.min_seconds
+
+        return Segment(start=start_s, end=end_s, text=text)
+
+    def _build_from_token_list(self, tokens: List[Token]) -> List[Segment]:
+        """从词级时间戳构建分段（逐 token 实现，用于空文本 token 的回退和一致性校验）"""
         if not tokens:
             return []
 
@@ -815,9 +1606,9 @@ class MockASRService:
         """Mock 服务始终可用"""
         return True
 
-    def preload(self) -> None:
+    def preload(self) -> bool:
         """Mock 预加载（无操作）"""
-        pass
+        return True
 
 
 # =============================================================================
@@ -831,12 +1622,13 @@ class ASRService:
 
     单例模式，根据配置自动选择后端:
     - funasr: FunASR 本地模型（默认）
+    - onnx: int8 量化 ONNX 模型（ONNX Runtime CPU 推理）
     - bcut: B站必剪云端 API
     """
 
     _instance: Optional["ASRService"] = None
     _preprocessor: Optional[AudioPreprocessor] = None
-    _backend = None  # FunASRBackend 或 BcutASRBackend
+    _backend = None  # FunASRBackend / OnnxASRBackend / BcutASRBackend
     _segment_builder: Optional[SegmentBuilder] = None
     _backend_name: str = ""
 
@@ -863,16 +1655,43 @@ class ASRService:
         if backend_name == "bcut":
             logger.info("ASR 后端: Bcut (B站必剪云端API)")
             self._backend = BcutASRBackend()
+        elif backend_name == "onnx":
+            logger.info("ASR 后端: ONNX Runtime (量化本地模型)")
+            self._backend = OnnxASRBackend()
         else:
             logger.info("ASR 后端: FunASR (本地模型)")
             self._backend = FunASRBackend()
 
-    def transcribe(self, audio_path: str) -> TranscriptResult:
+    def _prepare(self, audio: Union[str, AudioInfo]) -> Tuple[AudioInfo, bool]:
+        """
+        准备 16kHz mono 音频
+
+        提取阶段返回的 AudioInfo 已符合要求时原样使用（含内存 PCM），
+        否则经 AudioPreprocessor 转换。
+
+        Returns:
+            (音频, 是否为需要清理的临时文件)
+        """
+        if isinstance(audio, AudioInfo) and self._preprocessor.is_asr_ready(audio):
+            return audio, False
+        audio_path = audio.path if isinstance(audio, AudioInfo) else audio
+        wav_path = self._preprocessor.preprocess(audio_path)
+        try:
+            info = read_wav_info(wav_path)
+        except AudioExtractError as e:
+            raise ASRError(str(e))
+        return info, wav_path != audio_path
+
+    def _backend_input(self, audio: AudioInfo) -> Union[str, AudioInfo]:
+        """Bcut 上传文件，本地模型直接使用采样"""
+        return audio.path if self._backend_name == "bcut" else audio
+
+    def transcribe(self, audio: Union[str, AudioInfo]) -> TranscriptResult:
         """
         转录音频
 
         Args:
-            audio_path: 音频文件路径（支持 mp4/wav/mp3/m4a 等）
+            audio: 音频文件路径（支持 mp4/wav/mp3/m4a 等），或提取阶段返回的 AudioInfo
 
         Returns:
             TranscriptResult: 包含完整文本和句子级时间戳分段
@@ -880,17 +1699,16 @@ class ASRService:
         Raises:
             ASRError: 转录失败
         """
-        wav_path = None
+        prepared = None
         temp_file = False
 
         try:
             # 1. 音频预处理
-            logger.info(f"开始转录: {audio_path}")
-            wav_path = self._preprocessor.preprocess(audio_path)
-            temp_file = wav_path != audio_path
+            logger.info(f"开始转录: {audio}")
+            prepared, temp_file = self._prepare(audio)
 
             # 2. FunASR 转录
-            raw_result = self._backend.transcribe(wav_path)
+            raw_result = self._backend.transcribe(self._backend_input(prepared))
 
             # 3. 句子切分
             segments = self._segment_builder.build_segments(raw_result)
@@ -906,41 +1724,225 @@ class ASRService:
             raise ASRError(f"转录失败: {e}")
         finally:
             # 清理临时文件
-            if temp_file and wav_path:
-                self._preprocessor.cleanup(wav_path)
+            if temp_file and prepared:
+                self._preprocessor.cleanup(prepared.path)
+
+    def iter_transcribe(self, audio: Union[str, AudioInfo]) -> Generator[List[Segment], None, TranscriptResult]:
+        """
+        渐进式转录音频
+
+        每解码完一个窗口产出该窗口的句子级分段（时间戳为整段音频的绝对时间），
+        生成器结束时的返回值（StopIteration.value）为完整的 TranscriptResult，
+        与 transcribe() 一样基于整段拼接结果切分句子。
+        不支持窗口输出的后端（Bcut）一次性产出全部分段。
+
+        Raises:
+            ASRError: 转录失败
+        """
+        prepared = None
+        temp_file = False
+
+        try:
+            logger.info(f"开始渐进式转录: {audio}")
+            prepared, temp_file = self._prepare(audio)
+            backend_input = self._backend_input(prepared)
+
+            if hasattr(self._backend, "iter_transcribe"):
+                windows = []
+                for offset_ms, window_result in self._backend.iter_transcribe(backend_input):
+                    windows.append((offset_ms, window_result))
+                    partial = self._segment_builder.build_segments(
+                        stitch_window_results([(offset_ms, window_result)])
+                    )
+                    if partial:
+                        yield partial
+                raw_result = stitch_window_results(windows)
+                segments = self._segment_builder.build_segments(raw_result)
+            else:
+                raw_result = self._backend.transcribe(backend_input)
+                segments = self._segment_builder.build_segments(raw_result)
+                if segments:
+                    yield segments
+
+            logger.info(f"转录完成: {len(raw_result.text)} 字符, {len(segments)} 段")
+            return TranscriptResult(text=raw_result.text, segments=segments)
+
+        except ASRError:
+            raise
+        except Exception as e:
+            logger.error(f"转录失败: {e}")
+            raise ASRError(f"转录失败: {e}")
+        finally:
+            if temp_file and prepared:
+                self._preprocessor.cleanup(prepared.path)
+
+    async def atranscribe(
+        self,
+        audio: Union[str, AudioInfo],
+        on_segments: Optional[SegmentsCallback] = None,
+    ) -> TranscriptResult:
+        """
+        异步转录音频
+
+        启用工作进程池时提交到池中（不占用 API 进程的 GIL，子进程按路径读取 WAV），
+        否则在线程池中调用 transcribe（AudioInfo 的内存 PCM 直接使用）。
+
+        Args:
+            audio: 音频文件路径，或提取阶段返回的 AudioInfo
+            on_segments: 可选的渐进回调，每个窗口解码完成后以该窗口的分段调用
+        """
+        from services.asr_worker_pool import get_asr_worker_pool
+
+        if self._backend_name == "bcut":
+            return await self._atranscribe_remote(audio, on_segments)
+
+        pool = get_asr_worker_pool()
+        if pool is not None:
+            audio_path = audio.path if isinstance(audio, AudioInfo) else audio
+            return await pool.submit(audio_path, on_segments=on_segments)
+        if on_segments is None:
+            return await asyncio.to_thread(self.transcribe, audio)
+
+        loop = asyncio.get_running_loop()
+        updates: asyncio.Queue = asyncio.Queue()
+
+        def run() -> TranscriptResult:
+            generator = self.iter_transcribe(audio)
+            while True:
+                try:
+                    segments = next(generator)
+                except StopIteration as stop:
+                    return stop.value
+                loop.call_soon_threadsafe(updates.put_nowait, segments)
+
+        return await relay_segments(asyncio.to_thread(run), updates, on_segments)
+
+    async def _atranscribe_remote(
+        self,
+        audio: Union[str, AudioInfo],
+        on_segments: Optional[SegmentsCallback] = None,
+    ) -> TranscriptResult:
+        """云端后端（Bcut）: 上传与轮询直接在事件循环中进行，仅预处理放到线程池"""
+        prepared = None
+        temp_file = False
+        try:
+            logger.info(f"开始转录: {audio}")
+            prepared, temp_file = await asyncio.to_thread(self._prepare, audio)
+            raw_result = await self._backend.atranscribe(prepared.path)
+            segments = self._segment_builder.build_segments(raw_result)
+            logger.info(f"转录完成: {len(raw_result.text)} 字符, {len(segments)} 段")
+        except ASRError:
+            raise
+        except Exception as e:
+            logger.error(f"转录失败: {e}")
+            raise ASRError(f"转录失败: {e}")
+        finally:
+            if temp_file and prepared:
+                self._preprocessor.cleanup(prepared.path)
+
+        if on_segments and segments:
+            try:
+                await on_segments(segments)
+            except Exception as e:
+                logger.warning(f"渐进转录回调失败: {e}")
+        return TranscriptResult(text=raw_result.text, segments=segments)
+
+    @property
+    def uses_worker_pool(self) -> bool:
+        """是否使用独立工作进程转录（仅本地模型后端）"""
+        return settings.ASR_WORKER_PROCESSES > 0 and self._backend_name != "bcut"
+
+    async def apreload(self) -> bool:
+        """
+        异步预加载
+
+        使用工作进程池时启动工作进程并等待其加载完模型（模型在子进程中加载），
+        否则在线程池中加载本进程的模型。
+
+        工作进程池在第一个 await 之前注册到全局，因此即使预加载作为后台任务运行，
+        期间到达的转录请求也会提交到池中排队，而不会回退到本进程加载模型。
+
+        Returns:
+            模型是否已就绪（Bcut 无需预加载视为就绪）；工作进程在 ASR_PRELOAD_TIMEOUT 秒内
+            未全部报告就绪，或有工作进程加载模型失败时返回 False
+        """
+        if self.uses_worker_pool:
+            from services.asr_worker_pool import start_asr_worker_pool
+            pool = await start_asr_worker_pool()
+            try:
+                return await pool.wait_ready(settings.ASR_PRELOAD_TIMEOUT)
+            except asyncio.TimeoutError:
+                logger.error(f"ASR 工作进程 {settings.ASR_PRELOAD_TIMEOUT}s 内未完成模型加载")
+                return False
+        return await asyncio.to_thread(self.preload)
+
+    async def ashutdown(self) -> None:
+        """关闭工作进程池（如有）"""
+        from services.asr_worker_pool import shutdown_asr_worker_pool
+        await shutdown_asr_worker_pool()
 
     def is_available(self) -> bool:
         """检查 ASR 服务是否可用"""
         return self._backend.is_available()
 
-    def preload(self) -> None:
+    def preload(self) -> bool:
         """
         预加载模型
 
         在应用启动时调用，避免首次转录时的延迟
-        仅对 FunASR 本地模型有效，Bcut API 无需预加载
+        仅对本地模型（FunASR / ONNX）有效，Bcut API 无需预加载
+
+        Returns:
+            模型是否已就绪
         """
         # Bcut 后端无需预加载
         if self._backend_name == "bcut":
             logger.info("Bcut 后端无需预加载")
-            return
+            return True
 
         if not self.is_available():
-            logger.warning("FunASR 不可用，跳过预加载")
-            return
+            logger.warning(f"ASR 后端 {self._backend_name} 不可用，跳过预加载")
+            return False
 
         try:
-            logger.info("预加载 FunASR 模型...")
+            logger.info(f"预加载 ASR 模型 ({self._backend_name})...")
             self._backend._load_model()
-            logger.info("FunASR 模型预加载完成")
+            logger.info("ASR 模型预加载完成")
+            return True
         except Exception as e:
             logger.error(f"模型预加载失败: {e}")
+            return False
 
     @property
     def backend_name(self) -> str:
         """获取当前后端名称"""
         return self._backend_name
 
+    @property
+    def model_version(self) -> str:
+        """
+        转录结果版本标识
+
+        包含后端、模型、FunASR 切窗方式和字幕切分参数，用于转录结果缓存的键，
+        任一项变化都会产生不同的版本（整段识别与按窗口识别的标点、断句可能不同）。
+        """
+        if self._backend_name == "bcut":
+            model = "bcut:8"
+        elif self._backend_name == "onnx":
+            quant = "int8" if settings.ASR_ONNX_QUANTIZE else "fp32"
+            model = f"onnx-{quant}:{settings.ASR_ONNX_MODEL}/{settings.ASR_ONNX_VAD_MODEL}/{settings.ASR_ONNX_PUNC_MODEL}"
+        else:
+            model = f"funasr:{settings.ASR_MODEL}/{settings.ASR_VAD_MODEL}/{settings.ASR_PUNC_MODEL}"
+            if settings.ASR_BATCH_MAX_SIZE > 1:
+                model += "|batch"
+            elif settings.ASR_PARALLEL_WORKERS > 1:
+                model += f"|win:{settings.ASR_WINDOW_SECONDS}/{settings.ASR_PARALLEL_MIN_SECONDS}"
+            else:
+                model += "|whole"
+        builder = self._segment_builder
+        seg = f"seg:{builder.max_chars}/{builder.max_seconds}/{builder.min_seconds}/{builder.gap_split_ms}"
+        return f"{model}|{seg}"
+
 
 # =============================================================================
 # 导出
@@ -952,8 +1954,14 @@ __all__ = [
     "MockASRService",
     "AudioPreprocessor",
     "FunASRBackend",
+    "OnnxASRBackend",
     "BcutASRBackend",
     "SegmentBuilder",
     "Token",
+    "TokenColumns",
     "RawTranscriptResult",
+    "load_pcm",
+    "plan_windows",
+    "relay_segments",
+    "stitch_window_results",
 ]
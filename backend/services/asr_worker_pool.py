@@ -0,0 +1,531 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2026 relakkes@gmail.com
+#
+# This file is part of MediaCrawlerPro-ContentRemixAgent project.
+# Repository: https://github.com/MediaCrawlerPro/MediaCrawlerPro-ContentRemixAgent/blob/main/backend/services/asr_worker_pool.py
+# GitHub: https://github.com/NanmiCoder
+# Licensed under NON-COMMERCIAL LEARNING LICENSE 1.1
+#
+# 声明：本代码仅供学习和研究目的使用。使用者应遵守以下原则：
+# 1. 不得用于任何商业用途。
+# 2. 使用时应遵守目标平台的使用条款和robots.txt规则。
+# 3. 不得进行大规模爬取或对平台造成运营干扰。
+# 4. 应合理控制请求频率，避免给目标平台带来不必要的负担。
+# 5. 不得用于任何非法或不当的用途。
+#
+# 详细许可条款请参阅项目根目录下的LICENSE文件。
+# 使用本代码即表示您同意遵守上述原则和LICENSE中的所有条款。
+
+"""
+ASR 工作进程池 - 在独立进程中运行本地模型推理
+
+FunASR 推理是 CPU 密集型任务，放在 API 进程内（asyncio.to_thread）会与事件循环争抢 GIL，
+导致其他用户的 SSE 流卡顿。工作进程池将模型常驻在 N 个子进程中:
+
+- 任务队列: submit() 入队，队列满时立即拒绝（ASRQueueFullError），形成背压
+- 单任务超时: 只失败超时的任务；该工作进程不再接收新任务，其余在途任务结束后重启
+- 崩溃隔离: 工作进程异常退出只影响其正在处理的任务，进程在后台自动重启
+  （就绪前反复退出时指数退避）
+- 指标: 队列深度、运行中任务数、完成/失败/超时次数、排队与执行耗时
+- 渐进输出: 提交时带 on_segments 的任务，工作进程每解码完一个窗口回传一次分段
+
+进程间只传递音频路径和转录结果字典，模型不跨进程共享。
+"""
+
+import asyncio
+import multiprocessing
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional
+
+from config import settings
+from schemas import Segment, TranscriptResult
+from services.asr_service import ASRError, SegmentsCallback, relay_segments
+from utils.logger import logger
+
+
+class ASRQueueFullError(ASRError):
+    """ASR 任务队列已满"""
+    pass
+
+
+# =============================================================================
+# 工作进程端
+# =============================================================================
+
+
+def _preload_in_worker() -> bool:
+    """工作进程初始化：加载模型，返回模型是否已就绪"""
+    from services.asr_service import ASRService
+    return ASRService().preload()
+
+
+def _transcribe_in_worker(audio_path: str, emit: Optional[Callable[[List[dict]], None]] = None) -> dict:
+    """工作进程内执行转录；emit 不为空时每个窗口的分段通过它回传"""
+    from services.asr_service import ASRService
+
+    service = ASRService()
+    if emit is None:
+        return service.transcribe(audio_path).model_dump()
+
+    generator = service.iter_transcribe(audio_path)
+    while True:
+        try:
+            segments = next(generator)
+        except StopIteration as stop:
+            return stop.value.model_dump()
+        emit([segment.model_dump() for segment in segments])
+
+
+def _worker_main(
+    conn,
+    handler: Callable[..., dict],
+    initializer: Optional[Callable[[], Optional[bool]]],
+    concurrency: int,
+) -> None:
+    """
+    工作进程主循环
+
+    协议（Pipe）:
+    - 父 -> 子: (job_id, audio_path, stream)；None 表示退出
+    - 子 -> 父: ("ready", None, init_error) / ("partial", job_id, segments) /
+      ("ok", job_id, result) / ("error", job_id, message)
+    """
+    init_error = None
+    if initializer:
+        try:
+            if initializer() is False:
+                init_error = "模型预加载失败"
+        except Exception as e:
+            init_error = str(e) or type(e).__name__
+    if init_error:
+        # 初始化失败也报告就绪（附带错误），由具体任务返回错误，避免反复重启
+        logger.error(f"ASR worker initialization failed: {init_error}")
+    conn.send(("ready", None, init_error))
+
+    send_lock = threading.Lock()
+
+    def send(message) -> None:
+        with send_lock:
+            conn.send(message)
+
+    def run(job_id: str, audio_path: str, stream: bool) -> None:
+        emit = (lambda segments: send(("partial", job_id, segments))) if stream else None
+        try:
+            message = ("ok", job_id, handler(audio_path, emit))
+        except Exception as e:
+            message = ("error", job_id, str(e))
+        send(message)
+
+    with ThreadPoolExecutor(max_workers=max(1, concurrency)) as executor:
+        while True:
+            try:
+                message = conn.recv()
+            except (EOFError, OSError):
+                break
+            if message is None:
+                break
+            executor.submit(run, *message)
+
+
+# =============================================================================
+# 父进程端
+# =============================================================================
+
+
+@dataclass
+class _Job:
+    job_id: str
+    audio_path: str
+    future: asyncio.Future
+    partials: Optional[asyncio.Queue] = None  # 渐进分段（仅 on_segments 任务）
+    enqueued_at: float = field(default_factory=time.monotonic)
+
+
+@dataclass
+class ASRPoolMetrics:
+    """工作进程池统计"""
+    submitted: int = 0
+    completed: int = 0
+    failed: int = 0
+    rejected: int = 0
+    timeouts: int = 0
+    restarts: int = 0
+    wait_ms_total: float = 0.0
+    run_ms_total: float = 0.0
+
+
+# 工作进程在就绪前退出（或无法启动）时按指数退避重启，避免无法启动的子进程被无间隔地反复拉起
+_RESTART_BACKOFF_BASE = 0.5
+_RESTART_BACKOFF_MAX = 30.0
+
+
+class _Worker:
+    """
+    单个工作进程槽位及其通信管道
+
+    ready 在槽位的整个生命周期内是同一个 Event：重启时 clear，新进程报告就绪后 set，
+    已在等待的调度协程与 wait_ready 不会因进程更替而丢失通知。
+    """
+
+    def __init__(self, pool: "ASRWorkerPool", index: int):
+        self.pool = pool
+        self.index = index
+        self.process: Optional[multiprocessing.Process] = None
+        self.conn = None
+        self.ready = asyncio.Event()
+        self.init_error: Optional[str] = None  # 最近一次就绪报告中的初始化错误
+        self.inflight: Dict[str, _Job] = {}
+        self.draining = False  # 有任务超时：不再接收新任务，其余在途任务结束后重启
+        self.crash_streak = 0  # 连续未就绪即退出（或启动失败）的次数，决定重启退避
+        self._restart_task: Optional[asyncio.Task] = None
+        self._send_lock = threading.Lock()
+
+    def _spawn(self):
+        """创建并启动子进程（阻塞，在线程池中调用）"""
+        ctx = multiprocessing.get_context("spawn")
+        parent_conn, child_conn = ctx.Pipe()
+        process = ctx.Process(
+            target=_worker_main,
+            args=(child_conn, self.pool.handler, self.pool.initializer, self.pool.concurrency),
+            name=f"asr-worker-{self.index}",
+            daemon=True,
+        )
+        process.start()
+        child_conn.close()
+        return process, parent_conn
+
+    async def start(self) -> None:
+        self.ready.clear()
+        self.draining = False
+        process, conn = await asyncio.to_thread(self._spawn)
+        if self.pool.closing:
+            await asyncio.to_thread(self._terminate, process, conn, False)
+            return
+        self.process, self.conn = process, conn
+        threading.Thread(
+            target=self._reader, args=(conn, self.pool.loop), name=f"asr-reader-{self.index}", daemon=True
+        ).start()
+
+    def _reader(self, conn, loop: asyncio.AbstractEventLoop) -> None:
+        """读取子进程消息并回调到事件循环；管道断开视为进程崩溃"""
+        while True:
+            try:
+                message = conn.recv()
+            except (EOFError, OSError):
+                conn.close()
+                if not loop.is_closed():
+                    loop.call_soon_threadsafe(self._on_exit, conn)
+                return
+            if not loop.is_closed():
+                loop.call_soon_threadsafe(self._on_message, conn, message)
+
+    def _on_message(self, conn, message) -> None:
+        if conn is not self.conn:
+            return  # 已被替换的旧进程
+        kind, job_id, payload = message
+        if kind == "ready":
+            self.crash_streak = 0
+            self.init_error = payload
+            self.ready.set()
+            if payload:
+                logger.error(f"ASR worker {self.index} ready without model (pid={self.process.pid}): {payload}")
+            else:
+                logger.info(f"ASR worker {self.index} ready (pid={self.process.pid})")
+            return
+        if kind == "partial":
+            job = self.inflight.get(job_id)
+            if job is not None and job.partials is not None:
+                job.partials.put_nowait([Segment(**segment) for segment in payload])
+            return
+        job = self.inflight.pop(job_id, None)
+        if job is not None and not job.future.done():
+            if kind == "ok":
+                job.future.set_result(payload)
+            else:
+                job.future.set_exception(ASRError(payload))
+        if self.draining and not self.inflight:
+            self.request_restart(None)
+
+    def _on_exit(self, conn) -> None:
+        if conn is not self.conn or self.pool.closing:
+            return
+        logger.error(f"ASR worker {self.index} exited unexpectedly (exitcode={self.process.exitcode})")
+        if not self.ready.is_set():
+            self.crash_streak += 1
+        self.request_restart(ASRError("ASR 工作进程异常退出"))
+
+    def send(self, job: _Job) -> None:
+        self.inflight[job.job_id] = job
+        with self._send_lock:
+            self.conn.send((job.job_id, job.audio_path, job.partials is not None))
+
+    def expire(self, job: _Job, error: Exception) -> None:
+        """
+        任务超时：只失败该任务
+
+        卡住的任务线程无法在子进程内单独终止，因此工作进程不再接收新任务，
+        同进程的其余在途任务正常结束（或各自超时）后再重启。
+        """
+        self.inflight.pop(job.job_id, None)
+        if not job.future.done():
+            job.future.set_exception(error)
+        if self.inflight:
+            self.draining = True
+            self.ready.clear()
+        else:
+            self.request_restart(None)
+
+    def request_restart(self, error: Optional[Exception]) -> None:
+        """失败所有在途任务并在后台重启进程（进行中的重启会合并）"""
+        for job in self.inflight.values():
+            if not job.future.done():
+                job.future.set_exception(error or ASRError("ASR 工作进程重启"))
+        self.inflight.clear()
+        self.ready.clear()
+        if self._restart_task is not None and not self._restart_task.done():
+            return
+        # 立即解除旧管道，旧进程退出时的 EOF 与迟到消息都会被忽略
+        process, conn = self.process, self.conn
+        self.process, self.conn = None, None
+        self.pool.metrics.restarts += 1
+        self._restart_task = asyncio.create_task(self._restart(process, conn))
+
+    async def _restart(self, process, conn) -> None:
+        """终止旧进程（线程池中执行，不阻塞事件循环），按退避间隔启动新进程"""
+        await asyncio.to_thread(self._terminate, process, conn, False)
+        while not self.pool.closing:
+            if self.crash_streak:
+                delay = min(_RESTART_BACKOFF_MAX, _RESTART_BACKOFF_BASE * 2 ** (self.crash_streak - 1))
+                logger.warning(
+                    f"ASR worker {self.index} failed {self.crash_streak} time(s) before ready, "
+                    f"restarting in {delay:.1f}s"
+                )
+                await asyncio.sleep(delay)
+            try:
+                await self.start()
+                return
+            except Exception as e:
+                self.crash_streak += 1
+                logger.error(f"ASR worker {self.index} failed to start: {e}")
+
+    @staticmethod
+    def _terminate(process, conn, graceful: bool) -> None:
+        """结束进程（阻塞）；管道由读取线程在进程退出（EOF）后关闭"""
+        if conn is not None and graceful:
+            try:
+                conn.send(None)
+            except OSError:
+                pass
+        if process is not None:
+            if graceful:
+                process.join(timeout=5)
+            if process.is_alive():
+                process.kill()
+                process.join(timeout=5)
+
+    async def stop(self) -> None:
+        """停止重启并优雅关闭进程"""
+        if self._restart_task is not None:
+            self._restart_task.cancel()
+            await asyncio.gather(self._restart_task, return_exceptions=True)
+        process, conn = self.process, self.conn
+        self.process, self.conn = None, None
+        await asyncio.to_thread(self._terminate, process, conn, True)
+
+
+class ASRWorkerPool:
+    """ASR 工作进程池"""
+
+    def __init__(
+        self,
+        processes: Optional[int] = None,
+        max_pending: Optional[int] = None,
+        job_timeout: Optional[float] = None,
+        concurrency: Optional[int] = None,
+        handler: Callable[[str], dict] = _transcribe_in_worker,
+        initializer: Optional[Callable[[], Optional[bool]]] = _preload_in_worker,
+    ):
+        self.processes = max(1, processes if processes is not None else settings.ASR_WORKER_PROCESSES)
+        self.max_pending = max_pending if max_pending is not None else settings.ASR_WORKER_MAX_PENDING
+        self.job_timeout = job_timeout if job_timeout is not None else settings.ASR_JOB_TIMEOUT
+        self.concurrency = max(1, concurrency if concurrency is not None else settings.ASR_WORKER_CONCURRENCY)
+        self.handler = handler
+        self.initializer = initializer
+        self.metrics = ASRPoolMetrics()
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+        self.closing = False
+        self._queue: Optional[asyncio.Queue] = None
+        self._workers: list[_Worker] = []
+        self._dispatchers: list[asyncio.Task] = []
+
+    async def start(self) -> None:
+        """启动工作进程和调度协程（模型在子进程中异步加载）"""
+        self.loop = asyncio.get_running_loop()
+        self._queue = asyncio.Queue(maxsize=self.max_pending if self.max_pending > 0 else 0)
+        # 队列与调度协程先就绪，进程启动期间提交的任务排队等待
+        for index in range(self.processes):
+            worker = _Worker(self, index)
+            self._workers.append(worker)
+            for _ in range(self.concurrency):
+                self._dispatchers.append(asyncio.create_task(self._dispatch(worker)))
+        await asyncio.gather(*(worker.start() for worker in self._workers))
+        logger.info(f"ASR worker pool started: {self.processes} processes x {self.concurrency} slots")
+
+    async def wait_ready(self, timeout: Optional[float] = None) -> bool:
+        """
+        等待所有工作进程完成初始化
+
+        Returns:
+            是否所有工作进程都成功加载了模型
+
+        Raises:
+            asyncio.TimeoutError: timeout 秒内仍有工作进程未报告就绪
+        """
+        await asyncio.wait_for(asyncio.gather(*(w.ready.wait() for w in self._workers)), timeout)
+        return all(w.init_error is None for w in self._workers)
+
+    async def submit(self, audio_path: str, on_segments: Optional[SegmentsCallback] = None) -> TranscriptResult:
+        """
+        提交转录任务并等待结果
+
+        Args:
+            audio_path: 音频文件路径
+            on_segments: 可选的渐进回调，工作进程每解码完一个窗口调用一次
+
+        Raises:
+            ASRQueueFullError: 队列已满
+            ASRError: 转录失败、超时或工作进程崩溃
+        """
+        if self._queue is None or self.closing:
+            raise ASRError("ASR 工作进程池未启动")
+
+        job = _Job(
+            job_id=uuid.uuid4().hex,
+            audio_path=audio_path,
+            future=self.loop.create_future(),
+            partials=asyncio.Queue() if on_segments is not None else None,
+        )
+        try:
+            self._queue.put_nowait(job)
+        except asyncio.QueueFull:
+            self.metrics.rejected += 1
+            raise ASRQueueFullError(f"ASR 任务队列已满（{self.max_pending}），请稍后重试")
+
+        self.metrics.submitted += 1
+        try:
+            if on_segments is None:
+                payload = await job.future
+            else:
+                payload = await relay_segments(job.future, job.partials, on_segments)
+        except ASRError:
+            self.metrics.failed += 1
+            raise
+        self.metrics.completed += 1
+        return TranscriptResult(**payload)
+
+    async def _dispatch(self, worker: _Worker) -> None:
+        """调度协程：每个工作进程槽位一个，从队列取任务交给工作进程"""
+        while True:
+            job = await self._queue.get()
+            try:
+                if job.future.done():
+                    continue
+                await worker.ready.wait()
+                started = time.monotonic()
+                self.metrics.wait_ms_total += (started - job.enqueued_at) * 1000
+                try:
+                    worker.send(job)
+                except (OSError, AttributeError) as e:
+                    worker.request_restart(ASRError(f"ASR 工作进程不可用: {e}"))
+                    continue
+
+                try:
+                    # asyncio.wait 不会取消 future，也不会吞掉本协程的取消
+                    done, _ = await asyncio.wait({job.future}, timeout=self.job_timeout)
+                    if not done:
+                        self.metrics.timeouts += 1
+                        logger.error(f"ASR job timed out after {self.job_timeout}s on worker {worker.index}")
+                        worker.expire(job, ASRError(f"ASR 任务超时（{self.job_timeout}s）"))
+                finally:
+                    self.metrics.run_ms_total += (time.monotonic() - started) * 1000
+            finally:
+                self._queue.task_done()
+
+    async def shutdown(self) -> None:
+        """停止调度并关闭所有工作进程"""
+        self.closing = True
+        for task in self._dispatchers:
+            task.cancel()
+        await asyncio.gather(*self._dispatchers, return_exceptions=True)
+        if self._queue is not None:
+            while not self._queue.empty():
+                job = self._queue.get_nowait()
+                if not job.future.done():
+                    job.future.set_exception(ASRError("ASR 工作进程池已关闭"))
+        for worker in self._workers:
+            for job in worker.inflight.values():
+                if not job.future.done():
+                    job.future.set_exception(ASRError("ASR 工作进程池已关闭"))
+            worker.inflight.clear()
+        await asyncio.gather(*(worker.stop() for worker in self._workers))
+        self._workers.clear()
+        self._dispatchers.clear()
+
+    def snapshot(self) -> dict:
+        """队列深度与任务统计"""
+        m = self.metrics
+        finished = m.completed + m.failed
+        return {
+            "processes": self.processes,
+            "ready": sum(1 for w in self._workers if w.ready and w.ready.is_set()),
+            "init_failed": sum(1 for w in self._workers if w.init_error),
+            "queue_depth": self._queue.qsize() if self._queue else 0,
+            "running": sum(len(w.inflight) for w in self._workers),
+            "submitted": m.submitted,
+            "completed": m.completed,
+            "failed": m.failed,
+            "rejected": m.rejected,
+            "timeouts": m.timeouts,
+            "restarts": m.restarts,
+            "avg_wait_ms": round(m.wait_ms_total / finished, 1) if finished else 0.0,
+            "avg_run_ms": round(m.run_ms_total / finished, 1) if finished else 0.0,
+        }
+
+
+# =============================================================================
+# Global Instance
+# =============================================================================
+
+_asr_worker_pool: Optional[ASRWorkerPool] = None
+
+
+def get_asr_worker_pool() -> Optional[ASRWorkerPool]:
+    """获取已启动的工作进程池（未启用时返回 None）"""
+    return _asr_worker_pool
+
+
+async def start_asr_worker_pool() -> ASRWorkerPool:
+    """启动全局工作进程池（应用启动时调用）"""
+    global _asr_worker_pool
+    if _asr_worker_pool is None:
+        # 先注册再启动：进程启动期间到达的转录任务进入池队列等待，而不是回退到本进程加载模型
+        pool = _asr_worker_pool = ASRWorkerPool()
+        try:
+            await pool.start()
+        except BaseException:
+            _asr_worker_pool = None
+            await pool.shutdown()
+            raise
+    return _asr_worker_pool
+
+
+async def shutdown_asr_worker_pool() -> None:
+    """关闭全局工作进程池（应用关闭时调用）"""
+    global _asr_worker_pool
+    if _asr_worker_pool is not None:
+        pool, _asr_worker_pool = _asr_worker_pool, None
+        await pool.shutdown()
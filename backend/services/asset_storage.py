@@ -34,6 +34,8 @@ from urllib.parse import urlparse
 import httpx
 
 from config import settings
+from services.blob_store import amove_asset_file, awrite_asset_bytes, get_blob_store
+from services.http_clients import get_http_client
 from utils.logger import logger
 
 
@@ -158,23 +160,22 @@ class AssetStorageService:
         headers = self._get_headers(cover_url)
 
         try:
-            async with httpx.AsyncClient(timeout=timeout, follow_redirects=True) as client:
-                response = await client.get(cover_url, headers=headers)
-                response.raise_for_status()
+            client = get_http_client("media")
+            response = await client.get(cover_url, headers=headers, timeout=timeout)
+            response.raise_for_status()
 
-                # 确定文件扩展名
-                content_type = response.headers.get("content-type", "")
-                ext = self._get_image_extension(cover_url, content_type)
-                filename = f"cover{ext}"
-                cover_path = content_dir / filename
+            # 确定文件扩展名
+            content_type = response.headers.get("content-type", "")
+            ext = self._get_image_extension(cover_url, content_type)
+            filename = f"cover{ext}"
+            cover_path = content_dir / filename
 
-                # 保存文件
-                with open(cover_path, "wb") as f:
-                    f.write(response.content)
+            # 保存文件（内容寻址去重）
+            await awrite_asset_bytes(response.content, cover_path)
 
-                logger.info(f"Cover downloaded: {cover_path} ({len(response.content)} bytes)")
+            logger.info(f"Cover downloaded: {cover_path} ({len(response.content)} bytes)")
 
-                return self.get_local_url(platform, content_id, filename)
+            return self.get_local_url(platform, content_id, filename)
 
         except httpx.TimeoutException:
             raise AssetStorageError("封面下载超时")
@@ -220,8 +221,8 @@ class AssetStorageService:
         target_path = content_dir / filename
 
         try:
-            # 移动文件（比复制快，且释放临时空间）
-            shutil.move(str(temp_path), str(target_path))
+            # 移动文件（比复制快，且释放临时空间；相同视频只保留一份 blob）
+            await amove_asset_file(temp_path, target_path)
             logger.info(f"Video persisted: {target_path}")
 
             return self.get_local_url(platform, content_id, filename)
@@ -439,3 +440,6 @@ class AssetStorageService:
         if content_dir.exists():
             shutil.rmtree(content_dir)
             logger.info(f"Content assets cleaned: {content_dir}")
+            if settings.ASSET_DEDUP_ENABLED:
+                # 回收不再被引用的 blob
+                get_blob_store().gc()
@@ -20,9 +20,21 @@
 音频提取器 - 从视频中提取音频用于 ASR
 
 使用 ffmpeg 将视频转换为 16kHz 单声道 WAV 格式
+
+支持两种模式:
+- extract: 对已下载的视频文件运行 ffmpeg
+- open_stream: 边下载边提取，视频字节流经 stdin 管道送入 ffmpeg
+
+每个视频只解码一次: ffmpeg 把 16-bit PCM 写到 stdout，由本进程写 WAV 文件，
+返回的 AudioInfo 同时携带时长/采样率元数据和内存中的 PCM，ASR 直接使用，
+不再需要 ffprobe 或二次读取解码。
 """
+import asyncio
 import subprocess
+import wave
+from dataclasses import dataclass, field
 from pathlib import Path
+from typing import List, Optional
 
 from config import settings
 from utils.logger import logger
@@ -33,13 +45,184 @@ class AudioExtractError(Exception):
     pass
 
 
+@dataclass
+class AudioInfo:
+    """提取后的音频: WAV 文件路径、头部元数据，以及可选的内存 PCM"""
+    path: str
+    sample_rate: int
+    channels: int
+    sample_width: int  # 字节数，2 表示 16-bit
+    frames: int
+    pcm: Optional[bytes] = field(default=None, repr=False)  # 小端 PCM 数据（不含 WAV 头）
+
+    @property
+    def duration(self) -> float:
+        """时长（秒）"""
+        return self.frames / self.sample_rate if self.sample_rate else 0.0
+
+
+def read_wav_info(wav_path: str) -> AudioInfo:
+    """
+    读取 WAV 头部元数据（不读取 PCM 数据，无需子进程）
+
+    Raises:
+        AudioExtractError: 不是有效的 PCM WAV 文件
+    """
+    try:
+        with wave.open(str(wav_path), "rb") as wav:
+            return AudioInfo(
+                path=str(wav_path),
+                sample_rate=wav.getframerate(),
+                channels=wav.getnchannels(),
+                sample_width=wav.getsampwidth(),
+                frames=wav.getnframes(),
+            )
+    except (wave.Error, EOFError, OSError) as e:
+        raise AudioExtractError(f"无法读取 WAV 文件: {e}")
+
+
+def write_wav(wav_path: Path, pcm: bytes, sample_rate: int, channels: int = 1) -> AudioInfo:
+    """将 16-bit PCM 写为 WAV 文件，返回携带 PCM 的 AudioInfo"""
+    with wave.open(str(wav_path), "wb") as wav:
+        wav.setnchannels(channels)
+        wav.setsampwidth(2)
+        wav.setframerate(sample_rate)
+        wav.writeframes(pcm)
+    return AudioInfo(
+        path=str(wav_path),
+        sample_rate=sample_rate,
+        channels=channels,
+        sample_width=2,
+        frames=len(pcm) // (2 * channels),
+        pcm=pcm,
+    )
+
+
+def _pcm_output_args(sample_rate: int) -> List[str]:
+    """ffmpeg 输出参数: 16-bit 单声道 PCM 写到 stdout"""
+    return [
+        "-vn",                          # 丢弃视频流
+        "-ar", str(sample_rate),        # 采样率 16000
+        "-ac", "1",                     # 单声道
+        "-f", "s16le",                  # 裸 PCM，WAV 头由本进程写入
+        "-acodec", "pcm_s16le",
+        "pipe:1",
+    ]
+
+
+def _log_audio_info(info: AudioInfo) -> None:
+    logger.info(
+        f"音频提取完成: {info.path}, 时长: {info.duration:.2f} 秒, "
+        f"大小: {len(info.pcm or b'') / 1024:.2f} KB"
+    )
+    if info.duration < 10:  # 小于 10 秒可能有问题
+        logger.warning(f"音频时长过短: {info.duration:.2f} 秒，原文件可能有问题或提取不完整")
+
+
+class StreamingAudioExtraction:
+    """
+    流式音频提取
+
+    ffmpeg 从 stdin (pipe:0) 读取视频字节流，向 stdout 输出 16kHz 单声道 PCM。
+    调用方在下载过程中逐块 feed()，下载结束后 finish() 等待 ffmpeg 收尾并写出 WAV。
+
+    注意: moov 位于文件末尾的 MP4 无法从管道解析，此时 finish() 抛出
+    AudioExtractError，调用方应回退到 extract()。
+    """
+
+    def __init__(self, audio_path: Path, sample_rate: int, timeout: float = 300):
+        self.audio_path = audio_path
+        self.sample_rate = sample_rate
+        self.timeout = timeout
+        self._process: Optional[asyncio.subprocess.Process] = None
+        self._stderr_task: Optional[asyncio.Task] = None
+        self._stdout_task: Optional[asyncio.Task] = None
+
+    async def start(self) -> None:
+        """启动 ffmpeg 进程"""
+        cmd = [
+            "ffmpeg",
+            "-hide_banner",
+            "-loglevel", "error",
+            "-i", "pipe:0",
+            *_pcm_output_args(self.sample_rate),
+        ]
+        try:
+            self._process = await asyncio.create_subprocess_exec(
+                *cmd,
+                stdin=asyncio.subprocess.PIPE,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE,
+            )
+        except FileNotFoundError:
+            raise AudioExtractError("ffmpeg 未安装或不在 PATH 中")
+
+        # 持续读取 stdout/stderr，避免管道写满导致 ffmpeg 阻塞
+        self._stdout_task = asyncio.create_task(self._process.stdout.read())
+        self._stderr_task = asyncio.create_task(self._process.stderr.read())
+        logger.info(f"开始流式提取音频: {self.audio_path}")
+
+    async def feed(self, chunk: bytes) -> None:
+        """写入一块视频数据（受 ffmpeg 消费速度反压）"""
+        try:
+            self._process.stdin.write(chunk)
+            await self._process.stdin.drain()
+        except (BrokenPipeError, ConnectionResetError):
+            stderr = await self._collect_stderr()
+            raise AudioExtractError(f"ffmpeg 提前退出: {stderr[:200]}")
+
+    async def finish(self) -> AudioInfo:
+        """关闭输入，等待 ffmpeg 完成并写出 WAV 文件"""
+        try:
+            self._process.stdin.close()
+            await self._process.stdin.wait_closed()
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+
+        try:
+            returncode = await asyncio.wait_for(self._process.wait(), timeout=self.timeout)
+        except asyncio.TimeoutError:
+            await self.abort()
+            raise AudioExtractError("音频提取超时")
+
+        pcm = await self._stdout_task
+        stderr = await self._collect_stderr()
+        if returncode != 0:
+            logger.error(f"ffmpeg 错误: {stderr[:500]}")
+            raise AudioExtractError(f"ffmpeg 执行失败: {stderr[:200]}")
+        if not pcm:
+            raise AudioExtractError("音频文件生成失败: 未解码出音频数据")
+
+        info = await asyncio.to_thread(write_wav, self.audio_path, pcm, self.sample_rate)
+        _log_audio_info(info)
+        return info
+
+    async def abort(self) -> None:
+        """终止 ffmpeg（下载失败或取消时调用）"""
+        if self._process and self._process.returncode is None:
+            self._process.kill()
+            await self._process.wait()
+        if self._stdout_task:
+            await asyncio.gather(self._stdout_task, return_exceptions=True)
+        await self._collect_stderr()
+
+    async def _collect_stderr(self) -> str:
+        if not self._stderr_task:
+            return ""
+        try:
+            data = await self._stderr_task
+        except Exception:
+            return ""
+        return data.decode("utf-8", errors="replace") if data else ""
+
+
 class AudioExtractor:
     """音频提取器"""
 
     def __init__(self):
         self.sample_rate = settings.AUDIO_SAMPLE_RATE  # 16000
 
-    def extract(self, video_path: str) -> str:
+    def extract(self, video_path: str) -> AudioInfo:
         """
         从视频中提取音频
 
@@ -47,7 +230,7 @@ class AudioExtractor:
             video_path: 视频文件路径
 
         Returns:
-            音频文件路径（WAV 格式）
+            AudioInfo: WAV 文件路径、时长等元数据及内存 PCM
 
         Raises:
             AudioExtractError: 提取失败
@@ -60,12 +243,10 @@ class AudioExtractor:
 
         cmd = [
             "ffmpeg",
+            "-hide_banner",
+            "-loglevel", "error",
             "-i", str(video_path),
-            "-ar", str(self.sample_rate),  # 采样率 16000
-            "-ac", "1",                     # 单声道
-            "-f", "wav",                    # WAV 格式
-            "-y",                           # 覆盖已存在
-            str(audio_path)
+            *_pcm_output_args(self.sample_rate),
         ]
 
         logger.info(f"开始提取音频: {video_path}")
@@ -77,7 +258,6 @@ class AudioExtractor:
                 capture_output=True,
                 timeout=300,  # 5分钟超时
             )
-            logger.info(f"音频提取成功: {audio_path}")
         except subprocess.CalledProcessError as e:
             stderr = e.stderr.decode('utf-8', errors='replace') if e.stderr else ''
             logger.error(f"ffmpeg 错误: {stderr[:500]}")
@@ -91,31 +271,29 @@ class AudioExtractor:
         except FileNotFoundError:
             raise AudioExtractError("ffmpeg 未安装或不在 PATH 中")
 
-        if not audio_path.exists():
-            raise AudioExtractError("音频文件生成失败")
+        if not result.stdout:
+            raise AudioExtractError("音频文件生成失败: 未解码出音频数据")
 
-        # 诊断：检查输出文件大小和时长
-        output_size = audio_path.stat().st_size
-        logger.info(f"音频提取完成: {audio_path}, 大小: {output_size / 1024:.2f} KB")
+        # 时长直接由 PCM 长度得出，无需 ffprobe
+        info = write_wav(audio_path, result.stdout, self.sample_rate)
+        _log_audio_info(info)
+        return info
 
-        # 检查音频时长
-        try:
-            probe_cmd = [
-                "ffprobe", "-v", "error",
-                "-show_entries", "format=duration",
-                "-of", "default=noprint_wrappers=1:nokey=1",
-                str(audio_path)
-            ]
-            probe_result = subprocess.run(probe_cmd, capture_output=True, text=True, timeout=30)
-            duration = float(probe_result.stdout.strip())
-            logger.info(f"提取的音频时长: {duration:.2f} 秒")
-
-            if duration < 10:  # 小于 10 秒可能有问题
-                logger.warning(f"音频时长过短: {duration:.2f} 秒，原文件可能有问题或提取不完整")
-        except Exception as e:
-            logger.warning(f"无法获取音频时长: {e}")
-
-        return str(audio_path)
+    async def open_stream(self, output_dir: str) -> StreamingAudioExtraction:
+        """
+        启动流式音频提取
+
+        Args:
+            output_dir: 输出目录，音频写入 {output_dir}/audio.wav
+
+        Returns:
+            已启动的 StreamingAudioExtraction
+        """
+        audio_path = Path(output_dir) / "audio.wav"
+        audio_path.parent.mkdir(parents=True, exist_ok=True)
+        extraction = StreamingAudioExtraction(audio_path, self.sample_rate)
+        await extraction.start()
+        return extraction
 
     def check_ffmpeg_available(self) -> bool:
         """检查 ffmpeg 是否可用"""
@@ -0,0 +1,518 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2026 relakkes@gmail.com
+#
+# This file is part of MediaCrawlerPro-ContentRemixAgent project.
+# Repository: https://github.com/MediaCrawlerPro/MediaCrawlerPro-ContentRemixAgent/blob/main/backend/services/blob_store.py
+# GitHub: https://github.com/NanmiCoder
+# Licensed under NON-COMMERCIAL LEARNING LICENSE 1.1
+#
+# 声明：本代码仅供学习和研究目的使用。使用者应遵守以下原则：
+# 1. 不得用于任何商业用途。
+# 2. 使用时应遵守目标平台的使用条款和robots.txt规则。
+# 3. 不得进行大规模爬取或对平台造成运营干扰。
+# 4. 应合理控制请求频率，避免给目标平台带来不必要的负担。
+# 5. 不得用于任何非法或不当的用途。
+#
+# 详细许可条款请参阅项目根目录下的LICENSE文件。
+# 使用本代码即表示您同意遵守上述原则和LICENSE中的所有条款。
+
+"""
+内容寻址资源存储 - 相同字节只落盘一次
+
+布局:
+- Blob:   {ASSET_BLOB_DIR}/{sha256[:2]}/{sha256}
+- 引用:   {ASSET_BLOB_DIR}/index.sqlite3 (path -> digest)
+- 对外路径保持不变（assets/{platform}/{content_id}/... 与 uploads/...），
+  通过硬链接（回退符号链接/复制）从 blob 物化出来，URL 布局无需改动
+
+写入流程:
+1. 计算 sha256
+2. blob 已存在则直接复用（去重），否则原子写入 blob
+3. 在目标路径物化链接（临时链接 + os.replace，原子替换）
+4. 记录引用
+
+注意: 物化出的硬链接与 blob 共享 inode，不允许原地改写，
+      需要更新内容时应重新调用 put_* 写入。
+      ASSETS_DIR 经 /media 公开访问，blob 目录必须位于其外（同一文件系统以便硬链接），
+      否则索引与全部 blob 可被直接下载，启动时由 ensure_blob_dir_private 校验。
+"""
+
+import asyncio
+import hashlib
+import os
+import shutil
+import sqlite3
+import threading
+import time
+import uuid
+from contextlib import closing
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterator, Optional, Union
+
+from config import settings
+from utils.logger import logger
+
+PathLike = Union[str, Path]
+
+_HASH_CHUNK_SIZE = 1024 * 1024
+
+# 参与就地去重的媒体文件类型（仅经由 blob 存储写入，不会被原地改写）
+DEDUPE_SUFFIXES = {
+    ".jpg", ".jpeg", ".png", ".gif", ".webp",
+    ".mp4", ".flv", ".webm", ".m4s", ".mov",
+    ".mp3", ".wav", ".m4a", ".aac", ".ogg",
+}
+
+
+class BlobStoreError(Exception):
+    """内容寻址存储错误"""
+    pass
+
+
+@dataclass
+class BlobRef:
+    """一次写入的结果"""
+    digest: str
+    size: int
+    path: str
+    deduplicated: bool  # True 表示复用了已有 blob，未新增磁盘占用
+
+
+@dataclass
+class BlobStoreStats:
+    """存储统计"""
+    blob_count: int
+    ref_count: int
+    logical_bytes: int   # 所有引用的文件大小之和（无去重时的占用）
+    physical_bytes: int  # blob 实际占用
+
+    @property
+    def reclaimed_bytes(self) -> int:
+        """去重节省的磁盘空间"""
+        return max(0, self.logical_bytes - self.physical_bytes)
+
+
+def _hash_file(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(_HASH_CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class ContentAddressedStore:
+    """内容寻址存储（sha256 命名 blob + 引用索引）"""
+
+    def __init__(self, blob_dir: Optional[str] = None, link_mode: Optional[str] = None):
+        self.blob_dir = Path(blob_dir or settings.ASSET_BLOB_DIR)
+        self.link_mode = (link_mode or settings.ASSET_LINK_MODE).lower()
+        self.index_path = self.blob_dir / "index.sqlite3"
+        self._lock = threading.Lock()
+        self._initialized = False
+
+    # -------------------------------------------------------------------------
+    # 内部工具
+    # -------------------------------------------------------------------------
+
+    def _connect(self) -> sqlite3.Connection:
+        if not self._initialized:
+            self.blob_dir.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(str(self.index_path), timeout=30)
+        if not self._initialized:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS blob_refs (
+                    path TEXT PRIMARY KEY,
+                    digest TEXT NOT NULL,
+                    size INTEGER NOT NULL,
+                    created_at REAL NOT NULL
+                )
+                """
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_blob_refs_digest ON blob_refs (digest)")
+            conn.commit()
+            self._initialized = True
+        return conn
+
+    def blob_path(self, digest: str) -> Path:
+        return self.blob_dir / digest[:2] / digest
+
+    @staticmethod
+    def _ref_key(target_path: Path) -> str:
+        return str(target_path.resolve())
+
+    def _tmp_sibling(self, path: Path) -> Path:
+        return path.with_name(f".{path.name}.{uuid.uuid4().hex}.tmp")
+
+    def _ensure_blob_from_bytes(self, digest: str, payload: bytes) -> bool:
+        """确保 blob 存在，返回是否复用了已有 blob"""
+        blob = self.blob_path(digest)
+        if blob.exists():
+            return True
+        blob.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self._tmp_sibling(blob)
+        with open(tmp, "wb") as f:
+            f.write(payload)
+        os.replace(tmp, blob)
+        return False
+
+    def _ensure_blob_from_file(self, digest: str, source: Path, mode: str) -> bool:
+        """
+        确保 blob 存在，返回是否复用了已有 blob
+
+        mode: move (移入 blob) / copy (复制) / link (硬链接，用于就地去重)
+        """
+        blob = self.blob_path(digest)
+        if blob.exists():
+            if mode == "move":
+                source.unlink()
+            return True
+        blob.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self._tmp_sibling(blob)
+        if mode == "move":
+            shutil.move(str(source), str(tmp))
+        elif mode == "link":
+            try:
+                os.link(source, tmp)
+            except OSError:
+                shutil.copyfile(str(source), str(tmp))
+        else:
+            shutil.copyfile(str(source), str(tmp))
+        os.replace(tmp, blob)
+        return False
+
+    def _materialize(self, blob: Path, target: Path) -> None:
+        """在目标路径物化 blob（原子替换已有文件）"""
+        target.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self._tmp_sibling(target)
+        try:
+            if self.link_mode == "hardlink":
+                try:
+                    os.link(blob, tmp)
+                except OSError:
+                    # 跨文件系统等情况回退到符号链接
+                    os.symlink(blob.resolve(), tmp)
+            elif self.link_mode == "symlink":
+                os.symlink(blob.resolve(), tmp)
+            else:
+                shutil.copyfile(str(blob), str(tmp))
+            os.replace(tmp, target)
+        except OSError as e:
+            try:
+                tmp.unlink()
+            except OSError:
+                pass
+            raise BlobStoreError(f"物化资源失败: {target} ({e})") from e
+
+    def _record_ref(self, target: Path, digest: str, size: int) -> None:
+        with self._lock, closing(self._connect()) as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO blob_refs (path, digest, size, created_at) VALUES (?, ?, ?, ?)",
+                (self._ref_key(target), digest, size, time.time()),
+            )
+            conn.commit()
+
+    # -------------------------------------------------------------------------
+    # 公开接口
+    # -------------------------------------------------------------------------
+
+    def put_bytes(self, payload: bytes, target_path: PathLike) -> BlobRef:
+        """写入字节数据并物化到 target_path"""
+        target = Path(target_path)
+        digest = hashlib.sha256(payload).hexdigest()
+        try:
+            deduplicated = self._ensure_blob_from_bytes(digest, payload)
+        except OSError as e:
+            raise BlobStoreError(f"写入 blob 失败: {e}") from e
+        self._materialize(self.blob_path(digest), target)
+        self._record_ref(target, digest, len(payload))
+        if deduplicated:
+            logger.debug(f"Blob dedup hit: {target} -> {digest[:12]} ({len(payload)} bytes)")
+        return BlobRef(digest=digest, size=len(payload), path=str(target), deduplicated=deduplicated)
+
+    def put_file(self, source_path: PathLike, target_path: PathLike, move: bool = True) -> BlobRef:
+        """
+        写入已有文件并物化到 target_path
+
+        Args:
+            source_path: 源文件
+            target_path: 目标路径（可与源路径相同，用于就地去重）
+            move: True 时源文件被移入 blob（或在去重时删除），False 时复制
+        """
+        source = Path(source_path)
+        target = Path(target_path)
+        if not source.exists():
+            raise BlobStoreError(f"源文件不存在: {source}")
+
+        try:
+            size = source.stat().st_size
+            digest = _hash_file(source)
+            if source.resolve() == target.resolve():
+                # 就地去重时源文件即目标文件，由 _materialize 原子替换，不能提前删除
+                mode = "link"
+            else:
+                mode = "move" if move else "copy"
+            deduplicated = self._ensure_blob_from_file(digest, source, mode)
+        except OSError as e:
+            raise BlobStoreError(f"写入 blob 失败: {e}") from e
+
+        self._materialize(self.blob_path(digest), target)
+        self._record_ref(target, digest, size)
+        return BlobRef(digest=digest, size=size, path=str(target), deduplicated=deduplicated)
+
+    def link(self, digest: str, target_path: PathLike) -> Optional[BlobRef]:
+        """
+        把已有 blob 物化到 target_path 并记录引用（不重新写入字节）
+
+        Returns:
+            blob 不存在（已被 gc 回收）时返回 None
+        """
+        target = Path(target_path)
+        blob = self.blob_path(digest)
+        try:
+            size = blob.stat().st_size
+        except OSError:
+            return None
+        self._materialize(blob, target)
+        self._record_ref(target, digest, size)
+        return BlobRef(digest=digest, size=size, path=str(target), deduplicated=True)
+
+    def lookup(self, target_path: PathLike) -> Optional[str]:
+        """
+        查询目标路径当前对应的 blob 摘要，免去重新哈希整个文件
+
+        Returns:
+            目标文件仍是所记录 blob 的链接时返回其 sha256，否则（无引用、已被替换、
+            copy 模式无法校验）返回 None
+        """
+        target = Path(target_path)
+        if self.link_mode == "copy":
+            return None
+        with self._lock, closing(self._connect()) as conn:
+            row = conn.execute(
+                "SELECT digest FROM blob_refs WHERE path = ?", (self._ref_key(target),)
+            ).fetchone()
+        if row is None:
+            return None
+        try:
+            return row[0] if os.path.samefile(target, self.blob_path(row[0])) else None
+        except OSError:
+            return None
+
+    def release(self, target_path: PathLike) -> bool:
+        """删除物化文件及其引用（blob 在 gc 时回收）"""
+        target = Path(target_path)
+        with self._lock, closing(self._connect()) as conn:
+            cursor = conn.execute("DELETE FROM blob_refs WHERE path = ?", (self._ref_key(target),))
+            conn.commit()
+            removed = cursor.rowcount > 0
+        try:
+            target.unlink()
+        except FileNotFoundError:
+            pass
+        return removed
+
+    def gc(self) -> int:
+        """
+        回收无引用的 blob
+
+        先清理失效引用（目标文件已被外部删除或被替换为其他内容），
+        再删除不再被引用的 blob。
+
+        Returns:
+            释放的字节数
+        """
+        freed = 0
+        with self._lock, closing(self._connect()) as conn:
+            rows = conn.execute("SELECT path, digest FROM blob_refs").fetchall()
+            stale = []
+            for path, digest in rows:
+                target = Path(path)
+                blob = self.blob_path(digest)
+                try:
+                    valid = target.exists() and (
+                        os.path.samefile(target, blob) or self.link_mode == "copy"
+                    )
+                except OSError:
+                    valid = False
+                if not valid:
+                    stale.append((path,))
+            if stale:
+                conn.executemany("DELETE FROM blob_refs WHERE path = ?", stale)
+                conn.commit()
+
+            referenced = {row[0] for row in conn.execute("SELECT DISTINCT digest FROM blob_refs")}
+
+        for blob in self._iter_blobs():
+            if blob.name in referenced:
+                continue
+            try:
+                size = blob.stat().st_size
+                blob.unlink()
+                freed += size
+            except OSError as e:
+                logger.warning(f"Blob gc failed: {blob} ({e})")
+
+        if freed:
+            logger.info(f"Blob gc freed {freed / 1024 / 1024:.2f} MB")
+        return freed
+
+    def stats(self) -> BlobStoreStats:
+        """统计引用与实际占用"""
+        with self._lock, closing(self._connect()) as conn:
+            ref_count, logical_bytes = conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM blob_refs"
+            ).fetchone()
+
+        blob_count = 0
+        physical_bytes = 0
+        for blob in self._iter_blobs():
+            try:
+                physical_bytes += blob.stat().st_size
+                blob_count += 1
+            except OSError:
+                continue
+
+        return BlobStoreStats(
+            blob_count=blob_count,
+            ref_count=ref_count,
+            logical_bytes=logical_bytes,
+            physical_bytes=physical_bytes,
+        )
+
+    def dedupe_tree(self, root: PathLike) -> BlobStoreStats:
+        """
+        对已有目录做就地去重（迁移旧数据）
+
+        遍历 root 下的媒体文件，纳入 blob 存储并以链接替换原文件。
+        已是 blob 链接的文件会被跳过；元数据等会被原地改写的文件
+        （metadata.md、*.json、压缩图）不参与去重，避免改写共享 inode。
+
+        Returns:
+            去重后的存储统计
+        """
+        root_path = Path(root).resolve()
+        blob_root = self.blob_dir.resolve()
+
+        for path in sorted(root_path.rglob("*")):
+            if not path.is_file() or path.is_symlink() or path.name.startswith("."):
+                continue
+            if path.suffix.lower() not in DEDUPE_SUFFIXES or "_compressed" in path.stem:
+                continue
+            if blob_root in path.resolve().parents:
+                continue
+            if path.stat().st_nlink > 1:
+                # 已与 blob 共享 inode
+                continue
+            try:
+                self.put_file(path, path, move=True)
+            except BlobStoreError as e:
+                logger.warning(f"Dedupe skipped {path}: {e}")
+
+        return self.stats()
+
+    def _iter_blobs(self) -> Iterator[Path]:
+        if not self.blob_dir.exists():
+            return
+        for shard in self.blob_dir.iterdir():
+            if not shard.is_dir() or len(shard.name) != 2:
+                continue
+            for blob in shard.iterdir():
+                if blob.is_file() and not blob.name.startswith("."):
+                    yield blob
+
+
+# =============================================================================
+# 便捷函数（根据 ASSET_DEDUP_ENABLED 自动选择去重或直接写入）
+# =============================================================================
+
+_blob_store: Optional[ContentAddressedStore] = None
+
+
+def ensure_blob_dir_private(
+    blob_dir: Optional[PathLike] = None,
+    assets_dir: Optional[PathLike] = None,
+) -> None:
+    """
+    校验 blob 目录不在公开的资源目录内
+
+    Raises:
+        BlobStoreError: blob 目录位于 ASSETS_DIR 之下（或与之相同）
+    """
+    blob_path = Path(blob_dir or settings.ASSET_BLOB_DIR).resolve()
+    assets_path = Path(assets_dir or settings.ASSETS_DIR).resolve()
+    if blob_path == assets_path or assets_path in blob_path.parents:
+        raise BlobStoreError(
+            f"ASSET_BLOB_DIR ({blob_path}) 位于公开资源目录 ASSETS_DIR ({assets_path}) 内，"
+            "blob 与索引会经 /media 暴露，请改为其外的目录（如 ./data/blobs）"
+        )
+    # 旧版默认位置 {ASSETS_DIR}/.blobs 仍存在时同样会被公开访问，需先迁移
+    legacy_path = assets_path / ".blobs"
+    if legacy_path.exists():
+        raise BlobStoreError(
+            f"发现旧版 blob 目录 {legacy_path}（经 /media 公开访问），"
+            f"请将其移动到 ASSET_BLOB_DIR ({blob_path}) 后再启动"
+        )
+
+
+def get_blob_store() -> ContentAddressedStore:
+    """获取内容寻址存储实例 (单例)"""
+    global _blob_store
+    if _blob_store is None:
+        ensure_blob_dir_private()
+        _blob_store = ContentAddressedStore()
+    return _blob_store
+
+
+def write_asset_bytes(payload: bytes, target_path: PathLike) -> Optional[BlobRef]:
+    """写入资源文件（启用去重时经由 blob 存储，返回 blob 引用；直接写入时返回 None）"""
+    target = Path(target_path)
+    if settings.ASSET_DEDUP_ENABLED:
+        try:
+            return get_blob_store().put_bytes(payload, target)
+        except BlobStoreError as e:
+            logger.warning(f"Blob store write failed, falling back to plain write: {e}")
+    target.parent.mkdir(parents=True, exist_ok=True)
+    with open(target, "wb") as f:
+        f.write(payload)
+    return None
+
+
+def file_digest(path: PathLike) -> str:
+    """
+    计算文件 sha256
+
+    经由 blob 存储写入、仍链接到 blob 的文件直接取索引中的摘要，否则分块读取计算，不整体读入内存。
+    """
+    if settings.ASSET_DEDUP_ENABLED:
+        try:
+            digest = get_blob_store().lookup(path)
+            if digest:
+                return digest
+        except (BlobStoreError, sqlite3.Error, OSError) as e:
+            logger.warning(f"Blob store lookup failed, hashing file: {e}")
+    return _hash_file(Path(path))
+
+
+async def awrite_asset_bytes(payload: bytes, target_path: PathLike) -> Optional[BlobRef]:
+    """异步写入资源文件（sha256 计算与 SQLite 索引写入可能阻塞，放到线程池执行）"""
+    return await asyncio.to_thread(write_asset_bytes, payload, target_path)
+
+
+def move_asset_file(source_path: PathLike, target_path: PathLike) -> None:
+    """移动文件到资源目录（启用去重时经由 blob 存储）"""
+    if settings.ASSET_DEDUP_ENABLED:
+        try:
+            get_blob_store().put_file(source_path, target_path, move=True)
+            return
+        except BlobStoreError as e:
+            logger.warning(f"Blob store move failed, falling back to plain move: {e}")
+    Path(target_path).parent.mkdir(parents=True, exist_ok=True)
+    shutil.move(str(source_path), str(target_path))
+
+
+async def amove_asset_file(source_path: PathLike, target_path: PathLike) -> None:
+    """异步移动文件到资源目录（整文件哈希放到线程池执行）"""
+    await asyncio.to_thread(move_asset_file, source_path, target_path)
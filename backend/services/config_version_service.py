@@ -0,0 +1,232 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2026 relakkes@gmail.com
+#
+# This file is part of MediaCrawlerPro-ContentRemixAgent project.
+# Repository: https://github.com/MediaCrawlerPro/MediaCrawlerPro-ContentRemixAgent/blob/main/backend/services/config_version_service.py
+# GitHub: https://github.com/NanmiCoder
+# Licensed under NON-COMMERCIAL LEARNING LICENSE 1.1
+#
+# 声明：本代码仅供学习和研究目的使用。使用者应遵守以下原则：
+# 1. 不得用于任何商业用途。
+# 2. 使用时应遵守目标平台的使用条款和robots.txt规则。
+# 3. 不得进行大规模爬取或对平台造成运营干扰。
+# 4. 应合理控制请求频率，避免给目标平台带来不必要的负担。
+# 5. 不得用于任何非法或不当的用途。
+#
+# 详细许可条款请参阅项目根目录下的LICENSE文件。
+# 使用本代码即表示您同意遵守上述原则和LICENSE中的所有条款。
+
+
+"""
+配置版本服务 - 多 worker 进程内缓存的失效通知
+
+insight mode 配置、mode prompt、意图关键词都缓存在各 worker 的进程内存中，
+管理后台的修改只会清空当前 worker 的缓存。本服务在 config_versions 表中为每个
+作用域维护一个版本号:
+
+- 配置变更时调用 bump(scope)，版本号 +1，当前 worker 立即失效
+- 每个 worker 后台每 CONFIG_VERSION_POLL_INTERVAL 秒查询一次版本表（主键小表），
+  发现版本变化后递增本地 generation
+- 缓存写入时记录 generation(scope)，读取时用 is_fresh() 判断；请求路径上只有内存比较，不产生额外查询
+- 轮询正常时缓存不再按 TTL 过期（版本号已能感知变更）；轮询未启动或失败时回退到原有 TTL
+- 无法在读取时重新加载的缓存（如同步的 mode prompt 中间件）可通过 subscribe() 在变更后主动刷新
+"""
+
+import asyncio
+import time
+from typing import Awaitable, Callable, Dict, List, Optional, Set
+
+import aiomysql
+
+from config import settings
+from utils.logger import logger
+
+
+INSIGHT_MODES_SCOPE = "insight_modes"
+
+
+class ConfigVersionService:
+    """配置版本轮询与本地 generation 管理"""
+
+    def __init__(self, poll_interval: Optional[float] = None):
+        self.poll_interval = poll_interval if poll_interval is not None else settings.CONFIG_VERSION_POLL_INTERVAL
+        self._pool: Optional[aiomysql.Pool] = None
+        self._seen: Dict[str, int] = {}        # 最近一次看到的数据库版本号
+        self._generations: Dict[str, int] = {}  # 本地 generation，任何已知变更都会递增
+        self._subscribers: Dict[str, List[Callable[[], Awaitable[object]]]] = {}
+        self._callback_tasks: Set[asyncio.Task] = set()
+        self._task: Optional[asyncio.Task] = None
+        self._poll_failed = False
+
+    async def _get_pool(self) -> aiomysql.Pool:
+        """获取 Agent 数据库连接池"""
+        if self._pool is None:
+            self._pool = await aiomysql.create_pool(
+                host=settings.AGENT_DB_HOST or "localhost",
+                port=settings.AGENT_DB_PORT or 3306,
+                user=settings.AGENT_DB_USER or "root",
+                password=settings.AGENT_DB_PASSWORD or "",
+                db=settings.AGENT_DB_NAME,
+                charset="utf8mb4",
+                autocommit=True,
+                minsize=1,
+                maxsize=2,
+            )
+        return self._pool
+
+    async def _fetch_versions(self) -> Dict[str, int]:
+        pool = await self._get_pool()
+        async with pool.acquire() as conn:
+            async with conn.cursor() as cursor:
+                await cursor.execute("SELECT scope, version FROM config_versions")
+                rows = await cursor.fetchall()
+        return {scope: int(version) for scope, version in rows}
+
+    async def _increment(self, scope: str) -> int:
+        pool = await self._get_pool()
+        async with pool.acquire() as conn:
+            async with conn.cursor() as cursor:
+                await cursor.execute(
+                    """
+                    INSERT INTO config_versions (scope, version) VALUES (%s, 1)
+                    ON DUPLICATE KEY UPDATE version = version + 1
+                    """,
+                    (scope,),
+                )
+                await cursor.execute("SELECT version FROM config_versions WHERE scope = %s", (scope,))
+                row = await cursor.fetchone()
+        return int(row[0]) if row else 0
+
+    # -------------------------------------------------------------------------
+    # 公开接口
+    # -------------------------------------------------------------------------
+
+    def generation(self, scope: str) -> int:
+        """当前 worker 观察到的配置 generation（纯内存读取）"""
+        return self._generations.get(scope, 0)
+
+    @property
+    def healthy(self) -> bool:
+        """后台轮询是否在正常运行"""
+        return self._task is not None and not self._task.done() and not self._poll_failed
+
+    def is_fresh(self, scope: str, generation: int, filled_at: float, ttl: float) -> bool:
+        """
+        判断缓存是否仍然有效
+
+        Args:
+            generation: 缓存写入时的 generation(scope)
+            filled_at: 缓存写入时间 (time.time())
+            ttl: 轮询不可用时的兜底 TTL（秒）
+        """
+        if generation != self.generation(scope):
+            return False
+        if self.healthy:
+            return True
+        return (time.time() - filled_at) < ttl
+
+    def subscribe(self, scope: str, callback: Callable[[], Awaitable[object]]) -> None:
+        """注册变更回调（协程函数），generation 变化后在后台执行"""
+        self._subscribers.setdefault(scope, []).append(callback)
+
+    def _advance(self, scope: str) -> None:
+        self._generations[scope] = self._generations.get(scope, 0) + 1
+        callbacks = self._subscribers.get(scope)
+        if not callbacks:
+            return
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        for callback in callbacks:
+            task = asyncio.create_task(self._run_callback(scope, callback))
+            self._callback_tasks.add(task)
+            task.add_done_callback(self._callback_tasks.discard)
+
+    @staticmethod
+    async def _run_callback(scope: str, callback: Callable[[], Awaitable[object]]) -> None:
+        try:
+            await callback()
+        except Exception as e:
+            logger.warning(f"Config change callback failed for {scope}: {e}")
+
+    async def bump(self, scope: str) -> None:
+        """
+        标记配置已变更
+
+        当前 worker 立即失效；写入版本表后其他 worker 在下一次轮询时失效。
+        版本表不可用时只影响本 worker，其他 worker 依赖缓存 TTL。
+
+        不在此处记录新版本号: 递增结果可能同时包含其他 worker 尚未被本 worker 轮询到的变更，
+        记录后本 worker 会漏掉那次失效。本 worker 的下一次轮询会把自己的变更再失效一次，
+        代价只是多一次缓存重载。
+        """
+        self._advance(scope)
+        try:
+            await self._increment(scope)
+        except Exception as e:
+            logger.warning(f"Config version bump failed for {scope}: {e}")
+
+    def apply_versions(self, versions: Dict[str, int]) -> None:
+        """合并一次轮询结果，版本号变化的作用域递增 generation"""
+        for scope, version in versions.items():
+            if self._seen.get(scope) != version:
+                if scope in self._seen:
+                    logger.info(f"Config version changed: {scope} -> {version}")
+                self._seen[scope] = version
+                self._advance(scope)
+
+    async def poll_once(self) -> None:
+        try:
+            versions = await self._fetch_versions()
+        except Exception as e:
+            if not self._poll_failed:
+                logger.warning(f"Config version poll failed: {e}")
+            self._poll_failed = True
+            return
+        self._poll_failed = False
+        self.apply_versions(versions)
+
+    async def start(self) -> None:
+        """读取初始版本并启动后台轮询（应在缓存预加载之前调用）"""
+        if self._task is not None:
+            return
+        try:
+            self._seen = await self._fetch_versions()
+        except Exception as e:
+            logger.warning(f"Config version table unavailable, caches fall back to TTL: {e}")
+            self._poll_failed = True
+        self._task = asyncio.create_task(self._run(), name="config-version-poller")
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.poll_interval)
+            await self.poll_once()
+
+    async def aclose(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self._pool is not None:
+            self._pool.close()
+            await self._pool.wait_closed()
+            self._pool = None
+
+
+# =============================================================================
+# Global Instance (Lazy Initialization)
+# =============================================================================
+
+_config_version_service: Optional[ConfigVersionService] = None
+
+
+def get_config_version_service() -> ConfigVersionService:
+    """获取配置版本服务实例 (单例)"""
+    global _config_version_service
+    if _config_version_service is None:
+        _config_version_service = ConfigVersionService()
+    return _config_version_service
@@ -28,6 +28,7 @@ import httpx
 
 from config import settings
 from schemas import Platform, ContentType, ContentParseResponse
+from services.http_clients import get_http_client
 from utils.logger import logger
 
 
@@ -82,14 +83,14 @@ class DownloadServerClient:
             DownloadServerError: 服务不可用
         """
         try:
-            async with httpx.AsyncClient(timeout=10) as client:
-                response = await client.get(f"{self.base_url}/ping")
-                response.raise_for_status()
-                data = response.json()
-
-                if data.get("biz_code") == 0:
-                    return True
-                raise DownloadServerError(f"DownloadServer 返回错误: {data.get('msg')}")
+            client = get_http_client("download_server")
+            response = await client.get(f"{self.base_url}/ping", timeout=10)
+            response.raise_for_status()
+            data = response.json()
+
+            if data.get("biz_code") == 0:
+                return True
+            raise DownloadServerError(f"DownloadServer 返回错误: {data.get('msg')}")
         except httpx.TimeoutException:
             raise DownloadServerError(f"DownloadServer 连接超时: {self.base_url}")
         except httpx.ConnectError:
@@ -170,16 +171,17 @@ class DownloadServerClient:
             raise DownloadServerError(f"未知平台: {platform}")
 
         try:
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                response = await client.post(
-                    f"{self.base_url}/api/v1/content_detail",
-                    json={
-                        "platform": api_platform,
-                        "content_url": url,
-                    }
-                )
-                response.raise_for_status()
-                data = response.json()
+            client = get_http_client("download_server")
+            response = await client.post(
+                f"{self.base_url}/api/v1/content_detail",
+                json={
+                    "platform": api_platform,
+                    "content_url": url,
+                },
+                timeout=self.timeout,
+            )
+            response.raise_for_status()
+            data = response.json()
 
         except httpx.TimeoutException:
             raise DownloadServerError(f"请求超时: {self.base_url}")
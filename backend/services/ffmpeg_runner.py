@@ -0,0 +1,150 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2026 relakkes@gmail.com
+#
+# This file is part of MediaCrawlerPro-ContentRemixAgent project.
+# Repository: https://github.com/MediaCrawlerPro/MediaCrawlerPro-ContentRemixAgent/blob/main/backend/services/ffmpeg_runner.py
+# GitHub: https://github.com/NanmiCoder
+# Licensed under NON-COMMERCIAL LEARNING LICENSE 1.1
+#
+# 声明：本代码仅供学习和研究目的使用。使用者应遵守以下原则：
+# 1. 不得用于任何商业用途。
+# 2. 使用时应遵守目标平台的使用条款和robots.txt规则。
+# 3. 不得进行大规模爬取或对平台造成运营干扰。
+# 4. 应合理控制请求频率，避免给目标平台带来不必要的负担。
+# 5. 不得用于任何非法或不当的用途。
+#
+# 详细许可条款请参阅项目根目录下的LICENSE文件。
+# 使用本代码即表示您同意遵守上述原则和LICENSE中的所有条款。
+
+
+"""
+异步 ffmpeg 子进程执行层
+
+素材剪辑/转码原先在同步方法里调用 subprocess.run，输入先写临时文件、输出再读回内存；
+被异步路由直接调用时，一次长时间裁剪会卡住整个事件循环。这里统一改为:
+
+- asyncio.create_subprocess_exec 启动 ffmpeg，等待期间不阻塞事件循环
+- 输入/输出优先经 stdin/stdout 管道传输；需要随机访问的容器格式
+  （MP4/MOV 的 moov 索引、faststart 输出等）由调用方改用临时文件
+- 超时（FFMPEG_TIMEOUT）或调用方取消时终止子进程，不留孤儿进程
+- 本进程内同时运行的 ffmpeg 数受 FFMPEG_MAX_PROCESSES 限制
+"""
+
+import asyncio
+from dataclasses import dataclass
+from typing import Optional, Sequence, Tuple
+
+from config import settings
+from utils.logger import logger
+
+
+# 可从管道顺序读取的输入容器（MP4/MOV 等的 moov 可能在文件末尾，需要临时文件）
+PIPE_INPUT_EXTS = frozenset({
+    ".wav", ".mp3", ".ogg", ".oga", ".opus", ".webm", ".mkv", ".flac", ".aac", ".ts", ".flv",
+})
+
+# 可直接写到管道的输出格式: 扩展名 -> ffmpeg muxer
+PIPE_OUTPUT_FORMATS = {
+    ".mp3": "mp3",
+    ".ogg": "ogg",
+    ".opus": "opus",
+    ".flac": "flac",
+    ".aac": "adts",
+    ".webm": "webm",
+}
+
+
+class FFmpegError(Exception):
+    """ffmpeg 执行失败（含超时）"""
+
+    def __init__(self, message: str, stderr: str = ""):
+        super().__init__(message)
+        self.stderr = stderr
+
+
+@dataclass
+class FFmpegResult:
+    """ffmpeg 执行结果"""
+    stdout: bytes
+    stderr: str
+
+
+def can_pipe_input(ext: str) -> bool:
+    """该扩展名的输入能否经 stdin 管道送入 ffmpeg"""
+    return (ext or "").lower() in PIPE_INPUT_EXTS
+
+
+def pipe_output_format(ext: str) -> Optional[str]:
+    """该扩展名的输出能否写到 stdout 管道，能则返回 muxer 名称"""
+    return PIPE_OUTPUT_FORMATS.get((ext or "").lower())
+
+
+_semaphore: Optional[Tuple[asyncio.AbstractEventLoop, asyncio.Semaphore]] = None
+
+
+def _process_semaphore() -> asyncio.Semaphore:
+    """当前事件循环上的进程数信号量（事件循环更换时重建）"""
+    global _semaphore
+    loop = asyncio.get_running_loop()
+    if _semaphore is None or _semaphore[0] is not loop:
+        _semaphore = (loop, asyncio.Semaphore(max(1, settings.FFMPEG_MAX_PROCESSES)))
+    return _semaphore[1]
+
+
+async def _terminate(process: asyncio.subprocess.Process) -> None:
+    if process.returncode is None:
+        try:
+            process.kill()
+        except ProcessLookupError:
+            pass
+        await process.wait()
+
+
+async def run_ffmpeg(
+    args: Sequence[str],
+    *,
+    input_bytes: Optional[bytes] = None,
+    timeout: Optional[float] = None,
+) -> FFmpegResult:
+    """
+    执行 ffmpeg
+
+    Args:
+        args: ffmpeg 之后的参数（不含可执行文件名）；使用管道时输入写 pipe:0、输出写 pipe:1
+        input_bytes: 写入 stdin 的数据，None 表示不使用 stdin
+        timeout: 超时秒数，默认 FFMPEG_TIMEOUT
+
+    Returns:
+        FFmpegResult（stdout 为输出字节，未使用管道输出时为空）
+
+    Raises:
+        FFmpegError: ffmpeg 不存在、退出码非 0 或超时
+    """
+    limit = timeout if timeout is not None else settings.FFMPEG_TIMEOUT
+    cmd = ["ffmpeg", "-y", "-hide_banner", "-loglevel", "error", *args]
+
+    async with _process_semaphore():
+        try:
+            process = await asyncio.create_subprocess_exec(
+                *cmd,
+                stdin=asyncio.subprocess.PIPE if input_bytes is not None else asyncio.subprocess.DEVNULL,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE,
+            )
+        except FileNotFoundError as e:
+            raise FFmpegError("ffmpeg 未安装或不在 PATH 中") from e
+
+        try:
+            # communicate 同时写 stdin、读 stdout/stderr，避免任一管道写满互相阻塞
+            stdout, stderr = await asyncio.wait_for(process.communicate(input_bytes), timeout=limit)
+        except asyncio.TimeoutError:
+            logger.warning(f"ffmpeg timed out after {limit}s: {' '.join(cmd[:12])}")
+            raise FFmpegError(f"ffmpeg 执行超时（{limit} 秒）")
+        finally:
+            # 超时或调用方取消时终止进程
+            await _terminate(process)
+
+    stderr_text = (stderr or b"").decode("utf-8", errors="replace")
+    if process.returncode != 0:
+        raise FFmpegError(f"ffmpeg 退出码 {process.returncode}", stderr_text)
+    return FFmpegResult(stdout=stdout or b"", stderr=stderr_text)
@@ -0,0 +1,296 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2026 relakkes@gmail.com
+#
+# This file is part of MediaCrawlerPro-ContentRemixAgent project.
+# Repository: https://github.com/MediaCrawlerPro/MediaCrawlerPro-ContentRemixAgent/blob/main/backend/services/http_clients.py
+# GitHub: https://github.com/NanmiCoder
+# Licensed under NON-COMMERCIAL LEARNING LICENSE 1.1
+#
+# 声明：本代码仅供学习和研究目的使用。使用者应遵守以下原则：
+# 1. 不得用于任何商业用途。
+# 2. 使用时应遵守目标平台的使用条款和robots.txt规则。
+# 3. 不得进行大规模爬取或对平台造成运营干扰。
+# 4. 应合理控制请求频率，避免给目标平台带来不必要的负担。
+# 5. 不得用于任何非法或不当的用途。
+#
+# 详细许可条款请参阅项目根目录下的LICENSE文件。
+# 使用本代码即表示您同意遵守上述原则和LICENSE中的所有条款。
+
+"""
+共享 HTTP 客户端池 - 按上游分组复用 httpx.AsyncClient
+
+每个上游（DownloadServer、媒体 CDN、Sync.so、Voicv、OAuth、Bcut）一个长连接池，
+避免每次调用重新建立 TCP/TLS 连接。
+
+特性:
+- keep-alive 连接复用，可选 HTTP/2（需安装 h2）
+- 每个上游的总连接数 + 每个 host 的并发连接数限制
+- 生命周期由 FastAPI lifespan 管理（关闭时 aclose_all）
+- 每个上游的请求数、新建连接数（复用率）、错误数、响应延迟统计
+- 与 httpx 默认行为一致地使用环境变量代理（HTTP_PROXY/HTTPS_PROXY/ALL_PROXY/NO_PROXY），
+  代理连接同样计入统计与 host 并发限制
+
+使用方式:
+    from services.http_clients import get_http_client
+
+    client = get_http_client("syncso")
+    response = await client.post(url, json=payload, timeout=30)
+"""
+
+import asyncio
+import ipaddress
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, Optional
+from urllib.request import getproxies
+
+import httpx
+
+from config import settings
+from utils.logger import logger
+
+
+# 上游分组 -> 是否默认跟随重定向
+UPSTREAMS: Dict[str, bool] = {
+    "download_server": False,
+    "media": True,       # 视频/封面/图片等 CDN 资源
+    "syncso": False,
+    "voicv": False,
+    "oauth": False,
+    "bcut": False,       # B站必剪 ASR（接口与分片上传）
+}
+
+
+@dataclass
+class UpstreamMetrics:
+    """单个上游的连接与延迟统计"""
+    requests: int = 0
+    errors: int = 0
+    connections_opened: int = 0
+    latency_total_ms: float = 0.0
+    latency_max_ms: float = 0.0
+
+    def record(self, latency_ms: float) -> None:
+        self.requests += 1
+        self.latency_total_ms += latency_ms
+        self.latency_max_ms = max(self.latency_max_ms, latency_ms)
+
+    def snapshot(self) -> dict:
+        reused = max(0, self.requests - self.connections_opened)
+        return {
+            "requests": self.requests,
+            "errors": self.errors,
+            "connections_opened": self.connections_opened,
+            "connections_reused": reused,
+            "reuse_ratio": round(reused / self.requests, 3) if self.requests else 0.0,
+            "latency_avg_ms": round(self.latency_total_ms / self.requests, 1) if self.requests else 0.0,
+            "latency_max_ms": round(self.latency_max_ms, 1),
+        }
+
+
+class _ReleasingStream(httpx.AsyncByteStream):
+    """响应流关闭时释放 host 并发名额"""
+
+    def __init__(self, stream: httpx.AsyncByteStream, release: Callable[[], None]):
+        self._stream = stream
+        self._release = release
+        self._released = False
+
+    async def __aiter__(self):
+        async for chunk in self._stream:
+            yield chunk
+
+    async def aclose(self) -> None:
+        try:
+            await self._stream.aclose()
+        finally:
+            if not self._released:
+                self._released = True
+                self._release()
+
+
+class _InstrumentedTransport(httpx.AsyncBaseTransport):
+    """
+    包装 AsyncHTTPTransport:
+    - 每个 host 一个信号量，限制并发连接数（名额持有到响应流关闭）
+    - 通过 httpcore trace 扩展统计新建连接数
+    - 统计请求到响应头的延迟
+    """
+
+    def __init__(
+        self,
+        inner: httpx.AsyncHTTPTransport,
+        metrics: UpstreamMetrics,
+        per_host_limit: int,
+        semaphores: Optional[Dict[str, asyncio.Semaphore]] = None,
+    ):
+        self._inner = inner
+        self._metrics = metrics
+        self._per_host_limit = per_host_limit
+        # 同一客户端的直连与代理 transport 共用信号量，host 并发限制不因代理挂载而放宽
+        self._semaphores: Dict[str, asyncio.Semaphore] = semaphores if semaphores is not None else {}
+
+    async def _trace(self, event_name: str, info: dict) -> None:
+        if event_name == "connection.connect_tcp.complete":
+            self._metrics.connections_opened += 1
+
+    def _host_semaphore(self, host: str) -> Optional[asyncio.Semaphore]:
+        if self._per_host_limit <= 0:
+            return None
+        semaphore = self._semaphores.get(host)
+        if semaphore is None:
+            semaphore = asyncio.Semaphore(self._per_host_limit)
+            self._semaphores[host] = semaphore
+        return semaphore
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        request.extensions["trace"] = self._trace
+        semaphore = self._host_semaphore(request.url.host)
+        if semaphore:
+            await semaphore.acquire()
+
+        start = time.perf_counter()
+        try:
+            response = await self._inner.handle_async_request(request)
+        except BaseException:
+            self._metrics.errors += 1
+            if semaphore:
+                semaphore.release()
+            raise
+
+        self._metrics.record((time.perf_counter() - start) * 1000)
+        if semaphore:
+            response.stream = _ReleasingStream(response.stream, semaphore.release)
+        return response
+
+    async def aclose(self) -> None:
+        await self._inner.aclose()
+
+
+def _http2_available() -> bool:
+    try:
+        import h2  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+
+def _environment_proxies() -> Dict[str, Optional[str]]:
+    """
+    读取环境变量代理，返回 httpx mounts 模式 -> 代理 URL（None 表示直连）
+
+    传入自定义 transport 后 httpx 不再读取环境变量代理，这里按 httpx 默认规则自行解析:
+    - http/https/all 代理分别挂载到 "http://"、"https://"、"all://"
+    - NO_PROXY 中的主机直连；NO_PROXY=* 时忽略全部代理
+    """
+    proxy_info = getproxies()
+    mounts: Dict[str, Optional[str]] = {}
+    for scheme in ("http", "https", "all"):
+        proxy = proxy_info.get(scheme)
+        if proxy:
+            mounts[f"{scheme}://"] = proxy if "://" in proxy else f"http://{proxy}"
+
+    for host in (h.strip() for h in proxy_info.get("no", "").split(",")):
+        if not host:
+            continue
+        if host == "*":
+            return {}
+        if "://" in host:
+            mounts[host] = None
+            continue
+        try:
+            address = ipaddress.ip_address(host)
+        except ValueError:
+            address = None
+        if address is not None and address.version == 6:
+            mounts[f"all://[{host}]"] = None
+        elif address is not None or host.lower() == "localhost":
+            mounts[f"all://{host}"] = None
+        else:
+            # .example.com 匹配子域名；example.com 同时匹配自身与子域名
+            mounts[f"all://*{host}"] = None
+    return mounts
+
+
+class HttpClientRegistry:
+    """按上游管理共享 httpx.AsyncClient"""
+
+    def __init__(self):
+        self._clients: Dict[str, httpx.AsyncClient] = {}
+        self._metrics: Dict[str, UpstreamMetrics] = {name: UpstreamMetrics() for name in UPSTREAMS}
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def _create_client(self, upstream: str) -> httpx.AsyncClient:
+        http2 = settings.HTTP_CLIENT_HTTP2
+        if http2 and not _http2_available():
+            logger.warning("HTTP_CLIENT_HTTP2 已开启但未安装 h2，回退到 HTTP/1.1")
+            http2 = False
+
+        limits = httpx.Limits(
+            max_connections=settings.HTTP_CLIENT_MAX_CONNECTIONS,
+            max_keepalive_connections=settings.HTTP_CLIENT_MAX_KEEPALIVE,
+            keepalive_expiry=settings.HTTP_CLIENT_KEEPALIVE_EXPIRY,
+        )
+        semaphores: Dict[str, asyncio.Semaphore] = {}
+
+        def instrumented(proxy: Optional[str] = None) -> _InstrumentedTransport:
+            return _InstrumentedTransport(
+                httpx.AsyncHTTPTransport(proxy=proxy, limits=limits, http2=http2),
+                self._metrics[upstream],
+                settings.HTTP_CLIENT_PER_HOST_LIMIT,
+                semaphores,
+            )
+
+        mounts = {
+            pattern: instrumented(proxy) if proxy else None
+            for pattern, proxy in _environment_proxies().items()
+        }
+        return httpx.AsyncClient(
+            transport=instrumented(),
+            mounts=mounts,
+            timeout=settings.HTTP_CLIENT_DEFAULT_TIMEOUT,
+            follow_redirects=UPSTREAMS[upstream],
+        )
+
+    def get(self, upstream: str) -> httpx.AsyncClient:
+        """
+        获取上游对应的共享客户端（懒创建）
+
+        客户端绑定创建时的事件循环；在新的事件循环中调用时（如脚本中多次 asyncio.run）
+        会重新创建连接池。
+        """
+        if upstream not in UPSTREAMS:
+            raise ValueError(f"未知的上游: {upstream}")
+
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._clients = {}
+            self._loop = loop
+
+        client = self._clients.get(upstream)
+        if client is None or client.is_closed:
+            client = self._create_client(upstream)
+            self._clients[upstream] = client
+        return client
+
+    async def aclose_all(self) -> None:
+        """关闭所有连接池（FastAPI lifespan 关闭时调用）"""
+        clients, self._clients = self._clients, {}
+        for upstream, client in clients.items():
+            try:
+                await client.aclose()
+            except Exception as e:
+                logger.warning(f"Failed to close HTTP client {upstream}: {e}")
+
+    def metrics(self) -> Dict[str, dict]:
+        """每个上游的连接复用与延迟统计"""
+        return {name: metrics.snapshot() for name, metrics in self._metrics.items()}
+
+
+# 全局实例
+http_clients = HttpClientRegistry()
+
+
+def get_http_client(upstream: str) -> httpx.AsyncClient:
+    """获取上游对应的共享 httpx.AsyncClient"""
+    return http_clients.get(upstream)
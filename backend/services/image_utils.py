@@ -23,10 +23,16 @@
 - 批量下载图片到本地
 - 检测图片格式（通过文件头）
 - Base64 编码图片
-- 大图压缩处理
+- 大图压缩处理（可选 WebP 输出，按源图哈希 + 参数索引已有压缩结果）
+- 并发流水线：图片并行下载，解码/缩放/编码在进程池中执行
 """
+import asyncio
 import base64
 import io
+import multiprocessing
+import shutil
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from dataclasses import dataclass
 from pathlib import Path
 from typing import List, Optional, Tuple
@@ -35,6 +41,15 @@ from urllib.parse import urlparse
 import httpx
 
 from config import settings
+from services.blob_store import (
+    BlobStoreError,
+    awrite_asset_bytes,
+    file_digest,
+    get_blob_store,
+    write_asset_bytes,
+)
+from services.http_clients import get_http_client
+from services.json_file_store import JsonFileStore
 from utils.logger import logger
 
 
@@ -139,20 +154,107 @@ async def compress_image_if_needed(
     file_path: str,
     max_size_bytes: int = 2 * 1024 * 1024,  # 2MB
     max_dimension: int = 1920,
-    quality: int = 85
+    quality: int = 85,
+    output_format: Optional[str] = None
 ) -> str:
     """
     压缩大图（如果超过限制）
 
+    解码/缩放/编码在图片工作池中执行，不阻塞事件循环。
+
     Args:
         file_path: 图片文件路径
         max_size_bytes: 最大文件大小（字节）
         max_dimension: 最大边长（像素）
-        quality: JPEG 压缩质量 (1-100)
+        quality: 压缩质量 (1-100)
+        output_format: 输出格式 jpeg/webp（默认读取 MULTIMODAL_IMAGE_OUTPUT_FORMAT）
 
     Returns:
         处理后的图片路径（可能是原路径或压缩后的新路径）
     """
+    return await _run_image_job(
+        _compress_image_sync, file_path, max_size_bytes, max_dimension, quality, output_format
+    )
+
+
+# 输出格式 -> (Pillow 格式名, 扩展名)
+_OUTPUT_FORMATS = {
+    "jpeg": ("JPEG", ".jpg"),
+    "webp": ("WEBP", ".webp"),
+}
+
+
+_compressed_index: Optional[JsonFileStore] = None
+
+
+def _get_compressed_index() -> JsonFileStore:
+    """
+    压缩结果索引（懒创建，每个工作进程一个实例）
+
+    条目键为源图 sha256 + 压缩参数，值为压缩图的 blob 摘要与资源路径；
+    字节只保存在资源文件（启用去重时即 blob）中，索引条目按 TTL / 条目数淘汰，
+    blob 随资源清理由 gc 回收，回收后的条目在读取时视为未命中。
+    """
+    global _compressed_index
+    directory = Path(settings.MULTIMODAL_IMAGE_CACHE_DIR)
+    if _compressed_index is None or _compressed_index.directory != directory:
+        # 旧版在缓存目录下按 sha256 前两位分片另存一份压缩图字节，且从不淘汰
+        if directory.is_dir():
+            for shard in directory.iterdir():
+                if shard.is_dir() and len(shard.name) == 2:
+                    shutil.rmtree(shard, ignore_errors=True)
+        _compressed_index = JsonFileStore(
+            directory,
+            name="Compressed image index",
+            ttl_seconds=settings.MULTIMODAL_IMAGE_CACHE_TTL_SECONDS,
+            max_entries=settings.MULTIMODAL_IMAGE_CACHE_MAX_ENTRIES,
+        )
+    return _compressed_index
+
+
+def _compressed_index_key(digest: str, max_dimension: int, quality: int, output_format: str) -> str:
+    """压缩结果索引键：按源文件哈希 + 压缩参数区分"""
+    return f"{digest}_{max_dimension}_{quality}_{output_format}"
+
+
+def _reuse_compressed(entry: dict, target: Path) -> bool:
+    """
+    把索引记录的压缩结果物化到 target
+
+    优先链接已有 blob；未启用去重时从记录的资源文件复制。
+    blob 已被回收或资源文件已不存在时返回 False（按未命中处理）。
+    """
+    if entry.get("digest") and settings.ASSET_DEDUP_ENABLED:
+        try:
+            if get_blob_store().link(entry["digest"], target) is not None:
+                return True
+        except BlobStoreError as e:
+            logger.warning(f"Compressed image blob link failed: {e}")
+
+    recorded = Path(entry.get("path") or "")
+    try:
+        if not recorded.is_file() or recorded.stat().st_size != entry.get("size"):
+            return False
+        if recorded.resolve() != target.resolve():
+            write_asset_bytes(recorded.read_bytes(), target)
+    except OSError:
+        return False
+    return True
+
+
+def _compress_image_sync(
+    file_path: str,
+    max_size_bytes: int,
+    max_dimension: int,
+    quality: int = 85,
+    output_format: Optional[str] = None
+) -> str:
+    """
+    compress_image_if_needed 的同步实现（可在工作进程中执行）
+
+    - 相同源图（按 sha256）+ 相同参数只压缩一次，之后经索引复用已有压缩结果
+    - JPEG 源图使用 Image.draft 在解码阶段按 1/2、1/4、1/8 缩放，减少解码开销
+    """
     try:
         from PIL import Image
     except ImportError:
@@ -165,21 +267,32 @@ async def compress_image_if_needed(
     if file_size <= max_size_bytes:
         return file_path
 
-    logger.info(f"Compressing image: {file_path} ({file_size / 1024 / 1024:.2f}MB)")
+    output_format = (output_format or settings.MULTIMODAL_IMAGE_OUTPUT_FORMAT).lower()
+    if output_format not in _OUTPUT_FORMATS:
+        logger.warning(f"Unsupported image output format: {output_format}, using jpeg")
+        output_format = "jpeg"
+    pil_format, ext = _OUTPUT_FORMATS[output_format]
+
+    source = Path(file_path)
+    compressed_path = source.with_name(f"{source.stem}_compressed{ext}")
 
     try:
-        img = Image.open(file_path)
+        index = _get_compressed_index()
+        index_key = _compressed_index_key(file_digest(source), max_dimension, quality, output_format)
 
-        # 保持原始模式，但转换 RGBA 为 RGB（JPEG 不支持透明通道）
-        if img.mode == 'RGBA':
-            background = Image.new('RGB', img.size, (255, 255, 255))
-            background.paste(img, mask=img.split()[3])
-            img = background
-        elif img.mode != 'RGB':
-            img = img.convert('RGB')
+        # 命中索引：不再重新压缩
+        entry = index.read(index_key)
+        if entry and _reuse_compressed(entry, compressed_path):
+            logger.debug(f"Compressed image cache hit: {file_path}")
+            return str(compressed_path)
 
-        # 调整尺寸
+        logger.info(f"Compressing image: {file_path} ({file_size / 1024 / 1024:.2f}MB)")
+
+        img = Image.open(file_path)
+
+        # 计算目标尺寸
         width, height = img.size
+        new_width, new_height = width, height
         if width > max_dimension or height > max_dimension:
             if width > height:
                 new_width = max_dimension
@@ -187,27 +300,123 @@ async def compress_image_if_needed(
             else:
                 new_height = max_dimension
                 new_width = int(width * (max_dimension / height))
+
+            # JPEG draft 模式：解码时直接降采样到不小于目标尺寸的最小比例
+            if img.format == "JPEG":
+                img.draft("RGB", (new_width, new_height))
+
+        # WebP 保留透明通道；JPEG 不支持透明通道，RGBA 合成到白底
+        if img.mode == 'RGBA' and pil_format == "WEBP":
+            pass
+        elif img.mode == 'RGBA':
+            background = Image.new('RGB', img.size, (255, 255, 255))
+            background.paste(img, mask=img.split()[3])
+            img = background
+        elif img.mode != 'RGB':
+            img = img.convert('RGB')
+
+        # 调整尺寸
+        if img.size != (new_width, new_height):
             img = img.resize((new_width, new_height), Image.Resampling.LANCZOS)
             logger.debug(f"Resized from {width}x{height} to {new_width}x{new_height}")
 
-        # 保存压缩后的图片
-        compressed_path = file_path.replace('.', '_compressed.')
-        if not compressed_path.endswith(('.jpg', '.jpeg')):
-            compressed_path = str(Path(file_path).with_suffix('.jpg'))
-            compressed_path = compressed_path.replace('.jpg', '_compressed.jpg')
+        # 编码后写入资源目录，并在索引中记录
+        buffer = io.BytesIO()
+        if pil_format == "JPEG":
+            img.save(buffer, pil_format, quality=quality, optimize=True)
+        else:
+            img.save(buffer, pil_format, quality=quality, method=4)
+        payload = buffer.getvalue()
 
-        img.save(compressed_path, 'JPEG', quality=quality, optimize=True)
+        ref = write_asset_bytes(payload, compressed_path)
+        index.write(index_key, {
+            "digest": ref.digest if ref else None,
+            "path": str(compressed_path.resolve()),
+            "size": len(payload),
+        })
 
-        new_size = get_image_file_size(compressed_path)
-        logger.info(f"Compressed: {file_size / 1024:.1f}KB -> {new_size / 1024:.1f}KB")
+        logger.info(f"Compressed: {file_size / 1024:.1f}KB -> {len(payload) / 1024:.1f}KB ({output_format})")
 
-        return compressed_path
+        return str(compressed_path)
 
     except Exception as e:
         logger.warning(f"Failed to compress image: {e}, using original")
         return file_path
 
 
+# =============================================================================
+# 图片处理工作池
+# =============================================================================
+
+_image_executor: Optional[Executor] = None
+
+
+def _get_image_executor() -> Executor:
+    """
+    获取图片处理执行器（懒创建）
+
+    MULTIMODAL_IMAGE_WORKERS > 0 时使用进程池（spawn，避免 fork 继承事件循环和连接），
+    否则使用线程池。
+    """
+    global _image_executor
+    if _image_executor is None:
+        workers = settings.MULTIMODAL_IMAGE_WORKERS
+        if workers > 0:
+            _image_executor = ProcessPoolExecutor(
+                max_workers=workers,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        else:
+            _image_executor = ThreadPoolExecutor(
+                max_workers=settings.MULTIMODAL_IMAGE_CONCURRENCY,
+                thread_name_prefix="image",
+            )
+    return _image_executor
+
+
+def shutdown_image_workers() -> None:
+    """关闭图片处理工作池（应用关闭时调用）"""
+    global _image_executor
+    if _image_executor is not None:
+        _image_executor.shutdown(wait=False, cancel_futures=True)
+        _image_executor = None
+
+
+async def _run_image_job(func, *args):
+    """在工作池中执行图片处理；进程池崩溃时重建一次后重试"""
+    global _image_executor
+    loop = asyncio.get_running_loop()
+    try:
+        return await loop.run_in_executor(_get_image_executor(), func, *args)
+    except BrokenProcessPool:
+        logger.warning("Image worker pool broken, recreating")
+        _image_executor = None
+        return await loop.run_in_executor(_get_image_executor(), func, *args)
+
+
+def _process_downloaded_image(
+    local_path: str,
+    compress: bool,
+    max_size_bytes: int,
+    max_dimension: int,
+) -> Tuple[str, str, str, int]:
+    """
+    处理已下载的图片：压缩（如需要）、检测格式、Base64 编码
+
+    在工作进程中执行，只接收/返回可序列化的基础类型。
+
+    Returns:
+        (local_path, mime_type, base64_data, file_size)
+    """
+    if compress:
+        local_path = _compress_image_sync(local_path, max_size_bytes, max_dimension)
+
+    mime_type, _ = detect_image_format(local_path)
+    base64_data = encode_image_to_base64(local_path)
+    file_size = get_image_file_size(local_path)
+    return local_path, mime_type, base64_data, file_size
+
+
 def _get_headers_for_url(url: str) -> dict:
     """根据 URL 获取合适的请求头"""
     headers = {
@@ -272,30 +481,29 @@ async def download_image(
     headers = _get_headers_for_url(image_url)
 
     try:
-        async with httpx.AsyncClient(timeout=timeout, follow_redirects=True) as client:
-            response = await client.get(image_url, headers=headers)
-            response.raise_for_status()
-
-            # 从 Content-Type 或 URL 确定扩展名
-            content_type = response.headers.get("content-type", "")
-            if "jpeg" in content_type or "jpg" in content_type:
-                ext = ".jpg"
-            elif "png" in content_type:
-                ext = ".png"
-            elif "webp" in content_type:
-                ext = ".webp"
-            elif "gif" in content_type:
-                ext = ".gif"
-            else:
-                ext = _get_extension_from_url(image_url)
-
-            # 保存文件
-            save_path = save_dir / f"{filename}{ext}"
-            with open(save_path, "wb") as f:
-                f.write(response.content)
-
-            logger.debug(f"Image downloaded: {save_path} ({len(response.content)} bytes)")
-            return str(save_path)
+        client = get_http_client("media")
+        response = await client.get(image_url, headers=headers, timeout=timeout)
+        response.raise_for_status()
+
+        # 从 Content-Type 或 URL 确定扩展名
+        content_type = response.headers.get("content-type", "")
+        if "jpeg" in content_type or "jpg" in content_type:
+            ext = ".jpg"
+        elif "png" in content_type:
+            ext = ".png"
+        elif "webp" in content_type:
+            ext = ".webp"
+        elif "gif" in content_type:
+            ext = ".gif"
+        else:
+            ext = _get_extension_from_url(image_url)
+
+        # 保存文件（内容寻址去重）
+        save_path = save_dir / f"{filename}{ext}"
+        await awrite_asset_bytes(response.content, save_path)
+
+        logger.debug(f"Image downloaded: {save_path} ({len(response.content)} bytes)")
+        return str(save_path)
 
     except httpx.TimeoutException:
         raise ImageProcessError(f"Image download timeout: {image_url}")
@@ -345,40 +553,37 @@ async def download_and_process_images(
     assets_dir = Path(settings.ASSETS_DIR)
     save_dir = assets_dir / platform / content_id / "images"
 
-    processed_images: List[ProcessedImage] = []
+    semaphore = asyncio.Semaphore(max(1, settings.MULTIMODAL_IMAGE_CONCURRENCY))
 
-    for idx, url in enumerate(urls_to_process):
+    async def process_one(idx: int, url: str) -> Optional[ProcessedImage]:
         try:
-            # 下载图片
-            filename = f"image_{idx:02d}"
-            local_path = await download_image(url, save_dir, filename)
-
-            # 压缩（如果需要）
-            if _compress:
-                local_path = await compress_image_if_needed(
-                    local_path,
-                    max_size_bytes=_max_size,
-                    max_dimension=_max_dim
-                )
-
-            # 检测格式并编码
-            mime_type, _ = detect_image_format(local_path)
-            base64_data = encode_image_to_base64(local_path)
-            file_size = get_image_file_size(local_path)
-
-            processed_images.append(ProcessedImage(
+            # 下载图片（并发受限）
+            async with semaphore:
+                filename = f"image_{idx:02d}"
+                local_path = await download_image(url, save_dir, filename)
+
+            # 压缩、检测格式并编码（在工作池中执行，不阻塞事件循环）
+            local_path, mime_type, base64_data, file_size = await _run_image_job(
+                _process_downloaded_image, local_path, _compress, _max_size, _max_dim
+            )
+
+            logger.info(f"Processed image {idx + 1}/{len(urls_to_process)}: {file_size / 1024:.1f}KB")
+
+            return ProcessedImage(
                 base64_data=base64_data,
                 mime_type=mime_type,
                 original_url=url,
                 local_path=local_path,
                 file_size=file_size,
-            ))
-
-            logger.info(f"Processed image {idx + 1}/{len(urls_to_process)}: {file_size / 1024:.1f}KB")
+            )
 
         except Exception as e:
             logger.warning(f"Failed to process image {idx + 1}: {e}")
-            continue
+            return None
+
+    # gather 保持输入顺序；单张失败返回 None，不影响其他图片
+    results = await asyncio.gather(*(process_one(idx, url) for idx, url in enumerate(urls_to_process)))
+    processed_images: List[ProcessedImage] = [image for image in results if image is not None]
 
     logger.info(f"Downloaded and processed {len(processed_images)} images for {platform}/{content_id}")
     return processed_images
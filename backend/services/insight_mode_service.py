@@ -28,6 +28,7 @@ from typing import List, Optional, Dict, Any
 import aiomysql
 
 from config import settings
+from services.config_version_service import INSIGHT_MODES_SCOPE, get_config_version_service
 from schemas import (
     InsightModeInfo,
     InsightModeDetail,
@@ -52,7 +53,8 @@ class InsightModeService:
     # 缓存配置
     _cache: Dict[str, Any] = {}
     _cache_timestamp: float = 0
-    _cache_ttl: float = 300  # 5 分钟缓存
+    _cache_ttl: float = 300  # 5 分钟缓存（配置版本轮询不可用时的兜底）
+    _cache_generation: int = 0  # 缓存对应的配置 generation，其他 worker 修改配置后失效
 
     def __init__(self):
         self._pool: Optional[aiomysql.Pool] = None
@@ -86,8 +88,27 @@ class InsightModeService:
         self._cache_timestamp = 0
 
     def _is_cache_valid(self) -> bool:
-        """检查缓存是否有效"""
-        return (time.time() - self._cache_timestamp) < self._cache_ttl
+        """检查缓存是否有效（配置 generation 一致；版本轮询不可用时再按 TTL 判断）"""
+        versions = get_config_version_service()
+        if versions.is_fresh(INSIGHT_MODES_SCOPE, self._cache_generation, self._cache_timestamp, self._cache_ttl):
+            return True
+        generation = versions.generation(INSIGHT_MODES_SCOPE)
+        if generation != self._cache_generation:
+            self._invalidate_cache()
+            self._cache_generation = generation
+        return False
+
+    def _put_cache(self, cache_key: str, value: Any, generation: int) -> None:
+        """写入缓存；读取期间配置已变更时丢弃结果"""
+        if generation != get_config_version_service().generation(INSIGHT_MODES_SCOPE):
+            return
+        self._cache[cache_key] = value
+        self._cache_timestamp = time.time()
+
+    async def _notify_changed(self) -> None:
+        """配置已修改：清空本地缓存并通知其他 worker"""
+        self._invalidate_cache()
+        await get_config_version_service().bump(INSIGHT_MODES_SCOPE)
 
     async def list_all(self, active_only: bool = False) -> List[InsightModeInfo]:
         """
@@ -193,6 +214,7 @@ class InsightModeService:
         cache_key = f"prompt:{mode_key}"
         if self._is_cache_valid() and cache_key in self._cache:
             return self._cache[cache_key]
+        generation = self._cache_generation
 
         pool = await self._get_pool()
 
@@ -206,8 +228,7 @@ class InsightModeService:
 
                 # 更新缓存
                 if prompt:
-                    self._cache[cache_key] = prompt
-                    self._cache_timestamp = time.time()
+                    self._put_cache(cache_key, prompt, generation)
 
                 return prompt
 
@@ -221,6 +242,7 @@ class InsightModeService:
         cache_key = "all_prompts"
         if self._is_cache_valid() and cache_key in self._cache:
             return self._cache[cache_key]
+        generation = self._cache_generation
 
         pool = await self._get_pool()
 
@@ -233,8 +255,7 @@ class InsightModeService:
                 prompts = {row["mode_key"]: row["system_prompt"] for row in rows}
 
                 # 更新缓存
-                self._cache[cache_key] = prompts
-                self._cache_timestamp = time.time()
+                self._put_cache(cache_key, prompts, generation)
 
                 return prompts
 
@@ -248,6 +269,7 @@ class InsightModeService:
         cache_key = "intent_keywords"
         if self._is_cache_valid() and cache_key in self._cache:
             return self._cache[cache_key]
+        generation = self._cache_generation
 
         pool = await self._get_pool()
 
@@ -266,8 +288,7 @@ class InsightModeService:
                     }
 
                 # 更新缓存
-                self._cache[cache_key] = keywords
-                self._cache_timestamp = time.time()
+                self._put_cache(cache_key, keywords, generation)
 
                 return keywords
 
@@ -311,7 +332,7 @@ class InsightModeService:
                     request.system_prompt,
                 ))
 
-        self._invalidate_cache()
+        await self._notify_changed()
 
     async def update_mode(self, mode_key: str, request: InsightModeUpdateRequest) -> bool:
         """
@@ -395,7 +416,7 @@ class InsightModeService:
                     success = bool(await cursor.fetchone())
 
         if success and affected > 0:
-            self._invalidate_cache()
+            await self._notify_changed()
 
         return success
 
@@ -437,7 +458,7 @@ class InsightModeService:
                 success = cursor.rowcount > 0
 
         if success:
-            self._invalidate_cache()
+            await self._notify_changed()
 
         return success
 
@@ -460,7 +481,7 @@ class InsightModeService:
                 success = cursor.rowcount > 0
 
         if success:
-            self._invalidate_cache()
+            await self._notify_changed()
 
         return success
 
@@ -487,7 +508,7 @@ class InsightModeService:
                         (idx, mode_key)
                     )
 
-        self._invalidate_cache()
+        await self._notify_changed()
         return True
 
     async def initialize_default_modes(self) -> None:
@@ -0,0 +1,220 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2026 relakkes@gmail.com
+#
+# This file is part of MediaCrawlerPro-ContentRemixAgent project.
+# Repository: https://github.com/MediaCrawlerPro/MediaCrawlerPro-ContentRemixAgent/blob/main/backend/services/json_file_store.py
+# GitHub: https://github.com/NanmiCoder
+# Licensed under NON-COMMERCIAL LEARNING LICENSE 1.1
+#
+# 声明：本代码仅供学习和研究目的使用。使用者应遵守以下原则：
+# 1. 不得用于任何商业用途。
+# 2. 使用时应遵守目标平台的使用条款和robots.txt规则。
+# 3. 不得进行大规模爬取或对平台造成运营干扰。
+# 4. 应合理控制请求频率，避免给目标平台带来不必要的负担。
+# 5. 不得用于任何非法或不当的用途。
+#
+# 详细许可条款请参阅项目根目录下的LICENSE文件。
+# 使用本代码即表示您同意遵守上述原则和LICENSE中的所有条款。
+
+"""
+每条目一个 JSON 文件的缓存存储（视频处理结果缓存、TTS 缓存共用）
+
+存储:
+- 条目文件: {directory}/{key}.json，key 由调用方保证文件名安全
+- 写入使用临时文件 + os.replace，保证原子性，多进程共享安全
+- 条目内带 created_at，读取时超过 TTL 视为失效并删除
+- 命中时刷新文件 mtime，作为 LRU 依据
+
+淘汰:
+- 进程内记录条目数与总大小的估计值，写入时增量更新，不逐次扫描目录
+- 估计值超过上限，或距上次全量扫描超过 SWEEP_INTERVAL_SECONDS（清理过期条目、
+  校正其他进程写入造成的偏差）时才扫描目录，并按最近访问时间淘汰到上限的 90%，
+  使全量扫描的开销分摊到多次写入
+"""
+
+import json
+import math
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from utils.logger import logger
+
+
+# 两次全量扫描的最长间隔(秒)
+SWEEP_INTERVAL_SECONDS = 600
+# 超限时淘汰到上限的比例
+EVICT_LOW_WATER = 0.9
+
+
+class JsonFileStore:
+    """基于文件系统的 JSON 条目存储（TTL + 条目数/总大小 LRU 淘汰）"""
+
+    def __init__(
+        self,
+        directory: Path,
+        *,
+        name: str,
+        ttl_seconds: int,
+        max_entries: int = 0,
+        max_bytes: int = 0,
+        sweep_interval: float = SWEEP_INTERVAL_SECONDS,
+    ):
+        self.directory = Path(directory)
+        self.name = name
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.sweep_interval = sweep_interval
+        self._lock = threading.Lock()
+        # 条目数/总大小估计值，首次写入时通过全量扫描初始化
+        self._count: Optional[int] = None
+        self._bytes = 0
+        self._next_sweep_at = 0.0
+
+    def path(self, key: str) -> Path:
+        return self.directory / f"{key}.json"
+
+    def read(self, key: str) -> Optional[Dict[str, Any]]:
+        """
+        读取条目
+
+        Returns:
+            命中且未过期时返回条目内容，否则返回 None（损坏或过期的条目会被删除）
+        """
+        path = self.path(key)
+        if not path.exists():
+            return None
+
+        try:
+            entry = json.loads(path.read_text(encoding="utf-8"))
+        except Exception as e:
+            logger.warning(f"{self.name} entry unreadable, dropping: {path} ({e})")
+            self._discard(path)
+            return None
+
+        if self.ttl_seconds > 0 and time.time() - entry.get("created_at", 0) > self.ttl_seconds:
+            self._discard(path)
+            return None
+
+        # 刷新访问时间（LRU）
+        try:
+            os.utime(path, None)
+        except OSError:
+            pass
+        return entry
+
+    def write(self, key: str, value: Dict[str, Any]) -> bool:
+        """写入条目（原子替换，未带 created_at 时补上当前时间），必要时执行淘汰"""
+        path = self.path(key)
+        tmp_path = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+        data = json.dumps({"created_at": time.time(), **value}, ensure_ascii=False).encode("utf-8")
+
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            try:
+                old_size = path.stat().st_size
+            except OSError:
+                old_size = None
+            tmp_path.write_bytes(data)
+            os.replace(tmp_path, path)
+        except Exception as e:
+            logger.warning(f"{self.name} write failed: {e}")
+            self._unlink(tmp_path)
+            return False
+
+        with self._lock:
+            if self._count is not None:
+                self._count += 1 if old_size is None else 0
+                self._bytes += len(data) - (old_size or 0)
+            needs_evict = self._count is None or self._over_limit() or time.monotonic() >= self._next_sweep_at
+        if needs_evict:
+            self.evict()
+        return True
+
+    def delete(self, key: str) -> None:
+        """删除指定条目"""
+        self._discard(self.path(key))
+
+    def evict(self) -> int:
+        """
+        全量扫描: 删除过期条目；超出上限时按最近访问时间淘汰到上限的 90%，并校正估计值
+
+        Returns:
+            删除的条目数
+        """
+        with self._lock:
+            now = time.time()
+            entries = []
+            removed = 0
+            if self.directory.exists():
+                for path in self.directory.glob("*.json"):
+                    try:
+                        stat = path.stat()
+                    except OSError:
+                        continue
+                    # TTL 以 mtime 近似判断，避免逐个解析 JSON；
+                    # mtime 在命中时刷新，因此 read() 中还需按 created_at 精确判断
+                    if self.ttl_seconds > 0 and now - stat.st_mtime > self.ttl_seconds:
+                        self._unlink(path)
+                        removed += 1
+                        continue
+                    entries.append((stat.st_mtime, stat.st_size, path))
+
+            self._count = len(entries)
+            self._bytes = sum(size for _, size, _ in entries)
+            if self._over_limit():
+                max_entries = math.ceil(self.max_entries * EVICT_LOW_WATER)
+                max_bytes = math.ceil(self.max_bytes * EVICT_LOW_WATER)
+                entries.sort(key=lambda item: item[0])  # 最久未访问的在前
+                for _, size, path in entries:
+                    if not (
+                        (self.max_bytes > 0 and self._bytes > max_bytes)
+                        or (self.max_entries > 0 and self._count > max_entries)
+                    ):
+                        break
+                    self._unlink(path)
+                    self._count -= 1
+                    self._bytes -= size
+                    removed += 1
+
+            self._next_sweep_at = time.monotonic() + self.sweep_interval
+
+        if removed:
+            logger.info(f"{self.name} evicted {removed} entries")
+        return removed
+
+    def list_entries(self) -> List[Path]:
+        """列出所有条目文件（调试/测试用）"""
+        if not self.directory.exists():
+            return []
+        return sorted(self.directory.glob("*.json"))
+
+    def _over_limit(self) -> bool:
+        return (self.max_bytes > 0 and self._bytes > self.max_bytes) or (
+            self.max_entries > 0 and self._count > self.max_entries
+        )
+
+    def _discard(self, path: Path) -> None:
+        """删除条目文件并同步估计值"""
+        try:
+            size = path.stat().st_size
+        except OSError:
+            return
+        if self._unlink(path):
+            with self._lock:
+                if self._count is not None:
+                    self._count -= 1
+                    self._bytes -= size
+
+    def _unlink(self, path: Path) -> bool:
+        try:
+            path.unlink()
+            return True
+        except FileNotFoundError:
+            return False
+        except OSError as e:
+            logger.warning(f"{self.name} unlink failed: {path} ({e})")
+            return False
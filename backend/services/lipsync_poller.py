@@ -0,0 +1,368 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2026 relakkes@gmail.com
+#
+# This file is part of MediaCrawlerPro-ContentRemixAgent project.
+# Repository: https://github.com/MediaCrawlerPro/MediaCrawlerPro-ContentRemixAgent/blob/main/backend/services/lipsync_poller.py
+# GitHub: https://github.com/NanmiCoder
+# Licensed under NON-COMMERCIAL LEARNING LICENSE 1.1
+#
+# 声明：本代码仅供学习和研究目的使用。使用者应遵守以下原则：
+# 1. 不得用于任何商业用途。
+# 2. 使用时应遵守目标平台的使用条款和robots.txt规则。
+# 3. 不得进行大规模爬取或对平台造成运营干扰。
+# 4. 应合理控制请求频率，避免给目标平台带来不必要的负担。
+# 5. 不得用于任何非法或不当的用途。
+#
+# 详细许可条款请参阅项目根目录下的LICENSE文件。
+# 使用本代码即表示您同意遵守上述原则和LICENSE中的所有条款。
+
+
+"""
+Lipsync 任务服务端轮询器
+
+原先前端每个打开的页面每 5 秒请求一次 /media-ai/lipsync/{id}，每次都透传到 Sync.so，
+上游请求数随观看者数量增长。轮询器改为在服务端按任务跟踪:
+
+- 任务创建后登记到轮询器，单个后台协程按各任务的下次轮询时间查询上游
+- 自适应退避: 状态不变（或查询失败）时间隔乘以 LIPSYNC_POLL_BACKOFF，
+  上限 LIPSYNC_POLL_MAX_INTERVAL；状态变化后回到 LIPSYNC_POLL_MIN_INTERVAL
+- 状态变化时经 MediaAIStore.upsert_lipsync_result 写库，并推送给所有订阅者（SSE）
+- 查询走共享的 syncso 连接池，同时进行的查询数受 LIPSYNC_POLL_CONCURRENCY 限制
+- 进入终态或超过 LIPSYNC_POLL_TIMEOUT 后停止跟踪，最近的终态结果保留在内存中供后来的查询直接返回
+
+上游请求数只与任务数相关，与打开页面的数量无关。
+"""
+
+import asyncio
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Dict, Optional, Sequence, Set
+
+from config import settings
+from services.media_ai_store import MediaAIStore
+from services.syncso_client import SyncsoClient, SyncsoClientError
+from utils.logger import logger
+
+
+TERMINAL_STATUSES = frozenset({"COMPLETED", "FAILED", "REJECTED", "CANCELED", "CANCELLED"})
+
+# 终态结果保留条数（供任务结束后才打开的页面直接读取）
+FINISHED_CACHE_SIZE = 512
+
+
+@dataclass
+class LipsyncJob:
+    """被跟踪的 lipsync 任务"""
+    generation_id: str
+    user_id: Optional[str]
+    record: Dict[str, Any]          # 写库时附带的任务信息（model、video_url 等）
+    interval: float
+    next_poll_at: float
+    deadline: float
+    status: str = "PENDING"
+    output_url: str = ""
+    raw: Dict[str, Any] = field(default_factory=dict)
+    error: Optional[str] = None
+    timed_out: bool = False
+    polls: int = 0
+
+    @property
+    def done(self) -> bool:
+        return self.status in TERMINAL_STATUSES or self.timed_out
+
+    def event(self) -> Dict[str, Any]:
+        """推送给订阅者的状态快照"""
+        return {
+            "generation_id": self.generation_id,
+            "status": self.status,
+            "output_url": self.output_url,
+            "done": self.done,
+            "timed_out": self.timed_out,
+            "error": self.error,
+        }
+
+    def payload(self) -> Dict[str, Any]:
+        """与 SyncsoClient.get_generation 同形的响应（供状态查询接口直接返回）"""
+        return {
+            **self.raw,
+            "id": self.generation_id,
+            "status": self.status,
+            "outputUrl": self.output_url,
+        }
+
+
+class LipsyncPoller:
+    """Lipsync 任务服务端轮询器（单个后台协程 + 按任务退避）"""
+
+    def __init__(
+        self,
+        client: Optional[SyncsoClient] = None,
+        store: Optional[MediaAIStore] = None,
+        *,
+        min_interval: Optional[float] = None,
+        max_interval: Optional[float] = None,
+        backoff: Optional[float] = None,
+        timeout: Optional[float] = None,
+        request_timeout: Optional[float] = None,
+        concurrency: Optional[int] = None,
+    ):
+        self.client = client or SyncsoClient()
+        self.store = store or MediaAIStore()
+        self.min_interval = min_interval if min_interval is not None else settings.LIPSYNC_POLL_MIN_INTERVAL
+        self.max_interval = max(self.min_interval, max_interval if max_interval is not None else settings.LIPSYNC_POLL_MAX_INTERVAL)
+        self.backoff = max(1.0, backoff if backoff is not None else settings.LIPSYNC_POLL_BACKOFF)
+        self.timeout = timeout if timeout is not None else settings.LIPSYNC_POLL_TIMEOUT
+        self.request_timeout = request_timeout if request_timeout is not None else settings.LIPSYNC_POLL_REQUEST_TIMEOUT
+        self.concurrency = max(1, concurrency if concurrency is not None else settings.LIPSYNC_POLL_CONCURRENCY)
+
+        self._jobs: Dict[str, LipsyncJob] = {}
+        self._finished: "OrderedDict[str, LipsyncJob]" = OrderedDict()
+        self._subscribers: Dict[str, Set[asyncio.Queue]] = {}
+        self._task: Optional[asyncio.Task] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._stats = {"polls": 0, "errors": 0, "status_changes": 0, "finished": 0, "timed_out": 0}
+
+    # ------------------------------------------------------------------
+    # 登记 / 查询
+    # ------------------------------------------------------------------
+
+    def track(
+        self,
+        generation_id: str,
+        user_id: Optional[str] = None,
+        record: Optional[Dict[str, Any]] = None,
+        *,
+        status: str = "PENDING",
+        output_url: str = "",
+    ) -> None:
+        """登记任务（已在跟踪时只补充缺失的用户和任务信息）"""
+        generation_id = (generation_id or "").strip()
+        if not generation_id:
+            return
+
+        job = self._jobs.get(generation_id)
+        if job is not None:
+            job.user_id = job.user_id or user_id
+            for key, value in (record or {}).items():
+                job.record.setdefault(key, value)
+            return
+
+        now = time.monotonic()
+        job = LipsyncJob(
+            generation_id=generation_id,
+            user_id=user_id,
+            record=dict(record or {}),
+            interval=self.min_interval,
+            next_poll_at=now + self.min_interval,
+            deadline=now + self.timeout,
+            status=(status or "PENDING").upper(),
+            output_url=output_url or "",
+        )
+        if job.done:
+            self._remember_finished(job)
+            return
+
+        self._finished.pop(generation_id, None)
+        self._jobs[generation_id] = job
+        self._ensure_running()
+        self._wakeup.set()
+
+    def get(self, generation_id: str) -> Optional[LipsyncJob]:
+        """返回跟踪中或最近结束的任务，未知任务返回 None"""
+        return self._jobs.get(generation_id) or self._finished.get(generation_id)
+
+    async def refresh(self, generation_id: str, user_id: Optional[str] = None) -> LipsyncJob:
+        """
+        获取任务状态: 已知任务直接返回缓存；未知任务（如服务重启前创建）查询一次上游，
+        未到终态时登记跟踪，已到终态时写入存储。上游查询失败时抛出 SyncsoClientError。
+        """
+        job = self.get(generation_id)
+        if job is not None:
+            if user_id and job.user_id is None:
+                job.user_id = user_id
+            return job
+
+        payload = await self.client.get_generation(generation_id, timeout=self.request_timeout)
+        self._stats["polls"] += 1
+        status = (payload.get("status") or "PENDING").upper()
+        output_url = payload.get("outputUrl") or payload.get("outputMediaUrl") or ""
+        self.track(generation_id, user_id, status=status, output_url=output_url)
+        job = self.get(generation_id)
+        job.raw = payload
+        if job.done:
+            # 已到终态的任务不会再被轮询，这里直接落库（未指定用户时跳过）
+            await self._persist(job)
+        return job
+
+    async def watch(self, generation_ids: Sequence[str]) -> AsyncIterator[Dict[str, Any]]:
+        """
+        订阅任务状态: 先推送当前快照，之后每次状态变化推送一次，全部结束后迭代终止。
+        未知任务会被忽略（调用方应先 refresh）。
+        """
+        queue: asyncio.Queue = asyncio.Queue()
+        ids = list(dict.fromkeys(generation_ids))
+        for generation_id in ids:
+            self._subscribers.setdefault(generation_id, set()).add(queue)
+        try:
+            pending = set()
+            for generation_id in ids:
+                job = self.get(generation_id)
+                if job is None:
+                    continue
+                yield job.event()
+                if not job.done:
+                    pending.add(generation_id)
+
+            while pending:
+                event = await queue.get()
+                if event["generation_id"] not in pending:
+                    continue
+                yield event
+                if event["done"]:
+                    pending.discard(event["generation_id"])
+        finally:
+            for generation_id in ids:
+                queues = self._subscribers.get(generation_id)
+                if queues is not None:
+                    queues.discard(queue)
+                    if not queues:
+                        self._subscribers.pop(generation_id, None)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """轮询统计（/health/lipsync 导出）"""
+        return {
+            "tracked": len(self._jobs),
+            "subscribers": sum(len(queues) for queues in self._subscribers.values()),
+            **self._stats,
+        }
+
+    async def aclose(self) -> None:
+        """停止后台轮询协程"""
+        task, self._task = self._task, None
+        if task is not None and not task.done():
+            task.cancel()
+            try:
+                await task
+            except (asyncio.CancelledError, RuntimeError):
+                pass
+
+    # ------------------------------------------------------------------
+    # 后台轮询
+    # ------------------------------------------------------------------
+
+    def _ensure_running(self) -> None:
+        loop = asyncio.get_running_loop()
+        if self._task is not None and not self._task.done() and self._task.get_loop() is loop:
+            return
+        # 首次启动或事件循环已更换（测试/重载）时重建协程及其同步原语
+        self._wakeup = asyncio.Event()
+        self._semaphore = asyncio.Semaphore(self.concurrency)
+        self._task = loop.create_task(self._run(), name="lipsync-poller")
+
+    async def _run(self) -> None:
+        while self._jobs:
+            now = time.monotonic()
+            due = [job for job in self._jobs.values() if job.next_poll_at <= now]
+            if due:
+                await asyncio.gather(*(self._poll(job) for job in due))
+                continue
+
+            self._wakeup.clear()
+            delay = min(job.next_poll_at for job in self._jobs.values()) - now
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=max(0.0, delay))
+            except asyncio.TimeoutError:
+                pass
+
+    async def _poll(self, job: LipsyncJob) -> None:
+        async with self._semaphore:
+            try:
+                payload = await self.client.get_generation(job.generation_id, timeout=self.request_timeout)
+            except SyncsoClientError as e:
+                payload = None
+                job.error = str(e)
+                self._stats["errors"] += 1
+                logger.warning(f"Lipsync status poll failed: {job.generation_id} ({e})")
+            except Exception as e:
+                payload = None
+                job.error = str(e)
+                self._stats["errors"] += 1
+                logger.error(f"Lipsync status poll crashed: {job.generation_id} ({e})")
+
+        job.polls += 1
+        self._stats["polls"] += 1
+        now = time.monotonic()
+        changed = False
+
+        if payload is not None:
+            job.error = None
+            job.raw = payload
+            status = (payload.get("status") or job.status).upper()
+            output_url = payload.get("outputUrl") or payload.get("outputMediaUrl") or job.output_url
+            changed = status != job.status or output_url != job.output_url
+            job.status = status
+            job.output_url = output_url
+
+        if changed:
+            self._stats["status_changes"] += 1
+            job.interval = self.min_interval
+            await self._persist(job)
+        else:
+            job.interval = min(self.max_interval, job.interval * self.backoff)
+        job.next_poll_at = now + job.interval
+
+        if not job.done and now >= job.deadline:
+            job.timed_out = True
+            self._stats["timed_out"] += 1
+            logger.warning(f"Lipsync poller gave up after {self.timeout}s: {job.generation_id}")
+
+        if job.done:
+            self._jobs.pop(job.generation_id, None)
+            if not job.timed_out:
+                # 超时任务不缓存，之后的查询会重新访问上游并恢复跟踪
+                self._remember_finished(job)
+                self._stats["finished"] += 1
+            self._publish(job)
+        elif changed:
+            self._publish(job)
+
+    async def _persist(self, job: LipsyncJob) -> None:
+        if not job.user_id:
+            return
+        await self.store.upsert_lipsync_result(
+            job.user_id,
+            {
+                **job.record,
+                "generation_id": job.generation_id,
+                "status": job.status,
+                "output_url": job.output_url,
+            },
+        )
+
+    def _publish(self, job: LipsyncJob) -> None:
+        event = job.event()
+        for queue in self._subscribers.get(job.generation_id, ()):
+            queue.put_nowait(event)
+
+    def _remember_finished(self, job: LipsyncJob) -> None:
+        self._finished[job.generation_id] = job
+        self._finished.move_to_end(job.generation_id)
+        while len(self._finished) > FINISHED_CACHE_SIZE:
+            self._finished.popitem(last=False)
+
+
+# =============================================================================
+# Global Instance (Lazy Initialization)
+# =============================================================================
+
+_lipsync_poller: Optional[LipsyncPoller] = None
+
+
+def get_lipsync_poller() -> LipsyncPoller:
+    """获取 lipsync 轮询器实例 (单例)"""
+    global _lipsync_poller
+    if _lipsync_poller is None:
+        _lipsync_poller = LipsyncPoller()
+    return _lipsync_poller
@@ -30,6 +30,7 @@ import httpx
 from PIL import Image
 
 from config.brand_logos import BrandInfo
+from services.http_clients import get_http_client
 
 
 # ========== 预设 Logo URL（作为 fallback） ==========
@@ -94,18 +95,18 @@ async def download_image(url: str, save_path: Path, timeout: int = 30) -> None:
         LogoDownloadError: 下载失败
     """
     try:
-        async with httpx.AsyncClient(timeout=timeout, follow_redirects=True) as client:
-            response = await client.get(url)
-            response.raise_for_status()
-
-            # 验证内容类型
-            content_type = response.headers.get("content-type", "")
-            if not any(img_type in content_type for img_type in ["image/", "application/octet-stream"]):
-                raise LogoDownloadError(f"Invalid content type: {content_type}")
-
-            # 保存原始文件
-            save_path.parent.mkdir(parents=True, exist_ok=True)
-            save_path.write_bytes(response.content)
+        client = get_http_client("media")
+        response = await client.get(url, timeout=timeout)
+        response.raise_for_status()
+
+        # 验证内容类型
+        content_type = response.headers.get("content-type", "")
+        if not any(img_type in content_type for img_type in ["image/", "application/octet-stream"]):
+            raise LogoDownloadError(f"Invalid content type: {content_type}")
+
+        # 保存原始文件
+        save_path.parent.mkdir(parents=True, exist_ok=True)
+        save_path.write_bytes(response.content)
 
     except httpx.HTTPError as e:
         raise LogoDownloadError(f"HTTP error downloading image: {e}")
@@ -1,18 +1,30 @@
 # -*- coding: utf-8 -*-
 """Media AI 源处理服务 - 上传保存、URL 下载、音频裁剪"""
 
+import asyncio
+import io
 import mimetypes
-import subprocess
+import os
+import shutil
 import tempfile
 import uuid
+import wave
+from contextlib import asynccontextmanager
 from pathlib import Path
-from typing import Tuple
+from typing import AsyncIterator, List, Optional, Tuple
 from urllib.parse import urlparse
 
 import httpx
 from fastapi import UploadFile
 
 from config import settings
+from services.blob_store import awrite_asset_bytes, move_asset_file, write_asset_bytes
+from services.ffmpeg_runner import FFmpegError, can_pipe_input, pipe_output_format, run_ffmpeg
+from services.http_clients import get_http_client
+
+
+# 提取/裁剪输出的 wav 采样率（16k 单声道）
+WAV_SAMPLE_RATE = 16000
 
 
 class MediaSourceError(Exception):
@@ -104,8 +116,7 @@ class MediaAISourceService:
         normalized_ext = ext if ext.startswith(".") else f".{ext}"
         filename = f"{prefix}_{uuid.uuid4().hex}{normalized_ext}"
         target_path = self.upload_dir / filename
-        with open(target_path, "wb") as f:
-            f.write(payload)
+        write_asset_bytes(payload, target_path)
         return {
             "filename": filename,
             "path": str(target_path),
@@ -133,8 +144,7 @@ class MediaAISourceService:
         if not content:
             raise MediaSourceError("上传文件内容为空")
 
-        with open(target_path, "wb") as f:
-            f.write(content)
+        await awrite_asset_bytes(content, target_path)
 
         return {
             "filename": filename,
@@ -160,6 +170,126 @@ class MediaAISourceService:
             content_type=content_type,
         )
 
+    def _resolve_local_asset(self, source_url: str) -> Optional[Path]:
+        """本站资源 URL 映射为 ASSETS_DIR 下的本地路径，非本站 URL 返回 None"""
+        prefix = self.url_prefix
+        if source_url.startswith(prefix + "/"):
+            relative = source_url.split(prefix + "/", 1)[-1]
+        elif source_url.startswith("/media/"):
+            relative = source_url.split("/media/", 1)[-1]
+        else:
+            return None
+        local_path = self.assets_dir / relative
+        if not local_path.exists():
+            raise MediaSourceError(f"本地文件不存在: {source_url}")
+        return local_path
+
+    def _check_media_payload(self, content_type: str, head: bytes) -> None:
+        if self._looks_like_html_or_json(content_type, head):
+            preview = head[:120].decode("utf-8", errors="ignore").replace("\n", " ").strip()
+            raise MediaSourceError(
+                f"下载到的内容不是媒体文件（content-type={content_type}），可能是页面/鉴权响应: {preview}"
+            )
+
+    @asynccontextmanager
+    async def download_to_temp(
+        self,
+        source_url: str,
+        *,
+        max_bytes: int | None = None,
+    ) -> AsyncIterator[Tuple[Path, str, str]]:
+        """
+        下载媒体到临时文件，返回 (本地路径, 文件名, content-type)
+
+        与 download_bytes 不同，内容边下载边写盘，不在内存中拼接完整字节，
+        适合几百 MB 的视频。本站资源直接返回原文件路径（不复制）。
+        临时文件在退出上下文时删除。
+
+        用法:
+            async with svc.download_to_temp(url, max_bytes=...) as (path, name, content_type):
+                ...
+        """
+        if not source_url:
+            raise MediaSourceError("source_url 不能为空")
+
+        limit = max_bytes if max_bytes is not None else self.max_audio_bytes
+
+        local_path = self._resolve_local_asset(source_url)
+        if local_path is not None:
+            if limit > 0 and local_path.stat().st_size > limit:
+                raise MediaSourceError(f"本地文件过大，超过限制 {limit} bytes")
+            guessed_type = mimetypes.guess_type(local_path.name)[0] or "application/octet-stream"
+            yield local_path, local_path.name, guessed_type
+            return
+
+        guessed_name = Path(urlparse(source_url).path).name or f"remote_{uuid.uuid4().hex}"
+        fd, temp_name = tempfile.mkstemp(prefix="media_ai_dl_", suffix=Path(guessed_name).suffix)
+        temp_path = Path(temp_name)
+        try:
+            try:
+                with os.fdopen(fd, "wb") as f:
+                    client = get_http_client("media")
+                    async with client.stream("GET", source_url, timeout=self.download_timeout) as response:
+                        response.raise_for_status()
+                        content_type = self._normalize_content_type(
+                            response.headers.get("content-type", ""),
+                            "application/octet-stream",
+                        )
+                        head = b""
+                        total = 0
+                        async for chunk in response.aiter_bytes():
+                            if not chunk:
+                                continue
+                            total += len(chunk)
+                            if limit > 0 and total > limit:
+                                raise MediaSourceError(f"下载文件过大，超过限制 {limit} bytes")
+                            if len(head) < 512:
+                                head += chunk[:512 - len(head)]
+                            await asyncio.to_thread(f.write, chunk)
+            except httpx.TimeoutException as e:
+                raise MediaSourceError(f"下载超时: {e}") from e
+            except httpx.HTTPStatusError as e:
+                raise MediaSourceError(f"下载失败，HTTP {e.response.status_code}") from e
+            except httpx.RequestError as e:
+                raise MediaSourceError(f"下载请求失败: {e}") from e
+
+            self._check_media_payload(content_type, head)
+            yield temp_path, guessed_name, content_type
+        finally:
+            temp_path.unlink(missing_ok=True)
+
+    def persist_file(
+        self,
+        source_path: Path,
+        *,
+        prefix: str,
+        ext: str,
+        content_type: str = "application/octet-stream",
+    ) -> dict:
+        """复制本地文件到 uploads 目录并返回可访问 URL（不读入内存）"""
+        source_path = Path(source_path)
+        size = source_path.stat().st_size if source_path.exists() else 0
+        if not size:
+            raise MediaSourceError("写入内容为空")
+        self._ensure_upload_dir()
+        normalized_ext = ext if ext.startswith(".") else f".{ext}"
+        filename = f"{prefix}_{uuid.uuid4().hex}{normalized_ext}"
+        target_path = self.upload_dir / filename
+        # 先复制到同目录临时文件，再经 blob 存储移动到位（源文件可能仍被调用方使用）
+        staging = self.upload_dir / f".{filename}.part"
+        try:
+            shutil.copyfile(source_path, staging)
+            move_asset_file(staging, target_path)
+        finally:
+            staging.unlink(missing_ok=True)
+        return {
+            "filename": filename,
+            "path": str(target_path),
+            "size": size,
+            "content_type": self._normalize_content_type(content_type, "application/octet-stream"),
+            "url": self.build_public_upload_url(target_path),
+        }
+
     async def download_bytes(
         self,
         source_url: str,
@@ -171,12 +301,8 @@ class MediaAISourceService:
 
         limit = max_bytes if max_bytes is not None else self.max_audio_bytes
 
-        prefix = self.url_prefix
-        if source_url.startswith(prefix + "/") or source_url.startswith("/media/"):
-            relative = source_url.split(prefix + "/", 1)[-1] if source_url.startswith(prefix + "/") else source_url.split("/media/", 1)[-1]
-            local_path = self.assets_dir / relative
-            if not local_path.exists():
-                raise MediaSourceError(f"本地文件不存在: {source_url}")
+        local_path = self._resolve_local_asset(source_url)
+        if local_path is not None:
             content = local_path.read_bytes()
             if limit > 0 and len(content) > limit:
                 raise MediaSourceError(f"本地文件过大，超过限制 {limit} bytes")
@@ -184,25 +310,25 @@ class MediaAISourceService:
             return content, local_path.name, guessed_type
 
         try:
-            async with httpx.AsyncClient(timeout=self.download_timeout, follow_redirects=True) as client:
-                async with client.stream("GET", source_url) as response:
-                    response.raise_for_status()
-                    content_type = self._normalize_content_type(
-                        response.headers.get("content-type", ""),
-                        "application/octet-stream",
-                    )
-                    parsed = urlparse(source_url)
-                    guessed_name = Path(parsed.path).name or f"remote_{uuid.uuid4().hex}"
-
-                    chunks = []
-                    total = 0
-                    async for chunk in response.aiter_bytes():
-                        if not chunk:
-                            continue
-                        total += len(chunk)
-                        if limit > 0 and total > limit:
-                            raise MediaSourceError(f"下载文件过大，超过限制 {limit} bytes")
-                        chunks.append(chunk)
+            client = get_http_client("media")
+            async with client.stream("GET", source_url, timeout=self.download_timeout) as response:
+                response.raise_for_status()
+                content_type = self._normalize_content_type(
+                    response.headers.get("content-type", ""),
+                    "application/octet-stream",
+                )
+                parsed = urlparse(source_url)
+                guessed_name = Path(parsed.path).name or f"remote_{uuid.uuid4().hex}"
+
+                chunks = []
+                total = 0
+                async for chunk in response.aiter_bytes():
+                    if not chunk:
+                        continue
+                    total += len(chunk)
+                    if limit > 0 and total > limit:
+                        raise MediaSourceError(f"下载文件过大，超过限制 {limit} bytes")
+                    chunks.append(chunk)
         except httpx.TimeoutException as e:
             raise MediaSourceError(f"下载超时: {e}") from e
         except httpx.HTTPStatusError as e:
@@ -211,15 +337,58 @@ class MediaAISourceService:
             raise MediaSourceError(f"下载请求失败: {e}") from e
 
         payload = b"".join(chunks)
-        if self._looks_like_html_or_json(content_type, payload):
-            preview = payload[:120].decode("utf-8", errors="ignore").replace("\n", " ").strip()
-            raise MediaSourceError(
-                f"下载到的内容不是媒体文件（content-type={content_type}），可能是页面/鉴权响应: {preview}"
-            )
+        self._check_media_payload(content_type, payload[:512])
 
         return payload, guessed_name, content_type
 
-    def trim_audio_clip(
+    async def _ffmpeg(self, args: List[str], *, input_bytes: Optional[bytes], action: str) -> bytes:
+        """执行 ffmpeg，失败时转换为 MediaSourceError"""
+        try:
+            result = await run_ffmpeg(args, input_bytes=input_bytes)
+        except FFmpegError as e:
+            reason = self._format_ffmpeg_error(e.stderr) if e.stderr else str(e)
+            raise MediaSourceError(f"ffmpeg {action}失败: {reason}") from e
+        return result.stdout
+
+    async def _ffmpeg_input(
+        self,
+        input_bytes: Optional[bytes],
+        ext: str,
+        temp_dir: Path,
+    ) -> Tuple[str, Optional[bytes]]:
+        """
+        决定输入方式: 可顺序解析的容器经 stdin 管道送入，
+        其余（如 moov 在末尾的 MP4）写入临时文件。返回 (-i 参数, stdin 数据)
+        """
+        if can_pipe_input(ext):
+            return "pipe:0", input_bytes
+        in_path = temp_dir / f"in{ext or '.bin'}"
+        await asyncio.to_thread(in_path.write_bytes, input_bytes)
+        return str(in_path), None
+
+    @staticmethod
+    def _pcm_to_wav(pcm: bytes, sample_rate: int) -> bytes:
+        """为 16-bit 单声道 PCM 加上 WAV 头（WAV 无法直接写到管道: 头部长度需回填）"""
+        buffer = io.BytesIO()
+        with wave.open(buffer, "wb") as wav:
+            wav.setnchannels(1)
+            wav.setsampwidth(2)
+            wav.setframerate(sample_rate)
+            wav.writeframes(pcm)
+        return buffer.getvalue()
+
+    async def _to_wav(self, args: List[str], *, input_bytes: Optional[bytes], action: str) -> bytes:
+        """执行输出 16k 单声道 PCM 到 stdout 的 ffmpeg，返回 WAV 字节"""
+        pcm = await self._ffmpeg(
+            [*args, "-vn", "-ar", str(WAV_SAMPLE_RATE), "-ac", "1", "-f", "s16le", "-acodec", "pcm_s16le", "pipe:1"],
+            input_bytes=input_bytes,
+            action=action,
+        )
+        if not pcm:
+            raise MediaSourceError(f"ffmpeg {action}失败: 未输出音频数据")
+        return self._pcm_to_wav(pcm, WAV_SAMPLE_RATE)
+
+    async def trim_audio_clip(
         self,
         input_bytes: bytes,
         input_ext: str,
@@ -233,66 +402,43 @@ class MediaAISourceService:
 
         ext = input_ext if input_ext.startswith(".") else f".{input_ext}"
         with tempfile.TemporaryDirectory(prefix="media_ai_clip_") as temp_dir:
-            temp_path = Path(temp_dir)
-            in_path = temp_path / f"in{ext or '.bin'}"
-            out_path = temp_path / "clip.wav"
-            in_path.write_bytes(input_bytes)
-
-            cmd = [
-                "ffmpeg",
-                "-y",
-                "-hide_banner",
-                "-loglevel", "error",
-                "-ss", str(max(0, start_seconds)),
-                "-t", str(max(1, duration_seconds)),
-                "-i", str(in_path),
-                "-vn",
-                "-ar", "16000",
-                "-ac", "1",
-                str(out_path),
-            ]
-            result = subprocess.run(cmd, capture_output=True, text=True)
-            if result.returncode != 0 or not out_path.exists():
-                reason = self._format_ffmpeg_error(result.stderr, result.stdout)
-                raise MediaSourceError(f"ffmpeg 裁剪失败: {reason}")
-
-            return out_path.read_bytes(), "clip.wav", "audio/wav"
-
-    def extract_audio_to_wav(
+            source, stdin = await self._ffmpeg_input(input_bytes, ext, Path(temp_dir))
+            wav_bytes = await self._to_wav(
+                [
+                    "-ss", str(max(0, start_seconds)),
+                    "-t", str(max(1, duration_seconds)),
+                    "-i", source,
+                ],
+                input_bytes=stdin,
+                action="裁剪",
+            )
+        return wav_bytes, "clip.wav", "audio/wav"
+
+    async def extract_audio_to_wav(
         self,
-        input_bytes: bytes,
-        input_ext: str,
+        input_bytes: bytes | None = None,
+        input_ext: str = "",
+        *,
+        input_path: Path | None = None,
     ) -> Tuple[bytes, str, str]:
-        """从视频/音频源提取完整音轨，输出 16k 单声道 wav"""
-        if not input_bytes:
+        """
+        从视频/音频源提取完整音轨，输出 16k 单声道 wav
+
+        input_path 指向已落盘的源文件时直接交给 ffmpeg 读取，不再经过内存。
+        """
+        if input_path is None and not input_bytes:
             raise MediaSourceError("输入媒体为空")
 
         ext = input_ext if input_ext.startswith(".") else f".{input_ext}"
         with tempfile.TemporaryDirectory(prefix="media_ai_extract_") as temp_dir:
-            temp_path = Path(temp_dir)
-            in_path = temp_path / f"in{ext or '.bin'}"
-            out_path = temp_path / "full.wav"
-            in_path.write_bytes(input_bytes)
-
-            cmd = [
-                "ffmpeg",
-                "-y",
-                "-hide_banner",
-                "-loglevel", "error",
-                "-i", str(in_path),
-                "-vn",
-                "-ar", "16000",
-                "-ac", "1",
-                str(out_path),
-            ]
-            result = subprocess.run(cmd, capture_output=True, text=True)
-            if result.returncode != 0 or not out_path.exists():
-                reason = self._format_ffmpeg_error(result.stderr, result.stdout)
-                raise MediaSourceError(f"ffmpeg 提取音轨失败: {reason}")
-
-            return out_path.read_bytes(), "full.wav", "audio/wav"
-
-    def change_audio_speed(
+            if input_path is not None:
+                source, stdin = str(input_path), None
+            else:
+                source, stdin = await self._ffmpeg_input(input_bytes, ext, Path(temp_dir))
+            wav_bytes = await self._to_wav(["-i", source], input_bytes=stdin, action="提取音轨")
+        return wav_bytes, "full.wav", "audio/wav"
+
+    async def change_audio_speed(
         self,
         input_bytes: bytes,
         input_ext: str,
@@ -313,32 +459,32 @@ class MediaAISourceService:
             content_type = mimetypes.guess_type(f"out{normalized_out_ext}")[0] or "application/octet-stream"
             return input_bytes, f"speed1x{normalized_out_ext}", content_type
 
+        out_name = f"speed{normalized_out_ext}"
+        content_type = mimetypes.guess_type(out_name)[0] or "application/octet-stream"
+        atempo_filter = self._build_atempo_filter(speed)
+        output_format = pipe_output_format(normalized_out_ext)
+
         with tempfile.TemporaryDirectory(prefix="media_ai_speed_") as temp_dir:
             temp_path = Path(temp_dir)
-            in_path = temp_path / f"in{normalized_in_ext}"
-            out_path = temp_path / f"speed{normalized_out_ext}"
-            in_path.write_bytes(input_bytes)
-
-            atempo_filter = self._build_atempo_filter(speed)
-            cmd = [
-                "ffmpeg",
-                "-y",
-                "-hide_banner",
-                "-loglevel", "error",
-                "-i", str(in_path),
-                "-filter:a", atempo_filter,
-                str(out_path),
-            ]
-            result = subprocess.run(cmd, capture_output=True, text=True)
-            if result.returncode != 0 or not out_path.exists():
-                reason = self._format_ffmpeg_error(result.stderr, result.stdout)
-                raise MediaSourceError(f"ffmpeg 调整语速失败: {reason}")
-
-            out_bytes = out_path.read_bytes()
-            content_type = mimetypes.guess_type(out_path.name)[0] or "application/octet-stream"
-            return out_bytes, out_path.name, content_type
-
-    def trim_video_clip(
+            source, stdin = await self._ffmpeg_input(input_bytes, normalized_in_ext, temp_path)
+            args = ["-i", source, "-filter:a", atempo_filter]
+            if output_format:
+                out_bytes = await self._ffmpeg(
+                    [*args, "-f", output_format, "pipe:1"],
+                    input_bytes=stdin,
+                    action="调整语速",
+                )
+            else:
+                # 输出容器需要回写头部（wav/m4a 等），写入临时文件
+                out_path = temp_path / out_name
+                await self._ffmpeg([*args, str(out_path)], input_bytes=stdin, action="调整语速")
+                out_bytes = await asyncio.to_thread(out_path.read_bytes) if out_path.exists() else b""
+
+        if not out_bytes:
+            raise MediaSourceError("ffmpeg 调整语速失败: 未生成输出")
+        return out_bytes, out_name, content_type
+
+    async def trim_video_clip(
         self,
         input_bytes: bytes,
         input_ext: str,
@@ -353,31 +499,29 @@ class MediaAISourceService:
         ext = input_ext if input_ext.startswith(".") else f".{input_ext}"
         with tempfile.TemporaryDirectory(prefix="media_ai_vclip_") as temp_dir:
             temp_path = Path(temp_dir)
-            in_path = temp_path / f"in{ext or '.bin'}"
+            source, stdin = await self._ffmpeg_input(input_bytes, ext, temp_path)
+            # +faststart 需要回写 moov，输出只能是可 seek 的文件
             out_path = temp_path / "clip.mp4"
-            in_path.write_bytes(input_bytes)
-
-            cmd = [
-                "ffmpeg",
-                "-y",
-                "-hide_banner",
-                "-loglevel", "error",
-                "-ss", str(max(0, start_seconds)),
-                "-t", str(max(1, duration_seconds)),
-                "-i", str(in_path),
-                "-map", "0:v:0",
-                "-map", "0:a?",
-                "-c:v", "libx264",
-                "-preset", "veryfast",
-                "-crf", "23",
-                "-c:a", "aac",
-                "-movflags", "+faststart",
-                "-pix_fmt", "yuv420p",
-                str(out_path),
-            ]
-            result = subprocess.run(cmd, capture_output=True, text=True)
-            if result.returncode != 0 or not out_path.exists():
-                reason = self._format_ffmpeg_error(result.stderr, result.stdout)
-                raise MediaSourceError(f"ffmpeg 裁剪视频失败: {reason}")
-
-            return out_path.read_bytes(), out_path.name, "video/mp4"
+            await self._ffmpeg(
+                [
+                    "-ss", str(max(0, start_seconds)),
+                    "-t", str(max(1, duration_seconds)),
+                    "-i", source,
+                    "-map", "0:v:0",
+                    "-map", "0:a?",
+                    "-c:v", "libx264",
+                    "-preset", "veryfast",
+                    "-crf", "23",
+                    "-c:a", "aac",
+                    "-movflags", "+faststart",
+                    "-pix_fmt", "yuv420p",
+                    str(out_path),
+                ],
+                input_bytes=stdin,
+                action="裁剪视频",
+            )
+            if not out_path.exists():
+                raise MediaSourceError("ffmpeg 裁剪视频失败: 未生成输出")
+            out_bytes = await asyncio.to_thread(out_path.read_bytes)
+
+        return out_bytes, out_path.name, "video/mp4"
@@ -165,6 +165,7 @@ class MediaAIStore:
             logger.warning(f"Failed to persist TTS result: {exc}")
 
     async def upsert_lipsync_result(self, user_id: Optional[str], data: Dict[str, Any]) -> None:
+        # 缺省字段（None）保留库中原值，状态轮询只需传 generation_id/status/output_url
         if not user_id:
             return
         generation_id = (data.get("generation_id") or "").strip()
@@ -191,13 +192,13 @@ class MediaAIStore:
                 :video_url, :audio_url, :video_source_type, :audio_source_type
             )
             ON DUPLICATE KEY UPDATE
-                model = VALUES(model),
-                status = VALUES(status),
-                output_url = VALUES(output_url),
-                video_url = VALUES(video_url),
-                audio_url = VALUES(audio_url),
-                video_source_type = VALUES(video_source_type),
-                audio_source_type = VALUES(audio_source_type),
+                model = COALESCE(VALUES(model), model),
+                status = COALESCE(VALUES(status), status),
+                output_url = COALESCE(VALUES(output_url), output_url),
+                video_url = COALESCE(VALUES(video_url), video_url),
+                audio_url = COALESCE(VALUES(audio_url), audio_url),
+                video_source_type = COALESCE(VALUES(video_source_type), video_source_type),
+                audio_source_type = COALESCE(VALUES(audio_source_type), audio_source_type),
                 updated_at = CURRENT_TIMESTAMP(6)
             """
         )
@@ -0,0 +1,130 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2026 relakkes@gmail.com
+#
+# This file is part of MediaCrawlerPro-ContentRemixAgent project.
+# Repository: https://github.com/MediaCrawlerPro/MediaCrawlerPro-ContentRemixAgent/blob/main/backend/services/multipart_stream.py
+# GitHub: https://github.com/NanmiCoder
+# Licensed under NON-COMMERCIAL LEARNING LICENSE 1.1
+#
+# 声明：本代码仅供学习和研究目的使用。使用者应遵守以下原则：
+# 1. 不得用于任何商业用途。
+# 2. 使用时应遵守目标平台的使用条款和robots.txt规则。
+# 3. 不得进行大规模爬取或对平台造成运营干扰。
+# 4. 应合理控制请求频率，避免给目标平台带来不必要的负担。
+# 5. 不得用于任何非法或不当的用途。
+#
+# 详细许可条款请参阅项目根目录下的LICENSE文件。
+# 使用本代码即表示您同意遵守上述原则和LICENSE中的所有条款。
+
+
+"""
+流式 multipart/form-data 请求体
+
+httpx 的 files= 需要把文件整体读入内存（或同步文件句柄），大视频上传时
+每个任务都要常驻一份完整字节。这里按 RFC 7578 自行拼装请求体:
+
+- 文本字段与各文件的分段头预先编码，文件内容在发送时按块从磁盘读取
+- 总长度在发送前即可算出，请求带显式 Content-Length，不退化为 chunked 编码
+- 峰值内存与文件大小无关，只取决于读块大小
+"""
+
+import asyncio
+import os
+import uuid
+from dataclasses import dataclass
+from pathlib import Path
+from typing import AsyncIterator, Dict, List, Optional, Tuple, Union
+
+UPLOAD_READ_SIZE = 256 * 1024
+
+
+@dataclass
+class FilePart:
+    """multipart 中的一个文件字段，内容来自磁盘文件或内存字节"""
+    name: str
+    filename: str
+    content_type: str = "application/octet-stream"
+    path: Optional[Path] = None
+    data: Optional[bytes] = None
+
+    @property
+    def size(self) -> int:
+        if self.path is not None:
+            return os.path.getsize(self.path)
+        return len(self.data or b"")
+
+
+def _quote(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', "%22").replace("\r", "%0D").replace("\n", "%0A")
+
+
+class MultipartStream:
+    """可多次迭代的流式 multipart 请求体（httpx 重试/重定向时会重新迭代）"""
+
+    def __init__(
+        self,
+        files: List[FilePart],
+        fields: Optional[Dict[str, str]] = None,
+        *,
+        boundary: Optional[str] = None,
+        read_size: int = UPLOAD_READ_SIZE,
+    ):
+        self.boundary = boundary or uuid.uuid4().hex
+        self.read_size = max(1, read_size)
+        self._parts: List[Tuple[bytes, Union[FilePart, bytes]]] = []
+        for key, value in (fields or {}).items():
+            head = (
+                f"--{self.boundary}\r\n"
+                f'Content-Disposition: form-data; name="{_quote(key)}"\r\n\r\n'
+            ).encode("utf-8")
+            self._parts.append((head, str(value).encode("utf-8")))
+        for part in files:
+            head = (
+                f"--{self.boundary}\r\n"
+                f'Content-Disposition: form-data; name="{_quote(part.name)}"; '
+                f'filename="{_quote(part.filename)}"\r\n'
+                f"Content-Type: {part.content_type}\r\n\r\n"
+            ).encode("utf-8")
+            self._parts.append((head, part))
+        self._tail = f"--{self.boundary}--\r\n".encode("ascii")
+
+    @property
+    def content_type(self) -> str:
+        return f"multipart/form-data; boundary={self.boundary}"
+
+    @property
+    def content_length(self) -> int:
+        total = len(self._tail)
+        for head, body in self._parts:
+            size = body.size if isinstance(body, FilePart) else len(body)
+            total += len(head) + size + 2  # 每段末尾的 \r\n
+        return total
+
+    @property
+    def headers(self) -> Dict[str, str]:
+        return {
+            "Content-Type": self.content_type,
+            "Content-Length": str(self.content_length),
+        }
+
+    async def _iter_file(self, path: Path) -> AsyncIterator[bytes]:
+        with open(path, "rb") as f:
+            while True:
+                chunk = await asyncio.to_thread(f.read, self.read_size)
+                if not chunk:
+                    return
+                yield chunk
+
+    async def __aiter__(self) -> AsyncIterator[bytes]:
+        for head, body in self._parts:
+            yield head
+            if isinstance(body, FilePart):
+                if body.path is not None:
+                    async for chunk in self._iter_file(body.path):
+                        yield chunk
+                elif body.data:
+                    yield body.data
+            else:
+                yield body
+            yield b"\r\n"
+        yield self._tail
@@ -32,6 +32,7 @@ from urllib.parse import urlencode
 import httpx
 
 from config import settings
+from services.http_clients import get_http_client
 from utils.logger import logger
 
 
@@ -102,82 +103,82 @@ class GitHubOAuthClient:
         if not self.is_configured():
             raise OAuthError("GitHub OAuth 未配置")
 
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                self.TOKEN_URL,
-                data={
-                    "client_id": self.client_id,
-                    "client_secret": self.client_secret,
-                    "code": code,
-                    "redirect_uri": self.callback_url,
-                },
-                headers={"Accept": "application/json"},
-            )
+        client = get_http_client("oauth")
+        response = await client.post(
+            self.TOKEN_URL,
+            data={
+                "client_id": self.client_id,
+                "client_secret": self.client_secret,
+                "code": code,
+                "redirect_uri": self.callback_url,
+            },
+            headers={"Accept": "application/json"},
+        )
 
-            if response.status_code != 200:
-                logger.error(f"GitHub token exchange failed: {response.text}")
-                raise OAuthError("获取 Access Token 失败")
+        if response.status_code != 200:
+            logger.error(f"GitHub token exchange failed: {response.text}")
+            raise OAuthError("获取 Access Token 失败")
 
-            data = response.json()
+        data = response.json()
 
-            if "error" in data:
-                logger.error(f"GitHub OAuth error: {data}")
-                raise OAuthError(data.get("error_description", "OAuth 错误"))
+        if "error" in data:
+            logger.error(f"GitHub OAuth error: {data}")
+            raise OAuthError(data.get("error_description", "OAuth 错误"))
 
-            return data["access_token"]
+        return data["access_token"]
 
     async def get_user_info(self, access_token: str) -> OAuthUserInfo:
         """获取用户信息"""
-        async with httpx.AsyncClient() as client:
-            # 获取基本用户信息
-            response = await client.get(
-                self.USER_API_URL,
+        client = get_http_client("oauth")
+        # 获取基本用户信息
+        response = await client.get(
+            self.USER_API_URL,
+            headers={
+                "Authorization": f"Bearer {access_token}",
+                "Accept": "application/vnd.github+json",
+            },
+        )
+
+        if response.status_code != 200:
+            logger.error(f"GitHub user API failed: {response.text}")
+            raise OAuthError("获取用户信息失败")
+
+        user_data = response.json()
+
+        # 获取邮箱（可能需要单独请求）
+        email = user_data.get("email")
+        if not email:
+            email_response = await client.get(
+                self.EMAIL_API_URL,
                 headers={
                     "Authorization": f"Bearer {access_token}",
                     "Accept": "application/vnd.github+json",
                 },
             )
-
-            if response.status_code != 200:
-                logger.error(f"GitHub user API failed: {response.text}")
-                raise OAuthError("获取用户信息失败")
-
-            user_data = response.json()
-
-            # 获取邮箱（可能需要单独请求）
-            email = user_data.get("email")
-            if not email:
-                email_response = await client.get(
-                    self.EMAIL_API_URL,
-                    headers={
-                        "Authorization": f"Bearer {access_token}",
-                        "Accept": "application/vnd.github+json",
-                    },
-                )
-                if email_response.status_code == 200:
-                    emails = email_response.json()
-                    # 优先使用主邮箱
+            if email_response.status_code == 200:
+                emails = email_response.json()
+                # 优先使用主邮箱
+                for e in emails:
+                    if e.get("primary") and e.get("verified"):
+                        email = e["email"]
+                        break
+                # 如果没有主邮箱，使用第一个已验证的
+                if not email:
                     for e in emails:
-                        if e.get("primary") and e.get("verified"):
+                        if e.get("verified"):
                             email = e["email"]
                             break
-                    # 如果没有主邮箱，使用第一个已验证的
-                    if not email:
-                        for e in emails:
-                            if e.get("verified"):
-                                email = e["email"]
-                                break
-
-            return OAuthUserInfo(
-                provider="github",
-                provider_user_id=str(user_data["id"]),
-                email=email,
-                display_name=user_data.get("name") or user_data.get("login"),
-                avatar_url=user_data.get("avatar_url"),
-                access_token=access_token,
-                refresh_token=None,  # GitHub 不返回 refresh token
-                raw_data=user_data,
-            )
+
+        return OAuthUserInfo(
+            provider="github",
+            provider_user_id=str(user_data["id"]),
+            email=email,
+            display_name=user_data.get("name") or user_data.get("login"),
+            avatar_url=user_data.get("avatar_url"),
+            access_token=access_token,
+            refresh_token=None,  # GitHub 不返回 refresh token
+            raw_data=user_data,
+        )
 
 
 class GoogleOAuthClient:
@@ -231,54 +232,54 @@ class GoogleOAuthClient:
         if not self.is_configured():
             raise OAuthError("Google OAuth 未配置")
 
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                self.TOKEN_URL,
-                data={
-                    "client_id": self.client_id,
-                    "client_secret": self.client_secret,
-                    "code": code,
-                    "redirect_uri": self.callback_url,
-                    "grant_type": "authorization_code",
-                },
-            )
+        client = get_http_client("oauth")
+        response = await client.post(
+            self.TOKEN_URL,
+            data={
+                "client_id": self.client_id,
+                "client_secret": self.client_secret,
+                "code": code,
+                "redirect_uri": self.callback_url,
+                "grant_type": "authorization_code",
+            },
+        )
 
-            if response.status_code != 200:
-                logger.error(f"Google token exchange failed: {response.text}")
-                raise OAuthError("获取 Access Token 失败")
+        if response.status_code != 200:
+            logger.error(f"Google token exchange failed: {response.text}")
+            raise OAuthError("获取 Access Token 失败")
 
-            data = response.json()
+        data = response.json()
 
-            if "error" in data:
-                logger.error(f"Google OAuth error: {data}")
-                raise OAuthError(data.get("error_description", "OAuth 错误"))
+        if "error" in data:
+            logger.error(f"Google OAuth error: {data}")
+            raise OAuthError(data.get("error_description", "OAuth 错误"))
 
-            return data["access_token"], data.get("refresh_token")
+        return data["access_token"], data.get("refresh_token")
 
     async def get_user_info(self, access_token: str, refresh_token: str = None) -> OAuthUserInfo:
         """获取用户信息"""
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                self.USER_API_URL,
-                headers={"Authorization": f"Bearer {access_token}"},
-            )
-
-            if response.status_code != 200:
-                logger.error(f"Google user API failed: {response.text}")
-                raise OAuthError("获取用户信息失败")
-
-            user_data = response.json()
-
-            return OAuthUserInfo(
-                provider="google",
-                provider_user_id=user_data["id"],
-                email=user_data.get("email"),
-                display_name=user_data.get("name"),
-                avatar_url=user_data.get("picture"),
-                access_token=access_token,
-                refresh_token=refresh_token,
-                raw_data=user_data,
-            )
+        client = get_http_client("oauth")
+        response = await client.get(
+            self.USER_API_URL,
+            headers={"Authorization": f"Bearer {access_token}"},
+        )
+
+        if response.status_code != 200:
+            logger.error(f"Google user API failed: {response.text}")
+            raise OAuthError("获取用户信息失败")
+
+        user_data = response.json()
+
+        return OAuthUserInfo(
+            provider="google",
+            provider_user_id=user_data["id"],
+            email=user_data.get("email"),
+            display_name=user_data.get("name"),
+            avatar_url=user_data.get("picture"),
+            access_token=access_token,
+            refresh_token=refresh_token,
+            raw_data=user_data,
+        )
 
 
 # 单例
@@ -1,11 +1,14 @@
 # -*- coding: utf-8 -*-
 """Sync.so API 客户端 - Lipsync 生成"""
 
-from typing import Any, Dict
+from pathlib import Path
+from typing import Any, Dict, Optional
 
 import httpx
 
 from config import settings
+from services.http_clients import get_http_client
+from services.multipart_stream import FilePart, MultipartStream
 
 
 class SyncsoClientError(Exception):
@@ -28,33 +31,51 @@ class SyncsoClient:
 
     async def create_generation(
         self,
-        video_bytes: bytes,
-        video_filename: str,
-        video_content_type: str,
-        audio_bytes: bytes,
-        audio_filename: str,
-        audio_content_type: str,
+        video_bytes: Optional[bytes] = None,
+        video_filename: str = "input_video.mp4",
+        video_content_type: str = "video/mp4",
+        audio_bytes: Optional[bytes] = None,
+        audio_filename: str = "input_audio.mp3",
+        audio_content_type: str = "audio/mpeg",
         model: str = "lipsync-2",
+        *,
+        video_path: Optional[Path] = None,
+        audio_path: Optional[Path] = None,
     ) -> Dict[str, Any]:
-        """创建 lipsync 任务"""
+        """
+        创建 lipsync 任务
+
+        素材可以是内存字节（video_bytes/audio_bytes），也可以是磁盘文件
+        （video_path/audio_path）。文件形式以流式 multipart 上传，按块读盘，
+        大视频不会整体驻留内存。
+        """
         self._check_config()
+        if video_path is None and not video_bytes:
+            raise SyncsoClientError("视频素材为空")
+        if audio_path is None and not audio_bytes:
+            raise SyncsoClientError("音频素材为空")
+
         url = f"{self.base_url}/generate"
-        headers = {"x-api-key": self.api_key}
-        files = {
-            "video": (video_filename, video_bytes, video_content_type),
-            "audio": (audio_filename, audio_bytes, audio_content_type),
-        }
-        form_data = {"model": model}
+        body = MultipartStream(
+            files=[
+                FilePart("video", video_filename, video_content_type, path=video_path, data=video_bytes),
+                FilePart("audio", audio_filename, audio_content_type, path=audio_path, data=audio_bytes),
+            ],
+            fields={"model": model},
+        )
+        headers = {"x-api-key": self.api_key, **body.headers}
 
         try:
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                response = await client.post(url, files=files, data=form_data, headers=headers)
+            client = get_http_client("syncso")
+            response = await client.post(url, content=body, headers=headers, timeout=self.timeout)
         except httpx.TimeoutException as e:
             raise SyncsoClientError(f"Sync.so 请求超时: {e}") from e
         except httpx.ConnectError as e:
             raise SyncsoClientError(f"无法连接 Sync.so 服务: {e}") from e
         except httpx.RequestError as e:
             raise SyncsoClientError(f"Sync.so 请求失败: {e}") from e
+        except OSError as e:
+            raise SyncsoClientError(f"读取素材文件失败: {e}") from e
 
         try:
             payload = response.json()
@@ -76,15 +97,15 @@ class SyncsoClient:
             "raw": payload,
         }
 
-    async def get_generation(self, generation_id: str) -> Dict[str, Any]:
+    async def get_generation(self, generation_id: str, timeout: Optional[float] = None) -> Dict[str, Any]:
         """查询 lipsync 任务状态"""
         self._check_config()
         url = f"{self.base_url}/generate/{generation_id}"
         headers = {"x-api-key": self.api_key}
 
         try:
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                response = await client.get(url, headers=headers)
+            client = get_http_client("syncso")
+            response = await client.get(url, headers=headers, timeout=timeout or self.timeout)
         except httpx.TimeoutException as e:
             raise SyncsoClientError(f"Sync.so 状态查询超时: {e}") from e
         except httpx.RequestError as e:
@@ -0,0 +1,133 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2026 relakkes@gmail.com
+#
+# This file is part of MediaCrawlerPro-ContentRemixAgent project.
+# Repository: https://github.com/MediaCrawlerPro/MediaCrawlerPro-ContentRemixAgent/blob/main/backend/services/tts_audio_service.py
+# GitHub: https://github.com/NanmiCoder
+# Licensed under NON-COMMERCIAL LEARNING LICENSE 1.1
+#
+# 声明：本代码仅供学习和研究目的使用。使用者应遵守以下原则：
+# 1. 不得用于任何商业用途。
+# 2. 使用时应遵守目标平台的使用条款和robots.txt规则。
+# 3. 不得进行大规模爬取或对平台造成运营干扰。
+# 4. 应合理控制请求频率，避免给目标平台带来不必要的负担。
+# 5. 不得用于任何非法或不当的用途。
+#
+# 详细许可条款请参阅项目根目录下的LICENSE文件。
+# 使用本代码即表示您同意遵守上述原则和LICENSE中的所有条款。
+
+
+"""
+TTS 音频合成（二级缓存）
+
+/media-ai/tts 接口、text_to_speech 工具和 lipsync 工具共用的合成流程:
+缓存查询 -> Voicv 合成 -> 下载 -> 变速（语速 != 1 时）-> 落盘 -> 写入缓存。
+
+缓存开启时音频总是落盘到 uploads，缓存条目指向本地资源而不是会过期的上游 URL。
+准入控制由调用方通过 slot 工厂注入（接口按用户、工具按会话上下文）。
+"""
+
+import asyncio
+from pathlib import Path
+from typing import AsyncContextManager, Callable, Optional
+
+from config import settings
+from services.admission_control import ResourceClass
+from services.media_ai_source_service import MediaAISourceService
+from services.tts_cache import get_tts_cache
+from services.voicv_client import VoicvClient
+from utils.logger import logger
+
+
+SlotFactory = Callable[[ResourceClass], AsyncContextManager]
+
+
+async def synthesize_tts_audio(
+    *,
+    voice_id: str,
+    text: str,
+    audio_format: str,
+    speed: float,
+    slot: SlotFactory,
+    client: Optional[VoicvClient] = None,
+    source_svc: Optional[MediaAISourceService] = None,
+) -> dict:
+    """
+    合成（或复用）一段 TTS 音频
+
+    Args:
+        voice_id: 音色 ID
+        text: 最终送入 TTS 的标注文本
+        audio_format: 输出格式（mp3/wav 等）
+        speed: 语速倍率，1.0 表示不变速
+        slot: 准入控制工厂，slot(ResourceClass.X) 返回异步上下文管理器
+
+    Returns:
+        Voicv 返回结果，附加 audio_url / original_audio_url / audio_local_path / cached 字段
+    """
+    cache = get_tts_cache()
+    needs_speed = abs(speed - 1.0) > 1e-6
+    key = cache.audio_key(text, voice_id, speed, audio_format)
+
+    cached = await asyncio.to_thread(cache.get_audio, key)
+    if cached:
+        logger.debug(f"[tts] audio cache hit: voice_id={voice_id}")
+        return {
+            "audio_url": cached["audio_url"],
+            "voice_id": voice_id,
+            "format": audio_format,
+            "original_audio_url": cached.get("original_audio_url"),
+            "audio_local_path": cached["audio_local_path"],
+            "cached": True,
+        }
+
+    client = client or VoicvClient()
+    async with slot(ResourceClass.MEDIA_API):
+        result = await client.text_to_speech(
+            voice_id=voice_id,
+            text=text,
+            audio_format=audio_format,
+        )
+    result["cached"] = False
+
+    if not needs_speed and not cache.enabled:
+        return result
+
+    source_svc = source_svc or MediaAISourceService()
+    upstream_url = result["audio_url"]
+    async with slot(ResourceClass.DOWNLOAD):
+        audio_bytes, guessed_name, content_type = await source_svc.download_bytes(
+            upstream_url,
+            max_bytes=max(settings.VOICE_CLONE_MAX_AUDIO_BYTES, 50 * 1024 * 1024),
+        )
+    output_ext = f".{audio_format}"
+    ext = Path(guessed_name).suffix or output_ext
+
+    if needs_speed:
+        async with slot(ResourceClass.FFMPEG):
+            audio_bytes, speed_name, content_type = await source_svc.change_audio_speed(
+                audio_bytes,
+                input_ext=ext,
+                speed=speed,
+                output_ext=output_ext,
+            )
+        ext = Path(speed_name).suffix or output_ext
+
+    asset = source_svc.persist_bytes(
+        audio_bytes,
+        prefix="tts_speed" if needs_speed else "tts",
+        ext=ext,
+        content_type=content_type,
+    )
+    result["original_audio_url"] = upstream_url
+    result["audio_url"] = asset["url"]
+    result["audio_local_path"] = asset["path"]
+
+    await asyncio.to_thread(cache.put_audio, key, {
+        "audio_url": asset["url"],
+        "audio_local_path": asset["path"],
+        "original_audio_url": upstream_url,
+        "voice_id": voice_id,
+        "format": audio_format,
+    })
+    return result
@@ -0,0 +1,170 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2026 relakkes@gmail.com
+#
+# This file is part of MediaCrawlerPro-ContentRemixAgent project.
+# Repository: https://github.com/MediaCrawlerPro/MediaCrawlerPro-ContentRemixAgent/blob/main/backend/services/tts_cache.py
+# GitHub: https://github.com/NanmiCoder
+# Licensed under NON-COMMERCIAL LEARNING LICENSE 1.1
+#
+# 声明：本代码仅供学习和研究目的使用。使用者应遵守以下原则：
+# 1. 不得用于任何商业用途。
+# 2. 使用时应遵守目标平台的使用条款和robots.txt规则。
+# 3. 不得进行大规模爬取或对平台造成运营干扰。
+# 4. 应合理控制请求频率，避免给目标平台带来不必要的负担。
+# 5. 不得用于任何非法或不当的用途。
+#
+# 详细许可条款请参阅项目根目录下的LICENSE文件。
+# 使用本代码即表示您同意遵守上述原则和LICENSE中的所有条款。
+
+
+"""
+TTS 两级缓存 - 复用 LLM 标注结果与合成音频
+
+相同文本、风格、标签偏好重复请求时，LLM 标注和 Voicv 合成都会被完整重跑。
+缓存分两级:
+
+- tags:  键为 (原文, speech_style, 语气偏好, 音效偏好, 标注模型)，值为通过原文校验的标注文本
+- audio: 键为 (标注后文本, voice_id, 语速, 音频格式)，值为已落盘音频资源的 URL/路径
+
+音频本身作为普通资源写入 uploads（经 blob 存储去重），缓存条目只记录引用；
+淘汰条目不删除音频文件（历史 TTS 记录仍引用它），命中时若文件已不存在则视为未命中。
+
+每级一个 JsonFileStore（与视频处理结果缓存共用的存储实现）:
+- 每个条目一个 JSON 文件: {TTS_CACHE_DIR}/{level}/{sha1(key)}.json
+- 条目创建超过 TTS_CACHE_TTL_SECONDS 后失效；每级条目数超过 TTS_CACHE_MAX_ENTRIES 时按最近访问时间淘汰
+"""
+
+import hashlib
+import json
+from pathlib import Path
+from typing import Any, Dict, Optional, Sequence
+
+from config import settings
+from services.json_file_store import JsonFileStore
+
+
+TAGS_LEVEL = "tags"
+AUDIO_LEVEL = "audio"
+
+
+class TTSCache:
+    """基于文件系统的 TTS 两级缓存"""
+
+    def __init__(
+        self,
+        cache_dir: Optional[str] = None,
+        ttl_seconds: Optional[int] = None,
+        max_entries: Optional[int] = None,
+        enabled: Optional[bool] = None,
+    ):
+        self.cache_dir = Path(cache_dir or settings.TTS_CACHE_DIR)
+        self.ttl_seconds = ttl_seconds if ttl_seconds is not None else settings.TTS_CACHE_TTL_SECONDS
+        self.max_entries = max_entries if max_entries is not None else settings.TTS_CACHE_MAX_ENTRIES
+        self.enabled = settings.TTS_CACHE_ENABLED if enabled is None else enabled
+        self._stores = {
+            level: JsonFileStore(
+                self.cache_dir / level,
+                name=f"TTS cache ({level})",
+                ttl_seconds=self.ttl_seconds,
+                max_entries=self.max_entries,
+            )
+            for level in (TAGS_LEVEL, AUDIO_LEVEL)
+        }
+
+    # ------------------------------------------------------------------
+    # 缓存键
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def make_key(*parts: Any) -> str:
+        """由有序字段生成缓存键（文件名安全）"""
+        raw = json.dumps(parts, ensure_ascii=False, separators=(",", ":"))
+        return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+    def tag_key(
+        self,
+        text: str,
+        speech_style: str,
+        preferred_tones: Sequence[str],
+        preferred_effects: Sequence[str],
+        model: str,
+    ) -> str:
+        return self.make_key(
+            TAGS_LEVEL,
+            (text or "").strip(),
+            speech_style or "",
+            list(preferred_tones or []),
+            list(preferred_effects or []),
+            model or "",
+        )
+
+    def audio_key(self, tagged_text: str, voice_id: str, speed: float, audio_format: str) -> str:
+        return self.make_key(AUDIO_LEVEL, tagged_text, voice_id, round(float(speed), 4), (audio_format or "").lower())
+
+    # ------------------------------------------------------------------
+    # 一级: LLM 标注文本
+    # ------------------------------------------------------------------
+
+    def get_tagged_text(self, key: str) -> Optional[str]:
+        entry = self._get(TAGS_LEVEL, key)
+        return entry.get("tagged_text") if entry else None
+
+    def put_tagged_text(self, key: str, tagged_text: str) -> None:
+        if tagged_text:
+            self._put(TAGS_LEVEL, key, {"tagged_text": tagged_text})
+
+    # ------------------------------------------------------------------
+    # 二级: 合成音频资源
+    # ------------------------------------------------------------------
+
+    def get_audio(self, key: str) -> Optional[Dict[str, Any]]:
+        """命中时返回 {audio_url, audio_local_path, original_audio_url, ...}；资源文件缺失视为未命中"""
+        entry = self._get(AUDIO_LEVEL, key)
+        if not entry:
+            return None
+        local_path = entry.get("audio_local_path")
+        if not local_path or not Path(local_path).exists():
+            self._stores[AUDIO_LEVEL].delete(key)
+            return None
+        return entry
+
+    def put_audio(self, key: str, audio: Dict[str, Any]) -> None:
+        if audio.get("audio_url") and audio.get("audio_local_path"):
+            self._put(AUDIO_LEVEL, key, audio)
+
+    # ------------------------------------------------------------------
+    # 存储
+    # ------------------------------------------------------------------
+
+    def _get(self, level: str, key: str) -> Optional[Dict[str, Any]]:
+        if not self.enabled:
+            return None
+        return self._stores[level].read(key)
+
+    def _put(self, level: str, key: str, value: Dict[str, Any]) -> None:
+        if self.enabled:
+            self._stores[level].write(key, value)
+
+    def evict(self, level: str) -> int:
+        """
+        对指定级别执行 TTL + 条目数淘汰
+
+        Returns:
+            删除的条目数
+        """
+        return self._stores[level].evict()
+
+
+# =============================================================================
+# Global Instance (Lazy Initialization)
+# =============================================================================
+
+_tts_cache: Optional[TTSCache] = None
+
+
+def get_tts_cache() -> TTSCache:
+    """获取 TTS 缓存实例 (单例)"""
+    global _tts_cache
+    if _tts_cache is None:
+        _tts_cache = TTSCache()
+    return _tts_cache
@@ -3,8 +3,10 @@
 
 from __future__ import annotations
 
+import asyncio
 import re
-from typing import Dict, Iterable, List, Optional, Sequence
+from functools import lru_cache
+from typing import Dict, FrozenSet, Iterable, List, Optional, Sequence, Tuple
 
 from services.tts_tag_service import (
     TTSTagError,
@@ -13,7 +15,10 @@ from services.tts_tag_service import (
     normalize_tone_tags,
     normalize_tts_text,
 )
-from services.tts_llm_tag_service import generate_tagged_text
+from services.tts_cache import get_tts_cache
+from services.tts_llm_tag_service import generate_tagged_text, get_tagging_llm, model_identity
+from utils.keyword_matcher import KeywordMatcher
+from utils.logger import logger
 
 _SENTENCE_PATTERN = re.compile(r"[^。！？!?；;\n]+[。！？!?；;]?")
 _CLAUSE_PATTERN = re.compile(r"[^，,、；;：:\n]+[，,、；;：:]?")
@@ -80,6 +85,37 @@ _TONE_HINTS = [
 
 _TSK_HINTS = ("啧", "离谱", "无语", "嫌弃", "不屑", "阴阳")
 
+_EMOTION_KEYWORDS = [
+    ("(angry)", ("生气", "愤怒", "离谱", "可恶", "气死", "烦死", "暴怒", "怒")),
+    ("(sad)", ("难过", "伤心", "遗憾", "失落", "心碎", "痛苦", "悲伤")),
+    ("(worried)", ("担心", "害怕", "焦虑", "不安", "忐忑", "怕", "顾虑")),
+    ("(excited)", ("太棒", "绝了", "厉害", "牛", "冲", "wow", "amazing", "great")),
+    ("(happy)", ("开心", "高兴", "幸福", "愉快", "满意", "喜悦")),
+    ("(curious)", ("为什么", "如何", "怎么", "是什么", "吗", "么", "呢", "?", "？")),
+    ("(confident)", ("一定", "必须", "肯定", "稳", "绝对", "放心")),
+    ("(calm)", ("请", "建议", "可以", "我们", "首先", "然后", "最后")),
+]
+# 分值相同时优先情绪更强烈的标签
+_EMOTION_PRIORITY = [tag for tag, _ in _EMOTION_KEYWORDS]
+
+
+def _compile_hints(tag_hints: Sequence[Tuple[str, Sequence[str]]]) -> List[Tuple[str, FrozenSet[str]]]:
+    return [(tag, frozenset(hint.lower() for hint in hints)) for tag, hints in tag_hints]
+
+
+_EFFECT_HINT_SETS = _compile_hints(_EFFECT_HINTS)
+_TONE_HINT_SETS = _compile_hints(_TONE_HINTS)
+_EMOTION_KEYWORD_SETS = _compile_hints(_EMOTION_KEYWORDS)
+_TSK_HINT_SET = frozenset(_TSK_HINTS)
+
+# 全部提示词合并为一个自动机，每段文本只扫描一次即可得到所有命中的提示词；
+# 提示词均为小写，匹配小写化后的文本等价于原先的 `hint in text or hint in lowered`
+_HINT_MATCHER = KeywordMatcher([
+    *(hint for _, hints in (*_EFFECT_HINT_SETS, *_TONE_HINT_SETS, *_EMOTION_KEYWORD_SETS) for hint in hints),
+    *_TSK_HINT_SET,
+])
+_INLINE_TAG_MATCHER = KeywordMatcher(_INLINE_EFFECT_TAGS | _INLINE_TONE_TAGS)
+
 
 def _dedupe(items: Iterable[str]) -> List[str]:
     result: List[str] = []
@@ -110,13 +146,38 @@ def split_sentences(text: str) -> List[str]:
     return result
 
 
+def _scan_hints(text: str) -> FrozenSet[str]:
+    """单次扫描返回 text 中出现的全部提示词"""
+    return _HINT_MATCHER.find((text or "").lower())
+
+
+@lru_cache(maxsize=1024)
+def _classify_tag(raw_tag: str) -> Tuple[Optional[str], Optional[str]]:
+    """
+    识别标签类型并规范化
+
+    Returns:
+        (kind, normalized)，kind 为 "emotion" / "tone" / "effect"；不支持的标签返回 (None, None)
+    """
+    try:
+        return "emotion", normalize_emotion_tag(raw_tag)
+    except TTSTagError:
+        pass
+    try:
+        return "tone", normalize_tone_tags([raw_tag])[0]
+    except TTSTagError:
+        pass
+    try:
+        return "effect", normalize_effect_tags([raw_tag])[0]
+    except TTSTagError:
+        return None, None
+
+
 def _extract_emotion_from_text(text: str) -> Optional[str]:
     for match in _TAG_PATTERN.finditer(text or ""):
-        raw_tag = match.group(0)
-        try:
-            return normalize_emotion_tag(raw_tag)
-        except TTSTagError:
-            continue
+        kind, normalized = _classify_tag(match.group(0))
+        if kind == "emotion":
+            return normalized
     return None
 
 
@@ -130,18 +191,7 @@ def _normalize_plain_text(text: str) -> str:
 
 
 def _normalize_any_tag(raw_tag: str) -> Optional[str]:
-    try:
-        return normalize_emotion_tag(raw_tag)
-    except TTSTagError:
-        pass
-    try:
-        return normalize_tone_tags([raw_tag])[0]
-    except TTSTagError:
-        pass
-    try:
-        return normalize_effect_tags([raw_tag])[0]
-    except TTSTagError:
-        return None
+    return _classify_tag(raw_tag)[1]
 
 
 def _sanitize_tagged_text(text: str) -> str:
@@ -169,11 +219,11 @@ def _ensure_emotion_prefix(text: str) -> str:
 
         def strip_emotions(match: re.Match) -> str:
             raw = match.group(0)
-            try:
-                emotions.append(normalize_emotion_tag(raw))
+            kind, normalized = _classify_tag(raw)
+            if kind == "emotion":
+                emotions.append(normalized)
                 return ""
-            except TTSTagError:
-                return raw
+            return raw
 
         cleaned = _TAG_PATTERN.sub(strip_emotions, sentence)
         cleaned = _SPACE_PATTERN.sub(" ", cleaned).strip()
@@ -189,22 +239,11 @@ def _extract_inline_tags(text: str) -> Dict[str, List[str]]:
     emotions: List[str] = []
     tones: List[str] = []
     effects: List[str] = []
+    buckets = {"emotion": emotions, "tone": tones, "effect": effects}
     for match in _TAG_PATTERN.finditer(text or ""):
-        raw = match.group(0)
-        try:
-            emotions.append(normalize_emotion_tag(raw))
-            continue
-        except TTSTagError:
-            pass
-        try:
-            tones.append(normalize_tone_tags([raw])[0])
-            continue
-        except TTSTagError:
-            pass
-        try:
-            effects.append(normalize_effect_tags([raw])[0])
-        except TTSTagError:
-            continue
+        kind, normalized = _classify_tag(match.group(0))
+        if kind:
+            buckets[kind].append(normalized)
     return {
         "emotions": _dedupe(emotions),
         "tones": _dedupe(tones),
@@ -218,20 +257,9 @@ def _visible_text_len(text: str) -> int:
     return len(stripped)
 
 
-def _has_inline_effect_tag(text: str) -> bool:
-    lowered = (text or "").lower()
-    for tag in _INLINE_EFFECT_TAGS:
-        if tag in lowered:
-            return True
-    return False
-
-
-def _has_inline_tone_tag(text: str) -> bool:
-    lowered = (text or "").lower()
-    for tag in _INLINE_TONE_TAGS:
-        if tag in lowered:
-            return True
-    return False
+def _has_inline_tag(text: str) -> bool:
+    """文本中是否已包含句内语气/音效标签"""
+    return bool(_INLINE_TAG_MATCHER.find((text or "").lower()))
 
 
 def _split_clauses(text: str) -> List[str]:
@@ -239,22 +267,30 @@ def _split_clauses(text: str) -> List[str]:
     return chunks if chunks else [text or ""]
 
 
-def _contains_hint(text: str, hints: Iterable[str]) -> bool:
-    lowered = (text or "").lower()
-    return any(hint in text or hint in lowered for hint in hints)
-
-
-def _detect_semantic_tag(text: str, *, allowed_tags: set[str], tag_hints: List[tuple[str, tuple[str, ...]]]) -> Optional[str]:
+def _detect_semantic_tag(
+    hits: FrozenSet[str],
+    *,
+    allowed_tags: set[str],
+    tag_hints: List[Tuple[str, FrozenSet[str]]],
+) -> Optional[str]:
+    """按 tag_hints 顺序返回第一个提示词命中的可用标签（hits 由 _scan_hints 得到）"""
     for tag, hints in tag_hints:
         if tag not in allowed_tags:
             continue
-        if _contains_hint(text, hints):
+        if not hints.isdisjoint(hits):
             return tag
     return None
 
 
-def _detect_tone_tag(text: str, *, allowed_tags: set[str]) -> Optional[str]:
-    tone_tag = _detect_semantic_tag(text, allowed_tags=allowed_tags, tag_hints=_TONE_HINTS)
+def _detect_tone_tag(
+    text: str,
+    *,
+    allowed_tags: set[str],
+    hits: Optional[FrozenSet[str]] = None,
+) -> Optional[str]:
+    if hits is None:
+        hits = _scan_hints(text)
+    tone_tag = _detect_semantic_tag(hits, allowed_tags=allowed_tags, tag_hints=_TONE_HINT_SETS)
     if tone_tag:
         return tone_tag
 
@@ -266,12 +302,19 @@ def _detect_tone_tag(text: str, *, allowed_tags: set[str]) -> Optional[str]:
     return None
 
 
-def _detect_effect_tag(text: str, *, allowed_tags: set[str]) -> Optional[str]:
-    effect_tag = _detect_semantic_tag(text, allowed_tags=allowed_tags, tag_hints=_EFFECT_HINTS)
+def _detect_effect_tag(
+    text: str,
+    *,
+    allowed_tags: set[str],
+    hits: Optional[FrozenSet[str]] = None,
+) -> Optional[str]:
+    if hits is None:
+        hits = _scan_hints(text)
+    effect_tag = _detect_semantic_tag(hits, allowed_tags=allowed_tags, tag_hints=_EFFECT_HINT_SETS)
     if effect_tag:
         return effect_tag
 
-    if _contains_hint(text, _TSK_HINTS):
+    if not _TSK_HINT_SET.isdisjoint(hits):
         if "(groaning)" in allowed_tags:
             return "(groaning)"
         if "(breath)" in allowed_tags:
@@ -290,7 +333,7 @@ def _inject_intra_sentence_expressions(
     original = (sentence or "").strip()
     if not original:
         return original
-    if _has_inline_effect_tag(original) or _has_inline_tone_tag(original):
+    if _has_inline_tag(original):
         return original
 
     inline_effect_tags = set(inline_effect_tags or []) & _INLINE_EFFECT_TAGS
@@ -309,6 +352,9 @@ def _inject_intra_sentence_expressions(
 
     clauses = _split_clauses(original)
     boundary_count = max(0, len(clauses) - 1)
+    # 每个子句只扫描一次，语气与音效检测共用命中结果
+    plain_clauses = [_strip_tags(clause) for clause in clauses]
+    clause_hits = [_scan_hints(clause) for clause in plain_clauses]
     clause_prefix_tones: Dict[int, str] = {}
     max_semantic_tones = 2 if visible_len >= 48 else 1
     semantic_tone_count = 0
@@ -316,7 +362,7 @@ def _inject_intra_sentence_expressions(
     for idx, clause in enumerate(clauses):
         if semantic_tone_count >= max_semantic_tones:
             break
-        tone_tag = _detect_tone_tag(_strip_tags(clause), allowed_tags=active_tones)
+        tone_tag = _detect_tone_tag(plain_clauses[idx], allowed_tags=active_tones, hits=clause_hits[idx])
         if tone_tag and tone_tag != recent_tone:
             clause_prefix_tones[idx] = tone_tag
             semantic_tone_count += 1
@@ -329,7 +375,7 @@ def _inject_intra_sentence_expressions(
     for idx, clause in enumerate(clauses):
         if semantic_effect_count >= max_semantic_effects:
             break
-        effect_tag = _detect_effect_tag(_strip_tags(clause), allowed_tags=active_effects)
+        effect_tag = _detect_effect_tag(plain_clauses[idx], allowed_tags=active_effects, hits=clause_hits[idx])
         if not effect_tag:
             continue
         semantic_effect_count += 1
@@ -464,6 +510,53 @@ def _build_from_tagged_text(
     }
 
 
+async def _llm_tagged_text(
+    text: str,
+    *,
+    speech_style: str,
+    preferred_tones: Sequence[str],
+    preferred_effects: Sequence[str],
+) -> Optional[str]:
+    """
+    LLM 标注（一级缓存）
+
+    只缓存通过原文校验的清洗结果；校验失败时返回 None，由调用方回退到规则标注。
+    """
+    if not text or not text.strip():
+        return None
+
+    try:
+        llm = get_tagging_llm()
+    except Exception as e:
+        logger.warning(f"[tts-llm] tagging llm unavailable: {e}")
+        return None
+
+    cache = get_tts_cache()
+    key = cache.tag_key(text, speech_style, preferred_tones, preferred_effects, model_identity(llm))
+
+    cached = await asyncio.to_thread(cache.get_tagged_text, key)
+    if cached:
+        logger.debug("[tts-llm] tagged text cache hit")
+        return cached
+
+    tagged_text = await generate_tagged_text(
+        text,
+        speech_style=speech_style,
+        preferred_tones=preferred_tones,
+        preferred_effects=preferred_effects,
+        llm=llm,
+    )
+    if not tagged_text:
+        return None
+
+    sanitized = _sanitize_tagged_text(tagged_text)
+    if _normalize_plain_text(sanitized) != _normalize_plain_text(text):
+        return None
+
+    await asyncio.to_thread(cache.put_tagged_text, key, sanitized)
+    return sanitized
+
+
 async def build_expressive_tts_text_async(
     text: str,
     *,
@@ -507,24 +600,22 @@ async def build_expressive_tts_text_async(
         )
 
     if strategy == "llm":
-        tagged_text = await generate_tagged_text(
+        sanitized = await _llm_tagged_text(
             text,
             speech_style=speech_style,
             preferred_tones=merged_tones,
             preferred_effects=merged_effects,
         )
-        if tagged_text:
-            sanitized = _sanitize_tagged_text(tagged_text)
-            if _normalize_plain_text(sanitized) == _normalize_plain_text(text):
-                return _build_from_tagged_text(
-                    sanitized,
-                    emotion=emotion,
-                    auto_emotion=resolved_auto_emotion,
-                    auto_breaks=resolved_auto_breaks,
-                    merged_tones=merged_tones,
-                    merged_effects=merged_effects,
-                    voice_profile=voice_profile,
-                )
+        if sanitized:
+            return _build_from_tagged_text(
+                sanitized,
+                emotion=emotion,
+                auto_emotion=resolved_auto_emotion,
+                auto_breaks=resolved_auto_breaks,
+                merged_tones=merged_tones,
+                merged_effects=merged_effects,
+                voice_profile=voice_profile,
+            )
 
     return build_expressive_tts_text(
         text,
@@ -539,25 +630,11 @@ async def build_expressive_tts_text_async(
 
 def detect_sentence_emotion(sentence: str) -> str:
     content = (sentence or "").strip()
-    lowered = content.lower()
-
-    keyword_groups = [
-        ("(angry)", ["生气", "愤怒", "离谱", "可恶", "气死", "烦死", "暴怒", "怒"]),
-        ("(sad)", ["难过", "伤心", "遗憾", "失落", "心碎", "痛苦", "悲伤"]),
-        ("(worried)", ["担心", "害怕", "焦虑", "不安", "忐忑", "怕", "顾虑"]),
-        ("(excited)", ["太棒", "绝了", "厉害", "牛", "冲", "wow", "amazing", "great"]),
-        ("(happy)", ["开心", "高兴", "幸福", "愉快", "满意", "喜悦"]),
-        ("(curious)", ["为什么", "如何", "怎么", "是什么", "吗", "么", "呢", "?", "？"]),
-        ("(confident)", ["一定", "必须", "肯定", "稳", "绝对", "放心"]),
-        ("(calm)", ["请", "建议", "可以", "我们", "首先", "然后", "最后"]),
-    ]
+    hits = _scan_hints(content)
 
     scores: Dict[str, int] = {}
-    for emotion, keywords in keyword_groups:
-        score = 0
-        for kw in keywords:
-            if kw in lowered or kw in content:
-                score += 1
+    for emotion, keywords in _EMOTION_KEYWORD_SETS:
+        score = len(keywords & hits)
         if score > 0:
             scores[emotion] = score
 
@@ -569,10 +646,8 @@ def detect_sentence_emotion(sentence: str) -> str:
     if not scores:
         return "(calm)"
 
-    # 分值相同时优先情绪更强烈的标签
-    priority = ["(angry)", "(sad)", "(worried)", "(excited)", "(happy)", "(curious)", "(confident)", "(calm)"]
     max_score = max(scores.values())
-    for tag in priority:
+    for tag in _EMOTION_PRIORITY:
         if scores.get(tag) == max_score:
             return tag
     return "(calm)"
@@ -58,18 +58,33 @@ def _build_user_prompt(
     return "\n".join(hint_lines)
 
 
+TAGGING_TEMPERATURE = 0.25
+
+
+def get_tagging_llm():
+    """获取标注用 LLM 实例"""
+    return get_llm(temperature=TAGGING_TEMPERATURE, enable_thinking=False)
+
+
+def model_identity(llm) -> str:
+    """标注模型标识（用于缓存键），切换模型/提供方后旧缓存自然失效"""
+    model = getattr(llm, "model_name", None) or getattr(llm, "model", None) or ""
+    return f"{type(llm).__name__}:{model}:{TAGGING_TEMPERATURE}"
+
+
 async def generate_tagged_text(
     text: str,
     *,
     speech_style: str = "speech",
     preferred_tones: Optional[Sequence[str]] = None,
     preferred_effects: Optional[Sequence[str]] = None,
+    llm=None,
 ) -> Optional[str]:
     if not text or not text.strip():
         return None
 
     try:
-        llm = get_llm(temperature=0.25, enable_thinking=False)
+        llm = llm or get_tagging_llm()
         response = await llm.ainvoke([
             SystemMessage(content=TAGGING_SYSTEM_PROMPT),
             HumanMessage(content=_build_user_prompt(
@@ -89,4 +104,4 @@ async def generate_tagged_text(
         return None
 
 
-__all__ = ["generate_tagged_text"]
+__all__ = ["generate_tagged_text", "get_tagging_llm", "model_identity"]
@@ -0,0 +1,145 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2026 relakkes@gmail.com
+#
+# This file is part of MediaCrawlerPro-ContentRemixAgent project.
+# Repository: https://github.com/MediaCrawlerPro/MediaCrawlerPro-ContentRemixAgent/blob/main/backend/services/video_artifact_cache.py
+# GitHub: https://github.com/NanmiCoder
+# Licensed under NON-COMMERCIAL LEARNING LICENSE 1.1
+#
+# 声明：本代码仅供学习和研究目的使用。使用者应遵守以下原则：
+# 1. 不得用于任何商业用途。
+# 2. 使用时应遵守目标平台的使用条款和robots.txt规则。
+# 3. 不得进行大规模爬取或对平台造成运营干扰。
+# 4. 应合理控制请求频率，避免给目标平台带来不必要的负担。
+# 5. 不得用于任何非法或不当的用途。
+#
+# 详细许可条款请参阅项目根目录下的LICENSE文件。
+# 使用本代码即表示您同意遵守上述原则和LICENSE中的所有条款。
+
+"""
+视频处理结果缓存 - 跨会话复用 process_video 的产物
+
+同一视频被不同用户/会话分析时，跳过下载、音频提取和 ASR。
+
+缓存键: (platform, content_id, asr_version)
+- asr_version 包含 ASR 后端、模型和字幕切分参数，任一变化都会使旧结果失效
+
+存储（JsonFileStore，与 TTS 缓存共用）:
+- 每个条目一个 JSON 文件: {VIDEO_CACHE_DIR}/{sha1(key)}.json，原子写入，多进程共享安全
+- 命中时刷新文件 mtime，作为 LRU 依据
+
+淘汰策略:
+- TTL: 条目创建超过 VIDEO_CACHE_TTL_SECONDS 后失效
+- 容量: 总大小超过 VIDEO_CACHE_MAX_BYTES 或条目数超过 VIDEO_CACHE_MAX_ENTRIES 时，
+  按最近访问时间从旧到新删除
+"""
+
+import hashlib
+import time
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import List, Optional
+
+from config import settings
+from services.json_file_store import JsonFileStore
+from utils.logger import logger
+
+
+@dataclass
+class VideoArtifact:
+    """缓存的视频处理产物"""
+    platform: str
+    content_id: str
+    asr_version: str
+    text: str
+    segments: list  # [{start, end, text}, ...]
+    local_video_url: Optional[str] = None
+    created_at: float = field(default_factory=time.time)
+
+
+class VideoArtifactCache:
+    """基于文件系统的视频处理结果缓存"""
+
+    def __init__(
+        self,
+        cache_dir: Optional[str] = None,
+        ttl_seconds: Optional[int] = None,
+        max_bytes: Optional[int] = None,
+        max_entries: Optional[int] = None,
+    ):
+        self.cache_dir = Path(cache_dir or settings.VIDEO_CACHE_DIR)
+        self.ttl_seconds = ttl_seconds if ttl_seconds is not None else settings.VIDEO_CACHE_TTL_SECONDS
+        self.max_bytes = max_bytes if max_bytes is not None else settings.VIDEO_CACHE_MAX_BYTES
+        self.max_entries = max_entries if max_entries is not None else settings.VIDEO_CACHE_MAX_ENTRIES
+        self._store = JsonFileStore(
+            self.cache_dir,
+            name="Video cache",
+            ttl_seconds=self.ttl_seconds,
+            max_entries=self.max_entries,
+            max_bytes=self.max_bytes,
+        )
+
+    @staticmethod
+    def make_key(platform: str, content_id: str, asr_version: str) -> str:
+        """生成缓存键（文件名安全）"""
+        raw = f"{platform}\x00{content_id}\x00{asr_version}"
+        return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+    def _entry_path(self, key: str) -> Path:
+        return self._store.path(key)
+
+    def get(self, platform: str, content_id: str, asr_version: str) -> Optional[VideoArtifact]:
+        """
+        查询缓存
+
+        Returns:
+            命中且未过期时返回 VideoArtifact，否则返回 None
+        """
+        key = self.make_key(platform, content_id, asr_version)
+        entry = self._store.read(key)
+        if entry is None:
+            return None
+
+        try:
+            return VideoArtifact(**entry)
+        except TypeError as e:
+            logger.warning(f"Video cache entry malformed, dropping: {platform}/{content_id} ({e})")
+            self._store.delete(key)
+            return None
+
+    def put(self, artifact: VideoArtifact) -> None:
+        """写入缓存（原子替换），必要时执行容量淘汰"""
+        key = self.make_key(artifact.platform, artifact.content_id, artifact.asr_version)
+        self._store.write(key, asdict(artifact))
+
+    def delete(self, platform: str, content_id: str, asr_version: str) -> None:
+        """删除指定条目"""
+        self._store.delete(self.make_key(platform, content_id, asr_version))
+
+    def evict(self) -> int:
+        """
+        执行 TTL + 容量淘汰
+
+        Returns:
+            删除的条目数
+        """
+        return self._store.evict()
+
+    def list_entries(self) -> List[Path]:
+        """列出所有缓存文件（调试/测试用）"""
+        return self._store.list_entries()
+
+
+# =============================================================================
+# Global Instance (Lazy Initialization)
+# =============================================================================
+
+_video_artifact_cache: Optional[VideoArtifactCache] = None
+
+
+def get_video_artifact_cache() -> VideoArtifactCache:
+    """获取视频处理结果缓存实例 (单例)"""
+    global _video_artifact_cache
+    if _video_artifact_cache is None:
+        _video_artifact_cache = VideoArtifactCache()
+    return _video_artifact_cache
@@ -24,16 +24,19 @@
 - 进度回调支持
 - 临时文件管理和清理
 - 下载重试和断点续传
+- 多连接分段下载（服务器支持 Range 时并行拉取多个区间）
+- 流式下载（响应体逐块交给调用方，用于边下载边提取音频）
 """
 import asyncio
 import os
 import shutil
 from pathlib import Path
-from typing import Optional, Callable
+from typing import Awaitable, Callable, Optional
 
 import httpx
 
 from config import settings
+from services.http_clients import get_http_client
 from utils.logger import logger
 
 
@@ -42,19 +45,26 @@ class VideoDownloadError(Exception):
     pass
 
 
+class _RangeIgnoredError(VideoDownloadError):
+    """服务器声明支持 Range，但分段请求返回了完整文件"""
+    pass
+
+
 class VideoDownloader:
     """视频下载器"""
 
     # 默认重试配置
     DEFAULT_MAX_RETRIES = 3
     DEFAULT_RETRY_DELAY = 2  # 秒
-    DEFAULT_CHUNK_SIZE = 65536  # 64KB，更大的 chunk 减少 IO 次数
+    DEFAULT_CHUNK_SIZE = 262144  # 256KB，更大的 chunk 减少 IO 次数
 
     def __init__(self):
         self.temp_dir = settings.VIDEO_TEMP_DIR
         self.timeout = settings.VIDEO_DOWNLOAD_TIMEOUT
         self.max_retries = getattr(settings, 'VIDEO_DOWNLOAD_MAX_RETRIES', self.DEFAULT_MAX_RETRIES)
         self.retry_delay = getattr(settings, 'VIDEO_DOWNLOAD_RETRY_DELAY', self.DEFAULT_RETRY_DELAY)
+        self.max_segments = settings.VIDEO_DOWNLOAD_MAX_SEGMENTS
+        self.min_segment_bytes = settings.VIDEO_DOWNLOAD_MIN_SEGMENT_BYTES
 
     def _get_headers(self, video_url: str) -> dict:
         """
@@ -111,20 +121,150 @@ class VideoDownloader:
         # 默认 mp4
         return ".mp4"
 
-    async def _check_range_support(self, client: httpx.AsyncClient, url: str, headers: dict) -> tuple[bool, int]:
+    async def _probe(self, client: httpx.AsyncClient, url: str, headers: dict) -> tuple[bool, int, str]:
         """
-        检查服务器是否支持 Range 请求
+        探测 Range 支持、文件大小和 Content-Type
+
+        优先使用 HEAD；HEAD 不可用或信息不全时，请求首字节 (Range: bytes=0-0)，
+        从 Content-Range 中读取总大小，不会下载完整文件。
 
         Returns:
-            (支持断点续传, 文件总大小)
+            (支持断点续传, 文件总大小, Content-Type)
         """
+        supports_range = False
+        total = 0
+        content_type = ""
+
+        try:
+            response = await client.head(url, headers=headers, timeout=self.timeout)
+            if response.status_code < 400:
+                supports_range = response.headers.get("accept-ranges", "").lower() == "bytes"
+                total = int(response.headers.get("content-length", 0) or 0)
+                content_type = response.headers.get("content-type", "")
+        except Exception:
+            pass
+
+        if total > 0 and content_type:
+            return supports_range, total, content_type
+
         try:
-            response = await client.head(url, headers=headers)
-            accept_ranges = response.headers.get("accept-ranges", "").lower()
-            content_length = int(response.headers.get("content-length", 0))
-            return accept_ranges == "bytes", content_length
+            probe_headers = {**headers, "Range": "bytes=0-0"}
+            async with client.stream("GET", url, headers=probe_headers, timeout=self.timeout) as response:
+                content_type = content_type or response.headers.get("content-type", "")
+                if response.status_code == 206:
+                    # Content-Range: bytes 0-0/12345
+                    size = response.headers.get("content-range", "").rsplit("/", 1)[-1]
+                    if size.isdigit():
+                        total = int(size)
+                        supports_range = True
+                elif response.status_code == 200 and total == 0:
+                    total = int(response.headers.get("content-length", 0) or 0)
         except Exception:
-            return False, 0
+            pass
+
+        return supports_range, total, content_type
+
+    def _plan_segments(self, total: int) -> list[dict]:
+        """
+        按文件大小规划分段
+
+        分段数 = min(VIDEO_DOWNLOAD_MAX_SEGMENTS, total // VIDEO_DOWNLOAD_MIN_SEGMENT_BYTES)，
+        小文件只有一段（走单连接续传）。
+
+        Returns:
+            [{"start": int, "end": int (含), "written": int}, ...]
+        """
+        if total <= 0:
+            return []
+        count = min(max(1, self.max_segments), max(1, total // max(1, self.min_segment_bytes)))
+        seg_size = -(-total // count)  # 向上取整
+        return [
+            {"start": start, "end": min(start + seg_size, total) - 1, "written": 0}
+            for start in range(0, total, seg_size)
+        ]
+
+    async def _download_segmented(
+        self,
+        client: httpx.AsyncClient,
+        url: str,
+        headers: dict,
+        video_path: Path,
+        total: int,
+        segments: list[dict],
+        progress_callback: Optional[Callable[[int, int], None]] = None
+    ) -> None:
+        """
+        多连接分段下载
+
+        预分配目标文件，每个分段使用独立连接写入各自的区间；
+        分段失败时从已写入位置续传（Range: bytes={pos}-{end}），
+        进度按所有分段汇总后回调。
+        """
+        # 预分配文件（重试时若文件完整则保留已写入的分段进度）
+        if not video_path.exists() or video_path.stat().st_size != total:
+            with open(video_path, "wb") as f:
+                f.truncate(total)
+            for seg in segments:
+                seg["written"] = 0
+
+        progress = {"downloaded": sum(seg["written"] for seg in segments)}
+
+        async def fetch_segment(seg: dict) -> None:
+            for attempt in range(self.max_retries):
+                pos = seg["start"] + seg["written"]
+                if pos > seg["end"]:
+                    return
+
+                req_headers = {**headers, "Range": f"bytes={pos}-{seg['end']}"}
+                try:
+                    async with client.stream("GET", url, headers=req_headers, timeout=self.timeout) as response:
+                        response.raise_for_status()
+                        if response.status_code != 206:
+                            raise _RangeIgnoredError("服务器未按 Range 返回分段内容")
+
+                        with open(video_path, "r+b") as f:
+                            f.seek(pos)
+                            async for chunk in response.aiter_bytes(chunk_size=self.DEFAULT_CHUNK_SIZE):
+                                remaining = seg["end"] + 1 - (seg["start"] + seg["written"])
+                                if remaining <= 0:
+                                    break
+                                chunk = chunk[:remaining]
+                                f.write(chunk)
+                                seg["written"] += len(chunk)
+                                progress["downloaded"] += len(chunk)
+
+                                if progress_callback:
+                                    progress_callback(progress["downloaded"], total)
+
+                    if seg["start"] + seg["written"] > seg["end"]:
+                        return
+                    raise VideoDownloadError(
+                        f"分段下载不完整: {seg['start']}-{seg['end']}，已写入 {seg['written']} 字节"
+                    )
+                except _RangeIgnoredError:
+                    raise
+                except (httpx.TransportError, VideoDownloadError) as e:
+                    if attempt >= self.max_retries - 1:
+                        raise
+                    delay = self.retry_delay * (2 ** attempt)
+                    logger.warning(
+                        f"Segment {seg['start']}-{seg['end']} failed (attempt {attempt + 1}/{self.max_retries}): {e}, "
+                        f"resuming from byte {seg['start'] + seg['written']} in {delay}s"
+                    )
+                    await asyncio.sleep(delay)
+
+        tasks = [asyncio.create_task(fetch_segment(seg)) for seg in segments]
+        try:
+            await asyncio.gather(*tasks)
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            raise
+
+        written = sum(seg["written"] for seg in segments)
+        if written != total:
+            raise VideoDownloadError(f"下载不完整: 收到 {written} 字节，预期 {total} 字节")
 
     async def _download_with_resume(
         self,
@@ -160,7 +300,7 @@ class VideoDownloader:
             req_headers["Range"] = f"bytes={downloaded}-"
             logger.info(f"Resuming download from byte {downloaded}/{total}")
 
-        async with client.stream("GET", url, headers=req_headers) as response:
+        async with client.stream("GET", url, headers=req_headers, timeout=self.timeout) as response:
             # 206 Partial Content 表示断点续传成功
             # 200 OK 表示服务器不支持或返回完整文件
             if response.status_code == 200 and downloaded > 0:
@@ -220,38 +360,39 @@ class VideoDownloader:
 
         for attempt in range(self.max_retries):
             try:
-                async with httpx.AsyncClient(timeout=self.timeout, follow_redirects=True) as client:
-                    # 首次尝试时检查 Range 支持并获取文件大小
-                    if attempt == 0:
-                        supports_range, total = await self._check_range_support(client, video_url, headers)
-                        # 确定文件扩展名
-                        async with client.stream("GET", video_url, headers=headers) as resp:
-                            content_type = resp.headers.get("content-type", "")
-                            ext = self._get_file_extension(video_url, content_type)
-                            if total == 0:
-                                total = int(resp.headers.get("content-length", 0))
-                            # 立即关闭，不读取内容
-                            await resp.aclose()
-
-                        video_path = task_dir / f"video{ext}"
-                        self._video_path = video_path  # 保存供后续重试使用
-                        self._total = total
-                        self._supports_range = supports_range
-                    else:
-                        video_path = self._video_path
-                        total = self._total
-                        supports_range = self._supports_range
-
+                client = get_http_client("media")
+                # 首次尝试时检查 Range 支持并获取文件大小
+                if attempt == 0:
+                    supports_range, total, content_type = await self._probe(client, video_url, headers)
+                    # 确定文件扩展名
+                    ext = self._get_file_extension(video_url, content_type)
+
+                    video_path = task_dir / f"video{ext}"
+                    self._video_path = video_path  # 保存供后续重试使用
+                    self._total = total
+                    self._supports_range = supports_range
+                    self._segments = self._plan_segments(total) if supports_range else []
+                else:
+                    video_path = self._video_path
+                    total = self._total
+                    supports_range = self._supports_range
+
+                if supports_range and len(self._segments) > 1:
+                    # 大文件：多连接分段下载
+                    logger.info(f"Segmented download: {total} bytes in {len(self._segments)} ranges")
+                    await self._download_segmented(
+                        client, video_url, headers, video_path, total, self._segments, progress_callback
+                    )
+                elif supports_range and total > 0:
                     # 如果支持断点续传，使用续传方式
-                    if supports_range and total > 0:
-                        await self._download_with_resume(
-                            client, video_url, headers, video_path, total, progress_callback
-                        )
-                    else:
-                        # 不支持断点续传，普通下载
-                        await self._simple_download(
-                            client, video_url, headers, video_path, progress_callback
-                        )
+                    await self._download_with_resume(
+                        client, video_url, headers, video_path, total, progress_callback
+                    )
+                else:
+                    # 不支持断点续传，普通下载
+                    await self._simple_download(
+                        client, video_url, headers, video_path, progress_callback
+                    )
 
                 logger.info(f"Download completed: {video_path}")
                 return str(video_path)
@@ -265,6 +406,11 @@ class VideoDownloader:
                 # HTTP 错误通常不需要重试（如 404, 403）
                 if e.response.status_code in (404, 403, 401):
                     raise last_error
+            except _RangeIgnoredError as e:
+                # 回退到单连接下载
+                last_error = e
+                self._supports_range = False
+                logger.warning(f"Range requests ignored by server, falling back to single stream: {e}")
             except VideoDownloadError as e:
                 last_error = e
                 logger.warning(f"Download error (attempt {attempt + 1}/{self.max_retries}): {e}")
@@ -281,6 +427,98 @@ class VideoDownloader:
         # 所有重试都失败
         raise last_error or VideoDownloadError("视频下载失败: 未知错误")
 
+    async def download_streaming(
+        self,
+        video_url: str,
+        task_id: str,
+        sink: Callable[[bytes], Awaitable[None]],
+        keep_video: bool = False,
+        progress_callback: Optional[Callable[[int, int], None]] = None
+    ) -> tuple[Optional[str], int]:
+        """
+        流式下载：响应体按块交给 sink（如 ffmpeg stdin），不必等待整个文件落盘
+
+        连接中断时，若服务器支持 Range，则从已接收位置续传；
+        sink 看到的始终是连续、不重复的字节流。
+
+        Args:
+            video_url: 视频 URL
+            task_id: 任务 ID（用于创建临时目录）
+            sink: 异步数据消费者
+            keep_video: 是否同时将视频写入 {task_dir}/video{ext}
+            progress_callback: 进度回调 (downloaded_bytes, total_bytes)
+
+        Returns:
+            (本地视频路径（keep_video=False 时为 None）, 下载字节数)
+
+        Raises:
+            VideoDownloadError: 下载失败
+        """
+        task_dir = Path(self.temp_dir) / task_id
+        task_dir.mkdir(parents=True, exist_ok=True)
+        headers = self._get_headers(video_url)
+
+        received = 0
+        total = 0
+        supports_range = False
+        video_path: Optional[Path] = None
+        video_file = None
+
+        try:
+            client = get_http_client("media")
+            for attempt in range(self.max_retries):
+                req_headers = dict(headers)
+                if received > 0:
+                    req_headers["Range"] = f"bytes={received}-"
+
+                try:
+                    async with client.stream("GET", video_url, headers=req_headers, timeout=self.timeout) as response:
+                        response.raise_for_status()
+
+                        if received == 0:
+                            supports_range = response.headers.get("accept-ranges", "").lower() == "bytes"
+                            total = int(response.headers.get("content-length", 0) or 0)
+                            if keep_video:
+                                ext = self._get_file_extension(video_url, response.headers.get("content-type", ""))
+                                video_path = task_dir / f"video{ext}"
+                                video_file = open(video_path, "wb")
+                        elif response.status_code != 206:
+                            raise VideoDownloadError("服务器不支持 Range，无法续传流式下载")
+
+                        async for chunk in response.aiter_bytes(chunk_size=self.DEFAULT_CHUNK_SIZE):
+                            await sink(chunk)
+                            if video_file:
+                                video_file.write(chunk)
+                            received += len(chunk)
+
+                            if progress_callback:
+                                progress_callback(received, total)
+
+                    if total > 0 and received < total:
+                        raise httpx.ReadError(f"连接提前关闭: {received}/{total} 字节")
+                    break
+
+                except httpx.HTTPStatusError as e:
+                    raise VideoDownloadError(f"HTTP 错误 {e.response.status_code}: {e.response.reason_phrase}")
+                except httpx.TransportError as e:
+                    if not supports_range or attempt >= self.max_retries - 1:
+                        raise VideoDownloadError(f"流式下载中断: {e}")
+                    delay = self.retry_delay * (2 ** attempt)
+                    logger.warning(
+                        f"Stream interrupted at {received} bytes (attempt {attempt + 1}/{self.max_retries}): {e}, "
+                        f"resuming in {delay}s"
+                    )
+                    await asyncio.sleep(delay)
+        finally:
+            if video_file:
+                video_file.close()
+
+        if received == 0:
+            raise VideoDownloadError("下载的文件为空")
+
+        logger.info(f"Stream download completed: {received} bytes")
+        return (str(video_path) if video_path else None), received
+
     async def _simple_download(
         self,
         client: httpx.AsyncClient,
@@ -292,7 +530,7 @@ class VideoDownloader:
         """
         简单下载（不支持断点续传时使用）
         """
-        async with client.stream("GET", url, headers=headers) as response:
+        async with client.stream("GET", url, headers=headers, timeout=self.timeout) as response:
             response.raise_for_status()
 
             total = int(response.headers.get("content-length", 0))
@@ -1,40 +1,132 @@
 # -*- coding: utf-8 -*-
-"""语音表达习惯配置存储（按 voice_id 持久化）"""
+"""
+语音表达习惯配置存储（按 voice_id 持久化）
+
+存储: {ASSETS_DIR}/voice_style_profiles.sqlite3，voice_id 为主键
+- 写入为单条 upsert（SQLite 事务保证原子性，WAL + busy timeout 支持多 worker 并发写）
+- 读取走进程内缓存；通过 PRAGMA data_version 感知其他进程的提交，变化时清空缓存
+- 首次打开时把旧版 voice_style_profiles.json 导入表中，并重命名为 .migrated
+"""
 
 from __future__ import annotations
 
+import copy
 import json
+import os
+import sqlite3
+import threading
+import time
 from pathlib import Path
 from typing import Any, Dict, Optional
 
 from config import settings
-from services.tts_tag_service import normalize_effect_tags, normalize_tone_tags
+from services.tts_tag_service import TTSTagError, normalize_effect_tags, normalize_tone_tags
+from utils.logger import logger
 
 
 class VoiceStyleProfileStore:
-    """voice_id -> style profile 简易 JSON 存储"""
+    """voice_id -> style profile 索引存储（SQLite + 读缓存）"""
 
-    def __init__(self):
-        self._store_path = Path(settings.ASSETS_DIR) / "voice_style_profiles.json"
+    def __init__(self, db_path: Optional[str] = None, legacy_dir: Optional[str] = None):
+        self._db_path = Path(db_path or settings.VOICE_STYLE_DB_PATH)
+        # 旧版本把配置（JSON 及早期的 SQLite）放在公开访问的 ASSETS_DIR 下，仅在首次打开时从这里迁移
+        legacy_dir = Path(legacy_dir or settings.ASSETS_DIR)
+        self._legacy_path = legacy_dir / "voice_style_profiles.json"
+        self._legacy_db_path = legacy_dir / "voice_style_profiles.sqlite3"
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._data_version: Optional[int] = None
+        self._cache: Dict[str, Optional[Dict[str, Any]]] = {}
 
-    def _ensure_parent(self) -> None:
-        self._store_path.parent.mkdir(parents=True, exist_ok=True)
+    def _connection(self) -> sqlite3.Connection:
+        """获取（必要时初始化）共享连接，调用方需持有 self._lock"""
+        if self._conn is not None:
+            return self._conn
 
-    def _read_all(self) -> Dict[str, Dict[str, Any]]:
-        if not self._store_path.exists():
-            return {}
-        try:
-            payload = json.loads(self._store_path.read_text(encoding="utf-8"))
-            return payload if isinstance(payload, dict) else {}
-        except Exception:
-            return {}
-
-    def _write_all(self, payload: Dict[str, Dict[str, Any]]) -> None:
-        self._ensure_parent()
-        self._store_path.write_text(
-            json.dumps(payload, ensure_ascii=False, indent=2),
-            encoding="utf-8",
+        self._db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._migrate_legacy_db()
+        conn = sqlite3.connect(str(self._db_path), timeout=30, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS voice_style_profiles (
+                voice_id TEXT PRIMARY KEY,
+                profile TEXT NOT NULL,
+                updated_at REAL NOT NULL
+            )
+            """
         )
+        conn.commit()
+        self._migrate_legacy_json(conn)
+        self._conn = conn
+        return conn
+
+    def _migrate_legacy_db(self) -> None:
+        """把 ASSETS_DIR 下的旧库（含 WAL 中未检查点的数据）复制到新位置，并删除旧库文件"""
+        if self._db_path.exists() or not self._legacy_db_path.exists():
+            return
+        tmp_path = self._db_path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+        try:
+            source = sqlite3.connect(str(self._legacy_db_path), timeout=30)
+            try:
+                target = sqlite3.connect(str(tmp_path))
+                try:
+                    source.backup(target)
+                finally:
+                    target.close()
+            finally:
+                source.close()
+            if self._db_path.exists():
+                return  # 其他 worker 已完成迁移
+            os.replace(tmp_path, self._db_path)
+        except sqlite3.Error as e:
+            logger.warning(f"Voice style profile database migration failed: {e}")
+            return
+        finally:
+            tmp_path.unlink(missing_ok=True)
+
+        for suffix in ("", "-wal", "-shm"):
+            Path(f"{self._legacy_db_path}{suffix}").unlink(missing_ok=True)
+        logger.info(f"Moved voice style profiles out of the public assets directory: {self._db_path}")
+
+    def _migrate_legacy_json(self, conn: sqlite3.Connection) -> None:
+        """导入旧版 JSON 文件（INSERT OR IGNORE，多 worker 同时启动时重复导入无副作用）"""
+        if not self._legacy_path.exists():
+            return
+        try:
+            payload = json.loads(self._legacy_path.read_text(encoding="utf-8"))
+        except Exception as e:
+            logger.warning(f"Voice style profile JSON unreadable, skip migration: {e}")
+            return
+
+        rows = []
+        for voice_id, raw_profile in (payload.items() if isinstance(payload, dict) else []):
+            if not voice_id or not isinstance(raw_profile, dict):
+                continue
+            try:
+                normalized = self.normalize_profile(raw_profile)
+            except TTSTagError as e:
+                logger.warning(f"Voice style profile {voice_id} skipped during migration: {e}")
+                continue
+            rows.append((voice_id, json.dumps(normalized, ensure_ascii=False), time.time()))
+
+        with conn:
+            conn.executemany(
+                "INSERT OR IGNORE INTO voice_style_profiles (voice_id, profile, updated_at) VALUES (?, ?, ?)",
+                rows,
+            )
+        try:
+            self._legacy_path.replace(self._legacy_path.with_suffix(".json.migrated"))
+        except FileNotFoundError:
+            pass  # 其他 worker 已完成迁移
+        logger.info(f"Migrated {len(rows)} voice style profiles from {self._legacy_path.name}")
+
+    def _sync_cache(self, conn: sqlite3.Connection) -> None:
+        """其他连接提交后 data_version 会变化，此时丢弃读缓存"""
+        data_version = conn.execute("PRAGMA data_version").fetchone()[0]
+        if data_version != self._data_version:
+            self._cache.clear()
+            self._data_version = data_version
 
     def normalize_profile(self, profile: Optional[dict]) -> Dict[str, Any]:
         profile = profile or {}
@@ -52,18 +144,58 @@ class VoiceStyleProfileStore:
     def get(self, voice_id: str) -> Optional[Dict[str, Any]]:
         if not voice_id:
             return None
-        all_data = self._read_all()
-        raw_profile = all_data.get(voice_id)
-        if not isinstance(raw_profile, dict):
-            return None
-        return self.normalize_profile(raw_profile)
+        with self._lock:
+            conn = self._connection()
+            self._sync_cache(conn)
+            if voice_id not in self._cache:
+                row = conn.execute(
+                    "SELECT profile FROM voice_style_profiles WHERE voice_id = ?",
+                    (voice_id,),
+                ).fetchone()
+                self._cache[voice_id] = json.loads(row[0]) if row else None
+            profile = self._cache[voice_id]
+        return copy.deepcopy(profile) if profile is not None else None
 
     def upsert(self, voice_id: str, profile: Optional[dict]) -> Dict[str, Any]:
         if not voice_id:
             raise ValueError("voice_id 不能为空")
         normalized = self.normalize_profile(profile or {})
-        all_data = self._read_all()
-        all_data[voice_id] = normalized
-        self._write_all(all_data)
+        with self._lock:
+            conn = self._connection()
+            self._sync_cache(conn)
+            with conn:
+                conn.execute(
+                    """
+                    INSERT INTO voice_style_profiles (voice_id, profile, updated_at) VALUES (?, ?, ?)
+                    ON CONFLICT(voice_id) DO UPDATE SET
+                        profile = excluded.profile,
+                        updated_at = excluded.updated_at
+                    """,
+                    (voice_id, json.dumps(normalized, ensure_ascii=False), time.time()),
+                )
+            # 本连接的提交不会改变 data_version，直接更新缓存
+            self._cache[voice_id] = copy.deepcopy(normalized)
         return normalized
 
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+            self._cache.clear()
+            self._data_version = None
+
+
+# =============================================================================
+# Global Instance (Lazy Initialization)
+# =============================================================================
+
+_voice_style_profile_store: Optional[VoiceStyleProfileStore] = None
+
+
+def get_voice_style_profile_store() -> VoiceStyleProfileStore:
+    """获取语音表达习惯配置存储实例 (单例)"""
+    global _voice_style_profile_store
+    if _voice_style_profile_store is None:
+        _voice_style_profile_store = VoiceStyleProfileStore()
+    return _voice_style_profile_store
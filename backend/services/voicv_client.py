@@ -1,11 +1,14 @@
 # -*- coding: utf-8 -*-
 """Voicv API 客户端 - 语音克隆 / TTS"""
 
+from pathlib import Path
 from typing import Any, Dict, Optional
 
 import httpx
 
 from config import settings
+from services.http_clients import get_http_client
+from services.multipart_stream import FilePart, MultipartStream
 
 
 class VoicvClientError(Exception):
@@ -33,6 +36,7 @@ class VoicvClient:
         *,
         files: Optional[dict] = None,
         json_body: Optional[dict] = None,
+        multipart: Optional[MultipartStream] = None,
     ) -> Dict[str, Any]:
         self._check_config()
 
@@ -40,22 +44,28 @@ class VoicvClient:
         headers = {"x-api-key": self.api_key}
         if json_body is not None:
             headers["Content-Type"] = "application/json"
+        if multipart is not None:
+            headers.update(multipart.headers)
 
         try:
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                response = await client.request(
-                    method=method,
-                    url=url,
-                    files=files,
-                    json=json_body,
-                    headers=headers,
-                )
+            client = get_http_client("voicv")
+            response = await client.request(
+                method=method,
+                url=url,
+                files=files,
+                json=json_body,
+                content=multipart,
+                headers=headers,
+                timeout=self.timeout,
+            )
         except httpx.TimeoutException as e:
             raise VoicvClientError(f"Voicv 请求超时: {e}") from e
         except httpx.ConnectError as e:
             raise VoicvClientError(f"无法连接 Voicv 服务: {e}") from e
         except httpx.RequestError as e:
             raise VoicvClientError(f"Voicv 请求失败: {e}") from e
+        except OSError as e:
+            raise VoicvClientError(f"读取音频文件失败: {e}") from e
 
         try:
             payload = response.json()
@@ -73,13 +83,17 @@ class VoicvClient:
 
     async def clone_voice(
         self,
-        audio_bytes: bytes,
-        filename: str,
+        audio_bytes: Optional[bytes] = None,
+        filename: str = "voice.wav",
         content_type: str = "application/octet-stream",
+        *,
+        audio_path: Optional[Path] = None,
     ) -> Dict[str, Any]:
         """
         调用 Voicv voice-clone API
 
+        传 audio_path 时从磁盘流式上传，不把音频整体读入内存。
+
         Returns:
             {
                 "voice_id": str,
@@ -88,10 +102,14 @@ class VoicvClient:
                 "raw": dict,
             }
         """
+        if audio_path is None and not audio_bytes:
+            raise VoicvClientError("音频素材为空")
         data = await self._request(
             "POST",
             "/voice-clone",
-            files={"voice": (filename, audio_bytes, content_type)},
+            multipart=MultipartStream(
+                files=[FilePart("voice", filename, content_type, path=audio_path, data=audio_bytes)],
+            ),
         )
         voice_id = data.get("voiceId")
         if not voice_id:
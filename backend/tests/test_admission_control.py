@@ -0,0 +1,174 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2026 relakkes@gmail.com
+#
+# This file is part of MediaCrawlerPro-ContentRemixAgent project.
+# Repository: https://github.com/MediaCrawlerPro/MediaCrawlerPro-ContentRemixAgent/blob/main/backend/tests/test_admission_control.py
+# GitHub: https://github.com/NanmiCoder
+# Licensed under NON-COMMERCIAL LEARNING LICENSE 1.1
+#
+# 声明：本代码仅供学习和研究目的使用。使用者应遵守以下原则：
+# 1. 不得用于任何商业用途。
+# 2. 使用时应遵守目标平台的使用条款和robots.txt规则。
+# 3. 不得进行大规模爬取或对平台造成运营干扰。
+# 4. 应合理控制请求频率，避免给目标平台带来不必要的负担。
+# 5. 不得用于任何非法或不当的用途。
+#
+# 详细许可条款请参阅项目根目录下的LICENSE文件。
+# 使用本代码即表示您同意遵守上述原则和LICENSE中的所有条款。
+
+
+
+"""
+重资源准入控制测试
+"""
+import asyncio
+
+import pytest
+
+from services.admission_control import AdmissionController, ResourceClass, admission_context
+
+
+def make_controller(capacity: int = 1) -> AdmissionController:
+    return AdmissionController({resource: capacity for resource in ResourceClass}, enabled=True)
+
+
+async def _hold(controller, resource, user, order, release: asyncio.Event, on_queued=None):
+    async with controller.slot(resource, user_id=user, on_queued=on_queued):
+        order.append(user)
+        await release.wait()
+
+
+async def test_concurrency_capped_by_capacity():
+    controller = make_controller(capacity=2)
+    running = 0
+    peak = 0
+
+    async def job():
+        nonlocal running, peak
+        async with controller.slot(ResourceClass.FFMPEG):
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+
+    await asyncio.gather(*(job() for _ in range(8)))
+    assert peak == 2
+    snapshot = controller.snapshot()["ffmpeg"]
+    assert snapshot["admitted"] == 8
+    assert snapshot["queued"] == 6
+    assert snapshot["active"] == 0 and snapshot["waiting"] == 0
+    assert snapshot["wait_ms_buckets"]["+Inf"] == 8
+
+
+async def test_round_robin_between_users():
+    """同一用户的多个任务不会挤占其他用户：按用户轮转出队"""
+    controller = make_controller(capacity=1)
+    order = []
+    gate = asyncio.Event()
+    holder = asyncio.create_task(_hold(controller, ResourceClass.ASR, "owner", order, gate))
+    await asyncio.sleep(0)
+
+    async def job(user):
+        async with controller.slot(ResourceClass.ASR, user_id=user):
+            order.append(user)
+
+    tasks = [asyncio.create_task(job(user)) for user in ("a", "a", "a", "b", "c")]
+    await asyncio.sleep(0.01)
+    gate.set()
+    await asyncio.gather(holder, *tasks)
+    assert order == ["owner", "a", "b", "c", "a", "a"]
+
+
+async def test_queue_positions_reported():
+    controller = make_controller(capacity=1)
+    gate = asyncio.Event()
+    holder = asyncio.create_task(_hold(controller, ResourceClass.DOWNLOAD, "owner", [], gate))
+    await asyncio.sleep(0)
+
+    reports = {"a": [], "b": []}
+
+    def reporter(user):
+        async def report(resource, position):
+            assert resource is ResourceClass.DOWNLOAD
+            reports[user].append(position)
+        return report
+
+    first_gate = asyncio.Event()
+    first = asyncio.create_task(_hold(controller, ResourceClass.DOWNLOAD, "a", [], first_gate, reporter("a")))
+    await asyncio.sleep(0.01)
+    second = asyncio.create_task(_hold(controller, ResourceClass.DOWNLOAD, "b", [], asyncio.Event(), reporter("b")))
+    await asyncio.sleep(0.01)
+    assert reports == {"a": [1], "b": [2]}
+
+    gate.set()
+    await asyncio.sleep(0.01)
+    # a 获得槽位（0），b 前移到第 1 位
+    assert reports == {"a": [1, 0], "b": [2, 1]}
+
+    first_gate.set()
+    await asyncio.sleep(0.01)
+    assert reports["b"] == [2, 1, 0]
+    second.cancel()
+    await asyncio.gather(holder, first, second, return_exceptions=True)
+
+
+async def test_cancelled_waiter_leaves_queue():
+    controller = make_controller(capacity=1)
+    gate = asyncio.Event()
+    holder = asyncio.create_task(_hold(controller, ResourceClass.MEDIA_API, "owner", [], gate))
+    await asyncio.sleep(0)
+
+    waiter = asyncio.create_task(_hold(controller, ResourceClass.MEDIA_API, "a", [], asyncio.Event()))
+    await asyncio.sleep(0.01)
+    assert controller.limiter(ResourceClass.MEDIA_API).waiting == 1
+    waiter.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await waiter
+
+    limiter = controller.limiter(ResourceClass.MEDIA_API)
+    assert limiter.waiting == 0
+    gate.set()
+    await holder
+    assert limiter.active == 0
+    assert controller.snapshot()["media_api"]["cancelled"] == 1
+
+
+async def test_context_supplies_user_and_reporter():
+    controller = make_controller(capacity=1)
+    gate = asyncio.Event()
+    holder = asyncio.create_task(_hold(controller, ResourceClass.FFMPEG, "owner", [], gate))
+    await asyncio.sleep(0)
+
+    reports = []
+
+    async def report(resource, position):
+        reports.append(position)
+
+    async def job():
+        with admission_context("user-1", report):
+            async with controller.slots(ResourceClass.FFMPEG, ResourceClass.DOWNLOAD):
+                return controller.snapshot()
+
+    task = asyncio.create_task(job())
+    await asyncio.sleep(0.01)
+    assert controller.snapshot()["ffmpeg"]["waiting_users"] == 1
+    gate.set()
+    snapshot = await task
+    await holder
+    assert reports == [1, 0]
+    assert snapshot["download"]["active"] == 1 and snapshot["ffmpeg"]["active"] == 1
+
+
+async def test_disabled_controller_does_not_limit():
+    controller = AdmissionController({resource: 1 for resource in ResourceClass}, enabled=False)
+    entered = 0
+
+    async def job():
+        nonlocal entered
+        async with controller.slot(ResourceClass.ASR):
+            entered += 1
+            await asyncio.sleep(0.01)
+
+    await asyncio.wait_for(asyncio.gather(*(job() for _ in range(5))), 1)
+    assert entered == 5
+    assert controller.snapshot()["asr"]["admitted"] == 0
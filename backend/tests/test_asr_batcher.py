@@ -0,0 +1,120 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2026 relakkes@gmail.com
+#
+# This file is part of MediaCrawlerPro-ContentRemixAgent project.
+# Repository: https://github.com/MediaCrawlerPro/MediaCrawlerPro-ContentRemixAgent/blob/main/backend/tests/test_asr_batcher.py
+# GitHub: https://github.com/NanmiCoder
+# Licensed under NON-COMMERCIAL LEARNING LICENSE 1.1
+#
+# 声明：本代码仅供学习和研究目的使用。使用者应遵守以下原则：
+# 1. 不得用于任何商业用途。
+# 2. 使用时应遵守目标平台的使用条款和robots.txt规则。
+# 3. 不得进行大规模爬取或对平台造成运营干扰。
+# 4. 应合理控制请求频率，避免给目标平台带来不必要的负担。
+# 5. 不得用于任何非法或不当的用途。
+#
+# 详细许可条款请参阅项目根目录下的LICENSE文件。
+# 使用本代码即表示您同意遵守上述原则和LICENSE中的所有条款。
+
+
+"""
+ASR 微批调度器测试
+
+推理函数使用替身（记录每批大小），验证跨任务合批、结果路由和错误传播。
+"""
+import threading
+import time
+
+import pytest
+
+from services.asr_batcher import ASRBatchScheduler
+
+
+class RecordingModel:
+    """替身推理: 结果为 (模型名, 输入)，记录每批大小"""
+
+    def __init__(self, name: str = "m0", delay: float = 0.0):
+        self.name = name
+        self.delay = delay
+        self.batch_sizes = []
+
+    def run(self, chunks):
+        self.batch_sizes.append(len(chunks))
+        time.sleep(self.delay)
+        return [(self.name, chunk) for chunk in chunks]
+
+
+def _run_batch(model, chunks):
+    return model.run(chunks)
+
+
+class TestASRBatchScheduler:
+
+    def test_results_follow_input_order(self):
+        model = RecordingModel()
+        scheduler = ASRBatchScheduler([model], _run_batch, max_batch=4, window_ms=10)
+        try:
+            assert scheduler.run_all(list(range(10))) == [("m0", i) for i in range(10)]
+            assert max(model.batch_sizes) <= 4
+            assert sum(model.batch_sizes) == 10
+        finally:
+            scheduler.close()
+
+    def test_concurrent_jobs_share_batches(self):
+        model = RecordingModel(delay=0.05)
+        scheduler = ASRBatchScheduler([model], _run_batch, max_batch=16, window_ms=50)
+        results = {}
+
+        def job(job_id: int):
+            results[job_id] = scheduler.run_all([f"{job_id}-{i}" for i in range(3)])
+
+        threads = [threading.Thread(target=job, args=(j,)) for j in range(4)]
+        try:
+            for t in threads:
+                t.start()
+            for t in threads:
+                t.join()
+        finally:
+            scheduler.close()
+
+        for job_id in range(4):
+            assert results[job_id] == [("m0", f"{job_id}-{i}") for i in range(3)]
+        # 12 个语音块应合成少数几批，而不是逐个推理
+        assert len(model.batch_sizes) < 12
+        assert scheduler.metrics.snapshot()["max_batch_size"] > 3
+
+    def test_batch_error_fails_only_that_batch(self):
+        calls = {"n": 0}
+
+        def flaky(model, chunks):
+            calls["n"] += 1
+            if calls["n"] == 1:
+                raise RuntimeError("boom")
+            return [chunk * 2 for chunk in chunks]
+
+        scheduler = ASRBatchScheduler([object()], flaky, max_batch=1, window_ms=0)
+        try:
+            with pytest.raises(RuntimeError, match="boom"):
+                scheduler.submit(1).result(timeout=5)
+            assert scheduler.submit(2).result(timeout=5) == 4
+            assert scheduler.metrics.snapshot()["failed_batches"] == 1
+        finally:
+            scheduler.close()
+
+    def test_multiple_models_run_in_parallel(self):
+        models = [RecordingModel(f"m{i}", delay=0.2) for i in range(2)]
+        scheduler = ASRBatchScheduler(models, _run_batch, max_batch=1, window_ms=0)
+        try:
+            start = time.monotonic()
+            results = scheduler.run_all(["a", "b"])
+            elapsed = time.monotonic() - start
+        finally:
+            scheduler.close()
+        assert sorted(name for name, _ in results) == ["m0", "m1"]
+        assert elapsed < 0.35
+
+    def test_submit_after_close_raises(self):
+        scheduler = ASRBatchScheduler([RecordingModel()], _run_batch, max_batch=2, window_ms=0)
+        scheduler.close()
+        with pytest.raises(RuntimeError):
+            scheduler.submit("late")
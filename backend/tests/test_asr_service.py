@@ -24,19 +24,35 @@ ASR 服务测试
 - ASRService 可用性检查和单例模式
 - SegmentBuilder 句子切分逻辑
 - Token 和 RawTranscriptResult 数据结构
+- VAD 窗口切分与时间戳拼接
+- 渐进式转录（按窗口产出分段，最终结果与 transcribe() 一致）
+- 列式 token 与向量化切分（与逐 token 实现结果一致）
+- ONNX Runtime 后端的 VAD / 识别 / 标点流水线（替身模型）
 """
 
+import random
+from pathlib import Path
+
 import pytest
 
+from config import settings
 from schemas import Segment, TranscriptResult
 from services.asr_service import (
     ASRError,
     ASRService,
     MockASRService,
+    OnnxASRBackend,
     RawTranscriptResult,
     SegmentBuilder,
     Token,
+    TokenColumns,
+    AudioPreprocessor,
+    FunASRBackend,
+    load_pcm,
+    plan_windows,
+    stitch_window_results,
 )
+from services.audio_extractor import read_wav_info, write_wav
 
 
 class TestMockASRService:
@@ -90,6 +106,200 @@ class TestASRService:
         assert isinstance(result, bool)
 
 
+class WindowedBackend:
+    """替身后端: 两个窗口，时间戳相对窗口起点"""
+
+    def iter_transcribe(self, wav_path):
+        yield 0, RawTranscriptResult(text="你好。", tokens=[
+            Token("你", 0, 200), Token("好", 200, 400), Token("。", 400, 400),
+        ])
+        yield 5000, RawTranscriptResult(text="再见。", tokens=[
+            Token("再", 0, 200), Token("见", 200, 400), Token("。", 400, 400),
+        ])
+
+
+@pytest.fixture
+def windowed_service(monkeypatch, tmp_path):
+    service = ASRService()
+    audio = write_wav(tmp_path / "audio.wav", b"\x00\x00" * 16000, 16000)
+    monkeypatch.setattr(service, "_backend", WindowedBackend())
+    monkeypatch.setattr(service, "_backend_name", "funasr")
+    monkeypatch.setattr("services.asr_worker_pool._asr_worker_pool", None)
+    return service, audio.path
+
+
+class TestIncrementalTranscribe:
+    """渐进式转录测试"""
+
+    def test_iter_transcribe_yields_each_window(self, windowed_service):
+        service, audio = windowed_service
+        generator = service.iter_transcribe(audio)
+        partials = []
+        while True:
+            try:
+                partials.append(next(generator))
+            except StopIteration as stop:
+                final = stop.value
+                break
+
+        assert [[s.text for s in p] for p in partials] == [["你好。"], ["再见。"]]
+        assert partials[1][0].start == 5.0
+        assert final.text == "你好。再见。"
+        assert [s.text for s in final.segments] == ["你好。", "再见。"]
+
+    async def test_atranscribe_relays_segments(self, windowed_service):
+        service, audio = windowed_service
+        received = []
+
+        async def on_segments(segments):
+            received.append([s.text for s in segments])
+
+        result = await service.atranscribe(audio, on_segments=on_segments)
+        assert received == [["你好。"], ["再见。"]]
+        assert result.text == "你好。再见。"
+
+    async def test_callback_error_does_not_fail_transcription(self, windowed_service):
+        service, audio = windowed_service
+
+        async def on_segments(segments):
+            raise RuntimeError("client gone")
+
+        result = await service.atranscribe(audio, on_segments=on_segments)
+        assert len(result.segments) == 2
+
+
+class FakeFunASRModel:
+    """FunASR 替身: VAD 返回两个语音段；整段识别与分窗识别的标点不同，便于区分两种路径"""
+
+    def generate(self, input, fs, **kwargs):
+        if len(input) == 4 * fs:
+            return [{"text": "你好，再见。", "timestamp": [[1000, 1200], [1200, 1400], [1400, 1400],
+                                                        [3000, 3200], [3200, 3400], [3400, 3400]]}]
+        return [{"text": "片段。", "timestamp": [[0, 200], [200, 400], [400, 400]]}]
+
+
+class FakeVADModel:
+    def generate(self, input, fs):
+        return [{"value": [[1000, 1500], [3000, 3500]]}]
+
+
+@pytest.fixture
+def funasr_service(monkeypatch, tmp_path):
+    import queue
+    from concurrent.futures import ThreadPoolExecutor
+
+    model = FakeFunASRModel()
+    pool = queue.Queue()
+    pool.put(model)
+    executor = ThreadPoolExecutor(max_workers=1)
+    backend = FunASRBackend()
+    monkeypatch.setattr(backend, "_model", model)
+    monkeypatch.setattr(backend, "_vad_model", FakeVADModel())
+    monkeypatch.setattr(backend, "_model_pool", pool)
+    monkeypatch.setattr(backend, "_executor", executor)
+    monkeypatch.setattr(backend, "_batch_scheduler", None)
+    # 窗口上限 1 秒: 若渐进式转录仍按 VAD 切窗，会得到两个窗口
+    monkeypatch.setattr(settings, "ASR_WINDOW_SECONDS", 1)
+
+    service = ASRService()
+    audio = write_wav(tmp_path / "audio.wav", b"\x00\x00" * 64000, 16000)
+    monkeypatch.setattr(service, "_backend", backend)
+    monkeypatch.setattr(service, "_backend_name", "funasr")
+    monkeypatch.setattr("services.asr_worker_pool._asr_worker_pool", None)
+    yield service, audio.path
+    executor.shutdown()
+
+
+def _drain(generator):
+    partials = []
+    while True:
+        try:
+            partials.append(next(generator))
+        except StopIteration as stop:
+            return partials, stop.value
+
+
+class TestFunASRIncrementalTranscribe:
+    """FunASR 渐进式转录与 transcribe() 的切窗方式一致"""
+
+    def test_single_worker_matches_transcribe(self, funasr_service, monkeypatch):
+        """单实例时整段一次识别，最终结果与 transcribe() 相同"""
+        monkeypatch.setattr(settings, "ASR_PARALLEL_WORKERS", 1)
+        service, audio = funasr_service
+
+        expected = service.transcribe(audio)
+        partials, final = _drain(service.iter_transcribe(audio))
+
+        assert final.text == expected.text == "你好，再见。"
+        assert final.segments == expected.segments
+        assert len(partials) == 1
+
+    def test_short_audio_matches_transcribe(self, funasr_service, monkeypatch):
+        """多实例但音频短于 ASR_PARALLEL_MIN_SECONDS 时不切窗"""
+        monkeypatch.setattr(settings, "ASR_PARALLEL_WORKERS", 2)
+        monkeypatch.setattr(settings, "ASR_PARALLEL_MIN_SECONDS", 60)
+        service, audio = funasr_service
+
+        expected = service.transcribe(audio)
+        _, final = _drain(service.iter_transcribe(audio))
+
+        assert final.text == expected.text == "你好，再见。"
+        assert final.segments == expected.segments
+
+    def test_parallel_long_audio_uses_windows(self, funasr_service, monkeypatch):
+        """达到并行阈值时两条路径都按窗口转录"""
+        monkeypatch.setattr(settings, "ASR_PARALLEL_WORKERS", 2)
+        monkeypatch.setattr(settings, "ASR_PARALLEL_MIN_SECONDS", 1)
+        service, audio = funasr_service
+
+        expected = service.transcribe(audio)
+        partials, final = _drain(service.iter_transcribe(audio))
+
+        assert final.text == expected.text == "片段。片段。"
+        assert final.segments == expected.segments
+        assert len(partials) == 2
+
+
+class TestAudioPreparation:
+    """音频准备: WAV 头检查与内存 PCM（无子进程）"""
+
+    def test_write_and_read_wav_info(self, tmp_path):
+        pcm = b"\x01\x00" * 32000
+        info = write_wav(tmp_path / "a.wav", pcm, 16000)
+        assert info.duration == 2.0
+        header = read_wav_info(info.path)
+        assert (header.sample_rate, header.channels, header.frames) == (16000, 1, 32000)
+        assert header.pcm is None
+
+    def test_check_wav_format_reads_header(self, tmp_path):
+        preprocessor = AudioPreprocessor(cache_dir=str(tmp_path / "cache"))
+        ok = write_wav(tmp_path / "ok.wav", b"\x00\x00" * 100, 16000)
+        wrong_rate = write_wav(tmp_path / "44k.wav", b"\x00\x00" * 100, 44100)
+        not_wav = tmp_path / "bad.wav"
+        not_wav.write_bytes(b"not a wav")
+        assert preprocessor._check_wav_format(ok.path)
+        assert not preprocessor._check_wav_format(wrong_rate.path)
+        assert not preprocessor._check_wav_format(str(not_wav))
+
+    def test_load_pcm_prefers_memory(self, tmp_path):
+        info = write_wav(tmp_path / "a.wav", b"\x00\x40" * 10, 16000)
+        from_memory, rate = load_pcm(info)
+        from_file, _ = load_pcm(info.path)
+        assert rate == 16000
+        assert from_memory.tolist() == from_file.tolist() == [0.5] * 10
+
+    def test_prepared_audio_skips_preprocessing(self, windowed_service, monkeypatch):
+        service, audio_path = windowed_service
+        info = write_wav(Path(audio_path), b"\x00\x00" * 16000, 16000)
+
+        def fail(path):
+            raise AssertionError("preprocess should not run")
+
+        monkeypatch.setattr(service._preprocessor, "preprocess", fail)
+        prepared, temp_file = service._prepare(info)
+        assert prepared is info and not temp_file
+
+
 class TestASRError:
     """ASR 错误测试"""
 
@@ -306,3 +516,154 @@ class TestSegmentBuilderEdgeCases:
         segments = builder.build_segments(result)
 
         assert len(segments) == 2
+
+
+def _random_tokens(rng: random.Random, count: int, multi_char: bool = False) -> list:
+    alphabet = "你好世界今天天气不错我们一起去" + "。！？；…!?;，,、 "
+    tokens = []
+    cursor = rng.randint(0, 500)
+    for _ in range(count):
+        text = rng.choice(alphabet)
+        if multi_char and rng.random() < 0.3:
+            text += rng.choice(["hello", "ab", "。"])
+        cursor += rng.choice([0, 50, 120, 200, 700, 7000]) if rng.random() < 0.2 else rng.randint(0, 80)
+        duration = rng.randint(0, 400)
+        tokens.append(Token(text=text, start_ms=cursor, end_ms=cursor + duration))
+        cursor += duration
+    return tokens
+
+
+class TestTokenColumns:
+    """列式 token 测试"""
+
+    def test_from_chars_matches_timestamps(self):
+        cols = TokenColumns.from_chars("你好世界", [[0, 100], [100, 200.7], [200, 300]])
+        assert [(t.text, t.start_ms, t.end_ms) for t in cols] == [
+            ("你", 0, 100), ("好", 100, 200), ("世", 200, 300),
+        ]
+
+    def test_from_chars_skips_incomplete_timestamps(self):
+        cols = TokenColumns.from_chars("你好世", [[0, 100], [150], [200, 300]])
+        assert [(t.text, t.start_ms) for t in cols] == [("你", 0), ("世", 200)]
+
+    def test_concat_applies_offsets(self):
+        first = TokenColumns.from_tokens([Token("ab", 0, 10)])
+        second = TokenColumns.from_tokens([Token("c", 5, 8), Token("de", 8, 9)])
+        merged = TokenColumns.concat([(0, first), (1000, second)])
+        assert merged == [Token("ab", 0, 10), Token("c", 1005, 1008), Token("de", 1008, 1009)]
+        assert merged.text == "abcde"
+
+    @pytest.mark.parametrize("seed", range(20))
+    @pytest.mark.parametrize("max_chars", [1, 5, 20])
+    def test_vectorized_split_matches_token_loop(self, seed, max_chars):
+        rng = random.Random(seed)
+        tokens = _random_tokens(rng, rng.randint(1, 400), multi_char=seed % 2 == 1)
+        builder = SegmentBuilder(max_chars=max_chars, max_seconds=rng.choice([1.0, 6.0]), gap_split=0.6)
+        assert builder._build_from_tokens(tokens) == builder._build_from_token_list(tokens)
+
+    def test_empty_token_text_falls_back(self):
+        builder = SegmentBuilder()
+        tokens = [Token("你", 0, 100), Token("", 100, 200), Token("。", 200, 300), Token("好", 900, 1000)]
+        assert builder._build_from_tokens(tokens) == builder._build_from_token_list(tokens)
+
+
+class TestWindowing:
+    """VAD 窗口切分与拼接测试"""
+
+    def test_short_audio_single_window(self):
+        """总语音不超过窗口上限时只有一个窗口"""
+        windows = plan_windows([(0, 1000), (2000, 3000)], 4000, 60_000)
+        assert windows == [(0, 4000)]
+
+    def test_windows_cut_at_silence_midpoint(self):
+        """窗口在静音中点切分，首尾相接覆盖整段音频"""
+        speech = [(0, 20_000), (22_000, 40_000), (42_000, 60_000), (64_000, 80_000)]
+        windows = plan_windows(speech, 90_000, 45_000)
+
+        assert windows[0] == (0, 41_000)
+        assert windows[1] == (41_000, 90_000)
+        for start, end in windows:
+            # 没有语音段跨越窗口边界
+            assert all(seg_end <= start or seg_start >= end or (seg_start >= start and seg_end <= end)
+                       for seg_start, seg_end in speech)
+
+    def test_long_segment_gets_own_window(self):
+        """超长语音段独占一个窗口"""
+        speech = [(0, 10_000), (11_000, 100_000), (101_000, 110_000)]
+        windows = plan_windows(speech, 120_000, 30_000)
+        assert windows == [(0, 10_500), (10_500, 100_500), (100_500, 120_000)]
+
+    def test_no_speech(self):
+        """没有语音段时整段作为一个窗口"""
+        assert plan_windows([], 5000, 60_000) == [(0, 5000)]
+
+    def test_stitch_offsets_tokens(self):
+        """拼接时 token 时间戳加上窗口偏移"""
+        first = RawTranscriptResult(text="你好。", tokens=[
+            Token(text="你", start_ms=0, end_ms=200),
+            Token(text="好", start_ms=200, end_ms=400),
+            Token(text="。", start_ms=400, end_ms=450),
+        ])
+        second = RawTranscriptResult(text="再见", tokens=[
+            Token(text="再", start_ms=100, end_ms=300),
+            Token(text="见", start_ms=300, end_ms=500),
+        ])
+        stitched = stitch_window_results([(0, first), (60_000, second)])
+
+        assert stitched.text == "你好。再见"
+        assert [t.start_ms for t in stitched.tokens] == [0, 200, 400, 60_100, 60_300]
+
+        segments = SegmentBuilder().build_segments(stitched)
+        assert segments[0].text == "你好。"
+        assert segments[-1].start == 60.1
+
+
+class FakeOnnxModels:
+    """funasr_onnx 替身: VAD 返回两个语音块，识别结果按语音块长度区分"""
+
+    def vad(self, samples):
+        return [[[1000, 2000], [3000, 3500]]]
+
+    def asr(self, samples):
+        if len(samples) == 16000:
+            return [{"preds": "你好世界", "timestamp": [[0, 200], [200, 400], [400, 600], [600, 800]]}]
+        return [{"preds": ("再见", ["再", "见"]), "timestamp": [[0, 100], [100, 200]]}]
+
+    def punc(self, text):
+        return ("你好，世界。" if text == "你好世界" else text + "。", [])
+
+
+@pytest.fixture
+def onnx_backend(monkeypatch):
+    from concurrent.futures import ThreadPoolExecutor
+
+    fake = FakeOnnxModels()
+    backend = OnnxASRBackend()
+    executor = ThreadPoolExecutor(max_workers=2)
+    monkeypatch.setattr(backend, "_vad_model", fake.vad, raising=False)
+    monkeypatch.setattr(backend, "_asr_model", fake.asr, raising=False)
+    monkeypatch.setattr(backend, "_punc_model", fake.punc, raising=False)
+    monkeypatch.setattr(backend, "_executor", executor, raising=False)
+    yield backend
+    executor.shutdown()
+
+
+class TestOnnxBackend:
+    """ONNX Runtime 后端流水线"""
+
+    def test_transcribe_stitches_speech_chunks(self, onnx_backend, tmp_path):
+        audio = write_wav(tmp_path / "audio.wav", b"\x00\x00" * 64000, 16000)
+        raw = onnx_backend.transcribe(audio)
+
+        assert raw.text == "你好，世界。再见。"
+        assert [(t.text, t.start_ms) for t in raw.tokens if t.text.strip("，。")] == [
+            ("你", 1000), ("好", 1200), ("世", 1400), ("界", 1600), ("再", 3000), ("见", 3100),
+        ]
+        assert raw.vad_segments == [(1000, 2000), (3000, 3500)]
+
+        segments = SegmentBuilder().build_segments(raw)
+        assert [s.text for s in segments] == ["你好，世界。", "再见。"]
+
+    def test_iter_transcribe_yields_chunk_offsets(self, onnx_backend, tmp_path):
+        audio = write_wav(tmp_path / "audio.wav", b"\x00\x00" * 64000, 16000)
+        assert [offset for offset, _ in onnx_backend.iter_transcribe(audio)] == [1000, 3000]
@@ -0,0 +1,255 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2026 relakkes@gmail.com
+#
+# This file is part of MediaCrawlerPro-ContentRemixAgent project.
+# Repository: https://github.com/MediaCrawlerPro/MediaCrawlerPro-ContentRemixAgent/blob/main/backend/tests/test_asr_worker_pool.py
+# GitHub: https://github.com/NanmiCoder
+# Licensed under NON-COMMERCIAL LEARNING LICENSE 1.1
+#
+# 声明：本代码仅供学习和研究目的使用。使用者应遵守以下原则：
+# 1. 不得用于任何商业用途。
+# 2. 使用时应遵守目标平台的使用条款和robots.txt规则。
+# 3. 不得进行大规模爬取或对平台造成运营干扰。
+# 4. 应合理控制请求频率，避免给目标平台带来不必要的负担。
+# 5. 不得用于任何非法或不当的用途。
+#
+# 详细许可条款请参阅项目根目录下的LICENSE文件。
+# 使用本代码即表示您同意遵守上述原则和LICENSE中的所有条款。
+
+
+"""
+ASR 工作进程池测试
+
+工作进程使用替身处理函数（不加载模型），验证排队、超时、崩溃隔离和背压。
+"""
+import asyncio
+import functools
+import os
+import time
+
+import pytest
+
+import services.asr_worker_pool as asr_worker_pool
+from config import settings
+from services.asr_service import ASRError, ASRService
+from services.asr_worker_pool import ASRQueueFullError, ASRWorkerPool
+
+
+def fake_transcribe(audio_path: str, emit=None) -> dict:
+    """替身处理函数：按路径约定模拟不同行为"""
+    if audio_path == "crash":
+        os._exit(1)
+    if audio_path == "error":
+        raise RuntimeError("bad audio")
+    if audio_path.startswith("sleep:"):
+        time.sleep(float(audio_path.split(":", 1)[1]))
+    if audio_path.startswith("windows:"):
+        segments = []
+        for i in range(int(audio_path.split(":", 1)[1])):
+            window = [{"start": float(i), "end": i + 1.0, "text": f"w{i}"}]
+            segments.extend(window)
+            if emit:
+                emit(window)
+        return {"text": "".join(s["text"] for s in segments), "segments": segments}
+    return {"text": audio_path, "segments": [{"start": 0.0, "end": 1.0, "text": audio_path}]}
+
+
+def crash_once_initializer(marker: str) -> None:
+    """替身初始化：首次启动时进程在就绪前退出，之后正常"""
+    if not os.path.exists(marker):
+        open(marker, "w").close()
+        os._exit(1)
+
+
+def always_crash_initializer() -> None:
+    os._exit(1)
+
+
+def failing_initializer() -> None:
+    raise RuntimeError("model missing")
+
+
+def not_ready_initializer() -> bool:
+    return False
+
+
+def slow_initializer() -> None:
+    time.sleep(5)
+
+
+def _pool(**kwargs) -> ASRWorkerPool:
+    params = {"processes": 1, "max_pending": 8, "job_timeout": 10, "handler": fake_transcribe, "initializer": None}
+    params.update(kwargs)
+    return ASRWorkerPool(**params)
+
+
+class TestASRWorkerPool:
+
+    async def test_submit_returns_transcript(self):
+        pool = _pool()
+        await pool.start()
+        try:
+            result = await pool.submit("hello.wav")
+            assert result.text == "hello.wav"
+            assert result.segments[0].end == 1.0
+            assert pool.snapshot()["completed"] == 1
+        finally:
+            await pool.shutdown()
+
+    async def test_partial_segments_stream_in_order(self):
+        pool = _pool()
+        await pool.start()
+        received = []
+
+        async def on_segments(segments):
+            received.append([s.text for s in segments])
+
+        try:
+            result = await pool.submit("windows:3", on_segments=on_segments)
+            assert received == [["w0"], ["w1"], ["w2"]]
+            assert result.text == "w0w1w2"
+        finally:
+            await pool.shutdown()
+
+    async def test_handler_error_is_isolated(self):
+        pool = _pool()
+        await pool.start()
+        try:
+            with pytest.raises(ASRError, match="bad audio"):
+                await pool.submit("error")
+            assert (await pool.submit("ok.wav")).text == "ok.wav"
+            assert pool.snapshot()["restarts"] == 0
+        finally:
+            await pool.shutdown()
+
+    async def test_worker_crash_restarts_process(self):
+        pool = _pool()
+        await pool.start()
+        try:
+            with pytest.raises(ASRError):
+                await pool.submit("crash")
+            assert (await pool.submit("after.wav")).text == "after.wav"
+            assert pool.snapshot()["restarts"] == 1
+        finally:
+            await pool.shutdown()
+
+    async def test_job_timeout_restarts_worker(self):
+        pool = _pool(job_timeout=0.5)
+        await pool.start()
+        try:
+            await pool.wait_ready(timeout=30)
+            with pytest.raises(ASRError, match="超时"):
+                await pool.submit("sleep:5")
+            snapshot = pool.snapshot()
+            assert snapshot["timeouts"] == 1
+            assert snapshot["restarts"] == 1
+        finally:
+            await pool.shutdown()
+
+    async def test_queue_full_rejects(self):
+        pool = _pool(max_pending=1)
+        await pool.start()
+        try:
+            await pool.wait_ready(timeout=30)
+            running = asyncio.create_task(pool.submit("sleep:0.5"))
+            await asyncio.sleep(0.1)  # 第一个任务已被取走执行
+            queued = asyncio.create_task(pool.submit("queued.wav"))
+            await asyncio.sleep(0)
+            with pytest.raises(ASRQueueFullError):
+                await pool.submit("rejected.wav")
+            assert (await running).text == "sleep:0.5"
+            assert (await queued).text == "queued.wav"
+            assert pool.snapshot()["rejected"] == 1
+        finally:
+            await pool.shutdown()
+
+    async def test_crash_before_ready_keeps_waiters(self, tmp_path):
+        """就绪前崩溃重启后，已在等待的 wait_ready 与排队任务都能继续"""
+        pool = _pool(initializer=functools.partial(crash_once_initializer, str(tmp_path / "crashed")))
+        await pool.start()
+        try:
+            job = asyncio.create_task(pool.submit("queued.wav"))
+            await pool.wait_ready(timeout=15)
+            assert (await asyncio.wait_for(job, 15)).text == "queued.wav"
+            assert pool.snapshot()["restarts"] == 1
+        finally:
+            await pool.shutdown()
+
+    async def test_failing_worker_restarts_with_backoff(self):
+        """无法就绪的工作进程按退避间隔重启，而不是无间隔地反复拉起"""
+        pool = _pool(initializer=always_crash_initializer)
+        await pool.start()
+        try:
+            with pytest.raises(asyncio.TimeoutError):
+                await pool.wait_ready(timeout=3)
+            # 退避 0.5s, 1s, 2s ... 3 秒内最多重启 3 次
+            assert 1 <= pool.snapshot()["restarts"] <= 3
+        finally:
+            await pool.shutdown()
+
+    async def test_timeout_only_fails_that_job(self):
+        """同一进程并发执行时，单个任务超时不影响其他在途任务"""
+        pool = _pool(job_timeout=1, concurrency=2)
+        await pool.start()
+        try:
+            await pool.wait_ready(timeout=30)
+            stuck = asyncio.create_task(pool.submit("sleep:5"))
+            await asyncio.sleep(0.6)
+            # stuck 在 t=1s 超时时 other 仍在执行，t≈1.4s 完成（早于其自身超时）
+            other = asyncio.create_task(pool.submit("sleep:0.8"))
+            with pytest.raises(ASRError, match="超时"):
+                await stuck
+            assert not other.done()
+            assert (await other).text == "sleep:0.8"
+            # 其余在途任务结束后才重启，重启后继续服务
+            assert (await pool.submit("after.wav")).text == "after.wav"
+            snapshot = pool.snapshot()
+            assert snapshot["timeouts"] == 1
+            assert snapshot["restarts"] == 1
+        finally:
+            await pool.shutdown()
+
+
+class TestWorkerInitResult:
+    """工作进程报告初始化结果，预加载据此判断是否就绪"""
+
+    async def test_wait_ready_true_when_initialized(self):
+        pool = _pool()
+        await pool.start()
+        try:
+            assert await pool.wait_ready(timeout=30) is True
+            assert pool.snapshot()["init_failed"] == 0
+        finally:
+            await pool.shutdown()
+
+    @pytest.mark.parametrize("initializer", [failing_initializer, not_ready_initializer])
+    async def test_wait_ready_false_when_init_failed(self, initializer):
+        """初始化抛出异常或返回 False 时报告失败，进程不重启，仍可接收任务"""
+        pool = _pool(initializer=initializer)
+        await pool.start()
+        try:
+            assert await pool.wait_ready(timeout=30) is False
+            snapshot = pool.snapshot()
+            assert snapshot["init_failed"] == 1
+            assert snapshot["restarts"] == 0
+            assert (await pool.submit("ok.wav")).text == "ok.wav"
+        finally:
+            await pool.shutdown()
+
+    async def test_apreload_times_out(self, monkeypatch):
+        """工作进程在 ASR_PRELOAD_TIMEOUT 内未就绪时 apreload 返回 False，而不是一直等待"""
+        pool = _pool(initializer=slow_initializer)
+
+        async def start_pool():
+            await pool.start()
+            return pool
+
+        monkeypatch.setattr(asr_worker_pool, "start_asr_worker_pool", start_pool)
+        monkeypatch.setattr(ASRService, "uses_worker_pool", True)
+        monkeypatch.setattr(settings, "ASR_PRELOAD_TIMEOUT", 0.5)
+        try:
+            started = time.monotonic()
+            assert await ASRService().apreload() is False
+            assert time.monotonic() - started < 3
+        finally:
+            await pool.shutdown()
@@ -0,0 +1,250 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2026 relakkes@gmail.com
+#
+# This file is part of MediaCrawlerPro-ContentRemixAgent project.
+# Repository: https://github.com/MediaCrawlerPro/MediaCrawlerPro-ContentRemixAgent/blob/main/backend/tests/test_bcut_asr.py
+# GitHub: https://github.com/NanmiCoder
+# Licensed under NON-COMMERCIAL LEARNING LICENSE 1.1
+#
+# 声明：本代码仅供学习和研究目的使用。使用者应遵守以下原则：
+# 1. 不得用于任何商业用途。
+# 2. 使用时应遵守目标平台的使用条款和robots.txt规则。
+# 3. 不得进行大规模爬取或对平台造成运营干扰。
+# 4. 应合理控制请求频率，避免给目标平台带来不必要的负担。
+# 5. 不得用于任何非法或不当的用途。
+#
+# 详细许可条款请参阅项目根目录下的LICENSE文件。
+# 使用本代码即表示您同意遵守上述原则和LICENSE中的所有条款。
+
+
+
+"""
+Bcut 云端 ASR 异步实现测试（本地桩服务器模拟 Bcut 接口）
+"""
+import asyncio
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import httpx
+import pytest
+
+from config import settings
+from services.asr_service import ASRError, BcutASRBackend
+
+
+PER_SIZE = 1000
+CHUNKS = 5
+
+
+class BcutStub:
+    """Bcut 接口桩: 记录分片上传、并发峰值与轮询时间"""
+
+    def __init__(self, pending_polls: int = 2, final_state: int = 4):
+        self.pending_polls = pending_polls
+        self.final_state = final_state
+        self.chunks = {}
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.transfer_encodings = []
+        self.commit = None
+        self.poll_times = []
+        self.lock = threading.Lock()
+        self.server = None
+
+    @property
+    def base_url(self) -> str:
+        return f"http://127.0.0.1:{self.server.server_address[1]}"
+
+    def handler(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, *args):
+                pass
+
+            def _reply(self, payload: dict, headers: dict = None):
+                body = json.dumps(payload).encode()
+                self.send_response(200)
+                self.send_header("Content-Length", str(len(body)))
+                for key, value in (headers or {}).items():
+                    self.send_header(key, value)
+                self.end_headers()
+                self.wfile.write(body)
+
+            def _body(self) -> bytes:
+                return self.rfile.read(int(self.headers.get("Content-Length", 0)))
+
+            def do_PUT(self):
+                index = int(self.path.rsplit("/", 1)[1])
+                with stub.lock:
+                    stub.in_flight += 1
+                    stub.max_in_flight = max(stub.max_in_flight, stub.in_flight)
+                    stub.transfer_encodings.append(self.headers.get("Transfer-Encoding"))
+                data = self._body()
+                time.sleep(0.05)
+                with stub.lock:
+                    stub.in_flight -= 1
+                    stub.chunks[index] = data
+                self._reply({}, {"Etag": f"etag-{index}"})
+
+            def do_POST(self):
+                body = json.loads(self._body() or b"{}")
+                path = urlparse(self.path).path
+                if path.endswith("/resource/create"):
+                    self._reply({"code": 0, "data": {
+                        "in_boss_key": "boss", "resource_id": "res", "upload_id": "up",
+                        "per_size": PER_SIZE,
+                        "upload_urls": [f"{stub.base_url}/upload/{i}" for i in range(CHUNKS)],
+                    }})
+                elif path.endswith("/resource/create/complete"):
+                    stub.commit = body
+                    self._reply({"code": 0, "data": {"download_url": "http://audio"}})
+                elif path.endswith("/task"):
+                    self._reply({"code": 0, "data": {"task_id": "t-1"}})
+                else:
+                    self._reply({"code": -404, "message": "not found"})
+
+            def do_GET(self):
+                query = parse_qs(urlparse(self.path).query)
+                assert query["task_id"] == ["t-1"]
+                stub.poll_times.append(time.monotonic())
+                if len(stub.poll_times) <= stub.pending_polls:
+                    self._reply({"code": 0, "data": {"state": 1}})
+                    return
+                result = json.dumps({"utterances": [{
+                    "transcript": "你好世界", "start_time": 0, "end_time": 1200,
+                    "words": [
+                        {"label": "你好", "start_time": 0, "end_time": 600},
+                        {"label": "世界", "start_time": 600, "end_time": 1200},
+                    ],
+                }]})
+                self._reply({"code": 0, "data": {"state": stub.final_state, "result": result}})
+
+        return Handler
+
+
+@pytest.fixture
+def bcut_stub(monkeypatch):
+    servers = []
+
+    def start(**kwargs) -> BcutStub:
+        stub = BcutStub(**kwargs)
+        stub.server = ThreadingHTTPServer(("127.0.0.1", 0), stub.handler())
+        threading.Thread(target=stub.server.serve_forever, daemon=True).start()
+        servers.append(stub.server)
+
+        api = stub.base_url + "/x/bcut/rubick-interface"
+        monkeypatch.setattr(BcutASRBackend, "API_REQ_UPLOAD", api + "/resource/create")
+        monkeypatch.setattr(BcutASRBackend, "API_COMMIT_UPLOAD", api + "/resource/create/complete")
+        monkeypatch.setattr(BcutASRBackend, "API_CREATE_TASK", api + "/task")
+        monkeypatch.setattr(BcutASRBackend, "API_QUERY_RESULT", api + "/task/result")
+        return stub
+
+    monkeypatch.setattr(settings, "BCUT_POLL_INTERVAL", 0.05)
+    monkeypatch.setattr(settings, "BCUT_POLL_MAX_INTERVAL", 0.2)
+    monkeypatch.setattr(settings, "BCUT_UPLOAD_CONCURRENCY", 2)
+    yield start
+    for server in servers:
+        server.shutdown()
+        server.server_close()
+
+
+@pytest.fixture
+def audio_file(tmp_path):
+    path = tmp_path / "audio.mp3"
+    path.write_bytes(bytes(range(256)) * 18 + b"tail")  # 4612 字节 -> 5 片，末片不满
+    return path
+
+
+async def test_upload_poll_and_parse(bcut_stub, audio_file):
+    stub = bcut_stub(pending_polls=3)
+    async with httpx.AsyncClient() as client:
+        result = await BcutASRBackend().atranscribe(str(audio_file), client=client)
+
+    data = audio_file.read_bytes()
+    assert [stub.chunks[i] for i in range(CHUNKS)] == [
+        data[i * PER_SIZE:(i + 1) * PER_SIZE] for i in range(CHUNKS)
+    ]
+    # 分片带 Content-Length 流式上传，并发不超过上限
+    assert stub.transfer_encodings == [None] * CHUNKS
+    assert 1 < stub.max_in_flight <= settings.BCUT_UPLOAD_CONCURRENCY
+    # ETag 按分片顺序提交
+    assert stub.commit["Etags"] == ",".join(f"etag-{i}" for i in range(CHUNKS))
+
+    assert result.text == "你好世界"
+    assert [(t.text, t.start_ms, t.end_ms) for t in result.tokens] == [("你好", 0, 600), ("世界", 600, 1200)]
+
+
+async def test_poll_interval_backs_off(bcut_stub, audio_file, monkeypatch):
+    stub = bcut_stub(pending_polls=5)
+    delays = []
+    real_sleep = asyncio.sleep
+
+    async def recording_sleep(delay, *args, **kwargs):
+        if delay > 0:
+            delays.append(delay)
+        return await real_sleep(delay, *args, **kwargs)
+
+    monkeypatch.setattr(asyncio, "sleep", recording_sleep)
+    async with httpx.AsyncClient() as client:
+        await BcutASRBackend().atranscribe(str(audio_file), client=client)
+
+    assert len(stub.poll_times) == 6
+    assert delays == pytest.approx([0.05, 0.075, 0.1125, 0.16875, 0.2])
+
+
+async def test_poll_stops_at_total_deadline(bcut_stub, audio_file, monkeypatch):
+    stub = bcut_stub(pending_polls=1000)
+    monkeypatch.setattr(settings, "BCUT_POLL_TIMEOUT", 0.3)
+
+    async with httpx.AsyncClient() as client:
+        with pytest.raises(ASRError, match="任务超时"):
+            await BcutASRBackend().atranscribe(str(audio_file), client=client)
+
+    # 截止时间从开始轮询算起，最后一次等待被截短到剩余时间
+    assert 0.25 <= stub.poll_times[-1] - stub.poll_times[0] < 0.45
+    assert len(stub.poll_times) < settings.BCUT_MAX_RETRIES
+
+
+async def test_failed_task_raises(bcut_stub, audio_file):
+    bcut_stub(pending_polls=0, final_state=-1)
+    async with httpx.AsyncClient() as client:
+        with pytest.raises(ASRError, match="任务失败"):
+            await BcutASRBackend().atranscribe(str(audio_file), client=client)
+
+
+def test_sync_transcribe(bcut_stub, audio_file):
+    bcut_stub(pending_polls=0)
+    result = BcutASRBackend().transcribe(str(audio_file))
+    assert result.text == "你好世界"
+
+
+async def test_service_awaits_remote_backend(bcut_stub, tmp_path, monkeypatch):
+    from services.asr_service import ASRService
+    from services.audio_extractor import write_wav
+    from services.http_clients import http_clients
+
+    stub = bcut_stub(pending_polls=1)
+    audio = write_wav(tmp_path / "audio.wav", b"\x00\x00" * 16000, 16000)
+    service = ASRService()
+    monkeypatch.setattr(service, "_backend", BcutASRBackend())
+    monkeypatch.setattr(service, "_backend_name", "bcut")
+
+    received = []
+
+    async def on_segments(segments):
+        received.append([s.text for s in segments])
+
+    try:
+        result = await service.atranscribe(audio, on_segments=on_segments)
+    finally:
+        await http_clients.aclose_all()
+
+    assert stub.chunks[0] == (tmp_path / "audio.wav").read_bytes()[:PER_SIZE]
+    assert result.text == "你好世界"
+    assert received == [[s.text for s in result.segments]]
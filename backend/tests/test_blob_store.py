@@ -0,0 +1,157 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2026 relakkes@gmail.com
+#
+# This file is part of MediaCrawlerPro-ContentRemixAgent project.
+# Repository: https://github.com/MediaCrawlerPro/MediaCrawlerPro-ContentRemixAgent/blob/main/backend/tests/test_blob_store.py
+# GitHub: https://github.com/NanmiCoder
+# Licensed under NON-COMMERCIAL LEARNING LICENSE 1.1
+#
+# 声明：本代码仅供学习和研究目的使用。使用者应遵守以下原则：
+# 1. 不得用于任何商业用途。
+# 2. 使用时应遵守目标平台的使用条款和robots.txt规则。
+# 3. 不得进行大规模爬取或对平台造成运营干扰。
+# 4. 应合理控制请求频率，避免给目标平台带来不必要的负担。
+# 5. 不得用于任何非法或不当的用途。
+#
+# 详细许可条款请参阅项目根目录下的LICENSE文件。
+# 使用本代码即表示您同意遵守上述原则和LICENSE中的所有条款。
+
+
+"""
+内容寻址资源存储测试
+"""
+import os
+
+import pytest
+
+from services.blob_store import BlobStoreError, ContentAddressedStore, ensure_blob_dir_private
+
+
+@pytest.fixture
+def store(tmp_path):
+    return ContentAddressedStore(blob_dir=str(tmp_path / ".blobs"), link_mode="hardlink")
+
+
+class TestContentAddressedStore:
+    """内容寻址存储测试"""
+
+    def test_put_bytes_materializes_target(self, store, tmp_path):
+        """测试写入后目标路径内容正确"""
+        target = tmp_path / "dy" / "123" / "cover.jpg"
+        ref = store.put_bytes(b"cover-bytes", target)
+
+        assert target.read_bytes() == b"cover-bytes"
+        assert ref.deduplicated is False
+        assert os.path.samefile(target, store.blob_path(ref.digest))
+
+    def test_same_bytes_deduplicated(self, store, tmp_path):
+        """测试相同内容只保存一个 blob"""
+        payload = b"x" * 4096
+        first = store.put_bytes(payload, tmp_path / "a" / "cover.jpg")
+        second = store.put_bytes(payload, tmp_path / "b" / "cover.jpg")
+
+        assert second.deduplicated is True
+        assert first.digest == second.digest
+
+        stats = store.stats()
+        assert stats.blob_count == 1
+        assert stats.ref_count == 2
+        assert stats.reclaimed_bytes == 4096
+
+    def test_put_file_moves_source(self, store, tmp_path):
+        """测试 put_file 移动源文件"""
+        source = tmp_path / "temp" / "video.mp4"
+        source.parent.mkdir()
+        source.write_bytes(b"video")
+        target = tmp_path / "dy" / "123" / "video.mp4"
+
+        store.put_file(source, target, move=True)
+
+        assert not source.exists()
+        assert target.read_bytes() == b"video"
+
+    def test_overwrite_does_not_touch_other_refs(self, store, tmp_path):
+        """测试重写某个路径不影响共享 blob 的其他路径"""
+        a = tmp_path / "a.jpg"
+        b = tmp_path / "b.jpg"
+        store.put_bytes(b"same", a)
+        store.put_bytes(b"same", b)
+        store.put_bytes(b"changed", a)
+
+        assert a.read_bytes() == b"changed"
+        assert b.read_bytes() == b"same"
+
+    def test_release_and_gc(self, store, tmp_path):
+        """测试释放引用后 gc 回收 blob"""
+        target = tmp_path / "a.jpg"
+        ref = store.put_bytes(b"data", target)
+
+        assert store.release(target) is True
+        assert not target.exists()
+        assert store.gc() == 4
+        assert not store.blob_path(ref.digest).exists()
+
+    def test_gc_prunes_externally_deleted_refs(self, store, tmp_path):
+        """测试目标文件被外部删除时 gc 清理失效引用"""
+        target = tmp_path / "a.jpg"
+        store.put_bytes(b"data", target)
+        target.unlink()
+
+        store.gc()
+
+        assert store.stats().ref_count == 0
+
+    def test_link_existing_blob(self, store, tmp_path):
+        """测试链接已有 blob 并记录引用，blob 不存在时返回 None"""
+        ref = store.put_bytes(b"variant", tmp_path / "a" / "v.jpg")
+        linked = store.link(ref.digest, tmp_path / "b" / "v.jpg")
+
+        assert linked.deduplicated is True
+        assert (tmp_path / "b" / "v.jpg").read_bytes() == b"variant"
+        assert store.stats().ref_count == 2
+        assert store.link("0" * 64, tmp_path / "c" / "v.jpg") is None
+
+    def test_lookup_returns_digest_while_linked(self, store, tmp_path):
+        """测试查询摘要：文件被替换为其他内容后不再返回"""
+        target = tmp_path / "a" / "cover.jpg"
+        ref = store.put_bytes(b"cover", target)
+        assert store.lookup(target) == ref.digest
+
+        target.unlink()
+        target.write_bytes(b"replaced")
+        assert store.lookup(target) is None
+        assert store.lookup(tmp_path / "missing.jpg") is None
+
+    def test_dedupe_tree_reports_reclaimed(self, store, tmp_path):
+        """测试已有目录就地去重"""
+        root = tmp_path / "assets"
+        (root / "dy" / "1").mkdir(parents=True)
+        (root / "dy" / "2").mkdir(parents=True)
+        (root / "dy" / "1" / "cover.jpg").write_bytes(b"y" * 1000)
+        (root / "dy" / "2" / "cover.jpg").write_bytes(b"y" * 1000)
+        (root / "dy" / "1" / "metadata.md").write_text("meta", encoding="utf-8")
+
+        stats = store.dedupe_tree(root)
+
+        assert stats.blob_count == 1
+        assert stats.reclaimed_bytes == 1000
+        assert (root / "dy" / "2" / "cover.jpg").read_bytes() == b"y" * 1000
+        assert (root / "dy" / "1" / "metadata.md").stat().st_nlink == 1
+
+
+class TestBlobDirPlacement:
+    """blob 目录位置校验（资源目录经 /media 公开访问）"""
+
+    def test_blob_dir_outside_assets_allowed(self, tmp_path):
+        ensure_blob_dir_private(tmp_path / "blobs", tmp_path / "assets")
+
+    def test_blob_dir_inside_assets_rejected(self, tmp_path):
+        with pytest.raises(BlobStoreError):
+            ensure_blob_dir_private(tmp_path / "assets" / ".blobs", tmp_path / "assets")
+        with pytest.raises(BlobStoreError):
+            ensure_blob_dir_private(tmp_path / "assets", tmp_path / "assets")
+
+    def test_legacy_blob_dir_rejected(self, tmp_path):
+        (tmp_path / "assets" / ".blobs").mkdir(parents=True)
+        with pytest.raises(BlobStoreError):
+            ensure_blob_dir_private(tmp_path / "blobs", tmp_path / "assets")
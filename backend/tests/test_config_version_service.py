@@ -0,0 +1,162 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2026 relakkes@gmail.com
+#
+# This file is part of MediaCrawlerPro-ContentRemixAgent project.
+# Repository: https://github.com/MediaCrawlerPro/MediaCrawlerPro-ContentRemixAgent/blob/main/backend/tests/test_config_version_service.py
+# GitHub: https://github.com/NanmiCoder
+# Licensed under NON-COMMERCIAL LEARNING LICENSE 1.1
+#
+# 声明：本代码仅供学习和研究目的使用。使用者应遵守以下原则：
+# 1. 不得用于任何商业用途。
+# 2. 使用时应遵守目标平台的使用条款和robots.txt规则。
+# 3. 不得进行大规模爬取或对平台造成运营干扰。
+# 4. 应合理控制请求频率，避免给目标平台带来不必要的负担。
+# 5. 不得用于任何非法或不当的用途。
+#
+# 详细许可条款请参阅项目根目录下的LICENSE文件。
+# 使用本代码即表示您同意遵守上述原则和LICENSE中的所有条款。
+
+
+
+"""
+配置版本服务测试（两个实例模拟两个 worker，共享内存中的版本表）
+"""
+import asyncio
+import time
+
+import pytest
+
+import services.config_version_service as config_version_module
+from agent import intent_classifier
+from services.config_version_service import INSIGHT_MODES_SCOPE, ConfigVersionService
+
+
+class _VersionTable:
+    def __init__(self):
+        self.rows = {INSIGHT_MODES_SCOPE: 0}
+        self.reads = 0
+
+
+class _Worker(ConfigVersionService):
+    """以内存字典代替 config_versions 表"""
+
+    def __init__(self, table: _VersionTable, poll_interval: float = 0.02):
+        super().__init__(poll_interval=poll_interval)
+        self.table = table
+
+    async def _fetch_versions(self):
+        self.table.reads += 1
+        return dict(self.table.rows)
+
+    async def _increment(self, scope):
+        self.table.rows[scope] = self.table.rows.get(scope, 0) + 1
+        return self.table.rows[scope]
+
+
+@pytest.fixture
+async def workers():
+    table = _VersionTable()
+    worker_a, worker_b = _Worker(table), _Worker(table)
+    await worker_a.start()
+    await worker_b.start()
+    yield table, worker_a, worker_b
+    await worker_a.aclose()
+    await worker_b.aclose()
+
+
+async def _wait_for(predicate, timeout: float = 1.0) -> None:
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        assert time.monotonic() < deadline, "condition not met in time"
+        await asyncio.sleep(0.01)
+
+
+async def test_bump_propagates_to_other_worker(workers):
+    """测试一个 worker 修改配置后，其他 worker 在轮询间隔内感知"""
+    _, worker_a, worker_b = workers
+    before_a = worker_a.generation(INSIGHT_MODES_SCOPE)
+    before_b = worker_b.generation(INSIGHT_MODES_SCOPE)
+
+    await worker_a.bump(INSIGHT_MODES_SCOPE)
+    assert worker_a.generation(INSIGHT_MODES_SCOPE) == before_a + 1
+
+    await _wait_for(lambda: worker_b.generation(INSIGHT_MODES_SCOPE) == before_b + 1)
+
+
+async def test_own_bump_does_not_hide_remote_bump(workers):
+    """测试本 worker 的 bump 不会吞掉其他 worker 尚未被轮询到的变更"""
+    _, worker_a, worker_b = workers
+    before_a = worker_a.generation(INSIGHT_MODES_SCOPE)
+
+    # B 的变更写入版本表后、A 轮询之前，A 也修改了配置
+    await worker_b.bump(INSIGHT_MODES_SCOPE)
+    await worker_a.bump(INSIGHT_MODES_SCOPE)
+    assert worker_a.generation(INSIGHT_MODES_SCOPE) == before_a + 1
+
+    # A 的轮询仍能看到版本变化并再次失效
+    await _wait_for(lambda: worker_a.generation(INSIGHT_MODES_SCOPE) == before_a + 2)
+
+
+async def test_steady_state_keeps_generation(workers):
+    """测试无变更时 generation 不变，缓存在轮询正常时不按 TTL 过期"""
+    table, worker_a, _ = workers
+    generation = worker_a.generation(INSIGHT_MODES_SCOPE)
+    reads = table.reads
+    await asyncio.sleep(0.1)
+
+    assert table.reads > reads
+    assert worker_a.generation(INSIGHT_MODES_SCOPE) == generation
+    assert worker_a.healthy
+    assert worker_a.is_fresh(INSIGHT_MODES_SCOPE, generation, filled_at=0, ttl=1)
+    assert not worker_a.is_fresh(INSIGHT_MODES_SCOPE, generation - 1, filled_at=time.time(), ttl=300)
+
+
+async def test_ttl_fallback_without_polling():
+    """测试未启动轮询时回退到 TTL"""
+    service = _Worker(_VersionTable())
+    assert not service.healthy
+    assert service.is_fresh(INSIGHT_MODES_SCOPE, 0, filled_at=time.time(), ttl=300)
+    assert not service.is_fresh(INSIGHT_MODES_SCOPE, 0, filled_at=time.time() - 301, ttl=300)
+
+
+async def test_subscribers_run_on_change(workers):
+    """测试变更回调在其他 worker 感知变更后执行"""
+    _, worker_a, worker_b = workers
+    reloads = []
+
+    async def reload():
+        reloads.append(worker_b.generation(INSIGHT_MODES_SCOPE))
+
+    worker_b.subscribe(INSIGHT_MODES_SCOPE, reload)
+    await worker_a.bump(INSIGHT_MODES_SCOPE)
+    await _wait_for(lambda: len(reloads) == 1)
+
+
+async def test_intent_keywords_reload_after_remote_change(workers, monkeypatch):
+    """测试意图关键词缓存在其他 worker 修改配置后重新加载，稳态下不重复查询"""
+    _, worker_a, worker_b = workers
+    monkeypatch.setattr(config_version_module, "_config_version_service", worker_b)
+    monkeypatch.setattr(intent_classifier, "_keywords_cache", {})
+    monkeypatch.setattr(intent_classifier, "_keywords_cache_timestamp", 0)
+    monkeypatch.setattr(intent_classifier, "_keywords_cache_generation", 0)
+
+    from services.insight_mode_service import insight_mode_service
+    loads = []
+
+    async def fake_keywords():
+        loads.append(1)
+        return {"analyze": {"zh": [f"v{len(loads)}"], "en": []}}
+
+    monkeypatch.setattr(insight_mode_service, "get_intent_keywords", fake_keywords)
+
+    first = await intent_classifier._get_intent_keywords_async()
+    assert await intent_classifier._get_intent_keywords_async() is first
+    assert len(loads) == 1
+
+    await worker_a.bump(INSIGHT_MODES_SCOPE)
+    generation = worker_b.generation(INSIGHT_MODES_SCOPE)
+    await _wait_for(lambda: worker_b.generation(INSIGHT_MODES_SCOPE) != generation)
+
+    refreshed = await intent_classifier._get_intent_keywords_async()
+    assert refreshed["analyze"]["zh"] == ["v2"]
+    assert len(loads) == 2
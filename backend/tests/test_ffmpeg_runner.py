@@ -0,0 +1,165 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2026 relakkes@gmail.com
+#
+# This file is part of MediaCrawlerPro-ContentRemixAgent project.
+# Repository: https://github.com/MediaCrawlerPro/MediaCrawlerPro-ContentRemixAgent/blob/main/backend/tests/test_ffmpeg_runner.py
+# GitHub: https://github.com/NanmiCoder
+# Licensed under NON-COMMERCIAL LEARNING LICENSE 1.1
+#
+# 声明：本代码仅供学习和研究目的使用。使用者应遵守以下原则：
+# 1. 不得用于任何商业用途。
+# 2. 使用时应遵守目标平台的使用条款和robots.txt规则。
+# 3. 不得进行大规模爬取或对平台造成运营干扰。
+# 4. 应合理控制请求频率，避免给目标平台带来不必要的负担。
+# 5. 不得用于任何非法或不当的用途。
+#
+# 详细许可条款请参阅项目根目录下的LICENSE文件。
+# 使用本代码即表示您同意遵守上述原则和LICENSE中的所有条款。
+
+
+"""
+异步 ffmpeg 执行层测试
+
+PATH 中放入一个假的 ffmpeg 脚本（记录参数，按参数回显 stdin / 休眠 / 失败），
+验证管道传输、超时终止和并发上限，不依赖真实 ffmpeg。
+"""
+import asyncio
+import io
+import json
+import os
+import sys
+import time
+import wave
+
+import pytest
+
+from config import settings
+from services.ffmpeg_runner import FFmpegError, can_pipe_input, pipe_output_format, run_ffmpeg
+from services.media_ai_source_service import MediaAISourceService, MediaSourceError
+
+
+FAKE_FFMPEG = f"""#!{sys.executable}
+import json, os, sys, time
+args = sys.argv[1:]
+with open(os.environ["FAKE_FFMPEG_LOG"], "a") as log:
+    log.write(json.dumps(args) + "\\n")
+if "SLEEP" in args:
+    time.sleep(float(args[args.index("SLEEP") + 1]))
+data = sys.stdin.buffer.read() if "pipe:0" in args else b""
+if "FAIL" in args or data == b"FAIL":
+    sys.stderr.write("Invalid data found when processing input\\n")
+    sys.exit(1)
+if args[-1] == "pipe:1":
+    sys.stdout.buffer.write(data or b"\\x01\\x00" * 1600)
+else:
+    with open(args[-1], "wb") as f:
+        f.write(b"OUT:" + data)
+"""
+
+
+@pytest.fixture
+def fake_ffmpeg(tmp_path, monkeypatch):
+    bin_dir = tmp_path / "bin"
+    bin_dir.mkdir()
+    script = bin_dir / "ffmpeg"
+    script.write_text(FAKE_FFMPEG)
+    script.chmod(0o755)
+    log = tmp_path / "ffmpeg.log"
+    log.touch()
+    monkeypatch.setenv("PATH", f"{bin_dir}{os.pathsep}{os.environ.get('PATH', '')}")
+    monkeypatch.setenv("FAKE_FFMPEG_LOG", str(log))
+
+    def calls():
+        return [json.loads(line) for line in log.read_text().splitlines()]
+
+    return calls
+
+
+def test_pipe_capabilities():
+    assert can_pipe_input(".wav") and can_pipe_input(".WEBM")
+    assert not can_pipe_input(".mp4") and not can_pipe_input(".bin")
+    assert pipe_output_format(".mp3") == "mp3"
+    assert pipe_output_format(".wav") is None
+
+
+async def test_streams_stdin_to_stdout(fake_ffmpeg):
+    result = await run_ffmpeg(["-i", "pipe:0", "pipe:1"], input_bytes=b"abc" * 100_000)
+
+    assert result.stdout == b"abc" * 100_000
+    assert fake_ffmpeg()[0][:5] == ["-y", "-hide_banner", "-loglevel", "error", "-i"]
+
+
+async def test_failure_carries_stderr(fake_ffmpeg):
+    with pytest.raises(FFmpegError) as exc_info:
+        await run_ffmpeg(["FAIL", "pipe:1"])
+
+    assert "Invalid data" in exc_info.value.stderr
+
+
+async def test_timeout_kills_process(fake_ffmpeg):
+    start = time.monotonic()
+    with pytest.raises(FFmpegError, match="超时"):
+        await run_ffmpeg(["SLEEP", "10", "pipe:1"], timeout=0.2)
+
+    assert time.monotonic() - start < 5
+
+
+async def test_concurrent_processes_are_capped(fake_ffmpeg, monkeypatch):
+    monkeypatch.setattr(settings, "FFMPEG_MAX_PROCESSES", 2)
+
+    start = time.monotonic()
+    await asyncio.gather(*(run_ffmpeg(["SLEEP", "0.3", "pipe:1"]) for _ in range(4)))
+
+    # 上限 2: 4 个各 0.3 秒的进程至少分两轮执行
+    assert time.monotonic() - start >= 0.55
+
+
+async def test_missing_ffmpeg(monkeypatch, tmp_path):
+    monkeypatch.setenv("PATH", str(tmp_path))
+
+    with pytest.raises(FFmpegError, match="未安装"):
+        await run_ffmpeg(["pipe:1"])
+
+
+async def test_trim_audio_clip_pipes_wav_in_and_out(fake_ffmpeg):
+    svc = MediaAISourceService()
+
+    data, name, content_type = await svc.trim_audio_clip(b"RIFF....", ".wav", start_seconds=5, duration_seconds=10)
+
+    args = fake_ffmpeg()[0]
+    assert args[args.index("-i") + 1] == "pipe:0"
+    assert args[-1] == "pipe:1"
+    with wave.open(io.BytesIO(data)) as wav:
+        assert wav.getframerate() == 16000
+        assert wav.readframes(wav.getnframes()) == b"RIFF...."
+    assert (name, content_type) == ("clip.wav", "audio/wav")
+
+
+async def test_mp4_input_falls_back_to_temp_file(fake_ffmpeg):
+    svc = MediaAISourceService()
+
+    await svc.extract_audio_to_wav(b"\x00\x00\x00\x18ftypmp42", ".mp4")
+
+    args = fake_ffmpeg()[0]
+    source = args[args.index("-i") + 1]
+    assert source.endswith("in.mp4")
+    assert not os.path.exists(source)  # 临时文件已清理
+
+
+async def test_change_audio_speed_output_modes(fake_ffmpeg):
+    svc = MediaAISourceService()
+
+    data, name, _ = await svc.change_audio_speed(b"mp3-bytes", ".mp3", speed=0.85, output_ext=".mp3")
+    assert data == b"mp3-bytes" and name == "speed.mp3"
+    assert fake_ffmpeg()[0][-3:] == ["-f", "mp3", "pipe:1"]
+
+    # wav 输出需要回写头部，改写临时文件
+    data, name, _ = await svc.change_audio_speed(b"mp3-bytes", ".mp3", speed=1.2, output_ext=".wav")
+    assert data == b"OUT:mp3-bytes" and name == "speed.wav"
+
+
+async def test_ffmpeg_failure_becomes_media_source_error(fake_ffmpeg):
+    svc = MediaAISourceService()
+
+    with pytest.raises(MediaSourceError, match="ffmpeg 裁剪视频失败: Invalid data"):
+        await svc.trim_video_clip(b"FAIL", ".webm")
@@ -0,0 +1,166 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2026 relakkes@gmail.com
+#
+# This file is part of MediaCrawlerPro-ContentRemixAgent project.
+# Repository: https://github.com/MediaCrawlerPro/MediaCrawlerPro-ContentRemixAgent/blob/main/backend/tests/test_http_clients.py
+# GitHub: https://github.com/NanmiCoder
+# Licensed under NON-COMMERCIAL LEARNING LICENSE 1.1
+#
+# 声明：本代码仅供学习和研究目的使用。使用者应遵守以下原则：
+# 1. 不得用于任何商业用途。
+# 2. 使用时应遵守目标平台的使用条款和robots.txt规则。
+# 3. 不得进行大规模爬取或对平台造成运营干扰。
+# 4. 应合理控制请求频率，避免给目标平台带来不必要的负担。
+# 5. 不得用于任何非法或不当的用途。
+#
+# 详细许可条款请参阅项目根目录下的LICENSE文件。
+# 使用本代码即表示您同意遵守上述原则和LICENSE中的所有条款。
+
+
+"""
+共享 HTTP 客户端池测试
+"""
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import httpx
+import pytest
+
+from services.http_clients import HttpClientRegistry
+
+
+@pytest.fixture
+def keepalive_server():
+    """本地 keep-alive HTTP 服务器"""
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, *args):
+            pass
+
+        def do_GET(self):
+            body = b"ok"
+            self.send_response(200)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_address[1]}/"
+    server.shutdown()
+
+
+class TestHttpClientRegistry:
+
+    async def test_same_upstream_shares_client(self):
+        registry = HttpClientRegistry()
+        assert registry.get("media") is registry.get("media")
+        assert registry.get("media") is not registry.get("syncso")
+        await registry.aclose_all()
+
+    async def test_unknown_upstream_raises(self):
+        registry = HttpClientRegistry()
+        with pytest.raises(ValueError):
+            registry.get("unknown")
+
+    async def test_sequential_requests_reuse_connection(self, keepalive_server):
+        registry = HttpClientRegistry()
+        client = registry.get("download_server")
+        for _ in range(5):
+            response = await client.get(keepalive_server)
+            assert response.text == "ok"
+        await registry.aclose_all()
+
+        metrics = registry.metrics()["download_server"]
+        assert metrics["requests"] == 5
+        assert metrics["connections_opened"] == 1
+        assert metrics["connections_reused"] == 4
+        assert metrics["latency_avg_ms"] > 0
+
+    async def test_aclose_all_recreates_client(self):
+        registry = HttpClientRegistry()
+        first = registry.get("voicv")
+        await registry.aclose_all()
+        assert first.is_closed
+        assert registry.get("voicv") is not first
+        await registry.aclose_all()
+
+
+@pytest.fixture
+def proxy_server():
+    """记录请求行的代理桩: 普通请求返回 "proxied"，CONNECT 一律拒绝"""
+    requests = []
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, *args):
+            pass
+
+        def _reply(self, status: int, body: bytes):
+            self.send_response(status)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_GET(self):
+            requests.append(f"GET {self.path}")
+            self._reply(200, b"proxied")
+
+        def do_CONNECT(self):
+            requests.append(f"CONNECT {self.path}")
+            self._reply(403, b"")
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_address[1]}", requests
+    server.shutdown()
+
+
+class TestEnvironmentProxy:
+    """自定义 transport 下仍使用环境变量代理"""
+
+    @pytest.fixture(autouse=True)
+    def clean_proxy_env(self, monkeypatch):
+        for name in ("HTTP_PROXY", "HTTPS_PROXY", "ALL_PROXY", "NO_PROXY"):
+            monkeypatch.delenv(name, raising=False)
+            monkeypatch.delenv(name.lower(), raising=False)
+
+    async def test_https_proxy_is_used(self, proxy_server, monkeypatch):
+        proxy_url, requests = proxy_server
+        monkeypatch.setenv("HTTPS_PROXY", proxy_url)
+        registry = HttpClientRegistry()
+        client = registry.get("media")
+
+        with pytest.raises(httpx.ProxyError):
+            await client.get("https://cdn.example.test/cover.jpg")
+        await registry.aclose_all()
+
+        assert requests == ["CONNECT cdn.example.test:443"]
+        assert registry.metrics()["media"]["errors"] == 1
+
+    async def test_http_proxy_is_used_and_instrumented(self, proxy_server, monkeypatch):
+        proxy_url, requests = proxy_server
+        monkeypatch.setenv("HTTP_PROXY", proxy_url)
+        registry = HttpClientRegistry()
+
+        response = await registry.get("voicv").get("http://api.example.test/v1/voices")
+        await registry.aclose_all()
+
+        assert response.text == "proxied"
+        assert requests == ["GET http://api.example.test/v1/voices"]
+        assert registry.metrics()["voicv"]["requests"] == 1
+
+    async def test_no_proxy_hosts_connect_directly(self, proxy_server, keepalive_server, monkeypatch):
+        proxy_url, requests = proxy_server
+        monkeypatch.setenv("HTTP_PROXY", proxy_url)
+        monkeypatch.setenv("NO_PROXY", "127.0.0.1")
+        registry = HttpClientRegistry()
+
+        response = await registry.get("download_server").get(keepalive_server)
+        await registry.aclose_all()
+
+        assert response.text == "ok"
+        assert requests == []
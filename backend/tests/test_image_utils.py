@@ -0,0 +1,224 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2026 relakkes@gmail.com
+#
+# This file is part of MediaCrawlerPro-ContentRemixAgent project.
+# Repository: https://github.com/MediaCrawlerPro/MediaCrawlerPro-ContentRemixAgent/blob/main/backend/tests/test_image_utils.py
+# GitHub: https://github.com/NanmiCoder
+# Licensed under NON-COMMERCIAL LEARNING LICENSE 1.1
+#
+# 声明：本代码仅供学习和研究目的使用。使用者应遵守以下原则：
+# 1. 不得用于任何商业用途。
+# 2. 使用时应遵守目标平台的使用条款和robots.txt规则。
+# 3. 不得进行大规模爬取或对平台造成运营干扰。
+# 4. 应合理控制请求频率，避免给目标平台带来不必要的负担。
+# 5. 不得用于任何非法或不当的用途。
+#
+# 详细许可条款请参阅项目根目录下的LICENSE文件。
+# 使用本代码即表示您同意遵守上述原则和LICENSE中的所有条款。
+
+
+"""
+图片压缩测试
+"""
+import asyncio
+import os
+import time
+from pathlib import Path
+
+import pytest
+from PIL import Image
+
+from config import settings
+from services import image_utils
+from services.image_utils import (
+    ImageProcessError,
+    compress_image_if_needed,
+    detect_image_format,
+    download_and_process_images,
+)
+
+
+@pytest.fixture
+def image_env(tmp_path, monkeypatch):
+    """线程池执行 + 临时缓存目录"""
+    monkeypatch.setattr(settings, "MULTIMODAL_IMAGE_WORKERS", 0)
+    monkeypatch.setattr(settings, "MULTIMODAL_IMAGE_CACHE_DIR", str(tmp_path / "cache"))
+    monkeypatch.setattr(settings, "ASSET_DEDUP_ENABLED", False)
+    image_utils.shutdown_image_workers()
+    yield tmp_path
+    image_utils.shutdown_image_workers()
+
+
+def _make_jpeg(path, size=(2400, 1600)) -> str:
+    Image.effect_noise(size, 80).convert("RGB").save(path, "JPEG", quality=95)
+    return str(path)
+
+
+class TestCompressImage:
+
+    async def test_small_image_untouched(self, image_env):
+        src = _make_jpeg(image_env / "small.jpg", (64, 64))
+        assert await compress_image_if_needed(src, max_size_bytes=10 * 1024 * 1024) == src
+
+    async def test_large_jpeg_resized(self, image_env):
+        src = _make_jpeg(image_env / "large.jpg")
+        out = await compress_image_if_needed(src, max_size_bytes=1024, max_dimension=800)
+        assert out.endswith("large_compressed.jpg")
+        assert max(Image.open(out).size) == 800
+
+    async def test_webp_output(self, image_env):
+        src = _make_jpeg(image_env / "large.jpg")
+        out = await compress_image_if_needed(src, max_size_bytes=1024, max_dimension=800, output_format="webp")
+        assert out.endswith(".webp")
+        assert detect_image_format(out)[0] == "image/webp"
+
+    async def test_compressed_variant_cached_by_source_hash(self, image_env, monkeypatch):
+        src = _make_jpeg(image_env / "a.jpg")
+        copy = image_env / "b.jpg"
+        copy.write_bytes((image_env / "a.jpg").read_bytes())
+
+        await compress_image_if_needed(src, max_size_bytes=1024, max_dimension=800)
+        # 缓存目录只保存索引条目，不另存压缩图字节
+        assert len(list((image_env / "cache").glob("*.json"))) == 1
+        assert not list((image_env / "cache").rglob("*.jpg"))
+
+        # 相同内容的另一份源图直接复用已有压缩结果，不再解码
+        opened = []
+        real_open = Image.open
+        monkeypatch.setattr(Image, "open", lambda *args, **kwargs: opened.append(args) or real_open(*args, **kwargs))
+        out = await compress_image_if_needed(str(copy), max_size_bytes=1024, max_dimension=800)
+        assert out.endswith("b_compressed.jpg")
+        assert (image_env / "b_compressed.jpg").read_bytes() == (image_env / "a_compressed.jpg").read_bytes()
+        assert opened == []
+
+    async def test_missing_variant_recompresses(self, image_env):
+        """索引记录的压缩图已被删除时按未命中处理"""
+        src = _make_jpeg(image_env / "a.jpg")
+        first = await compress_image_if_needed(src, max_size_bytes=1024, max_dimension=800)
+        Path(first).unlink()
+
+        out = await compress_image_if_needed(src, max_size_bytes=1024, max_dimension=800)
+        assert max(Image.open(out).size) == 800
+
+    async def test_index_entries_evicted(self, image_env, monkeypatch):
+        """索引条目数超过上限时按最近访问时间淘汰"""
+        monkeypatch.setattr(settings, "MULTIMODAL_IMAGE_CACHE_MAX_ENTRIES", 1)
+        await compress_image_if_needed(_make_jpeg(image_env / "a.jpg"), max_size_bytes=1024, max_dimension=800)
+        await compress_image_if_needed(_make_jpeg(image_env / "b.jpg"), max_size_bytes=1024, max_dimension=800)
+
+        assert len(list((image_env / "cache").glob("*.json"))) == 1
+
+    async def test_legacy_cache_shards_removed(self, image_env):
+        """旧版分片保存的压缩图字节在创建索引时清理"""
+        legacy = image_env / "cache" / "ab" / "ab12_800_85.jpg"
+        legacy.parent.mkdir(parents=True)
+        legacy.write_bytes(b"old")
+
+        await compress_image_if_needed(_make_jpeg(image_env / "a.jpg"), max_size_bytes=1024, max_dimension=800)
+        assert not legacy.parent.exists()
+
+
+class TestCompressImageWithBlobStore:
+    """启用去重时压缩结果只保存为一个 blob"""
+
+    @pytest.fixture
+    def blob_env(self, image_env, monkeypatch):
+        from services import blob_store
+
+        monkeypatch.setattr(settings, "ASSET_DEDUP_ENABLED", True)
+        monkeypatch.setattr(blob_store, "_blob_store", blob_store.ContentAddressedStore(
+            blob_dir=str(image_env / "blobs"), link_mode="hardlink",
+        ))
+        return image_env, blob_store.get_blob_store()
+
+    async def test_variant_linked_from_blob(self, blob_env):
+        from services.blob_store import write_asset_bytes
+
+        env, store = blob_env
+        payload = Path(_make_jpeg(env / "raw.jpg")).read_bytes()
+        write_asset_bytes(payload, env / "a" / "image.jpg")
+        write_asset_bytes(payload, env / "b" / "image.jpg")
+
+        first = await compress_image_if_needed(str(env / "a" / "image.jpg"), max_size_bytes=1024, max_dimension=800)
+        second = await compress_image_if_needed(str(env / "b" / "image.jpg"), max_size_bytes=1024, max_dimension=800)
+
+        assert os.path.samefile(first, second)
+        # 源图两份 + 压缩图两份，各只占一个 blob
+        assert store.stats().blob_count == 2
+
+    async def test_source_digest_from_blob_index(self, blob_env, monkeypatch):
+        """经 blob 存储写入的源图直接取索引摘要，不重新读取整个文件"""
+        from services import blob_store
+
+        env, _ = blob_env
+        target = env / "a" / "image.jpg"
+        ref = blob_store.write_asset_bytes(Path(_make_jpeg(env / "raw.jpg")).read_bytes(), target)
+        monkeypatch.setattr(blob_store, "_hash_file", lambda path: pytest.fail("file re-hashed"))
+
+        assert blob_store.file_digest(target) == ref.digest
+
+    async def test_collected_blob_recompresses(self, blob_env):
+        """压缩图 blob 被 gc 回收后按未命中处理"""
+        env, store = blob_env
+        src = env / "a" / "image.jpg"
+        store.put_bytes(Path(_make_jpeg(env / "raw.jpg")).read_bytes(), src)
+        first = await compress_image_if_needed(str(src), max_size_bytes=1024, max_dimension=800)
+        store.release(first)
+        store.gc()
+
+        out = await compress_image_if_needed(str(src), max_size_bytes=1024, max_dimension=800)
+        assert max(Image.open(out).size) == 800
+
+
+class TestDownloadAndProcessImages:
+    """批量下载：并发执行、保持输入顺序、单张失败隔离"""
+
+    @pytest.fixture
+    def fake_download(self, image_env, monkeypatch):
+        """按 URL 决定延迟与成败的下载桩: slow/fast 成功，broken 失败"""
+        monkeypatch.setattr(settings, "ASSETS_DIR", str(image_env / "assets"))
+        monkeypatch.setattr(settings, "MULTIMODAL_IMAGE_CONCURRENCY", 4)
+        delays = {"slow": 0.2, "fast": 0.0, "broken": 0.05}
+
+        async def download_image(url, save_dir, filename):
+            kind = url.rsplit("/", 1)[-1].split("-")[0]
+            await asyncio.sleep(delays[kind])
+            if kind == "broken":
+                raise ImageProcessError(f"Image download failed: {url}")
+            save_dir.mkdir(parents=True, exist_ok=True)
+            return _make_jpeg(save_dir / f"{filename}.jpg", (32, 32))
+
+        monkeypatch.setattr(image_utils, "download_image", download_image)
+
+    async def test_output_follows_input_order(self, fake_download):
+        urls = [
+            "https://img.example.com/slow-0",
+            "https://img.example.com/fast-1",
+            "https://img.example.com/slow-2",
+            "https://img.example.com/fast-3",
+        ]
+
+        started = time.perf_counter()
+        images = await download_and_process_images(urls, "xhs", "note1", max_images=4, compress=False)
+        elapsed = time.perf_counter() - started
+
+        assert [image.original_url for image in images] == urls
+        assert [image.local_path.rsplit("/", 1)[-1] for image in images] == [
+            "image_00.jpg", "image_01.jpg", "image_02.jpg", "image_03.jpg"
+        ]
+        # 两张慢图并发下载，总耗时接近单张而非两张之和
+        assert elapsed < 0.38
+
+    async def test_failed_image_does_not_drop_others(self, fake_download):
+        urls = [
+            "https://img.example.com/fast-0",
+            "https://img.example.com/broken-1",
+            "https://img.example.com/slow-2",
+            "https://img.example.com/broken-3",
+            "https://img.example.com/fast-4",
+        ]
+
+        images = await download_and_process_images(urls, "xhs", "note2", max_images=5, compress=False)
+
+        assert [image.original_url for image in images] == [urls[0], urls[2], urls[4]]
+        assert all(image.base64_data and image.mime_type == "image/jpeg" for image in images)
@@ -0,0 +1,104 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2026 relakkes@gmail.com
+#
+# This file is part of MediaCrawlerPro-ContentRemixAgent project.
+# Repository: https://github.com/MediaCrawlerPro/MediaCrawlerPro-ContentRemixAgent/blob/main/backend/tests/test_json_file_store.py
+# GitHub: https://github.com/NanmiCoder
+# Licensed under NON-COMMERCIAL LEARNING LICENSE 1.1
+#
+# 声明：本代码仅供学习和研究目的使用。使用者应遵守以下原则：
+# 1. 不得用于任何商业用途。
+# 2. 使用时应遵守目标平台的使用条款和robots.txt规则。
+# 3. 不得进行大规模爬取或对平台造成运营干扰。
+# 4. 应合理控制请求频率，避免给目标平台带来不必要的负担。
+# 5. 不得用于任何非法或不当的用途。
+#
+# 详细许可条款请参阅项目根目录下的LICENSE文件。
+# 使用本代码即表示您同意遵守上述原则和LICENSE中的所有条款。
+
+"""
+JSON 条目存储测试（分摊淘汰）
+"""
+import os
+import time
+
+from services.json_file_store import JsonFileStore
+
+
+def _make_store(tmp_path, **kwargs):
+    options = {"name": "Test cache", "ttl_seconds": 0, "max_entries": 0, "max_bytes": 0}
+    options.update(kwargs)
+    return JsonFileStore(tmp_path / "store", **options)
+
+
+def _count_scans(store, monkeypatch):
+    scans = []
+    real_evict = store.evict
+
+    def counting_evict():
+        scans.append(1)
+        return real_evict()
+
+    monkeypatch.setattr(store, "evict", counting_evict)
+    return scans
+
+
+class TestAmortizedEviction:
+    """写入时不逐次扫描目录"""
+
+    def test_writes_under_limit_scan_once(self, tmp_path, monkeypatch):
+        """测试未超限时只在首次写入扫描一次"""
+        store = _make_store(tmp_path, max_entries=100)
+        scans = _count_scans(store, monkeypatch)
+
+        for i in range(50):
+            store.write(f"k{i}", {"value": i})
+        # 覆盖已有条目不增加条目数
+        store.write("k0", {"value": "again"})
+
+        assert len(scans) == 1
+        assert len(store.list_entries()) == 50
+        assert store.read("k0")["value"] == "again"
+
+    def test_over_limit_evicts_to_low_water(self, tmp_path, monkeypatch):
+        """测试超限时淘汰到上限的 90%，之后的写入不再立即扫描"""
+        store = _make_store(tmp_path, max_entries=20)
+        scans = _count_scans(store, monkeypatch)
+
+        for i in range(21):
+            store.write(f"k{i:02d}", {"value": i})
+            os.utime(store.path(f"k{i:02d}"), (1000 + i, 1000 + i))
+
+        assert len(scans) == 2
+        remaining = store.list_entries()
+        assert len(remaining) == 18
+        # 最久未访问的条目先被淘汰
+        assert not store.path("k00").exists() and store.path("k20").exists()
+
+        store.write("k21", {"value": 21})
+        assert len(scans) == 2
+
+    def test_sweep_interval_triggers_rescan(self, tmp_path, monkeypatch):
+        """测试超过扫描间隔后重新全量扫描，清理其他进程写入的过期条目"""
+        store = _make_store(tmp_path, ttl_seconds=60, sweep_interval=0.05)
+        scans = _count_scans(store, monkeypatch)
+        store.write("a", {"value": 1})
+
+        stale = store.path("stale")
+        stale.write_text('{"created_at": 0}', encoding="utf-8")
+        os.utime(stale, (time.time() - 120, time.time() - 120))
+        time.sleep(0.06)
+        store.write("b", {"value": 2})
+
+        assert len(scans) == 2
+        assert not stale.exists()
+
+    def test_delete_keeps_estimate(self, tmp_path):
+        """测试删除条目后估计值同步减少"""
+        store = _make_store(tmp_path, max_entries=2)
+        store.write("a", {"value": 1})
+        store.write("b", {"value": 2})
+        store.delete("a")
+        store.write("c", {"value": 3})
+
+        assert store.read("b") is not None and store.read("c") is not None
@@ -0,0 +1,81 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2026 relakkes@gmail.com
+#
+# This file is part of MediaCrawlerPro-ContentRemixAgent project.
+# Repository: https://github.com/MediaCrawlerPro/MediaCrawlerPro-ContentRemixAgent/blob/main/backend/tests/test_keyword_matcher.py
+# GitHub: https://github.com/NanmiCoder
+# Licensed under NON-COMMERCIAL LEARNING LICENSE 1.1
+#
+# 声明：本代码仅供学习和研究目的使用。使用者应遵守以下原则：
+# 1. 不得用于任何商业用途。
+# 2. 使用时应遵守目标平台的使用条款和robots.txt规则。
+# 3. 不得进行大规模爬取或对平台造成运营干扰。
+# 4. 应合理控制请求频率，避免给目标平台带来不必要的负担。
+# 5. 不得用于任何非法或不当的用途。
+#
+# 详细许可条款请参阅项目根目录下的LICENSE文件。
+# 使用本代码即表示您同意遵守上述原则和LICENSE中的所有条款。
+
+
+
+"""
+多关键词匹配与 TTS 提示词检测测试
+"""
+import random
+
+from services import tts_expression_service as tts
+from utils.keyword_matcher import KeywordMatcher
+
+
+class TestKeywordMatcher:
+    """Aho–Corasick 匹配器测试"""
+
+    def test_overlapping_and_suffix_keywords(self):
+        """测试重叠/后缀关键词都能命中"""
+        matcher = KeywordMatcher(["he", "she", "his", "hers", "上气不接下气", "气"])
+        assert matcher.find("ushers") == {"she", "he", "hers"}
+        assert matcher.find("跑得上气不接下气") == {"上气不接下气", "气"}
+        assert matcher.find("") == frozenset()
+
+    def test_matches_naive_substring_search(self):
+        """测试与逐个子串查找结果一致"""
+        keywords = ["a", "ab", "bab", "bc", "bca", "c", "caa", "哈", "哈哈", "aaa"]
+        matcher = KeywordMatcher(keywords)
+        rng = random.Random(0)
+        for _ in range(2000):
+            text = "".join(rng.choice("abc哈x") for _ in range(rng.randint(0, 16)))
+            assert matcher.find(text) == {kw for kw in keywords if kw in text}
+
+
+class TestHintDetection:
+    """TTS 提示词检测测试"""
+
+    def test_detectors_follow_table_order(self):
+        """测试多个标签命中时按提示词表顺序取第一个"""
+        text = "哈哈，天哪太好笑了"
+        hits = tts._scan_hints(text)
+        effect = tts._detect_effect_tag(text, allowed_tags=set(tts._AUTO_EFFECT_TAGS), hits=hits)
+        assert effect == "(laughing)"
+        assert tts._detect_effect_tag(text, allowed_tags={"(gasping)"}) == "(gasping)"
+
+    def test_case_insensitive_english_hints(self):
+        """测试英文提示词大小写不敏感"""
+        assert tts._detect_tone_tag("Please WHISPERING now", allowed_tags={"(whispering)"}) == "(whispering)"
+        assert tts.detect_sentence_emotion("This is AMAZING") == "(excited)"
+
+    def test_emotion_scores_count_distinct_keywords(self):
+        """测试情绪打分按命中的不同关键词计数"""
+        assert tts.detect_sentence_emotion("真的很难过，也很伤心，还有点担心") == "(sad)"
+        assert tts.detect_sentence_emotion("为什么？") == "(curious)"
+        assert tts.detect_sentence_emotion("今天天气晴") == "(calm)"
+
+    def test_tsk_hints_fallback(self):
+        """测试嫌弃类提示词回退到 groaning"""
+        assert tts._detect_effect_tag("这也太离谱了", allowed_tags={"(groaning)", "(breath)"}) == "(groaning)"
+        assert tts._detect_effect_tag("这也太离谱了", allowed_tags={"(breath)"}) == "(breath)"
+
+    def test_inline_tags_classified_once(self):
+        """测试句内标签分类与规范化"""
+        inline = tts._extract_inline_tags("(Happy) 你好 (WHISPERING) 呀 (break) (unknown)")
+        assert inline == {"emotions": ["(happy)"], "tones": ["(whispering)"], "effects": ["(breath)"]}
+        assert tts._sanitize_tagged_text("你好 (unknown) (sad)。") == "(sad) 你好 。"
@@ -0,0 +1,161 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2026 relakkes@gmail.com
+#
+# This file is part of MediaCrawlerPro-ContentRemixAgent project.
+# Repository: https://github.com/MediaCrawlerPro/MediaCrawlerPro-ContentRemixAgent/blob/main/backend/tests/test_lipsync_poller.py
+# GitHub: https://github.com/NanmiCoder
+# Licensed under NON-COMMERCIAL LEARNING LICENSE 1.1
+#
+# 声明：本代码仅供学习和研究目的使用。使用者应遵守以下原则：
+# 1. 不得用于任何商业用途。
+# 2. 使用时应遵守目标平台的使用条款和robots.txt规则。
+# 3. 不得进行大规模爬取或对平台造成运营干扰。
+# 4. 应合理控制请求频率，避免给目标平台带来不必要的负担。
+# 5. 不得用于任何非法或不当的用途。
+#
+# 详细许可条款请参阅项目根目录下的LICENSE文件。
+# 使用本代码即表示您同意遵守上述原则和LICENSE中的所有条款。
+
+
+"""
+Lipsync 服务端轮询器测试
+"""
+import asyncio
+
+import pytest
+
+from services.lipsync_poller import LipsyncPoller
+from services.syncso_client import SyncsoClientError
+
+
+class FakeSyncso:
+    """按预设序列返回任务状态的 Sync.so 客户端"""
+
+    def __init__(self, statuses):
+        self.statuses = {gid: list(seq) for gid, seq in statuses.items()}
+        self.calls = []
+
+    async def get_generation(self, generation_id, timeout=None):
+        self.calls.append(generation_id)
+        seq = self.statuses[generation_id]
+        item = seq.pop(0) if len(seq) > 1 else seq[0]
+        if isinstance(item, Exception):
+            raise item
+        status, output_url = item
+        return {"id": generation_id, "status": status, "outputUrl": output_url}
+
+
+class FakeStore:
+    def __init__(self):
+        self.upserts = []
+
+    async def upsert_lipsync_result(self, user_id, data):
+        self.upserts.append((user_id, dict(data)))
+
+
+def make_poller(statuses, **kwargs):
+    options = {
+        "min_interval": 0.01,
+        "max_interval": 0.04,
+        "backoff": 2.0,
+        "timeout": 5,
+        "request_timeout": 1,
+        "concurrency": 2,
+    }
+    options.update(kwargs)
+    client = FakeSyncso(statuses)
+    store = FakeStore()
+    return LipsyncPoller(client=client, store=store, **options), client, store
+
+
+async def collect(poller, ids):
+    return [event async for event in poller.watch(ids)]
+
+
+async def test_completion_is_persisted_and_pushed_to_all_subscribers():
+    poller, client, store = make_poller({
+        "g1": [("PENDING", ""), ("PROCESSING", ""), ("PROCESSING", ""), ("COMPLETED", "https://cdn/out.mp4")],
+    })
+    poller.track("g1", "u1", {"model": "lipsync-2", "video_url": "v"})
+
+    first, second = await asyncio.wait_for(
+        asyncio.gather(collect(poller, ["g1"]), collect(poller, ["g1"])),
+        timeout=5,
+    )
+
+    assert first == second
+    assert [event["status"] for event in first] == ["PENDING", "PROCESSING", "COMPLETED"]
+    assert first[-1]["done"] and first[-1]["output_url"] == "https://cdn/out.mp4"
+    # 订阅者数量不影响上游请求数
+    assert client.calls == ["g1"] * 4
+    assert [data["status"] for _, data in store.upserts] == ["PROCESSING", "COMPLETED"]
+    assert store.upserts[-1] == ("u1", {
+        "model": "lipsync-2",
+        "video_url": "v",
+        "generation_id": "g1",
+        "status": "COMPLETED",
+        "output_url": "https://cdn/out.mp4",
+    })
+    assert poller.get("g1").payload()["outputUrl"] == "https://cdn/out.mp4"
+    assert poller.snapshot()["tracked"] == 0
+
+
+async def test_interval_backs_off_while_unchanged_and_resets_on_change():
+    poller, _, _ = make_poller({"g1": [("PENDING", "")]})
+    poller.track("g1")
+    job = poller.get("g1")
+
+    intervals = []
+    for _ in range(4):
+        await poller._poll(job)
+        intervals.append(job.interval)
+    assert intervals == pytest.approx([0.02, 0.04, 0.04, 0.04])
+
+    poller.client.statuses["g1"] = [("PROCESSING", "")]
+    await poller._poll(job)
+    assert job.interval == pytest.approx(0.01)
+    await poller.aclose()
+
+
+async def test_upstream_errors_back_off_without_dropping_job():
+    poller, client, store = make_poller({
+        "g1": [SyncsoClientError("boom"), SyncsoClientError("boom"), ("COMPLETED", "out")],
+    })
+    poller.track("g1", "u1")
+
+    events = await asyncio.wait_for(collect(poller, ["g1"]), timeout=5)
+
+    assert events[-1]["status"] == "COMPLETED"
+    assert len(client.calls) == 3
+    assert poller.snapshot()["errors"] == 2
+    assert store.upserts[-1][1]["status"] == "COMPLETED"
+
+
+async def test_refresh_unknown_generation_queries_once_and_tracks():
+    poller, client, store = make_poller({
+        "done": [("COMPLETED", "out")],
+        "running": [("PROCESSING", ""), ("PROCESSING", ""), ("COMPLETED", "out2")],
+    })
+
+    job = await poller.refresh("done", "u1")
+    assert job.done and job.output_url == "out"
+    await poller.refresh("done")
+    assert client.calls == ["done"]
+    # 已到终态的未知任务不进入轮询，查询时直接落库
+    assert store.upserts == [("u1", {"generation_id": "done", "status": "COMPLETED", "output_url": "out"})]
+
+    job = await poller.refresh("running", "u1")
+    assert not job.done
+    events = await asyncio.wait_for(collect(poller, ["running"]), timeout=5)
+    assert events[-1]["status"] == "COMPLETED"
+
+
+async def test_job_times_out_and_is_not_cached():
+    poller, _, _ = make_poller({"g1": [("PROCESSING", "")]}, timeout=0.05)
+    poller.track("g1", status="PROCESSING")
+
+    events = await asyncio.wait_for(collect(poller, ["g1"]), timeout=5)
+
+    assert events[-1]["timed_out"] and events[-1]["done"]
+    assert events[-1]["status"] == "PROCESSING"
+    assert poller.get("g1") is None
@@ -0,0 +1,215 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2026 relakkes@gmail.com
+#
+# This file is part of MediaCrawlerPro-ContentRemixAgent project.
+# Repository: https://github.com/MediaCrawlerPro/MediaCrawlerPro-ContentRemixAgent/blob/main/backend/tests/test_media_streaming.py
+# GitHub: https://github.com/NanmiCoder
+# Licensed under NON-COMMERCIAL LEARNING LICENSE 1.1
+#
+# 声明：本代码仅供学习和研究目的使用。使用者应遵守以下原则：
+# 1. 不得用于任何商业用途。
+# 2. 使用时应遵守目标平台的使用条款和robots.txt规则。
+# 3. 不得进行大规模爬取或对平台造成运营干扰。
+# 4. 应合理控制请求频率，避免给目标平台带来不必要的负担。
+# 5. 不得用于任何非法或不当的用途。
+#
+# 详细许可条款请参阅项目根目录下的LICENSE文件。
+# 使用本代码即表示您同意遵守上述原则和LICENSE中的所有条款。
+
+
+"""
+媒体素材落盘下载 + 流式 multipart 上传测试（本地桩服务器）
+"""
+import email
+import email.policy
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from config import settings
+from services.media_ai_source_service import MediaAISourceService, MediaSourceError
+from services.multipart_stream import FilePart, MultipartStream
+from services.syncso_client import SyncsoClient
+from services.voicv_client import VoicvClient
+
+
+VIDEO = bytes(range(256)) * 4096  # 1 MiB
+AUDIO = b"ID3" + b"\x00" * 50_000
+
+
+class MediaStub:
+    """同时模拟素材源站与 Sync.so / Voicv 上传接口"""
+
+    def __init__(self):
+        self.uploads = []
+        self.server = None
+
+    @property
+    def base_url(self) -> str:
+        return f"http://127.0.0.1:{self.server.server_address[1]}"
+
+    def handler(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, *args):
+                pass
+
+            def _send(self, status: int, body: bytes, content_type: str):
+                self.send_response(status)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def do_GET(self):
+                if self.path == "/video.mp4":
+                    self._send(200, VIDEO, "video/mp4")
+                elif self.path == "/login":
+                    self._send(200, b"<!DOCTYPE html><html>login</html>", "text/html")
+                else:
+                    self._send(404, b"", "text/plain")
+
+            def do_POST(self):
+                length = int(self.headers.get("Content-Length", 0))
+                body = self.rfile.read(length)
+                stub.uploads.append({
+                    "path": self.path,
+                    "headers": dict(self.headers),
+                    "body": body,
+                })
+                if self.path == "/generate":
+                    payload = {"id": "gen-1", "status": "PENDING"}
+                    self._send(201, json.dumps(payload).encode(), "application/json")
+                else:
+                    payload = {"code": 200, "data": {"voiceId": "voice-1"}}
+                    self._send(200, json.dumps(payload).encode(), "application/json")
+
+        return Handler
+
+    def __enter__(self):
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), self.handler())
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *exc):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+def parse_multipart(upload: dict) -> dict:
+    """解析桩服务器收到的 multipart 请求体 -> {name: (filename, content_type, payload)}"""
+    raw = f"Content-Type: {upload['headers']['Content-Type']}\r\n\r\n".encode() + upload["body"]
+    message = email.message_from_bytes(raw, policy=email.policy.HTTP)
+    parts = {}
+    for part in message.iter_parts():
+        name = part.get_param("name", header="content-disposition")
+        parts[name] = (part.get_filename(), part.get_content_type(), part.get_payload(decode=True))
+    return parts
+
+
+@pytest.fixture
+def stub():
+    with MediaStub() as server:
+        yield server
+
+
+async def test_download_to_temp_streams_to_disk_and_cleans_up(stub):
+    svc = MediaAISourceService()
+
+    async with svc.download_to_temp(f"{stub.base_url}/video.mp4", max_bytes=2 * len(VIDEO)) as (path, name, ctype):
+        assert path.read_bytes() == VIDEO
+        assert name == "video.mp4"
+        assert ctype == "video/mp4"
+        temp_path = path
+
+    assert not temp_path.exists()
+
+
+async def test_download_to_temp_enforces_limit_while_streaming(stub, tmp_path, monkeypatch):
+    monkeypatch.setattr("tempfile.tempdir", str(tmp_path))
+    svc = MediaAISourceService()
+
+    with pytest.raises(MediaSourceError, match="超过限制"):
+        async with svc.download_to_temp(f"{stub.base_url}/video.mp4", max_bytes=len(VIDEO) // 2):
+            pass
+
+    assert list(tmp_path.iterdir()) == []
+
+
+async def test_download_to_temp_rejects_html(stub):
+    svc = MediaAISourceService()
+
+    with pytest.raises(MediaSourceError, match="不是媒体文件"):
+        async with svc.download_to_temp(f"{stub.base_url}/login", max_bytes=0):
+            pass
+
+
+async def test_multipart_stream_length_matches_body(tmp_path):
+    video = tmp_path / "v.mp4"
+    video.write_bytes(VIDEO)
+    body = MultipartStream(
+        files=[
+            FilePart("video", "v.mp4", "video/mp4", path=video),
+            FilePart("audio", "a.mp3", "audio/mpeg", data=AUDIO),
+        ],
+        fields={"model": "lipsync-2"},
+        read_size=64 * 1024,
+    )
+
+    chunks = [chunk async for chunk in body]
+
+    assert sum(len(chunk) for chunk in chunks) == body.content_length
+    # 磁盘文件按块读取，单块不超过 read_size（内存字节整段发送）
+    assert max(len(chunk) for chunk in chunks if chunk != AUDIO) <= 64 * 1024
+    # 可重复迭代（httpx 重发请求时需要）
+    assert b"".join([chunk async for chunk in body]) == b"".join(chunks)
+
+
+async def test_syncso_create_generation_uploads_from_disk(stub, tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "SYNCSO_BASE_URL", stub.base_url)
+    monkeypatch.setattr(settings, "SYNCSO_API_KEY", "test-key")
+    video = tmp_path / "input.mp4"
+    audio = tmp_path / "input.mp3"
+    video.write_bytes(VIDEO)
+    audio.write_bytes(AUDIO)
+
+    result = await SyncsoClient().create_generation(
+        video_filename="input.mp4",
+        video_content_type="video/mp4",
+        audio_filename="input.mp3",
+        audio_content_type="audio/mpeg",
+        model="lipsync-2",
+        video_path=video,
+        audio_path=audio,
+    )
+
+    assert result["generation_id"] == "gen-1"
+    upload = stub.uploads[0]
+    assert upload["headers"]["x-api-key"] == "test-key"
+    assert "Transfer-Encoding" not in upload["headers"]
+    parts = parse_multipart(upload)
+    assert parts["video"] == ("input.mp4", "video/mp4", VIDEO)
+    assert parts["audio"] == ("input.mp3", "audio/mpeg", AUDIO)
+    assert parts["model"][2] == b"lipsync-2"
+
+
+async def test_voicv_clone_voice_uploads_from_disk(stub, tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "VOICV_BASE_URL", stub.base_url)
+    monkeypatch.setattr(settings, "VOICV_API_KEY", "test-key")
+    audio = tmp_path / "voice.mp3"
+    audio.write_bytes(AUDIO)
+
+    result = await VoicvClient().clone_voice(
+        filename="voice.mp3",
+        content_type="audio/mpeg",
+        audio_path=audio,
+    )
+
+    assert result["voice_id"] == "voice-1"
+    parts = parse_multipart(stub.uploads[0])
+    assert parts["voice"] == ("voice.mp3", "audio/mpeg", AUDIO)
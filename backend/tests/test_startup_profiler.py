@@ -0,0 +1,143 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2026 relakkes@gmail.com
+#
+# This file is part of MediaCrawlerPro-ContentRemixAgent project.
+# Repository: https://github.com/MediaCrawlerPro/MediaCrawlerPro-ContentRemixAgent/blob/main/backend/tests/test_startup_profiler.py
+# GitHub: https://github.com/NanmiCoder
+# Licensed under NON-COMMERCIAL LEARNING LICENSE 1.1
+#
+# 声明：本代码仅供学习和研究目的使用。使用者应遵守以下原则：
+# 1. 不得用于任何商业用途。
+# 2. 使用时应遵守目标平台的使用条款和robots.txt规则。
+# 3. 不得进行大规模爬取或对平台造成运营干扰。
+# 4. 应合理控制请求频率，避免给目标平台带来不必要的负担。
+# 5. 不得用于任何非法或不当的用途。
+#
+# 详细许可条款请参阅项目根目录下的LICENSE文件。
+# 使用本代码即表示您同意遵守上述原则和LICENSE中的所有条款。
+
+
+
+"""
+启动阶段编排测试（并发分组、失败取消、后台阶段就绪状态）
+"""
+import asyncio
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+from utils.startup_profiler import StartupProfiler
+
+
+class TestStartupPhases:
+    """前台阶段分组"""
+
+    async def test_gather_runs_phases_concurrently(self):
+        profiler = StartupProfiler()
+
+        async def step(value):
+            await asyncio.sleep(0.1)
+            return value
+
+        started = time.perf_counter()
+        results = await profiler.gather(a=step(1), b=step(2), c=step(3))
+        elapsed = time.perf_counter() - started
+
+        assert results == {"a": 1, "b": 2, "c": 3}
+        assert elapsed < 0.25
+        snapshot = profiler.snapshot()
+        assert snapshot["ready"] is True
+        assert all(phase["state"] == "ok" for phase in snapshot["phases"].values())
+        assert all(phase["seconds"] >= 0.09 for phase in snapshot["phases"].values())
+
+    async def test_failure_cancels_sibling_phases(self):
+        profiler = StartupProfiler()
+        slow_finished = False
+
+        async def slow():
+            nonlocal slow_finished
+            await asyncio.sleep(1)
+            slow_finished = True
+
+        async def broken():
+            await asyncio.sleep(0.01)
+            raise RuntimeError("db down")
+
+        with pytest.raises(RuntimeError, match="db down"):
+            await profiler.gather(slow=slow(), broken=broken())
+
+        phases = profiler.snapshot()["phases"]
+        assert phases["broken"]["state"] == "failed"
+        assert phases["broken"]["error"] == "db down"
+        assert phases["slow"]["state"] == "cancelled"
+        assert slow_finished is False
+
+    async def test_report_lists_every_phase(self):
+        profiler = StartupProfiler()
+        await profiler.gather(migrations=asyncio.sleep(0), memory=asyncio.sleep(0))
+        profiler.mark_serving()
+
+        report = profiler.report()
+        assert report.startswith("Startup timing: serving after")
+        assert "migrations" in report and "memory" in report
+
+
+class TestBackgroundPhases:
+    """后台阶段与就绪状态"""
+
+    async def test_not_ready_until_background_phase_finishes(self):
+        profiler = StartupProfiler()
+        release = asyncio.Event()
+        task = profiler.start_background("asr_preload", release.wait())
+
+        profiler.mark_serving()
+        assert profiler.ready is False
+        assert profiler.snapshot()["phases"]["asr_preload"]["state"] == "running"
+
+        release.set()
+        await task
+        snapshot = profiler.snapshot()
+        assert snapshot["ready"] is True
+        assert snapshot["ready_after_s"] >= snapshot["serving_after_s"]
+
+    async def test_background_failure_is_recorded_not_raised(self):
+        profiler = StartupProfiler()
+
+        async def broken():
+            raise RuntimeError("model missing")
+
+        await profiler.start_background("asr_preload", broken())
+
+        phase = profiler.snapshot()["phases"]["asr_preload"]
+        assert phase["state"] == "failed"
+        assert phase["background"] is True
+        assert profiler.ready is True
+
+    async def test_aclose_cancels_pending_background_phases(self):
+        profiler = StartupProfiler()
+        task = profiler.start_background("asr_preload", asyncio.sleep(10))
+        await asyncio.sleep(0)
+
+        await profiler.aclose()
+
+        assert task.cancelled()
+        assert profiler.snapshot()["phases"]["asr_preload"]["state"] == "cancelled"
+
+
+def test_app_import_does_not_load_agent_factory():
+    """导入应用入口时不连带加载 Agent 工厂及 LLM 提供商集成包"""
+    code = (
+        "import sys, api.main; "
+        "print('agent.remix_agent' in sys.modules, 'langchain_openai' in sys.modules)"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=Path(__file__).resolve().parents[1],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    assert result.stdout.split()[-2:] == ["False", "False"]
@@ -0,0 +1,190 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2026 relakkes@gmail.com
+#
+# This file is part of MediaCrawlerPro-ContentRemixAgent project.
+# Repository: https://github.com/MediaCrawlerPro/MediaCrawlerPro-ContentRemixAgent/blob/main/backend/tests/test_tts_cache.py
+# GitHub: https://github.com/NanmiCoder
+# Licensed under NON-COMMERCIAL LEARNING LICENSE 1.1
+#
+# 声明：本代码仅供学习和研究目的使用。使用者应遵守以下原则：
+# 1. 不得用于任何商业用途。
+# 2. 使用时应遵守目标平台的使用条款和robots.txt规则。
+# 3. 不得进行大规模爬取或对平台造成运营干扰。
+# 4. 应合理控制请求频率，避免给目标平台带来不必要的负担。
+# 5. 不得用于任何非法或不当的用途。
+#
+# 详细许可条款请参阅项目根目录下的LICENSE文件。
+# 使用本代码即表示您同意遵守上述原则和LICENSE中的所有条款。
+
+
+
+"""
+TTS 两级缓存测试
+"""
+import os
+import time
+from contextlib import asynccontextmanager
+
+import pytest
+
+import services.tts_audio_service as tts_audio_service
+import services.tts_expression_service as tts_expression_service
+from services.tts_audio_service import synthesize_tts_audio
+from services.tts_cache import AUDIO_LEVEL, TAGS_LEVEL, TTSCache
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return TTSCache(cache_dir=str(tmp_path / "tts"), ttl_seconds=3600, max_entries=0, enabled=True)
+
+
+class TestTTSCache:
+    """缓存存储测试"""
+
+    def test_tagged_text_roundtrip(self, cache):
+        """测试标注文本写入后命中"""
+        key = cache.tag_key("大家好。", "speech", ["(confident)"], [], "ChatOpenAI:gpt")
+        cache.put_tagged_text(key, "(happy)大家好。")
+        assert cache.get_tagged_text(key) == "(happy)大家好。"
+
+    def test_tag_key_covers_all_inputs(self, cache):
+        """测试风格、偏好、模型任一变化都生成不同的键"""
+        base = ("大家好。", "speech", ["(confident)"], ["(breath)"], "ChatOpenAI:gpt")
+        keys = {
+            cache.tag_key(*base),
+            cache.tag_key("大家好！", *base[1:]),
+            cache.tag_key(base[0], "calm", *base[2:]),
+            cache.tag_key(*base[:2], [], *base[3:]),
+            cache.tag_key(*base[:3], [], base[4]),
+            cache.tag_key(*base[:4], "ChatAnthropic:claude"),
+        }
+        assert len(keys) == 6
+        assert cache.audio_key("t", "v1", 0.85, "mp3") != cache.audio_key("t", "v1", 1.0, "mp3")
+        assert cache.audio_key("t", "v1", 0.85, "mp3") != cache.audio_key("t", "v2", 0.85, "mp3")
+
+    def test_audio_miss_when_asset_removed(self, cache, tmp_path):
+        """测试音频资源文件被删除后视为未命中"""
+        asset = tmp_path / "tts_1.mp3"
+        asset.write_bytes(b"ID3")
+        key = cache.audio_key("t", "v1", 0.85, "mp3")
+        cache.put_audio(key, {"audio_url": "/media/uploads/tts_1.mp3", "audio_local_path": str(asset)})
+        assert cache.get_audio(key)["audio_url"] == "/media/uploads/tts_1.mp3"
+
+        asset.unlink()
+        assert cache.get_audio(key) is None
+        assert list((cache.cache_dir / AUDIO_LEVEL).glob("*.json")) == []
+
+    def test_expired_entry_removed(self, tmp_path):
+        """测试过期条目失效"""
+        cache = TTSCache(cache_dir=str(tmp_path), ttl_seconds=60, max_entries=0, enabled=True)
+        key = cache.tag_key("a", "speech", [], [], "m")
+        cache.put_tagged_text(key, "(happy)a")
+        path = cache.cache_dir / TAGS_LEVEL / f"{key}.json"
+        path.write_text(
+            '{"tagged_text": "(happy)a", "created_at": %f}' % (time.time() - 120),
+            encoding="utf-8",
+        )
+
+        assert cache.get_tagged_text(key) is None
+        assert not path.exists()
+
+    def test_evict_lru_per_level(self, tmp_path):
+        """测试每级独立按最近访问时间淘汰"""
+        cache = TTSCache(cache_dir=str(tmp_path), ttl_seconds=0, max_entries=2, enabled=True)
+        keys = [cache.tag_key(text, "speech", [], [], "m") for text in ("a", "b", "c")]
+        for i, key in enumerate(keys[:2]):
+            cache.put_tagged_text(key, f"tagged-{i}")
+            path = cache.cache_dir / TAGS_LEVEL / f"{key}.json"
+            os.utime(path, (time.time() - 100 + i, time.time() - 100 + i))
+
+        # 访问 a 使其成为最近使用
+        assert cache.get_tagged_text(keys[0]) == "tagged-0"
+        cache.put_tagged_text(keys[2], "tagged-2")
+
+        assert cache.get_tagged_text(keys[0]) == "tagged-0"
+        assert cache.get_tagged_text(keys[1]) is None
+        assert cache.get_tagged_text(keys[2]) == "tagged-2"
+
+    def test_disabled_is_noop(self, tmp_path):
+        """测试关闭缓存时不读写"""
+        cache = TTSCache(cache_dir=str(tmp_path), enabled=False)
+        key = cache.tag_key("a", "speech", [], [], "m")
+        cache.put_tagged_text(key, "(happy)a")
+        assert cache.get_tagged_text(key) is None
+        assert not (tmp_path / TAGS_LEVEL).exists()
+
+
+class _FakeVoicv:
+    def __init__(self):
+        self.calls = 0
+
+    async def text_to_speech(self, *, voice_id, text, audio_format):
+        self.calls += 1
+        return {"audio_url": f"https://cdn.example/{self.calls}.mp3", "voice_id": voice_id, "format": audio_format}
+
+
+class _FakeSource:
+    def __init__(self, assets_dir):
+        self.assets_dir = assets_dir
+        self.speed_calls = 0
+
+    async def download_bytes(self, url, *, max_bytes=None):
+        return b"AUDIO", "audio.mp3", "audio/mpeg"
+
+    async def change_audio_speed(self, payload, *, input_ext, speed, output_ext):
+        self.speed_calls += 1
+        return payload + b"-fast", f"speed{output_ext}", "audio/mpeg"
+
+    def persist_bytes(self, payload, *, prefix, ext, content_type):
+        path = self.assets_dir / f"{prefix}_{len(list(self.assets_dir.iterdir()))}{ext}"
+        path.write_bytes(payload)
+        return {"url": f"/media/uploads/{path.name}", "path": str(path)}
+
+
+@asynccontextmanager
+async def _no_slot():
+    yield
+
+
+async def test_synthesize_reuses_cached_audio(cache, tmp_path, monkeypatch):
+    """测试相同文本/音色/语速第二次直接复用落盘音频"""
+    monkeypatch.setattr(tts_audio_service, "get_tts_cache", lambda: cache)
+    assets = tmp_path / "uploads"
+    assets.mkdir()
+    client, source = _FakeVoicv(), _FakeSource(assets)
+    kwargs = dict(
+        voice_id="v1", text="(happy)大家好。", audio_format="mp3", speed=0.85,
+        slot=lambda resource: _no_slot(), client=client, source_svc=source,
+    )
+
+    first = await synthesize_tts_audio(**kwargs)
+    second = await synthesize_tts_audio(**kwargs)
+
+    assert first["cached"] is False and second["cached"] is True
+    assert second["audio_url"] == first["audio_url"]
+    assert second["original_audio_url"] == "https://cdn.example/1.mp3"
+    assert client.calls == 1 and source.speed_calls == 1
+
+    await synthesize_tts_audio(**{**kwargs, "speed": 1.0})
+    assert client.calls == 2 and source.speed_calls == 1
+
+
+async def test_llm_tagging_cached(cache, monkeypatch):
+    """测试 LLM 标注结果命中缓存后不再调用模型，未通过校验的结果不缓存"""
+    calls = []
+
+    async def fake_generate(text, **kwargs):
+        calls.append(text)
+        return "(happy)大家好。" if text == "大家好。" else "改写过的文本"
+
+    monkeypatch.setattr(tts_expression_service, "get_tts_cache", lambda: cache)
+    monkeypatch.setattr(tts_expression_service, "get_tagging_llm", lambda: object())
+    monkeypatch.setattr(tts_expression_service, "generate_tagged_text", fake_generate)
+    kwargs = dict(speech_style="speech", preferred_tones=[], preferred_effects=[])
+
+    first = await tts_expression_service._llm_tagged_text("大家好。", **kwargs)
+    assert first and first.startswith("(happy)")
+    assert await tts_expression_service._llm_tagged_text("大家好。", **kwargs) == first
+    assert await tts_expression_service._llm_tagged_text("你好。", **kwargs) is None
+    assert await tts_expression_service._llm_tagged_text("你好。", **kwargs) is None
+    assert calls == ["大家好。", "你好。", "你好。"]
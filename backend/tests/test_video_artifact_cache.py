@@ -0,0 +1,107 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2026 relakkes@gmail.com
+#
+# This file is part of MediaCrawlerPro-ContentRemixAgent project.
+# Repository: https://github.com/MediaCrawlerPro/MediaCrawlerPro-ContentRemixAgent/blob/main/backend/tests/test_video_artifact_cache.py
+# GitHub: https://github.com/NanmiCoder
+# Licensed under NON-COMMERCIAL LEARNING LICENSE 1.1
+#
+# 声明：本代码仅供学习和研究目的使用。使用者应遵守以下原则：
+# 1. 不得用于任何商业用途。
+# 2. 使用时应遵守目标平台的使用条款和robots.txt规则。
+# 3. 不得进行大规模爬取或对平台造成运营干扰。
+# 4. 应合理控制请求频率，避免给目标平台带来不必要的负担。
+# 5. 不得用于任何非法或不当的用途。
+#
+# 详细许可条款请参阅项目根目录下的LICENSE文件。
+# 使用本代码即表示您同意遵守上述原则和LICENSE中的所有条款。
+
+
+"""
+视频处理结果缓存测试
+"""
+import os
+import time
+
+import pytest
+
+from services.video_artifact_cache import VideoArtifact, VideoArtifactCache
+
+
+def _artifact(content_id: str, text: str = "转录文本", asr_version: str = "funasr:v1") -> VideoArtifact:
+    return VideoArtifact(
+        platform="dy",
+        content_id=content_id,
+        asr_version=asr_version,
+        text=text,
+        segments=[{"start": 0.0, "end": 1.0, "text": text}],
+        local_video_url=f"/media/dy/{content_id}/video.mp4",
+    )
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return VideoArtifactCache(cache_dir=str(tmp_path), ttl_seconds=3600, max_bytes=0, max_entries=0)
+
+
+class TestVideoArtifactCache:
+    """视频处理结果缓存测试"""
+
+    def test_put_and_get(self, cache):
+        """测试写入后命中"""
+        cache.put(_artifact("123"))
+        hit = cache.get("dy", "123", "funasr:v1")
+
+        assert hit is not None
+        assert hit.text == "转录文本"
+        assert hit.segments[0]["end"] == 1.0
+        assert hit.local_video_url == "/media/dy/123/video.mp4"
+
+    def test_miss_on_different_asr_version(self, cache):
+        """测试 ASR 版本不同不命中"""
+        cache.put(_artifact("123"))
+        assert cache.get("dy", "123", "bcut:8") is None
+        assert cache.get("bilibili", "123", "funasr:v1") is None
+
+    def test_expired_entry_removed(self, tmp_path):
+        """测试过期条目被删除"""
+        cache = VideoArtifactCache(cache_dir=str(tmp_path), ttl_seconds=60, max_bytes=0, max_entries=0)
+        artifact = _artifact("123")
+        artifact.created_at = time.time() - 120
+        cache.put(artifact)
+
+        assert cache.get("dy", "123", "funasr:v1") is None
+        assert cache.list_entries() == []
+
+    def test_evict_by_entry_count_lru(self, tmp_path):
+        """测试按条目数淘汰最久未访问的条目"""
+        cache = VideoArtifactCache(cache_dir=str(tmp_path), ttl_seconds=0, max_bytes=0, max_entries=2)
+        for i, content_id in enumerate(("a", "b")):
+            cache.put(_artifact(content_id))
+            path = cache._entry_path(cache.make_key("dy", content_id, "funasr:v1"))
+            os.utime(path, (1000 + i, 1000 + i))
+
+        # 访问 a，使 b 成为最久未访问
+        assert cache.get("dy", "a", "funasr:v1") is not None
+        cache.put(_artifact("c"))
+
+        assert cache.get("dy", "b", "funasr:v1") is None
+        assert cache.get("dy", "a", "funasr:v1") is not None
+        assert cache.get("dy", "c", "funasr:v1") is not None
+
+    def test_evict_by_size(self, tmp_path):
+        """测试按总大小淘汰"""
+        cache = VideoArtifactCache(cache_dir=str(tmp_path), ttl_seconds=0, max_bytes=3000, max_entries=0)
+        cache.put(_artifact("a", text="字" * 300))
+        cache.put(_artifact("b", text="字" * 300))
+
+        assert len(cache.list_entries()) == 1
+
+    def test_corrupted_entry_dropped(self, cache):
+        """测试损坏的条目被丢弃"""
+        cache.put(_artifact("123"))
+        path = cache.list_entries()[0]
+        path.write_text("{not json", encoding="utf-8")
+
+        assert cache.get("dy", "123", "funasr:v1") is None
+        assert not path.exists()
@@ -30,6 +30,50 @@ from services.video_downloader import VideoDownloader, VideoDownloadError
 from services.audio_extractor import AudioExtractor, AudioExtractError
 
 
+@pytest.fixture
+def range_server():
+    """本地支持 Range 的 HTTP 服务器，返回 (url, payload)"""
+    import re
+    import threading
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    payload = os.urandom(300_000)
+
+    class RangeHandler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, *args):
+            pass
+
+        def _send(self, with_body: bool):
+            match = re.match(r"bytes=(\d+)-(\d*)", self.headers.get("Range", ""))
+            if match:
+                start = int(match.group(1))
+                end = int(match.group(2)) if match.group(2) else len(payload) - 1
+                self.send_response(206)
+                self.send_header("Content-Range", f"bytes {start}-{end}/{len(payload)}")
+            else:
+                start, end = 0, len(payload) - 1
+                self.send_response(200)
+            self.send_header("Content-Length", str(end - start + 1))
+            self.send_header("Content-Type", "video/mp4")
+            self.send_header("Accept-Ranges", "bytes")
+            self.end_headers()
+            if with_body:
+                self.wfile.write(payload[start:end + 1])
+
+        def do_HEAD(self):
+            self._send(False)
+
+        def do_GET(self):
+            self._send(True)
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), RangeHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_address[1]}/video.mp4", payload
+    server.shutdown()
+
+
 class TestVideoDownloader:
     """视频下载器测试"""
 
@@ -69,6 +113,145 @@ class TestVideoDownloader:
         assert not task_dir.exists()
 
 
+class TestSegmentedDownload:
+    """多连接分段下载测试"""
+
+    def test_plan_segments_small_file_single_range(self):
+        """小文件只规划一个分段"""
+        downloader = VideoDownloader()
+        downloader.min_segment_bytes = 1024
+        downloader.max_segments = 4
+        assert len(downloader._plan_segments(1000)) == 1
+
+    def test_plan_segments_cover_whole_file(self):
+        """分段连续且覆盖整个文件"""
+        downloader = VideoDownloader()
+        downloader.min_segment_bytes = 1000
+        downloader.max_segments = 4
+        segments = downloader._plan_segments(10_001)
+        assert len(segments) == 4
+        assert segments[0]["start"] == 0
+        assert segments[-1]["end"] == 10_000
+        for prev, cur in zip(segments, segments[1:]):
+            assert cur["start"] == prev["end"] + 1
+
+    async def test_segmented_download_matches_source(self, tmp_path, range_server):
+        """分段下载结果与源文件一致，进度汇总到总大小"""
+        url, payload = range_server
+        downloader = VideoDownloader()
+        downloader.temp_dir = str(tmp_path)
+        downloader.min_segment_bytes = 50_000
+        downloader.max_segments = 4
+        progress = []
+
+        path = await downloader.download(
+            url, "segmented_task",
+            progress_callback=lambda done, total: progress.append((done, total)),
+        )
+
+        assert len(downloader._segments) == 4
+        assert Path(path).read_bytes() == payload
+        assert progress[-1] == (len(payload), len(payload))
+
+    async def test_streaming_download_feeds_sink(self, tmp_path, range_server):
+        """流式下载将完整字节流交给 sink，keep_video 时同时落盘"""
+        url, payload = range_server
+        downloader = VideoDownloader()
+        downloader.temp_dir = str(tmp_path)
+        received = bytearray()
+
+        async def sink(chunk: bytes) -> None:
+            received.extend(chunk)
+
+        video_path, size = await downloader.download_streaming(url, "stream_task", sink, keep_video=True)
+
+        assert bytes(received) == payload
+        assert size == len(payload)
+        assert Path(video_path).read_bytes() == payload
+
+        _, _ = await downloader.download_streaming(url, "stream_task_no_keep", sink)
+        assert not list(downloader.get_task_dir("stream_task_no_keep").glob("video*"))
+
+
+class _FakeStream:
+    def __init__(self, finish_error: bool):
+        self.finish_error = finish_error
+
+    async def feed(self, chunk: bytes) -> None:
+        pass
+
+    async def finish(self):
+        if self.finish_error:
+            raise AudioExtractError("moov atom not found")
+
+    async def abort(self) -> None:
+        pass
+
+
+class _FakeExtractor:
+    """流式提取在 finish 时失败，整文件提取成功"""
+
+    def __init__(self, tmp_path: Path):
+        self.tmp_path = tmp_path
+
+    async def open_stream(self, output_dir: str):
+        return _FakeStream(finish_error=True)
+
+    def extract(self, video_path: str):
+        from services.audio_extractor import AudioInfo
+
+        wav = self.tmp_path / "audio.wav"
+        wav.write_bytes(b"\0" * 1024)
+        return AudioInfo(path=str(wav), sample_rate=16000, channels=1, sample_width=2, frames=16000)
+
+
+class _FakeDownloader:
+    def __init__(self, tmp_path: Path):
+        self.tmp_path = tmp_path
+
+    def get_task_dir(self, task_id: str) -> Path:
+        return self.tmp_path
+
+    async def download_streaming(self, video_url, task_id, sink, keep_video=False):
+        await sink(b"x" * 1024)
+        return None, 200 * 1024
+
+    async def download(self, video_url, task_id):
+        video = self.tmp_path / "video.mp4"
+        video.write_bytes(b"x" * 200 * 1024)
+        return str(video)
+
+
+class TestStreamingFallbackProgress:
+    """流式提取回退到先下载后提取时的子步骤事件"""
+
+    async def test_fallback_emits_each_sub_step_once(self, tmp_path):
+        from agent.tools.video_processor_tool import (
+            _download_and_extract_streaming,
+            _download_then_extract,
+        )
+
+        events = []
+
+        async def step_callback(action: str, step_id: str, label: str) -> None:
+            events.append((action, step_id))
+
+        downloader, extractor = _FakeDownloader(tmp_path), _FakeExtractor(tmp_path)
+        streamed = await _download_and_extract_streaming(
+            downloader, extractor, "http://example.com/v.mp4", "task", step_callback
+        )
+        assert streamed is None
+
+        await _download_then_extract(
+            downloader, extractor, "http://example.com/v.mp4", "task", step_callback,
+            announce_start=False,
+        )
+
+        for step_id in ("download_video", "extract_audio"):
+            assert events.count(("start", step_id)) == 1
+            assert events.count(("end", step_id)) == 1
+
+
 class TestAudioExtractor:
     """音频提取器测试"""
 
@@ -0,0 +1,145 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2026 relakkes@gmail.com
+#
+# This file is part of MediaCrawlerPro-ContentRemixAgent project.
+# Repository: https://github.com/MediaCrawlerPro/MediaCrawlerPro-ContentRemixAgent/blob/main/backend/tests/test_voice_style_profile_store.py
+# GitHub: https://github.com/NanmiCoder
+# Licensed under NON-COMMERCIAL LEARNING LICENSE 1.1
+#
+# 声明：本代码仅供学习和研究目的使用。使用者应遵守以下原则：
+# 1. 不得用于任何商业用途。
+# 2. 使用时应遵守目标平台的使用条款和robots.txt规则。
+# 3. 不得进行大规模爬取或对平台造成运营干扰。
+# 4. 应合理控制请求频率，避免给目标平台带来不必要的负担。
+# 5. 不得用于任何非法或不当的用途。
+#
+# 详细许可条款请参阅项目根目录下的LICENSE文件。
+# 使用本代码即表示您同意遵守上述原则和LICENSE中的所有条款。
+
+
+
+"""
+语音表达习惯配置存储测试
+"""
+import json
+import threading
+from pathlib import Path
+
+import pytest
+
+from config import settings
+from services.voice_style_profile_store import VoiceStyleProfileStore
+
+
+def _open(tmp_path) -> VoiceStyleProfileStore:
+    return VoiceStyleProfileStore(db_path=str(tmp_path / "data" / "profiles.sqlite3"), legacy_dir=str(tmp_path / "assets"))
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = _open(tmp_path)
+    yield store
+    store.close()
+
+
+class TestVoiceStyleProfileStore:
+    """SQLite 索引存储测试"""
+
+    def test_upsert_and_get(self, store):
+        """测试写入后读取，返回值为副本"""
+        saved = store.upsert("v1", {"auto_breaks": False, "tone_tags": ["Soft Tone"], "effect_tags": ["(break)"]})
+        assert saved == {
+            "auto_emotion": True,
+            "auto_breaks": False,
+            "tone_tags": ["(soft tone)"],
+            "effect_tags": ["(breath)"],
+        }
+
+        profile = store.get("v1")
+        profile["tone_tags"].append("(shouting)")
+        assert store.get("v1")["tone_tags"] == ["(soft tone)"]
+        assert store.get("missing") is None
+        assert store.get("") is None
+
+    def test_migrates_legacy_json(self, tmp_path):
+        """测试首次打开时导入旧版 JSON，非法条目跳过"""
+        legacy = tmp_path / "assets" / "voice_style_profiles.json"
+        legacy.parent.mkdir()
+        legacy.write_text(json.dumps({
+            "v1": {"auto_emotion": False, "tone_tags": ["(whispering)"]},
+            "v2": {"tone_tags": ["(not-a-tag)"]},
+            "v3": "broken",
+        }), encoding="utf-8")
+
+        store = _open(tmp_path)
+        try:
+            assert store.get("v1")["auto_emotion"] is False
+            assert store.get("v1")["tone_tags"] == ["(whispering)"]
+            assert store.get("v2") is None
+            assert store.get("v3") is None
+        finally:
+            store.close()
+
+        assert not legacy.exists()
+        assert (tmp_path / "assets" / "voice_style_profiles.json.migrated").exists()
+
+    def test_moves_legacy_database_out_of_assets(self, tmp_path):
+        """测试旧版放在 ASSETS_DIR（公开访问）下的 SQLite 库被迁出，WAL 中的数据不丢失"""
+        legacy_dir = tmp_path / "assets"
+        legacy = VoiceStyleProfileStore(db_path=str(legacy_dir / "voice_style_profiles.sqlite3"), legacy_dir=str(legacy_dir))
+        legacy.upsert("v1", {"auto_breaks": False})
+        # 不关闭旧连接: 数据仍在 WAL 中，-wal/-shm 文件存在
+        assert (legacy_dir / "voice_style_profiles.sqlite3-wal").exists()
+
+        store = _open(tmp_path)
+        try:
+            assert store.get("v1")["auto_breaks"] is False
+        finally:
+            store.close()
+            legacy.close()
+        assert (tmp_path / "data" / "profiles.sqlite3").exists()
+        assert not (legacy_dir / "voice_style_profiles.sqlite3").exists()
+        assert not (legacy_dir / "voice_style_profiles.sqlite3-wal").exists()
+
+    def test_default_database_outside_assets(self):
+        """测试默认库位置不在公开访问的 ASSETS_DIR 下"""
+        db_path = Path(settings.VOICE_STYLE_DB_PATH).resolve()
+        assert Path(settings.ASSETS_DIR).resolve() not in db_path.parents
+
+    def test_cache_invalidated_by_other_process(self, tmp_path):
+        """测试其他连接（worker）的写入会使本地读缓存失效"""
+        worker_a = _open(tmp_path)
+        worker_b = _open(tmp_path)
+        try:
+            assert worker_a.get("v1") is None  # 负缓存
+            worker_b.upsert("v1", {"auto_breaks": False})
+            assert worker_a.get("v1")["auto_breaks"] is False
+
+            worker_b.upsert("v1", {"auto_breaks": True})
+            assert worker_a.get("v1")["auto_breaks"] is True
+        finally:
+            worker_a.close()
+            worker_b.close()
+
+    def test_concurrent_upserts(self, tmp_path):
+        """测试多线程、多连接并发写入不丢失"""
+        stores = [_open(tmp_path) for _ in range(2)]
+
+        def write(index: int) -> None:
+            store = stores[index % 2]
+            for i in range(25):
+                store.upsert(f"voice-{index}-{i}", {"auto_emotion": bool(i % 2)})
+
+        threads = [threading.Thread(target=write, args=(index,)) for index in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        try:
+            for index in range(4):
+                for i in range(25):
+                    assert stores[0].get(f"voice-{index}-{i}")["auto_emotion"] is bool(i % 2)
+        finally:
+            for store in stores:
+                store.close()
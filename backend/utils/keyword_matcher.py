@@ -0,0 +1,86 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2026 relakkes@gmail.com
+#
+# This file is part of MediaCrawlerPro-ContentRemixAgent project.
+# Repository: https://github.com/MediaCrawlerPro/MediaCrawlerPro-ContentRemixAgent/blob/main/backend/utils/keyword_matcher.py
+# GitHub: https://github.com/NanmiCoder
+# Licensed under NON-COMMERCIAL LEARNING LICENSE 1.1
+#
+# 声明：本代码仅供学习和研究目的使用。使用者应遵守以下原则：
+# 1. 不得用于任何商业用途。
+# 2. 使用时应遵守目标平台的使用条款和robots.txt规则。
+# 3. 不得进行大规模爬取或对平台造成运营干扰。
+# 4. 应合理控制请求频率，避免给目标平台带来不必要的负担。
+# 5. 不得用于任何非法或不当的用途。
+#
+# 详细许可条款请参阅项目根目录下的LICENSE文件。
+# 使用本代码即表示您同意遵守上述原则和LICENSE中的所有条款。
+
+
+"""
+多模式关键词匹配（Aho–Corasick 自动机）
+
+逐个关键词做 `kw in text` 的代价是 O(关键词数 × 文本长度)。
+自动机在构建时把全部关键词合并成一棵带失败指针的字典树，
+匹配时对文本只扫描一遍即可得到出现过的所有关键词，代价与关键词数量无关。
+
+用法:
+    matcher = KeywordMatcher(["哈哈", "笑死", "laughing"])
+    matcher.find("哈哈哈，笑死我了")  # -> {"哈哈", "笑死"}
+"""
+
+from collections import deque
+from typing import Dict, FrozenSet, Iterable, List
+
+
+class KeywordMatcher:
+    """预编译的多关键词匹配器（构建后只读，线程安全）"""
+
+    def __init__(self, keywords: Iterable[str]):
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._output: List[FrozenSet[str]] = [frozenset()]
+        self.keywords: FrozenSet[str] = frozenset(kw for kw in keywords if kw)
+
+        outputs: List[set] = [set()]
+        for keyword in self.keywords:
+            state = 0
+            for ch in keyword:
+                next_state = self._goto[state].get(ch)
+                if next_state is None:
+                    next_state = len(self._goto)
+                    self._goto[state][ch] = next_state
+                    self._goto.append({})
+                    self._fail.append(0)
+                    outputs.append(set())
+                state = next_state
+            outputs[state].add(keyword)
+
+        # BFS 计算失败指针（第一层节点指向根），并把失败链上的输出合并到当前状态
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, child in self._goto[state].items():
+                queue.append(child)
+                fallback = self._fail[state]
+                while fallback and ch not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[child] = self._goto[fallback].get(ch, 0)
+                outputs[child] |= outputs[self._fail[child]]
+
+        self._output = [frozenset(out) for out in outputs]
+
+    def find(self, text: str) -> FrozenSet[str]:
+        """返回 text 中出现过的全部关键词（单次扫描）"""
+        goto = self._goto
+        fail = self._fail
+        output = self._output
+        found: set = set()
+        state = 0
+        for ch in text or "":
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            if output[state]:
+                found |= output[state]
+        return frozenset(found)
@@ -0,0 +1,185 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2026 relakkes@gmail.com
+#
+# This file is part of MediaCrawlerPro-ContentRemixAgent project.
+# Repository: https://github.com/MediaCrawlerPro/MediaCrawlerPro-ContentRemixAgent/blob/main/backend/utils/startup_profiler.py
+# GitHub: https://github.com/NanmiCoder
+# Licensed under NON-COMMERCIAL LEARNING LICENSE 1.1
+#
+# 声明：本代码仅供学习和研究目的使用。使用者应遵守以下原则：
+# 1. 不得用于任何商业用途。
+# 2. 使用时应遵守目标平台的使用条款和robots.txt规则。
+# 3. 不得进行大规模爬取或对平台造成运营干扰。
+# 4. 应合理控制请求频率，避免给目标平台带来不必要的负担。
+# 5. 不得用于任何非法或不当的用途。
+#
+# 详细许可条款请参阅项目根目录下的LICENSE文件。
+# 使用本代码即表示您同意遵守上述原则和LICENSE中的所有条款。
+
+"""
+应用启动分阶段编排与计时
+
+lifespan 把启动步骤拆成阶段，互不依赖的阶段成组并发执行:
+- run(name, awaitable): 执行单个阶段并计时
+- gather(**phases): 并发执行一组阶段；任一阶段失败时取消同组其余阶段，并抛出该异常
+- start_background(name, awaitable): 不阻塞启动的后台阶段（如 ASR 模型预加载），
+  应用先开始接收请求，全部后台阶段结束前 /health/ready 报告未就绪
+- mark_serving(): 前台阶段完成、开始接收请求时调用，输出各阶段耗时报告
+"""
+
+import asyncio
+import time
+from dataclasses import dataclass
+from typing import Any, Awaitable, Dict, Optional
+
+from utils.logger import logger
+
+
+@dataclass
+class PhaseTiming:
+    """单个启动阶段的状态与耗时"""
+    name: str
+    background: bool = False
+    state: str = "running"  # running / ok / failed / cancelled
+    seconds: Optional[float] = None
+    error: Optional[str] = None
+
+
+class StartupProfiler:
+    """启动阶段编排器（单个事件循环内使用）"""
+
+    def __init__(self):
+        self._origin = time.perf_counter()
+        self.serving_after: Optional[float] = None
+        self.ready_after: Optional[float] = None
+        self._phases: Dict[str, PhaseTiming] = {}
+        self._background: Dict[str, asyncio.Task] = {}
+
+    def elapsed(self) -> float:
+        """自启动开始经过的秒数"""
+        return time.perf_counter() - self._origin
+
+    async def run(self, name: str, awaitable: Awaitable) -> Any:
+        """执行一个阶段并记录耗时与结果状态"""
+        phase = self._phases.setdefault(name, PhaseTiming(name))
+        started = time.perf_counter()
+        try:
+            result = await awaitable
+        except asyncio.CancelledError:
+            phase.state = "cancelled"
+            raise
+        except Exception as e:
+            phase.state = "failed"
+            phase.error = str(e)
+            raise
+        finally:
+            phase.seconds = time.perf_counter() - started
+        phase.state = "ok"
+        return result
+
+    async def gather(self, **phases: Awaitable) -> Dict[str, Any]:
+        """
+        并发执行一组互不依赖的阶段
+
+        Returns:
+            阶段名 -> 返回值
+
+        Raises:
+            第一个失败阶段的异常（同组其余阶段已被取消）
+        """
+        tasks = {name: asyncio.ensure_future(self.run(name, aw)) for name, aw in phases.items()}
+        try:
+            await asyncio.gather(*tasks.values())
+        except BaseException:
+            for task in tasks.values():
+                task.cancel()
+            await asyncio.gather(*tasks.values(), return_exceptions=True)
+            raise
+        return {name: task.result() for name, task in tasks.items()}
+
+    def start_background(self, name: str, awaitable: Awaitable) -> asyncio.Task:
+        """启动后台阶段（失败只记录，不影响应用启动）"""
+        # 阶段记录先于任务运行创建，确保任务真正开始前就报告未就绪
+        self._phases[name] = PhaseTiming(name, background=True)
+        task = asyncio.create_task(self._run_background(name, awaitable), name=f"startup:{name}")
+        self._background[name] = task
+        return task
+
+    async def _run_background(self, name: str, awaitable: Awaitable) -> None:
+        try:
+            await self.run(name, awaitable)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"Startup phase {name} failed: {e}")
+        else:
+            logger.info(f"Startup phase {name} finished in {self._phases[name].seconds:.2f}s")
+
+        if self.ready and self.ready_after is None:
+            self.ready_after = self.elapsed()
+            logger.info(f"Startup complete: ready after {self.ready_after:.2f}s")
+
+    @property
+    def ready(self) -> bool:
+        """全部阶段（含后台阶段）均已结束"""
+        return all(phase.state != "running" for phase in self._phases.values())
+
+    def mark_serving(self) -> None:
+        """前台阶段完成，记录开始接收请求的时间并输出耗时报告"""
+        self.serving_after = self.elapsed()
+        if self.ready and self.ready_after is None:
+            self.ready_after = self.serving_after
+        logger.info(self.report())
+
+    def report(self) -> str:
+        """各阶段耗时报告（按开始顺序）"""
+        lines = [f"Startup timing: serving after {self.serving_after or self.elapsed():.2f}s"]
+        width = max((len(name) for name in self._phases), default=0)
+        for phase in self._phases.values():
+            seconds = f"{phase.seconds:7.3f}s" if phase.seconds is not None else "       -"
+            suffix = " (background)" if phase.background else ""
+            lines.append(f"  {phase.name:<{width}}  {seconds}  {phase.state}{suffix}")
+        return "\n".join(lines)
+
+    def snapshot(self) -> dict:
+        """启动状态（/health/ready 使用）"""
+        return {
+            "ready": self.ready,
+            "serving_after_s": round(self.serving_after, 3) if self.serving_after is not None else None,
+            "ready_after_s": round(self.ready_after, 3) if self.ready_after is not None else None,
+            "phases": {
+                phase.name: {
+                    "state": phase.state,
+                    "background": phase.background,
+                    "seconds": round(phase.seconds, 3) if phase.seconds is not None else None,
+                    "error": phase.error,
+                }
+                for phase in self._phases.values()
+            },
+        }
+
+    async def aclose(self) -> None:
+        """取消仍在运行的后台阶段（应用关闭或启动失败时调用）"""
+        pending = [task for task in self._background.values() if not task.done()]
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+
+
+# =============================================================================
+# Global Instance
+# =============================================================================
+
+_startup_profiler: Optional[StartupProfiler] = None
+
+
+def start_startup_profiler() -> StartupProfiler:
+    """创建本次启动的编排器（每次 lifespan 启动时调用）"""
+    global _startup_profiler
+    _startup_profiler = StartupProfiler()
+    return _startup_profiler
+
+
+def get_startup_profiler() -> Optional[StartupProfiler]:
+    """获取当前启动编排器（lifespan 尚未运行时返回 None）"""
+    return _startup_profiler
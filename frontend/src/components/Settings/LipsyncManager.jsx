@@ -1,6 +1,6 @@
-import React, { useEffect, useMemo, useRef, useState } from 'react';
+import React, { useEffect, useMemo, useState } from 'react';
 import { useTranslation } from 'react-i18next';
-import { generateLipsync, getLipsyncStatus, textToSpeech, uploadAudioFile, uploadVideoFile, fetchMediaAiVoices, fetchMediaAiTtsResults, fetchMediaAiAvatars, fetchMediaAiLipsyncResults } from '../../services/api';
+import { generateLipsync, subscribeLipsyncStatus, textToSpeech, uploadAudioFile, uploadVideoFile, fetchMediaAiVoices, fetchMediaAiTtsResults, fetchMediaAiAvatars, fetchMediaAiLipsyncResults } from '../../services/api';
 import { normalizeAvatarItem, normalizeGenerationItem, normalizeMediaUrl, normalizeSpeechItem, normalizeVoiceItem, toPlayableMediaUrl } from '../../utils/mediaUrl';
 import TTSTagControls from './TTSTagControls';
 
@@ -66,7 +66,6 @@ function LipsyncManager() {
   const [serverLoading, setServerLoading] = useState(false);
   const [loading, setLoading] = useState(false);
   const [error, setError] = useState('');
-  const pollingRef = useRef(new Map());
 
   const [voices, setVoices] = useState(() => readStorage(VOICES_STORAGE_KEY));
   const [speeches, setSpeeches] = useState(() => readStorage(SPEECHES_STORAGE_KEY));
@@ -163,52 +162,36 @@ function LipsyncManager() {
     writeStorage(GENERATIONS_STORAGE_KEY, next);
   };
 
-  const stopPolling = (id) => {
-    const timer = pollingRef.current.get(id);
-    if (timer) {
-      clearInterval(timer);
-      pollingRef.current.delete(id);
-    }
-  };
-
-  const startPolling = (id) => {
-    if (!id || pollingRef.current.has(id)) return;
-    const timer = setInterval(async () => {
-      try {
-        const result = await getLipsyncStatus(id);
-        const data = result?.data || {};
-        const status = data.status;
-        const outputUrl = normalizeMediaUrl(data.outputUrl || data.outputMediaUrl || data.output_url || '');
-        setGenerations((prev) => {
-          const next = prev.map((item) => {
-            if (item.generationId !== id) return item;
-            return { ...item, status: status || item.status, outputUrl: outputUrl || item.outputUrl };
-          });
-          writeStorage(GENERATIONS_STORAGE_KEY, next);
-          return next;
-        });
-        if (status === 'COMPLETED' || status === 'FAILED' || status === 'REJECTED') {
-          stopPolling(id);
-        }
-      } catch {
-        // 忽略轮询错误，等待下一轮
-      }
-    }, 5000);
-    pollingRef.current.set(id, timer);
-  };
+  // 未完成任务的 id 集合（排序后拼接，作为订阅的依赖键）
+  const pendingKey = useMemo(() => generations
+    .filter((item) => item.generationId && (item.status === 'PENDING' || item.status === 'PROCESSING'))
+    .map((item) => item.generationId)
+    .sort()
+    .join(','), [generations]);
 
   useEffect(() => {
-    generations.forEach((item) => {
-      if (item.status === 'PENDING' || item.status === 'PROCESSING') {
-        startPolling(item.generationId);
-      }
+    if (!pendingKey) return undefined;
+    // 所有未完成任务共用一条订阅；状态由服务端统一轮询，这里只接收推送，
+    // 集合变化（新任务提交或有任务结束）时关闭旧订阅并按新集合重新订阅
+    const ids = pendingKey.split(',');
+    const subscription = subscribeLipsyncStatus(ids, (data) => {
+      const id = data.generation_id;
+      if (!ids.includes(id)) return;
+      const outputUrl = normalizeMediaUrl(data.output_url || '');
+      setGenerations((prev) => {
+        const next = prev.map((item) => {
+          if (item.generationId !== id) return item;
+          return { ...item, status: data.status || item.status, outputUrl: outputUrl || item.outputUrl };
+        });
+        writeStorage(GENERATIONS_STORAGE_KEY, next);
+        return next;
+      });
     });
-    return () => {
-      pollingRef.current.forEach((timer) => clearInterval(timer));
-      pollingRef.current.clear();
-    };
-  // eslint-disable-next-line react-hooks/exhaustive-deps
-  }, []);
+    subscription.promise.catch(() => {
+      // 忽略订阅错误，下次打开页面时重新订阅
+    });
+    return () => subscription.abort();
+  }, [pendingKey]);
 
   const canGenerate = useMemo(() => {
     const hasVideo = videoSourceType === 'upload'
@@ -273,7 +256,6 @@ function LipsyncManager() {
       };
       const next = [item, ...generations];
       persistGenerations(next);
-      startPolling(generationId);
     } catch (e) {
       setError(e.message || 'Lipsync failed');
     } finally {
@@ -401,6 +401,7 @@ function handleTranscript(prev, data) {
     segments[existing.index] = {
       ...existing.segment,
       data: transcript,
+      status: 'completed',
     };
     return { ...prev, segments };
   }
@@ -419,6 +420,43 @@ function handleTranscript(prev, data) {
   };
 }
 
+/**
+ * 处理 transcript_partial 事件
+ * 转录进行中按窗口追加字幕分段，最终由 transcript 事件的完整结果覆盖
+ */
+function handleTranscriptPartial(prev, data) {
+  if (!prev || !data?.segments?.length) return prev;
+
+  const existing = findLastSegment(prev.segments, 'transcript');
+  if (existing?.segment.status === 'completed') return prev;
+
+  const previous = existing?.segment.data?.segments || [];
+  const merged = [...previous, ...data.segments];
+  const transcript = {
+    text: merged.map(s => s.text).join(''),
+    segments: merged,
+    content_id: data.content_id,
+  };
+
+  if (existing) {
+    const segments = [...prev.segments];
+    segments[existing.index] = { ...existing.segment, data: transcript };
+    return { ...prev, segments };
+  }
+
+  return {
+    ...prev,
+    segments: [
+      ...prev.segments,
+      {
+        type: 'transcript',
+        data: transcript,
+        status: 'running',
+      },
+    ],
+  };
+}
+
 // ========== 事件处理器映射 ==========
 
 const eventHandlers = {
@@ -444,6 +482,8 @@ const eventHandlers = {
   content_info: handleContentInfo,
   // 转录文本（视频处理完成后）
   transcript: handleTranscript,
+  // 渐进式转录（视频处理进行中）
+  transcript_partial: handleTranscriptPartial,
 };
 
 /**
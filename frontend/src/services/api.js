@@ -2,7 +2,7 @@
  * API 服务模块
  * 提供与后端通信的所有 API 接口
  */
-import { createSSEStream } from './sse';
+import { createSSEStream, createCancellableSSEStream } from './sse';
 import { getCurrentLanguage } from '../i18n';
 import { getAccessToken } from './auth';
 
@@ -587,6 +587,24 @@ export async function getLipsyncStatus(generationId) {
   return response.json();
 }
 
+/**
+ * 订阅 lipsync 任务状态（服务端轮询，状态变化时通过 SSE 推送）
+ * @param {string[]} generationIds - 任务 ID 列表
+ * @param {function} onStatus - 状态回调 ({generation_id, status, output_url, done})
+ * @returns {{promise: Promise<void>, abort: function}}
+ */
+export function subscribeLipsyncStatus(generationIds, onStatus) {
+  return createCancellableSSEStream(
+    `${MEDIA_AI_API_BASE}/lipsync/events`,
+    { generation_ids: generationIds },
+    {
+      onChunk: ({ type, data }) => {
+        if (type === 'lipsync_status') onStatus?.(data);
+      },
+    },
+  );
+}
+
 export async function fetchMediaAiVoices(limit = 50, offset = 0, q = '') {
   const params = new URLSearchParams();
   params.set('limit', String(limit));